@@ -49,7 +49,15 @@ class Settings(BaseSettings):
     temperature: float = 0.1  # Low temperature for factual responses
 
     # Response Time Configuration
-    target_response_time: int = 3000  # milliseconds
+    target_response_time: int = 3000  # milliseconds; optional stages are skipped past it
+    request_deadline_ms: int = 12000  # Hard per-request ceiling (services/deadline.py)
+
+    # Railway PostgreSQL pool (database/connection.py; used when DATABASE_URL is set)
+    db_pool_min: int = 1
+    db_pool_max: int = 10
+    db_pool_timeout_seconds: float = 5.0  # Wait for a free connection before failing
+    db_statement_timeout_ms: int = 5000
+    db_health_check_idle_seconds: float = 30.0  # SELECT 1 before reusing a connection idle this long
 
     # Pixeltable Configuration (PRIMARY DATABASE)
     use_pixeltable: str = "true"  # Default to Pixeltable-only mode
@@ -59,6 +67,26 @@ class Settings(BaseSettings):
     # Redis Configuration (for session persistence)
     redis_url: str = "redis://localhost:6379/0"  # Railway will override
     redis_ttl_seconds: int = 5400  # 90 minutes (spec requirement)
+    redis_max_connections: int = 50  # Async pool for call context; requests wait briefly for a free connection
+    session_store: str = "redis"  # "redis" (shared across workers, in-process while unreachable) or "memory"
+    session_cache_max_entries: int = 10000  # Per in-process session / context store (LRU beyond this)
+    store_sweep_interval_seconds: float = 30.0  # Expiry sweep of in-process stores (services/bounded_store.py)
+
+    # LLM response cache (temperature-0 calls; L1 in-process, L2 Redis)
+    llm_cache_enabled: bool = True
+
+    # Local intent fast path (services/local_intent_classifier.py); GPT only below the threshold
+    local_intent_enabled: bool = True
+    local_intent_threshold: float = 0.85
+    local_intent_model_path: Optional[str] = None  # Shipped .npz artifact; trained at startup if unset
+
+    # Client-side OpenAI rate limiting (services/llm_scheduler.py); corrected from x-ratelimit-* headers
+    llm_scheduler_enabled: bool = True
+    llm_requests_per_minute: int = 500
+    llm_tokens_per_minute: int = 200000
+
+    # Background GPT enrichment of projects (services/enrichment_store.py), re-run on catalog refresh
+    enrichment_job_enabled: bool = True
 
     class Config:
         env_file = ".env"
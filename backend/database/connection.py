@@ -1,14 +1,31 @@
 """
 Database Connection Utility
 Provides connection management for Railway PostgreSQL
+
+Connections come from a process-wide pool (`db_pool`) instead of a new
+TCP+TLS+auth handshake per operation:
+- between `db_pool_min` and `db_pool_max` connections; callers wait up to
+  `db_pool_timeout_seconds` for a free one;
+- connections idle longer than `db_health_check_idle_seconds` are checked
+  with SELECT 1 before reuse, and broken ones are replaced;
+- every connection runs with `statement_timeout` set.
+
+Async code runs service methods that use get_db_connection through
+`database.executor.run_db`, off the event loop.
 """
 
 import os
 import logging
+import threading
+import time
 import psycopg2
+import psycopg2.pool
 from psycopg2.extras import RealDictCursor
+from collections import deque
 from contextlib import contextmanager
-from typing import Optional
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +33,7 @@ logger = logging.getLogger(__name__)
 def get_database_url() -> Optional[str]:
     """
     Get database URL from environment variables
-    
+
     Railway provides DATABASE_URL or POSTGRES_URL
     Returns None if not configured
     """
@@ -28,44 +45,197 @@ def has_database() -> bool:
     return get_database_url() is not None
 
 
+class PoolTimeout(psycopg2.pool.PoolError):
+    """No connection became free within the pool timeout."""
+
+
+class ConnectionPool:
+    """Thread-safe, health-checked pool of psycopg2 connections."""
+
+    def __init__(
+        self,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 5.0,
+        statement_timeout_ms: int = 5000,
+        connect_timeout: int = 5,
+        health_check_idle_seconds: float = 30.0,
+        connect: Optional[Callable[[], Any]] = None
+    ):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.statement_timeout_ms = statement_timeout_ms
+        self.connect_timeout = connect_timeout
+        self.health_check_idle_seconds = health_check_idle_seconds
+        self._connect = connect or self._connect_psycopg2
+        self._idle: Deque[Tuple[Any, float]] = deque()  # (connection, returned_at), most recent last
+        self._size = 0  # Open connections, idle or in use
+        self._cond = threading.Condition()
+        self._stats = {"acquired": 0, "opened": 0, "discarded": 0, "health_checks": 0, "timeouts": 0, "waited": 0}
+
+    def _connect_psycopg2(self):
+        db_url = get_database_url()
+        if not db_url:
+            raise ValueError("DATABASE_URL not configured. Set DATABASE_URL or POSTGRES_URL environment variable.")
+        return psycopg2.connect(
+            db_url,
+            cursor_factory=RealDictCursor,
+            connect_timeout=self.connect_timeout,
+            options=f"-c statement_timeout={self.statement_timeout_ms}"
+        )
+
+    def acquire(self):
+        """A healthy connection from the pool (opened if needed); raises PoolTimeout."""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            conn = None
+            with self._cond:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeout(f"No database connection free after {self.timeout:.1f}s")
+                    self._stats["waited"] += 1
+                    self._cond.wait(remaining)
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                else:
+                    self._size += 1  # Reserve the slot; connect outside the lock
+                    returned_at = None
+
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    self._forget()
+                    raise
+                self._stats["opened"] += 1
+            elif not self._healthy(conn, returned_at):
+                self._discard(conn)
+                continue
+            self._stats["acquired"] += 1
+            return conn
+
+    def release(self, conn, discard: bool = False) -> None:
+        """Return a connection; closed or `discard`ed connections are replaced later."""
+        if discard or getattr(conn, "closed", 0):
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def warm(self) -> None:
+        """Open connections up to `min_size` (startup)."""
+        opened = []
+        try:
+            while self._size < self.min_size:
+                opened.append(self.acquire())
+        finally:
+            for conn in opened:
+                self.release(conn)
+
+    def close(self) -> None:
+        """Close idle connections (app shutdown)."""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+        for conn, _ in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                **self._stats,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+            }
+
+    def _healthy(self, conn, returned_at: float) -> bool:
+        if getattr(conn, "closed", 0):
+            return False
+        if time.monotonic() - returned_at < self.health_check_idle_seconds:
+            return True
+        self._stats["health_checks"] += 1
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            conn.rollback()
+            return True
+        except Exception as e:
+            logger.warning(f"Dropping stale database connection: {e}")
+            return False
+
+    def _discard(self, conn) -> None:
+        self._stats["discarded"] += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+        self._forget()
+
+    def _forget(self) -> None:
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+
+# Global instance
+db_pool = ConnectionPool(
+    min_size=settings.db_pool_min,
+    max_size=settings.db_pool_max,
+    timeout=settings.db_pool_timeout_seconds,
+    statement_timeout_ms=settings.db_statement_timeout_ms,
+    health_check_idle_seconds=settings.db_health_check_idle_seconds
+)
+
+
 @contextmanager
 def get_db_connection():
     """
     Get database connection with automatic cleanup and transaction management
-    
+
     Usage:
         with get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM table")
             result = cursor.fetchall()
-    
+
     Automatically commits on success, rollback on exception
     """
-    db_url = get_database_url()
-    
-    if not db_url:
+    if not get_database_url():
         raise ValueError("DATABASE_URL not configured. Set DATABASE_URL or POSTGRES_URL environment variable.")
-    
-    conn = None
+
+    conn = db_pool.acquire()
+    broken = False
     try:
-        conn = psycopg2.connect(db_url, cursor_factory=RealDictCursor)
         yield conn
         conn.commit()
     except Exception as e:
-        if conn:
+        try:
             conn.rollback()
+        except Exception:
+            broken = True
+        broken = broken or isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
         logger.error(f"Database error: {e}")
         raise
     finally:
-        if conn:
-            conn.close()
+        db_pool.release(conn, discard=broken)
 
 
 @contextmanager
 def get_db_cursor():
     """
     Get database cursor directly
-    
+
     Usage:
         with get_db_cursor() as cursor:
             cursor.execute("SELECT * FROM table")
@@ -77,3 +247,4 @@ def get_db_cursor():
             yield cursor
         finally:
             cursor.close()
+
@@ -0,0 +1,34 @@
+"""
+Database Executor - Runs blocking database work off the event loop.
+
+Profile, scheduling and reminder services use psycopg2 through
+database/connection.py. Async endpoints call them with `run_db`, on an
+executor with one worker per pooled connection, so waiting for the
+database (or for a free connection) never blocks the event loop and
+async callers queue here rather than on the pool.
+
+Importable without psycopg2: the services fall back to in-memory storage
+in that case, and run_db simply runs them in a worker thread.
+"""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from config import settings
+
+_db_executor = ThreadPoolExecutor(max_workers=settings.db_pool_max, thread_name_prefix="db")
+
+
+async def run_db(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking database call on the database executor.
+
+    Usage:
+        profile = await run_db(profile_manager.get_or_create_profile, user_id)
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()  # Keep the request deadline
+    return await loop.run_in_executor(_db_executor, functools.partial(context.run, fn, *args, **kwargs))
@@ -66,7 +66,8 @@ class PixeltableClient:
         refusal_reason: str = None,
         response_time_ms: int = 0,
         project_id: str = None,
-        session_id: str = None
+        session_id: str = None,
+        classifier: str = None
     ):
         """Log a query - compatible with supabase_client interface."""
         if not self.initialized:
@@ -83,7 +84,8 @@ class PixeltableClient:
                 refusal_reason=refusal_reason,
                 response_time_ms=response_time_ms,
                 project_id=project_id,
-                session_id=session_id
+                session_id=session_id,
+                classifier=classifier
             )
         except Exception as e:
             logger.error(f"Failed to log query: {e}")
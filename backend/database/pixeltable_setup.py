@@ -12,6 +12,9 @@ import logging
 import os
 import json
 
+from services.llm_gateway import llm_gateway
+from services.llm_scheduler import Priority
+
 logger = logging.getLogger(__name__)
 
 # Initialize OpenAI client
@@ -21,7 +24,8 @@ client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
 def generate_faq_response(question: str) -> str:
     """Generate FAQ response using OpenAI (UDF)."""
     try:
-        response = client.chat.completions.create(
+        # Background priority: ingestion waits for capacity instead of starving live calls
+        response = llm_gateway.chat_sync(
             messages=[
                 {
                     "role": "system",
@@ -45,7 +49,9 @@ Use friendly emojis where appropriate."""
                     "content": question
                 }
             ],
-            model='gpt-4o-mini'
+            model='gpt-4o-mini',
+            priority=Priority.BACKGROUND,
+            max_wait=None
         )
         return response.choices[0].message.content
     except Exception as e:
@@ -130,6 +136,7 @@ def initialize_pixeltable():
     _create_query_logs_table()  # Query logging
     _create_documents_table()   # Vector store
     _create_faq_table()         # FAQ response trainer
+    _create_project_enrichment_table()  # Materialized GPT enrichment per project
     
     logger.info("Pixeltable initialization complete")
 
@@ -397,7 +404,11 @@ def _create_query_logs_table():
     
     if _table_exists('brigade.query_logs'):
         logger.info("Query logs table already exists")
-        return pxt.get_table('brigade.query_logs')
+        logs = pxt.get_table('brigade.query_logs')
+        if 'classifier' not in logs.columns:
+            logs.add_column(classifier=pxt.String)  # Tables created before the local intent classifier
+            logger.info("Added classifier column to brigade.query_logs")
+        return logs
     
     logs = pxt.create_table('brigade.query_logs', {
         'query_id': pxt.String,
@@ -410,6 +421,7 @@ def _create_query_logs_table():
         'response_time_ms': pxt.Int,
         'project_id': pxt.String,
         'session_id': pxt.String,
+        'classifier': pxt.String,  # Which intent classifier routed the query: "gpt" or "local"
         'created_at': pxt.Timestamp,
     })
     
@@ -422,6 +434,33 @@ def get_query_logs_table():
     return pxt.get_table('brigade.query_logs')
 
 
+def _create_project_enrichment_table():
+    """Create the GPT enrichment table (one row per project, versioned by a hash of the project row)."""
+
+    if _table_exists('brigade.project_enrichment'):
+        logger.info("Project enrichment table already exists")
+        return pxt.get_table('brigade.project_enrichment')
+
+    enrichment = pxt.create_table('brigade.project_enrichment', {
+        'project_id': pxt.String,
+        'version': pxt.String,
+        'amenities': pxt.String,
+        'nearby_places': pxt.String,
+        'connectivity': pxt.String,
+        'neighborhood_info': pxt.String,
+        'sales_pitch': pxt.String,
+        'enriched_at': pxt.Timestamp,
+    })
+
+    logger.info("Created brigade.project_enrichment table")
+    return enrichment
+
+
+def get_project_enrichment_table():
+    """Get the project enrichment table handle."""
+    return pxt.get_table('brigade.project_enrichment')
+
+
 async def log_query(
     user_id: str,
     query: str,
@@ -431,7 +470,8 @@ async def log_query(
     refusal_reason: str = None,
     response_time_ms: int = 0,
     project_id: str = None,
-    session_id: str = None
+    session_id: str = None,
+    classifier: str = None
 ):
     """Log a query to Pixeltable (async wrapper for compatibility)."""
     from datetime import datetime
@@ -450,6 +490,7 @@ async def log_query(
             'response_time_ms': response_time_ms,
             'project_id': project_id or '',
             'session_id': session_id or '',
+            'classifier': classifier or '',
             'created_at': datetime.now(),
         }])
         logger.debug(f"Logged query: {query[:50]}...")
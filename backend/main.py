@@ -3,10 +3,11 @@ Main FastAPI application for Real Estate Sales Intelligence Chatbot.
 Powered by Pixeltable - No Supabase Required!
 """
 
-from fastapi import FastAPI, HTTPException, Depends, Header
+from fastapi import FastAPI, HTTPException, Depends, Header, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 import time
 import logging
 import re
@@ -37,7 +38,11 @@ from config import settings
 from services.flow_engine import FlowEngine, flow_engine
 from services.retrieval import retrieval_service # Deferred import to prevent hang
 from services.intelligent_fallback import intelligent_fallback
-from services.project_enrichment import project_enrichment
+from services.project_enrichment import project_enrichment, sales_pitch_prompt
+from services.enrichment_store import enrichment_store
+from services.session_store import session_store, session_turn
+from services.bounded_store import run_sweeper, store_stats
+from database.executor import run_db
 from services.context_understanding import context_understanding
 
 from services.confidence_scorer import confidence_scorer
@@ -47,6 +52,15 @@ from services.multi_project_retrieval import multi_project_retrieval
 from services.persona_pitch import persona_pitch_generator
 from services.web_search import web_search_service
 from services.hybrid_retrieval import hybrid_retrieval
+from services.project_payloads import project_list_fields
+from services.pipeline import Pipeline, Stage
+from services.deadline import deadline_scope, degrade, has_budget
+from services.response_stream import SSE_HEADERS, emit_projects, emit_token, generate_text, sse_events
+from services.project_repository import project_repository
+from services.search_cache import search_cache
+from services.llm_cache import llm_cache
+from services.llm_scheduler import Priority, llm_scheduler
+from services.single_flight import single_flight
 from services.filter_extractor import filter_extractor
 from services.response_formatter import response_formatter
 from services.query_preprocessor import query_preprocessor
@@ -72,6 +86,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Time (seconds) the optional GPT sales pitch on project facts needs within the latency target
+ENRICHMENT_BUDGET = 4.0
+
 
 # === Routing Helper Functions ===
 
@@ -163,13 +180,7 @@ async def _generate_no_alternatives_message(
     Uses GPT to suggest budget/location/configuration adjustments.
     """
     try:
-        from openai import OpenAI
-        from config import settings
-        
-        client = OpenAI(
-            api_key=settings.openai_api_key,
-            base_url=settings.openai_base_url
-        )
+        from services.llm_gateway import llm_gateway
         
         # Extract filter details for context
         filter_details = []
@@ -205,7 +216,7 @@ Example structure:
   - **Explore different configurations** that might offer better value
 • I'm here to help you find the perfect property. What would you like to adjust?"""
 
-        response = client.chat.completions.create(
+        response = await llm_gateway.chat(
             model=settings.effective_gpt_model,
             messages=[
                 {
@@ -272,6 +283,29 @@ async def lifespan(app: FastAPI):
                 logger.warning(f"Seed file not found: {seed_file}")
     except Exception as e:
         logger.error(f"Auto-seed failed: {e}")
+
+    # Load the project snapshot in the background so the first search doesn't pay for it
+    try:
+        from services.project_snapshot import project_snapshots
+        project_snapshots.warm()
+    except Exception as e:
+        logger.warning(f"Project snapshot warm-up failed: {e}")
+
+    # Fill in GPT enrichment for new or changed projects (background priority, off the request path;
+    # one worker runs the job, the others wait on its lock and reload the results)
+    try:
+        if settings.enrichment_job_enabled:
+            enrichment_store.schedule_refresh()
+    except Exception as e:
+        logger.warning(f"Project enrichment job failed to start: {e}")
+
+    # Train (or load) the local intent model in the background; GPT classifies until it is ready
+    try:
+        from services.local_intent_classifier import local_intent_classifier
+        if settings.local_intent_enabled:
+            local_intent_classifier.warm()
+    except Exception as e:
+        logger.warning(f"Local intent model warm-up failed: {e}")
     
     # Initialize Railway PostgreSQL database
     try:
@@ -279,11 +313,13 @@ async def lifespan(app: FastAPI):
         if os.getenv('DATABASE_URL') or os.getenv('POSTGRES_URL'):
             logger.info("🚀 Initializing Railway PostgreSQL database...")
             from database.init_db import init_database
-            success = init_database()
+            from database.connection import db_pool
+            success = await asyncio.to_thread(init_database)
             if success:
                 logger.info("✅ Database initialization successful")
             else:
                 logger.warning("⚠️ Database initialization encountered errors")
+            await asyncio.to_thread(db_pool.warm)
         else:
             logger.info("ℹ️ No DATABASE_URL configured - using in-memory storage")
     except Exception as e:
@@ -295,7 +331,9 @@ async def lifespan(app: FastAPI):
         from services.redis_context import init_redis_context_manager
         redis_manager = init_redis_context_manager(
             redis_url=settings.redis_url,
-            ttl_seconds=settings.redis_ttl_seconds
+            ttl_seconds=settings.redis_ttl_seconds,
+            max_connections=settings.redis_max_connections,
+            memory_max_entries=settings.session_cache_max_entries
         )
         logger.info("✅ Redis context manager initialized")
         health = redis_manager.health_check()
@@ -304,8 +342,34 @@ async def lifespan(app: FastAPI):
         logger.error(f"Redis initialization failed: {e}")
         logger.warning("⚠️ Context will use in-memory fallback")
 
+    # Expire idle sessions, fallback contexts and caches held in process
+    sweeper = asyncio.create_task(run_sweeper(settings.store_sweep_interval_seconds))
+
     yield
     logger.info("Shutting down API...")
+    sweeper.cancel()
+
+    # Release pooled LLM connections
+    try:
+        from services.llm_gateway import llm_gateway
+        await llm_gateway.aclose()
+    except Exception as e:
+        logger.warning(f"LLM gateway shutdown failed: {e}")
+
+    # Release pooled Redis connections
+    try:
+        from services.redis_context import redis_context_manager
+        if redis_context_manager is not None:
+            await redis_context_manager.aclose()
+    except Exception as e:
+        logger.warning(f"Redis context manager shutdown failed: {e}")
+
+    # Release pooled database connections
+    try:
+        from database.connection import db_pool
+        db_pool.close()
+    except Exception as e:
+        logger.warning(f"Database pool shutdown failed: {e}")
 
 
 # Initialize FastAPI app
@@ -340,6 +404,7 @@ class ChatQueryRequest(BaseModel):
     session_id: Optional[str] = None  # For multi-turn conversations
     persona: Optional[str] = None  # Phase 2: persona-based pitches
     filters: Optional[Dict[str, Any]] = None  # UI-selected filters
+    fields: Optional[Union[str, List[str]]] = None  # Project field projection: "card", a field list, or full (default)
 
 
 class SourceInfo(BaseModel):
@@ -363,6 +428,7 @@ class ChatQueryResponse(BaseModel):
     projects: List[Dict[str, Any]] = []  # Default to empty list instead of None
     suggested_actions: Optional[List[str]] = None  # Dynamic quick reply chips
     coaching_prompt: Optional[Dict[str, Any]] = None  # Real-time sales coaching for salesman
+    degraded_stages: Optional[List[str]] = None  # Stages that took their fast path to meet the deadline
 
 
 class ProjectInfo(BaseModel):
@@ -379,6 +445,23 @@ class HealthResponse(BaseModel):
     status: str
     environment: str
     version: str
+    catalog: Optional[Dict[str, Any]] = None  # Project repository hit/miss counters
+    search_cache: Optional[Dict[str, Any]] = None  # Filter-result cache hit rate
+    llm_cache: Optional[Dict[str, Any]] = None  # Deterministic LLM response cache hit rates
+    coalescing: Optional[Dict[str, Any]] = None  # In-flight duplicate calls that shared one execution
+    llm_scheduler: Optional[Dict[str, Any]] = None  # Rate-limit buckets, granted / shed calls by priority
+    enrichment: Optional[Dict[str, Any]] = None  # Pre-computed project enrichment coverage and hit rate
+    sessions: Optional[Dict[str, Any]] = None  # Session store backend and field-level write volume
+    memory: Optional[Dict[str, Any]] = None  # Entries, evictions and approximate bytes per in-process store
+    database: Optional[Dict[str, Any]] = None  # PostgreSQL pool size, waits and timeouts (None without DATABASE_URL)
+
+
+def _database_pool_stats() -> Optional[Dict[str, Any]]:
+    try:
+        from database.connection import db_pool, has_database
+    except ImportError:
+        return None
+    return db_pool.stats() if has_database() else None
 
 
 # === API Endpoints ===
@@ -390,7 +473,16 @@ async def health_check():
     return {
         "status": "healthy",
         "environment": settings.environment,
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "catalog": project_repository.stats(),
+        "search_cache": search_cache.stats(),
+        "llm_cache": llm_cache.stats(),
+        "coalescing": single_flight.stats(),
+        "llm_scheduler": llm_scheduler.stats(),
+        "enrichment": enrichment_store.stats(),
+        "sessions": session_store.stats(),
+        "memory": store_stats(),
+        "database": _database_pool_stats()
     }
 
 
@@ -458,8 +550,8 @@ async def schedule_site_visit(request: SiteVisitScheduleRequest):
         # Get user's lead score
         lead_score = None
         try:
-            profile = profile_manager.get_or_create_profile(request.user_id)
-            lead_scores = profile_manager.calculate_lead_score(request.user_id)
+            profile = await run_db(profile_manager.get_or_create_profile, request.user_id)
+            lead_scores = await run_db(profile_manager.calculate_lead_score, request.user_id)
             lead_score = lead_scores.get('total_score', 0)
         except:
             pass
@@ -481,10 +573,10 @@ async def schedule_site_visit(request: SiteVisitScheduleRequest):
         )
         
         # Schedule visit
-        result = scheduling_service.schedule_site_visit(visit_request)
+        result = await run_db(scheduling_service.schedule_site_visit, visit_request)
         
         # Track in user profile
-        profile_manager.track_site_visit_scheduled(request.user_id)
+        await run_db(profile_manager.track_site_visit_scheduled, request.user_id)
         
         logger.info(f"✅ SITE VISIT SCHEDULED via API: {request.project_name} for {request.user_id}")
         
@@ -531,8 +623,8 @@ async def schedule_callback(request: CallbackScheduleRequest):
         # Get lead score
         lead_score = None
         try:
-            profile = profile_manager.get_or_create_profile(request.user_id)
-            lead_scores = profile_manager.calculate_lead_score(request.user_id)
+            profile = await run_db(profile_manager.get_or_create_profile, request.user_id)
+            lead_scores = await run_db(profile_manager.calculate_lead_score, request.user_id)
             lead_score = lead_scores.get('total_score', 0)
         except:
             pass
@@ -554,10 +646,10 @@ async def schedule_callback(request: CallbackScheduleRequest):
         )
         
         # Request callback
-        result = scheduling_service.request_callback(callback_request)
+        result = await run_db(scheduling_service.request_callback, callback_request)
         
         # Track in user profile
-        profile_manager.track_callback_requested(request.user_id)
+        await run_db(profile_manager.track_callback_requested, request.user_id)
         
         logger.info(f"✅ CALLBACK REQUESTED via API: {request.callback_reason} for {request.user_id}")
         
@@ -578,8 +670,8 @@ async def get_user_schedule(user_id: str):
         
         scheduling_service = get_scheduling_service()
         
-        visits = scheduling_service.get_user_visits(user_id)
-        callbacks = scheduling_service.get_user_callbacks(user_id)
+        visits = await run_db(scheduling_service.get_user_visits, user_id)
+        callbacks = await run_db(scheduling_service.get_user_callbacks, user_id)
         
         return {
             "user_id": user_id,
@@ -707,7 +799,8 @@ async def admin_update_visit_status(
         
         scheduling_service = get_scheduling_service()
         
-        success = scheduling_service.update_visit_status(
+        success = await run_db(
+            scheduling_service.update_visit_status,
             visit_id,
             SchedulingStatus(status),
             notes
@@ -743,7 +836,8 @@ async def admin_update_callback_status(
         
         scheduling_service = get_scheduling_service()
         
-        success = scheduling_service.update_callback_status(
+        success = await run_db(
+            scheduling_service.update_callback_status,
             callback_id,
             SchedulingStatus(status),
             notes,
@@ -851,15 +945,20 @@ async def admin_refresh_projects(x_admin_key: str = Header(None)):
             projects.insert(validated_data)
             logger.info(f"Inserted {len(validated_data)} projects with validated fields")
 
-            # CRITICAL: Clear hybrid_retrieval cache after refresh
-            # This ensures fresh queries will fetch the new data
+            # CRITICAL: Swap in a fresh project snapshot after refresh
+            # Readers keep the previous snapshot until the new one is fully built
+            from services.project_snapshot import project_snapshots
             try:
-                from services.hybrid_retrieval import _all_projects_cache
-                _all_projects_cache["data"] = None
-                _all_projects_cache["timestamp"] = 0
-                logger.info("✅ Cache cleared after admin refresh")
+                snapshot = project_snapshots.refresh()
+                logger.info(f"✅ Project snapshot v{snapshot.version} swapped in after admin refresh")
             except Exception as cache_err:
-                logger.warning(f"Could not clear cache: {cache_err}")
+                logger.warning(f"Could not refresh project snapshot: {cache_err}")
+                project_snapshots.invalidate()
+                snapshot = None
+
+            # Re-enrich only the projects whose rows changed
+            if settings.enrichment_job_enabled:
+                enrichment_store.schedule_refresh(snapshot.rows if snapshot is not None else None)
 
             return {"status": "success", "message": f"Loaded {len(seed_data)} projects"}
         else:
@@ -870,8 +969,85 @@ async def admin_refresh_projects(x_admin_key: str = Header(None)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _score_lead(user_id: str) -> None:
+    """Recalculate the lead score (runs after the chat response is sent)."""
+    try:
+        from services.user_profile_manager import get_profile_manager
+        lead_score = get_profile_manager().calculate_lead_score(user_id)
+        logger.info(f"📊 LEAD SCORE: {lead_score['lead_temperature']} "
+                   f"(engagement: {lead_score['engagement_score']}/10, "
+                   f"intent: {lead_score['intent_to_buy_score']}/10)")
+    except Exception as e:
+        logger.error(f"Error calculating lead score: {e}")
+
+
+def _track_profile_interactions(
+    user_id: str,
+    shown_projects: List[Dict[str, Any]],
+    sentiment_analysis: Optional[Dict[str, Any]],
+    objection_type: Optional[str],
+    filters: Dict[str, Any]
+) -> None:
+    """Record viewed projects, sentiment, objections and preferences (runs after the response is sent)."""
+    try:
+        from services.user_profile_manager import get_profile_manager
+        profile_manager = get_profile_manager()
+
+        # Track properties viewed
+        for project in shown_projects:
+            profile_manager.track_property_viewed(
+                user_id,
+                project.get("id", project.get("project_id", "")),
+                project.get("name", ""),
+                project
+            )
+
+        # Track sentiment
+        if sentiment_analysis:
+            profile_manager.track_sentiment(
+                user_id,
+                sentiment_analysis['sentiment'],
+                sentiment_analysis.get('frustration_level', 0)
+            )
+
+        # Track objections
+        if objection_type:
+            profile_manager.track_objection(user_id, objection_type)
+
+        # Update preferences from current filters
+        if filters:
+            profile_manager.update_preferences(
+                user_id,
+                budget_min=filters.get('budget_min'),
+                budget_max=filters.get('budget_max'),
+                configurations=[filters.get('configuration')] if filters.get('configuration') else None,
+                locations=[filters.get('location')] if filters.get('location') else None
+            )
+
+        logger.info(f"✅ Updated user profile for {user_id}")
+
+    except Exception as e:
+        logger.error(f"Error updating user profile: {e}")
+
+
 @app.post("/api/chat/query", response_model=ChatQueryResponse)
-async def chat_query(request: ChatQueryRequest):
+async def chat_query(request: ChatQueryRequest, background_tasks: BackgroundTasks):
+    """
+    Main chat endpoint, run under the request deadline (settings.request_deadline_ms).
+
+    Stages that ran out of budget and took their fast path are listed in
+    `degraded_stages`. The turn loads each session once and writes its
+    changes back once, after the answer is built.
+    """
+    with deadline_scope() as deadline:
+        async with session_turn():
+            response = await _answer_chat_query(request, background_tasks)
+        if isinstance(response, ChatQueryResponse):
+            response.degraded_stages = list(deadline.degraded) or None
+        return response
+
+
+async def _answer_chat_query(request: ChatQueryRequest, background_tasks: BackgroundTasks):
     """
         ChatQueryResponse with answer, sources, and metadata
     """
@@ -880,142 +1056,153 @@ async def chat_query(request: ChatQueryRequest):
     try:
         logger.info(f"Processing query: {request.query[:100]}...")
 
-        # Step 0: Preprocess Query
         original_query = request.query
-        normalized_query = query_preprocessor.preprocess(request.query)
-        request.query = normalized_query
-        logger.info(f"Normalized query: '{original_query}' -> '{normalized_query}'")
 
-        # Step 0.5: Get or Create Session and Load Context
-        session = None
-        context_summary_dict = {}
-        if request.session_id:
-            session = session_manager.get_or_create_session(request.session_id)
-            context_summary_dict = session_manager.get_context_summary(request.session_id)
-        
-        # 🆕 Step 0.55: Load or Create User Profile (Cross-Session Memory)
-        user_profile = None
-        welcome_back_message = None
-        
-        if request.user_id:
-            try:
-                from services.user_profile_manager import get_profile_manager
-                
-                profile_manager = get_profile_manager()
-                user_profile = profile_manager.get_or_create_profile(request.user_id)
-                
-                # Increment session count
-                profile_manager.increment_session_count(request.user_id, request.session_id or "default")
-                
-                # Get welcome back message for returning users
-                if user_profile.total_sessions > 1:
-                    welcome_back_message = profile_manager.get_welcome_back_message(request.user_id)
-                    logger.info(f"👋 RETURNING USER: {request.user_id} (session #{user_profile.total_sessions})")
-                else:
-                    logger.info(f"🆕 NEW USER: {request.user_id}")
-                
-                # Calculate lead score
-                lead_score = profile_manager.calculate_lead_score(request.user_id)
-                logger.info(f"📊 LEAD SCORE: {lead_score['lead_temperature']} "
-                           f"(engagement: {lead_score['engagement_score']}/10, "
-                           f"intent: {lead_score['intent_to_buy_score']}/10)")
-                
-            except Exception as e:
-                logger.error(f"Error loading user profile: {e}")
-                # Continue without profile
-        
-        # Step 0.6: Context Injection - Enrich vague queries with session context
         from services.context_injector import (
             enrich_query_with_context, 
             inject_context_metadata,
             should_use_gpt_fallback
         )
-        
-        enriched_query = request.query
-        was_enriched = False
-        
-        if session:
-            enriched_query, was_enriched = enrich_query_with_context(request.query, session)
-            if was_enriched:
-                logger.info(f"Query enriched: '{request.query}' → '{enriched_query}'")
-                # Use enriched query for classification
-                request.query = enriched_query
 
-        # Get full context metadata
-        context_metadata = inject_context_metadata(original_query, session)
+        # Steps 0-1 are declared as a stage DAG: independent loads (session, profile,
+        # project list) run concurrently; classification starts once its inputs are ready.
+
+        # Step 0: Preprocess Query
+        def preprocess_stage(ctx):
+            normalized_query = query_preprocessor.preprocess(original_query)
+            logger.info(f"Normalized query: '{original_query}' -> '{normalized_query}'")
+            return normalized_query
+
+        # Step 0.5: Get or Create Session and Load Context
+        def session_stage(ctx):
+            if not request.session_id:
+                return None, {}
+            return (
+                session_manager.get_or_create_session(request.session_id),
+                session_manager.get_context_summary(request.session_id)
+            )
+
+        # 🆕 Step 0.55: Load or Create User Profile (Cross-Session Memory)
+        # Lead scoring is deferred until after the response is sent
+        def profile_stage(ctx):
+            if not request.user_id:
+                return None, None
+            from services.user_profile_manager import get_profile_manager
+
+            profile_manager = get_profile_manager()
+            user_profile = profile_manager.get_or_create_profile(request.user_id)
+
+            # Increment session count
+            profile_manager.increment_session_count(request.user_id, request.session_id or "default")
+
+            # Get welcome back message for returning users
+            welcome_back_message = None
+            if user_profile.total_sessions > 1:
+                welcome_back_message = profile_manager.get_welcome_back_message(request.user_id)
+                logger.info(f"👋 RETURNING USER: {request.user_id} (session #{user_profile.total_sessions})")
+            else:
+                logger.info(f"🆕 NEW USER: {request.user_id}")
+            return user_profile, welcome_back_message
+
+        # Step 0.6: Context Injection - Enrich vague queries with session context
+        def context_stage(ctx):
+            query = ctx["preprocess"]
+            session, _ = ctx["session"]
+            if session:
+                enriched_query, was_enriched = enrich_query_with_context(query, session)
+                if was_enriched:
+                    logger.info(f"Query enriched: '{query}' → '{enriched_query}'")
+                    # Use enriched query for classification
+                    query = enriched_query
+            # Get full context metadata
+            return query, inject_context_metadata(original_query, session)
 
-        # Step 1: GPT-First Intent Classification with Intelligent Data Source Routing
-        # Get conversation history and session state for context
-        conversation_history = []
-        session_state = {}
-        
         # CRITICAL: Get list of all projects from database for GPT to match against
-        available_projects = []
-        try:
-            from database.pixeltable_setup import get_projects_table
-            projects_table = get_projects_table()
-            if projects_table:
-                all_projects = projects_table.select(
-                    projects_table.name,
-                    projects_table.location
-                ).collect()
-                available_projects = [
-                    {"name": p.get("name"), "location": p.get("location")}
-                    for p in all_projects
+        def available_projects_stage(ctx):
+            available_projects = project_repository.select("name", "location")
+            logger.info(f"✅ Loaded {len(available_projects)} projects for GPT matching")
+            return available_projects
+
+        # Step 1: GPT-First Intent Classification with Intelligent Data Source Routing
+        async def classify_stage(ctx):
+            query, _ = ctx["context"]
+            session, context_summary_dict = ctx["session"]
+            available_projects = ctx["available_projects"]
+
+            # Get conversation history and session state for context
+            conversation_history = []
+            session_state = {}
+            if session:
+                # Format messages for GPT context (now 10 turns for better context)
+                conversation_history = [
+                    {"role": msg.get("role", "user"), "content": msg.get("content", "")}
+                    for msg in session.messages[-10:]
                 ]
-                logger.info(f"✅ Loaded {len(available_projects)} projects for GPT matching")
-        except Exception as e:
-            logger.warning(f"Could not load projects for GPT: {e}")
-        
-        if session:
-            # Format messages for GPT context (now 10 turns for better context)
-            conversation_history = [
-                {"role": msg.get("role", "user"), "content": msg.get("content", "")}
-                for msg in session.messages[-10:]
-            ]
-            session_state = {
-                "selected_project_name": session.interested_projects[-1] if session.interested_projects else None,
-                "requirements": session.current_filters,
-                "last_intent": session.last_intent,
-                "last_topic": session.last_topic,
-                "conversation_phase": session.conversation_phase,
-                # CRITICAL: Add last_shown_projects and interested_projects for context
-                "last_shown_projects": session.last_shown_projects if hasattr(session, 'last_shown_projects') and session.last_shown_projects else [],
-                "interested_projects": session.interested_projects,
-                # CRITICAL: Add available projects list for GPT to match against
-                "available_projects": available_projects
-            }
-        
-        # Build comprehensive context for understanding ALL queries
-        comprehensive_context = context_understanding.build_comprehensive_context(
-            query=request.query,
-            session=session,
-            conversation_history=conversation_history
-        )
-        
-        # Enrich query with context if needed (auto-complete incomplete queries)
-        enriched_query = context_understanding.enrich_query_with_context(
-            query=request.query,
-            context=comprehensive_context
-        )
-        
-        if enriched_query != request.query:
-            logger.info(f"Query enriched: '{request.query}' → '{enriched_query}'")
-            # Use enriched query for classification
-            query_for_classification = enriched_query
-        else:
-            query_for_classification = request.query
-        
-        # GPT-first classification with data source selection and comprehensive context
-        gpt_result = classify_intent_gpt_first(
-            query=query_for_classification,
-            conversation_history=conversation_history,
-            session_state=session_state,
-            context_summary=context_summary_dict.get("summary"),
-            comprehensive_context=comprehensive_context
-        )
+                session_state = {
+                    "selected_project_name": session.interested_projects[-1] if session.interested_projects else None,
+                    "requirements": session.current_filters,
+                    "last_intent": session.last_intent,
+                    "last_topic": session.last_topic,
+                    "conversation_phase": session.conversation_phase,
+                    # CRITICAL: Add last_shown_projects and interested_projects for context
+                    "last_shown_projects": session.last_shown_projects if hasattr(session, 'last_shown_projects') and session.last_shown_projects else [],
+                    "interested_projects": session.interested_projects,
+                    # CRITICAL: Add available projects list for GPT to match against
+                    "available_projects": available_projects
+                }
+
+            # Build comprehensive context for understanding ALL queries
+            comprehensive_context = context_understanding.build_comprehensive_context(
+                query=query,
+                session=session,
+                conversation_history=conversation_history
+            )
+
+            # Enrich query with context if needed (auto-complete incomplete queries)
+            enriched_query = context_understanding.enrich_query_with_context(
+                query=query,
+                context=comprehensive_context
+            )
+
+            if enriched_query != query:
+                logger.info(f"Query enriched: '{query}' → '{enriched_query}'")
+                # Use enriched query for classification
+                query_for_classification = enriched_query
+            else:
+                query_for_classification = query
+
+            # GPT-first classification with data source selection and comprehensive context
+            gpt_result = await classify_intent_gpt_first(
+                query=query_for_classification,
+                conversation_history=conversation_history,
+                session_state=session_state,
+                context_summary=context_summary_dict.get("summary"),
+                comprehensive_context=comprehensive_context
+            )
+            return gpt_result, conversation_history, session_state, comprehensive_context
+
+        front = await Pipeline([
+            Stage("preprocess", preprocess_stage, blocking=False),
+            Stage("session", session_stage),
+            Stage("profile", profile_stage, critical=False, default=(None, None)),
+            Stage("context", context_stage, deps=("preprocess", "session")),
+            Stage("available_projects", available_projects_stage, critical=False, default=[]),
+            Stage("classify", classify_stage, deps=("context", "session", "available_projects")),
+        ]).run()
+        logger.info(f"⏱️ Chat pipeline: {front.summary()}")
+
+        session, context_summary_dict = front["session"]
+        user_profile, welcome_back_message = front["profile"]
+        request.query, context_metadata = front["context"]
+        available_projects = front["available_projects"]
+        gpt_result, conversation_history, session_state, comprehensive_context = front["classify"]
+
+        # Calculate lead score after the response is sent (non-critical, DB round trip)
+        if user_profile and request.user_id:
+            background_tasks.add_task(_score_lead, request.user_id)
         
         intent = gpt_result.get("intent", "unsupported")
+        intent_source = gpt_result.get("classifier", "gpt")  # Logged so offline evaluation can use GPT labels only
         data_source = gpt_result.get("data_source", "database")
         gpt_confidence = gpt_result.get("confidence", 0.0)
         extraction = gpt_result.get("extraction", {})
@@ -1032,21 +1219,15 @@ async def chat_query(request: ChatQueryRequest):
             
             # Also try to get full project details and save to last_shown_projects
             try:
-                from database.pixeltable_setup import get_projects_table
-                projects_table = get_projects_table()
-                if projects_table:
-                    results = list(projects_table.where(
-                        projects_table.name.contains(project_name)
-                    ).limit(1).collect())
-                    if results:
-                        project_dict = dict(results[0])
-                        if not hasattr(session, 'last_shown_projects') or not session.last_shown_projects:
-                            session.last_shown_projects = []
-                        existing_names = {p.get('name') for p in session.last_shown_projects if isinstance(p, dict) and p.get('name')}
-                        if project_dict.get('name') and project_dict.get('name') not in existing_names:
-                            session.last_shown_projects.insert(0, project_dict)
-                            session_manager.save_session(session)
-                            logger.info(f"✅ Saved project '{project_name}' to last_shown_projects")
+                project_dict = project_repository.find_by_name_fragment(project_name)
+                if project_dict:
+                    if not hasattr(session, 'last_shown_projects') or not session.last_shown_projects:
+                        session.last_shown_projects = []
+                    existing_names = {p.get('name') for p in session.last_shown_projects if isinstance(p, dict) and p.get('name')}
+                    if project_dict.get('name') and project_dict.get('name') not in existing_names:
+                        session.last_shown_projects.insert(0, project_dict)
+                        session_manager.save_session(session)
+                        logger.info(f"✅ Saved project '{project_name}' to last_shown_projects")
             except Exception as e:
                 logger.warning(f"Could not save project to last_shown_projects: {e}")
         
@@ -1100,7 +1281,7 @@ async def chat_query(request: ChatQueryRequest):
         if use_gpt_fallback:
             from services.gpt_content_generator import generate_contextual_response_with_full_history
             
-            response_text = generate_contextual_response_with_full_history(
+            response_text = await generate_contextual_response_with_full_history(
                 query=original_query,
                 conversation_history=conversation_history,
                 session_context=context_summary_dict,
@@ -1195,7 +1376,7 @@ async def chat_query(request: ChatQueryRequest):
             # Generate generic comparison answer using GPT
             from services.gpt_content_generator import generate_contextual_response_with_full_history
             
-            response_text = generate_contextual_response_with_full_history(
+            response_text = await generate_contextual_response_with_full_history(
                 query=original_query,
                 conversation_history=conversation_history if session else [],
                 session_context={},
@@ -1329,6 +1510,8 @@ async def chat_query(request: ChatQueryRequest):
                     logger.error(f"hybrid_retrieval search failed: {e}")
                     search_results = {"projects": [], "sources": []}
 
+                emit_projects(search_results["projects"])
+
                 # Check if zero results - trigger intelligent fallback
                 if len(search_results["projects"]) == 0:
                     logger.info("🔍 Zero results found, triggering intelligent fallback with aggressive mode...")
@@ -1382,14 +1565,16 @@ async def chat_query(request: ChatQueryRequest):
                     
                     # Log the interaction
                     if request.user_id:
-                        await pixeltable_client.log_query(
+                        background_tasks.add_task(
+                            pixeltable_client.log_query,
                             user_id=request.user_id,
                             query=request.query,
                             intent="property_search",
                             answered=True,
                             confidence_score=confidence,
                             response_time_ms=response_time_ms,
-                            project_id=request.project_id
+                            project_id=request.project_id,
+                            classifier=intent_source
                         )
                     
                     # Update session with messages
@@ -1405,7 +1590,7 @@ async def chat_query(request: ChatQueryRequest):
                     )
                     return ChatQueryResponse(
                         answer=answer_text,
-                        projects=projects,
+                        projects=project_list_fields(projects, request.fields),
                         sources=fallback_results.get("sources", []) if fallback_results.get("alternatives") else [],
                         confidence=confidence,
                         intent="property_search",
@@ -1434,14 +1619,16 @@ async def chat_query(request: ChatQueryRequest):
 
                 # Log the interaction
                 if request.user_id:
-                    await pixeltable_client.log_query(
+                    background_tasks.add_task(
+                        pixeltable_client.log_query,
                         user_id=request.user_id,
                         query=request.query,
                         intent="property_search",
                         answered=True,
                         confidence_score="High",
                         response_time_ms=response_time_ms,
-                        project_id=request.project_id
+                        project_id=request.project_id,
+                        classifier=intent_source
                     )
 
                 # Enrich projects with missing data (amenities, nearby places, etc.)
@@ -1527,7 +1714,7 @@ async def chat_query(request: ChatQueryRequest):
                 )
                 return ChatQueryResponse(
                     answer=answer_text,
-                    projects=projects_list,  # Use enriched projects
+                    projects=project_list_fields(projects_list, request.fields),  # Use enriched projects
                     sources=[],
                     confidence="High",
                     intent="property_search",
@@ -1551,14 +1738,8 @@ async def chat_query(request: ChatQueryRequest):
                     from services.fuzzy_matcher import extract_project_name_from_query
                     available_projects = session_state.get("available_projects", [])
                     if available_projects:
-                        # Extract project names as strings for fuzzy matching
-                        project_names = []
-                        for p in available_projects:
-                            if isinstance(p, dict):
-                                project_names.append(p.get('name', ''))
-                            else:
-                                project_names.append(str(p))
-                        project_name = extract_project_name_from_query(request.query, project_names)
+                        # available_projects is the catalog: match against its name index
+                        project_name = extract_project_name_from_query(request.query)
                         if project_name:
                             logger.info(f"✅ Fuzzy matched project: '{project_name}' from query: '{request.query}'")
                         else:
@@ -1576,19 +1757,13 @@ async def chat_query(request: ChatQueryRequest):
                 if project_name:
                     logger.info(f"Fetching project details for: {project_name}")
 
-                    # Fetch project from database
-                    from database.pixeltable_setup import get_projects_table
-                    projects_table = get_projects_table()
-
                     try:
-                        # Query for project by name
-                        results = list(projects_table.where(
-                            projects_table.name.contains(project_name)
-                        ).limit(1).collect())
+                        # Query for project by name (in-memory catalog)
+                        project = project_repository.find_by_name_fragment(project_name)
 
-                        if results:
-                            project = results[0]
-                            project_dict = dict(project)  # Convert to dict for consistency
+                        if project:
+                            project_dict = project
+                            emit_projects([project_dict])
 
                             # Format structured project response
                             response_parts = []
@@ -1633,62 +1808,36 @@ async def chat_query(request: ChatQueryRequest):
                                 response_parts.append(f"\n📄 [View Brochure]({project_dict['brochure_url']})")
 
                             # 🆕 GPT ENRICHMENT: Add sales pitch, investment potential, nearby amenities
-                            try:
-                                from openai import OpenAI
-                                from config import settings
-                                
-                                enrichment_client = OpenAI(
-                                    api_key=settings.openai_api_key,
-                                    base_url=settings.openai_base_url,
-                                    timeout=15.0
-                                )
-                                
-                                enrichment_prompt = f"""You are a real estate sales coach. Generate a SALES PITCH for this project that a salesperson can USE ON A LIVE CALL.
-
-PROJECT: {project_dict.get('name')}
-LOCATION: {project_dict.get('location')}
-PRICE: ₹{project_dict.get('budget_min', 0)/100:.1f} - ₹{project_dict.get('budget_max', 0)/100:.1f} Cr
-CONFIG: {project_dict.get('configuration')}
-POSSESSION: {project_dict.get('possession_year', 'N/A')}
-
-Generate EXACTLY this format (bullet points only):
-
-🎯 **WHY BUY THIS PROJECT:**
-• [Strong selling point 1]
-• [Strong selling point 2]
-• [Strong selling point 3]
-
-📍 **NEARBY AMENITIES:**
-• [Schools/colleges within 5km]
-• [Hospitals within 5km]
-• [Metro/transport connectivity]
-• [Shopping malls/tech parks]
-
-💰 **INVESTMENT ANGLE:**
-• [Appreciation potential]
-• [ROI argument]
-• [Urgency hook]
-
-🎤 **CLOSING LINE:**
-[One sentence to push for site visit]
-
-Be specific to {project_dict.get('location')} area. Make it persuasive and speakable."""
-
-                                enrichment_response = enrichment_client.chat.completions.create(
-                                    model=settings.effective_gpt_model,
-                                    messages=[{"role": "user", "content": enrichment_prompt}],
-                                    temperature=0.7,
-                                    max_tokens=600
-                                )
-                                
-                                enrichment_text = enrichment_response.choices[0].message.content.strip()
-                                response_parts.append(f"\n\n---\n\n{enrichment_text}")
-                                logger.info(f"✅ Added GPT enrichment for project: {project_dict.get('name')}")
-                                
-                            except Exception as enrich_err:
-                                logger.warning(f"GPT enrichment failed (non-critical): {enrich_err}")
-                                # Add default sales closing even without enrichment
+                            # Pre-computed by the enrichment job; generated on demand only when missing
+                            stored_pitch = enrichment_store.lookup(project_dict).get("sales_pitch")
+                            if stored_pitch:
+                                response_parts.append(f"\n\n---\n\n{stored_pitch}")
+                                emit_token("\n\n".join(response_parts))
+                            # (optional work: skipped once the request is past its latency target)
+                            elif not has_budget(ENRICHMENT_BUDGET, optional=True):
+                                degrade("enrichment", "skipped")
                                 response_parts.append(f"\n\n🎯 *Shall we schedule a site visit to see this property?*")
+                            else:
+                                try:
+                                    enrichment_prompt = sales_pitch_prompt(project_dict)
+
+                                    # Database facts are ready; stream them ahead of the pitch
+                                    emit_token("\n\n".join(response_parts) + "\n\n---\n\n")
+                                    enrichment_text = await generate_text(
+                                        model=settings.effective_gpt_model,
+                                        messages=[{"role": "user", "content": enrichment_prompt}],
+                                        temperature=0.7,
+                                        max_tokens=600,
+                                        timeout=15.0,
+                                        priority=Priority.BACKGROUND  # Optional pitch; shed under pressure
+                                    )
+                                    response_parts.append(f"\n\n---\n\n{enrichment_text}")
+                                    logger.info(f"✅ Added GPT enrichment for project: {project_dict.get('name')}")
+                                    
+                                except Exception as enrich_err:
+                                    logger.warning(f"GPT enrichment failed (non-critical): {enrich_err}")
+                                    # Add default sales closing even without enrichment
+                                    response_parts.append(f"\n\n🎯 *Shall we schedule a site visit to see this property?*")
 
                             response_text = "\n\n".join(response_parts)
                             response_time_ms = int((time.time() - start_time) * 1000)
@@ -1738,8 +1887,7 @@ Be specific to {project_dict.get('location')} area. Make it persuasive and speak
                 logger.info("🔹 PATH 1: Database - Nearby Properties (10km radius)")
                 
                 # Get location context from session or extraction
-                from utils.geolocation_utils import get_coordinates, calculate_distance
-                from database.pixeltable_setup import get_projects_table
+                from utils.geolocation_utils import get_coordinates
                 
                 target_location = None
                 
@@ -1775,40 +1923,24 @@ Be specific to {project_dict.get('location')} area. Make it persuasive and speak
                         center_lat, center_lon = center_coords
                         logger.info(f"📍 Searching within 10km of {target_location} ({center_lat}, {center_lon})")
                         
-                        # Fetch all projects with coordinates
-                        projects_table = get_projects_table()
+                        # Nearest-first projects from the catalog's geo index
                         nearby_projects = []
                         
-                        if projects_table:
-                            try:
-                                all_projects = projects_table.select(
-                                    projects_table.project_id, projects_table.name, projects_table.location,
-                                    projects_table.budget_min, projects_table.budget_max,
-                                    projects_table.configuration, projects_table.status,
-                                    projects_table.possession_year, projects_table.possession_quarter,
-                                    projects_table.usp, projects_table.amenities, projects_table.rera_number,
-                                    projects_table.latitude, projects_table.longitude
-                                ).collect()
-                                
-                                for proj in all_projects:
-                                    p_lat = proj.get('latitude')
-                                    p_lon = proj.get('longitude')
-                                    
-                                    if p_lat and p_lon:
-                                        try:
-                                            dist = calculate_distance(center_lat, center_lon, float(p_lat), float(p_lon))
-                                            if dist <= 10.0:  # 10km radius
-                                                proj_copy = dict(proj)
-                                                proj_copy['_distance_km'] = round(dist, 1)
-                                                nearby_projects.append(proj_copy)
-                                        except (ValueError, TypeError) as e:
-                                            logger.warning(f"Invalid coordinates for project {proj.get('name')}: {e}")
-                                
-                                # Sort by distance (nearest first)
-                                nearby_projects.sort(key=lambda x: x.get('_distance_km', 999))
-                                
-                            except Exception as e:
-                                logger.error(f"Error fetching projects for nearby search: {e}")
+                        try:
+                            nearby_projects = project_repository.within_radius(
+                                center_lat, center_lon, 10.0,
+                                columns=(
+                                    'project_id', 'name', 'location', 'budget_min', 'budget_max',
+                                    'configuration', 'status', 'possession_year', 'possession_quarter',
+                                    'usp', 'amenities', 'rera_number', 'latitude', 'longitude'
+                                ),
+                                distance_key='_distance_km'
+                            )
+                            for proj in nearby_projects:
+                                proj['_distance_km'] = round(proj['_distance_km'], 1)
+                            
+                        except Exception as e:
+                            logger.error(f"Error fetching projects for nearby search: {e}")
                         
                         if nearby_projects:
                             logger.info(f"✅ Found {len(nearby_projects)} projects within 10km of {target_location}")
@@ -1848,7 +1980,7 @@ Be specific to {project_dict.get('location')} area. Make it persuasive and speak
                             )
                             return ChatQueryResponse(
                                 answer=answer_text,
-                                projects=nearby_projects[:5],
+                                projects=project_list_fields(nearby_projects[:5], request.fields),
                                 sources=[],
                                 confidence="High",
                                 intent="nearby_properties",
@@ -1867,8 +1999,7 @@ Be specific to {project_dict.get('location')} area. Make it persuasive and speak
             elif intent == "show_more_projects":
                 logger.info("🔹 PATH 1: Database - Show More Projects (Smart Cascade)")
                 
-                from database.pixeltable_setup import get_projects_table
-                from utils.geolocation_utils import get_coordinates, calculate_distance
+                from utils.geolocation_utils import get_coordinates
                 
                 # Get context from session
                 last_location = None
@@ -1889,20 +2020,17 @@ Be specific to {project_dict.get('location')} area. Make it persuasive and speak
                 
                 logger.info(f"📍 Smart cascade context: location={last_location}, budget_max={last_budget_max}, shown={len(shown_project_ids)}")
                 
-                projects_table = get_projects_table()
                 cascade_results = []
                 cascade_type = None
                 
-                if projects_table and last_location:
+                if last_location:
                     try:
                         # STEP 1: More in same area + budget
-                        all_projects = projects_table.select(
-                            projects_table.project_id, projects_table.name, projects_table.location,
-                            projects_table.budget_min, projects_table.budget_max,
-                            projects_table.configuration, projects_table.status,
-                            projects_table.possession_year, projects_table.possession_quarter,
-                            projects_table.usp, projects_table.latitude, projects_table.longitude
-                        ).collect()
+                        all_projects = project_repository.select(
+                            'project_id', 'name', 'location', 'budget_min', 'budget_max',
+                            'configuration', 'status', 'possession_year', 'possession_quarter',
+                            'usp', 'latitude', 'longitude'
+                        )
                         
                         location_lower = last_location.lower()
                         
@@ -1941,27 +2069,21 @@ Be specific to {project_dict.get('location')} area. Make it persuasive and speak
                             center_coords = get_coordinates(last_location)
                             if center_coords:
                                 center_lat, center_lon = center_coords
-                                nearby = []
+                                nearby = [
+                                    proj for proj in project_repository.within_radius(
+                                        center_lat, center_lon, 10.0,
+                                        columns=(
+                                            'project_id', 'name', 'location', 'budget_min', 'budget_max',
+                                            'configuration', 'status', 'possession_year', 'possession_quarter',
+                                            'usp', 'latitude', 'longitude'
+                                        ),
+                                        distance_key='_distance_km'
+                                    )
+                                    if (proj.get('name') or '').lower() not in shown_project_ids
+                                ]
+                                for proj in nearby:
+                                    proj['_distance_km'] = round(proj['_distance_km'], 1)
                                 
-                                for proj in all_projects:
-                                    proj_name = proj.get('name', '').lower()
-                                    if proj_name in shown_project_ids:
-                                        continue
-                                    
-                                    p_lat = proj.get('latitude')
-                                    p_lon = proj.get('longitude')
-                                    
-                                    if p_lat and p_lon:
-                                        try:
-                                            dist = calculate_distance(center_lat, center_lon, float(p_lat), float(p_lon))
-                                            if dist <= 10.0:
-                                                proj_copy = dict(proj)
-                                                proj_copy['_distance_km'] = round(dist, 1)
-                                                nearby.append(proj_copy)
-                                        except (ValueError, TypeError):
-                                            pass
-                                
-                                nearby.sort(key=lambda x: x.get('_distance_km', 999))
                                 cascade_results = nearby[:5]
                                 cascade_type = "nearby"
                                 logger.info(f"✅ Cascade Step 3: Found {len(nearby)} nearby projects")
@@ -2008,7 +2130,7 @@ Be specific to {project_dict.get('location')} area. Make it persuasive and speak
                     )
                     return ChatQueryResponse(
                         answer=answer_text,
-                        projects=cascade_results,
+                        projects=project_list_fields(cascade_results, request.fields),
                         sources=[],
                         confidence="High",
                         intent="show_more_projects",
@@ -2173,7 +2295,7 @@ Be specific to {project_dict.get('location')} area. Make it persuasive and speak
                             alt_text = "\n\n💰 **Budget-Friendly Alternatives:**\n"
                             
                             if alternatives["lower_budget"]:
-                                alt_text += f"\n**More Affordable Options** (₹{alternatives['metadata']['lower_budget_max']/100:.1f} Cr):\n"
+                                alt_text += f"\n**More Affordable Options** (₹{alternatives['metadata']['lower_budget_max']/10000000:.1f} Cr):\n"
                                 for proj in alternatives["lower_budget"][:2]:
                                     alt_text += f"• {proj['name']} in {proj['location']}\n"
                             
@@ -2205,48 +2327,16 @@ Be specific to {project_dict.get('location')} area. Make it persuasive and speak
                             response_text += f"\n\n{escalation_msg}"
                             logger.warning(f"🚨 HUMAN ESCALATION OFFERED (frustration: {frustration_level}/10)")
                 
-                # 🆕 Track user profile interactions
+                # 🆕 Track user profile interactions (after the response is sent)
                 if user_profile and request.user_id:
-                    try:
-                        profile_manager = get_profile_manager()
-                        
-                        # Track properties viewed
-                        if session and session.last_shown_projects:
-                            for project in session.last_shown_projects[:5]:  # Track top 5
-                                profile_manager.track_property_viewed(
-                                    request.user_id,
-                                    project.get("id", project.get("project_id", "")),
-                                    project.get("name", ""),
-                                    project
-                                )
-                        
-                        # Track sentiment
-                        if sentiment_analysis:
-                            profile_manager.track_sentiment(
-                                request.user_id,
-                                sentiment_analysis['sentiment'],
-                                sentiment_analysis.get('frustration_level', 0)
-                            )
-                        
-                        # Track objections
-                        if objection_type:
-                            profile_manager.track_objection(request.user_id, objection_type)
-                        
-                        # Update preferences from current filters
-                        if session and session.current_filters:
-                            filters = session.current_filters
-                            profile_manager.update_preferences(
-                                request.user_id,
-                                budget_min=filters.get('budget_min'),
-                                budget_max=filters.get('budget_max'),
-                                configurations=[filters.get('configuration')] if filters.get('configuration') else None,
-                                locations=[filters.get('location')] if filters.get('location') else None
-                            )
-                        
-                        logger.info(f"✅ Updated user profile for {request.user_id}")
-                    
-                    except Exception as e:
-                        logger.error(f"Error updating user profile: {e}")
+                    background_tasks.add_task(
+                        _track_profile_interactions,
+                        request.user_id,
+                        list(session.last_shown_projects[:5]) if session and session.last_shown_projects else [],  # Track top 5
+                        sentiment_analysis,
+                        objection_type,
+                        dict(session.current_filters) if session and session.current_filters else {}
+                    )
                 
                 # ========================================
                 # 🆕 PROACTIVE NUDGING
@@ -2357,14 +2447,16 @@ Be specific to {project_dict.get('location')} area. Make it persuasive and speak
 
         # Log the interaction
         if request.user_id:
-            await pixeltable_client.log_query(
+            background_tasks.add_task(
+                pixeltable_client.log_query,
                 user_id=request.user_id,
                 query=request.query,
                 intent=intent,
                 answered=True,
                 confidence_score="High",
                 response_time_ms=response_time_ms,
-                project_id=request.project_id
+                project_id=request.project_id,
+                classifier=intent_source
             )
 
         # Log coaching prompt status
@@ -2433,14 +2525,16 @@ How can I assist you today?"""
                 response_time_ms = int((time.time() - start_time) * 1000)
                 
                 if request.user_id:
-                    await pixeltable_client.log_query(
+                    background_tasks.add_task(
+                        pixeltable_client.log_query,
                         user_id=request.user_id,
                         query=request.query,
                         intent=f"intelligent_faq_{sales_intent.value}",
                         answered=True,
                         confidence_score="High",
                         response_time_ms=response_time_ms,
-                        project_id=request.project_id
+                        project_id=request.project_id,
+                        classifier=intent_source
                     )
                 
                 if request.session_id:
@@ -2475,7 +2569,7 @@ How can I assist you today?"""
                     "amenities": "Office visits, Site visits, Video calls available"
                 }
                 
-                response_text = generate_insights(
+                response_text = await generate_insights(
                     project_facts=meeting_context,
                     topic="meeting_scheduling",
                     query=request.query,
@@ -2526,14 +2620,16 @@ How can I assist you today?"""
                 response_time_ms = int((time.time() - start_time) * 1000)
                 
                 if request.user_id:
-                    await pixeltable_client.log_query(
+                    background_tasks.add_task(
+                        pixeltable_client.log_query,
                         user_id=request.user_id,
                         query=request.query,
                         intent=f"intelligent_objection_{sales_intent.value}",
                         answered=True,
                         confidence_score="High",
                         response_time_ms=response_time_ms,
-                        project_id=request.project_id
+                        project_id=request.project_id,
+                        classifier=intent_source
                     )
                 
                 return ChatQueryResponse(
@@ -2566,69 +2662,63 @@ How can I assist you today?"""
             if project_name:
                 # Get project facts from database
                 try:
-                    from database.pixeltable_setup import get_projects_table
-                    projects_table = get_projects_table()
+                    # Query for project by name (in-memory catalog)
+                    project_facts = project_repository.find_by_name_fragment(project_name)
                     
-                    if projects_table:
-                        # Query for project by name
-                        results = list(projects_table.where(
-                            projects_table.name.contains(project_name)
-                        ).limit(1).collect())
+                    if project_facts:
+                        # Pure GPT generation for insights
+                        response_text = await generate_insights(
+                            project_facts=project_facts,
+                            topic=topic,
+                            query=request.query,
+                            user_requirements=session_state.get("requirements")
+                        )
                         
-                        if results:
-                            project_facts = results[0]
-                            
-                            # Pure GPT generation for insights
-                            response_text = generate_insights(
-                                project_facts=project_facts,
-                                topic=topic,
+                        response_time_ms = int((time.time() - start_time) * 1000)
+                        
+                        # Record interest in this project
+                        if request.session_id:
+                            session_manager.record_interest(request.session_id, project_name)
+                        
+                        if request.user_id:
+                            background_tasks.add_task(
+                                pixeltable_client.log_query,
+                                user_id=request.user_id,
                                 query=request.query,
-                                user_requirements=session_state.get("requirements")
-                            )
-                            
-                            response_time_ms = int((time.time() - start_time) * 1000)
-                            
-                            # Record interest in this project
-                            if request.session_id:
-                                session_manager.record_interest(request.session_id, project_name)
-                            
-                            if request.user_id:
-                                await pixeltable_client.log_query(
-                                    user_id=request.user_id,
-                                    query=request.query,
-                                    intent=f"gpt_more_info_{topic}",
-                                    answered=True,
-                                    confidence_score="High",
-                                    response_time_ms=response_time_ms,
-                                    project_id=request.project_id
-                                )
-                            
-                            # Update session with messages
-                            if session and request.session_id:
-                                session_manager.add_message(request.session_id, "user", original_query)
-                                session_manager.add_message(request.session_id, "assistant", response_text[:500])
-                                session.last_intent = "more_info_request"
-                                if extraction and extraction.get("topic"):
-                                    session.last_topic = extraction["topic"]
-                                session_manager.save_session(session)
-                            
-                            coaching_prompt = _get_coaching_for_response(
-                                session, request.session_id, request.query, "more_info_request",
-                                search_performed=False, data_source="gpt_generation", budget_alternatives_shown=False
-                            )
-                            return ChatQueryResponse(
-                                answer=response_text,
-                                sources=[],
-                                confidence="High",
-                                intent="gpt_more_info",
-                                refusal_reason=None,
+                                intent=f"gpt_more_info_{topic}",
+                                answered=True,
+                                confidence_score="High",
                                 response_time_ms=response_time_ms,
-                                suggested_actions=[],
-                                coaching_prompt=coaching_prompt
+                                project_id=request.project_id,
+                                classifier=intent_source
                             )
-                        else:
-                            # Project name found but no data in DB -> Fallback to Generic GPT
-                            logger.warning(f"Project '{project_name}' not found in DB. Falling back to generic GPT.")
+                        
+                        # Update session with messages
+                        if session and request.session_id:
+                            session_manager.add_message(request.session_id, "user", original_query)
+                            session_manager.add_message(request.session_id, "assistant", response_text[:500])
+                            session.last_intent = "more_info_request"
+                            if extraction and extraction.get("topic"):
+                                session.last_topic = extraction["topic"]
+                            session_manager.save_session(session)
+                        
+                        coaching_prompt = _get_coaching_for_response(
+                            session, request.session_id, request.query, "more_info_request",
+                            search_performed=False, data_source="gpt_generation", budget_alternatives_shown=False
+                        )
+                        return ChatQueryResponse(
+                            answer=response_text,
+                            sources=[],
+                            confidence="High",
+                            intent="gpt_more_info",
+                            refusal_reason=None,
+                            response_time_ms=response_time_ms,
+                            suggested_actions=[],
+                            coaching_prompt=coaching_prompt
+                        )
+                    else:
+                        # Project name found but no data in DB -> Fallback to Generic GPT
+                        logger.warning(f"Project '{project_name}' not found in DB. Falling back to generic GPT.")
                     
                 except Exception as e:
                     logger.error(f"GPT content generation failed: {e}")
@@ -2641,12 +2731,12 @@ How can I assist you today?"""
             
             logger.info("Falling back to generic GPT for more_info_request")
             from services.master_prompt import get_general_prompt
-            from services.gpt_content_generator import client, settings
+            from services.llm_gateway import llm_gateway
             
             prompt = get_general_prompt(request.query)
             
             try:
-                response = client.chat.completions.create(
+                response = await llm_gateway.chat(
                     model=settings.effective_gpt_model,
                     messages=[{"role": "user", "content": prompt}],
                     temperature=0.7
@@ -2674,7 +2764,8 @@ How can I assist you today?"""
             
             # Use Flow Engine to process the request
             # This handles: Requirement Extraction -> Node Logic -> Pixeltable Query -> Negotiation
-            flow_response = flow_engine.process(
+            flow_response = await asyncio.to_thread(
+                flow_engine.process,
                 session_id=request.session_id or "default_session",
                 user_input=request.query
             )
@@ -2704,14 +2795,16 @@ How can I assist you today?"""
             
             # Log the interaction
             if request.user_id:
-                await pixeltable_client.log_query(
+                background_tasks.add_task(
+                    pixeltable_client.log_query,
                     user_id=request.user_id,
                     query=request.query,
                     intent=f"flow_{flow_response.current_node}",
                     answered=True,
                     confidence_score="High", # Flow logic is deterministic
                     response_time_ms=response_time_ms,
-                    project_id=request.project_id
+                    project_id=request.project_id,
+                    classifier=intent_source
                 )
             
             # Map FlowResponse to ChatQueryResponse
@@ -2733,7 +2826,7 @@ How can I assist you today?"""
                 logger.info("Unsupported intent with context - routing to contextual GPT fallback")
                 from services.gpt_content_generator import generate_contextual_response_with_full_history
                 
-                response_text = generate_contextual_response_with_full_history(
+                response_text = await generate_contextual_response_with_full_history(
                     query=original_query,
                     conversation_history=conversation_history,
                     session_context=context_summary_dict,
@@ -2770,7 +2863,7 @@ How can I assist you today?"""
                     "amenities": "Property search, site visits, investment advice, meeting scheduling"
                 }
                 
-                response_text = generate_insights(
+                response_text = await generate_insights(
                     project_facts=general_context,
                     topic="general_selling_points",
                     query=request.query,
@@ -2814,7 +2907,7 @@ How can I assist you today?"""
                 
         #         # Log as answered with external source
         #         if request.user_id:
-        #             await pixeltable_client.log_query(
+        #             background_tasks.add_task(pixeltable_client.log_query,
         #                 user_id=request.user_id,
         #                 query=request.query,
         #                 intent=intent,
@@ -2982,14 +3075,16 @@ How can I assist you today?"""
 
             # Log query
             if request.user_id:
-                await pixeltable_client.log_query(
+                background_tasks.add_task(
+                    pixeltable_client.log_query,
                     user_id=request.user_id,
                     query=request.query,
                     intent=intent,
                     answered=False,
                     refusal_reason="hallucination_risk",
                     response_time_ms=int((time.time() - start_time) * 1000),
-                    project_id=request.project_id
+                    project_id=request.project_id,
+                    classifier=intent_source
                 )
 
             return ChatQueryResponse(
@@ -3002,14 +3097,16 @@ How can I assist you today?"""
 
         if request.user_id:
             confidence_score = result.get("confidence", "Medium")
-            await pixeltable_client.log_query(
+            background_tasks.add_task(
+                pixeltable_client.log_query,
                 user_id=request.user_id,
                 query=request.query,
                 intent=intent,
                 answered=True,
                 confidence_score=confidence_score,
                 response_time_ms=response_time_ms,
-                project_id=request.project_id
+                project_id=request.project_id,
+                classifier=intent_source
             )
 
         logger.info(f"Query processed successfully in {response_time_ms}ms")
@@ -3099,7 +3196,7 @@ How can I assist you today?"""
             intent=intent,
             refusal_reason=None,
             response_time_ms=response_time_ms,
-            projects=full_projects,
+            projects=project_list_fields(full_projects, request.fields),
             data=enhanced_ux_data if enhanced_ux_data else None  # Include enhanced UX data
         )
 
@@ -3108,6 +3205,26 @@ How can I assist you today?"""
         raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
 
 
+@app.post("/api/chat/query/stream")
+async def chat_query_stream(request: ChatQueryRequest, background_tasks: BackgroundTasks):
+    """
+    Streaming variant of /api/chat/query (server-sent events).
+
+    Emits `projects` as soon as retrieval finishes, `token` events while the
+    consultant answer is generated, then `coaching` and a `final` event
+    carrying the full ChatQueryResponse.
+    """
+    return StreamingResponse(
+        sse_events(
+            lambda: chat_query(request, background_tasks),
+            format_projects=lambda projects: project_list_fields(projects, request.fields),
+            coaching_fields=("coaching_prompt", "suggested_actions")
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
 @app.get("/api/projects", response_model=List[ProjectInfo])
 async def get_projects(user_id: str = "guest"):
     """
@@ -3170,6 +3287,24 @@ async def get_project(project_id: str):
         raise HTTPException(status_code=500, detail=f"Error fetching project: {str(e)}")
 
 
+@app.get("/api/projects/{project_id}/details")
+async def get_project_details(project_id: str, fields: Optional[str] = None):
+    """
+    Full (or projected) project payload, for lazily expanding a result card.
+
+    Args:
+        project_id: Project ID or exact project name
+        fields: Optional projection - "card", a comma-separated field list, or omitted for every field
+
+    Returns:
+        The same project dict search results use
+    """
+    project = project_repository.payload(project_id, fields)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project
+
+
 # === Phase 2 Endpoints ===
 
 @app.get("/api/personas")
@@ -3201,7 +3336,7 @@ async def get_filter_options_endpoint():
 
 
 @app.post("/api/chat/sales")
-async def sales_chat_query(request: ChatQueryRequest):
+async def sales_chat_query(request: ChatQueryRequest, background_tasks: BackgroundTasks):
     """
     Intelligent sales-focused chat endpoint powered by GPT-4.
     
@@ -3226,7 +3361,8 @@ async def sales_chat_query(request: ChatQueryRequest):
             response_time_ms = int((time.time() - start_time) * 1000)
             
             if request.user_id:
-                await pixeltable_client.log_query(
+                background_tasks.add_task(
+                    pixeltable_client.log_query,
                     user_id=request.user_id,
                     query=request.query,
                     intent=f"intelligent_sales_{sales_intent.value}",
@@ -3249,19 +3385,20 @@ async def sales_chat_query(request: ChatQueryRequest):
         
         # Fall back to regular chat endpoint for property queries
         logger.info("Falling back to regular chat processing for property/unknown query")
-        return await chat_query(request)
+        return await chat_query(request, background_tasks)
         
     except Exception as e:
         logger.error(f"Error in intelligent sales chat: {e}", exc_info=True)
         # Fallback to regular handler on error
         try:
-            return await chat_query(request)
+            return await chat_query(request, background_tasks)
         except:
             raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/api/chat/compare")
 async def compare_projects(
+    background_tasks: BackgroundTasks,
     query: str,
     project_ids: Optional[List[str]] = None,
     user_id: Optional[str] = None
@@ -3301,7 +3438,8 @@ async def compare_projects(
         response_time_ms = int((time.time() - start_time) * 1000)
 
         if user_id:
-            await pixeltable_client.log_query(
+            background_tasks.add_task(
+                pixeltable_client.log_query,
                 user_id=user_id,
                 query=query,
                 intent="comparison",
@@ -3323,7 +3461,7 @@ async def compare_projects(
 
 
 @app.post("/api/chat/filtered-search")
-async def filtered_search(request: ChatQueryRequest):
+async def filtered_search(request: ChatQueryRequest, background_tasks: BackgroundTasks):
     """
     Natural language property search across all projects with structured filtering.
 
@@ -3426,7 +3564,8 @@ async def filtered_search(request: ChatQueryRequest):
                 
                 # Log query
                 if request.user_id:
-                    await pixeltable_client.log_query(
+                    background_tasks.add_task(
+                        pixeltable_client.log_query,
                         user_id=request.user_id,
                         query=request.query,
                         intent="structured_search_with_fallback",
@@ -3451,7 +3590,8 @@ async def filtered_search(request: ChatQueryRequest):
             
             # Log query
             if request.user_id:
-                await pixeltable_client.log_query(
+                background_tasks.add_task(
+                    pixeltable_client.log_query,
                     user_id=request.user_id,
                     query=request.query,
                     intent="structured_search",
@@ -3505,7 +3645,8 @@ async def filtered_search(request: ChatQueryRequest):
 
         # Log query
         if request.user_id:
-            await pixeltable_client.log_query(
+            background_tasks.add_task(
+                pixeltable_client.log_query,
                 user_id=request.user_id,
                 query=request.query,
                 intent="structured_search",
@@ -3613,7 +3754,7 @@ if settings.environment == "development":
     async def test_intent(query: str):
         """Test intent classification using GPT-first classifier."""
         try:
-            gpt_result = classify_intent_gpt_first(query)
+            gpt_result = await classify_intent_gpt_first(query)
             return {
                 "query": query, 
                 "intent": gpt_result.get("intent"),
@@ -3639,21 +3780,23 @@ async def agent_flow_query(request: ChatQueryRequest):
     """
     try:
         session_id = request.session_id or "default_agent_session"
-        session = session_manager.get_or_create_session(session_id)
-        
-        # Load state
-        current_state_data = session.flow_state
-        if current_state_data:
-            state = FlowState(**current_state_data)
-        else:
-            state = FlowState() # Start at Node 1
-            
-        # Execute Flow
-        response = execute_flow(state, request.query, chat_history=session.messages)
-        
-        # Save state
-        session.flow_state = state.model_dump()
-        
+        async with session_turn():
+            session = await asyncio.to_thread(session_manager.get_or_create_session, session_id)
+
+            # Load state
+            current_state_data = session.flow_state
+            if current_state_data:
+                state = FlowState(**current_state_data)
+            else:
+                state = FlowState() # Start at Node 1
+
+            # Execute Flow (synchronous LLM calls; keep them off the event loop)
+            response = await asyncio.to_thread(execute_flow, state, request.query, session.messages)
+
+            # Save state (written back when the turn ends)
+            session.flow_state = state.model_dump()
+            session_manager.save_session(session)
+
         return response
         
     except Exception as e:
@@ -120,6 +120,11 @@ class CopilotResponse(BaseModel):
         description="6-part structure for live call scenarios (only populated when live_call_mode=True)"
     )
 
+    degraded_stages: Optional[List[str]] = Field(
+        None,
+        description="Stages that took their fast path to stay within the request deadline"
+    )
+
     class Config:
         json_schema_extra = {
             "example": {
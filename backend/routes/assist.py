@@ -1,14 +1,18 @@
+import asyncio
 import logging
 import openai
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from typing import Optional
 
 from models.copilot_request import AssistRequest
 from models.copilot_response import CopilotResponse
 from services.redis_context import get_redis_context_manager
 from services.copilot_formatter import copilot_formatter
+from services.deadline import deadline_scope
 from services.flow_engine import FlowState, FlowRequirements, execute_flow
 from services.gpt_intent_classifier import needs_clarification
+from services.response_stream import SSE_HEADERS, sse_events
 
 logger = logging.getLogger(__name__)
 
@@ -18,12 +22,20 @@ router = APIRouter()
 @router.post("/", response_model=CopilotResponse)
 async def assist(request: AssistRequest):
     """
-    Main /assist endpoint for Sales Copilot.
+    Main /assist endpoint for Sales Copilot, run under the request deadline.
     """
+    with deadline_scope() as deadline:
+        response = await _assist(request)
+        response.degraded_stages = list(deadline.degraded) or None
+        return response
+
+
+async def _assist(request: AssistRequest) -> CopilotResponse:
+    """Load the call context, run the flow engine, format and save the context back."""
     try:
         # 1. Load context from Redis
         redis_manager = get_redis_context_manager()
-        ctx = redis_manager.load_context(request.call_id)
+        ctx = await redis_manager.aload_context(request.call_id)
         logger.info(f"📥 Loaded context for call_id={request.call_id}")
 
         # 1.5. Check if query needs clarification (vague references without context)
@@ -32,7 +44,7 @@ async def assist(request: AssistRequest):
         if needs_clarification(request.query, ctx):
             logger.info(f"⚠️ Query needs clarification: '{request.query}' (vague reference without context)")
             # IMPORTANT: Still save context to maintain sliding TTL window
-            redis_manager.save_context(request.call_id, ctx)
+            await redis_manager.asave_context(request.call_id, ctx)
             return CopilotResponse(
                 projects=[],
                 answer=[
@@ -65,7 +77,8 @@ async def assist(request: AssistRequest):
 
         # 3. Execute Unified Flow (Intent -> Search -> Radius -> Formatting)
         # This one call replaces the manual pipeline below
-        flow_response = execute_flow(flow_state, request.query)
+        # Synchronous LLM calls; keep them off the event loop
+        flow_response = await asyncio.to_thread(execute_flow, flow_state, request.query)
         logger.info(f"🚀 Unified Flow Output: {flow_response.current_node} (Intent: {flow_state.last_intent})")
 
         # 4. Map FlowResponse to CopilotResponse (Frontend Protocol)
@@ -77,7 +90,7 @@ async def assist(request: AssistRequest):
         if request.live_call_mode:
             # Use copilot_formatter to generate live call structure
             try:
-                formatted_response = copilot_formatter.format_response(
+                formatted_response = await copilot_formatter.format_response(
                     query=request.query,
                     context=ctx,
                     db_projects=flow_response.projects,
@@ -118,7 +131,7 @@ async def assist(request: AssistRequest):
             "last_filters": reqs # Flow engine requirements are the source of truth for filters now
         })
 
-        redis_manager.save_context(request.call_id, ctx)
+        await redis_manager.asave_context(request.call_id, ctx)
         logger.info(f"💾 Updated context with Radius/Flow State for call_id={request.call_id}")
 
         return response
@@ -142,6 +155,28 @@ async def assist(request: AssistRequest):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.post("/stream")
+async def assist_stream(request: AssistRequest):
+    """
+    Streaming variant of /assist (server-sent events).
+
+    Emits `projects` as soon as the flow has them, `token` events while a
+    project answer is generated, then the coaching fields and
+    `live_call_structure`, and a `final` event with the full CopilotResponse.
+    """
+    return StreamingResponse(
+        sse_events(
+            lambda: assist(request),
+            format_projects=lambda projects: [
+                project.model_dump() for project in copilot_formatter._convert_to_project_infos(projects)
+            ],
+            coaching_fields=("pitch_help", "next_suggestion", "coaching_point", "live_call_structure")
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
 @router.get("/health")
 async def health_check():
     """
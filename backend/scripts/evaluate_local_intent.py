@@ -0,0 +1,121 @@
+"""
+Offline evaluation of the local intent classifier against logged GPT labels.
+
+Reads (query_text, intent) pairs from brigade.query_logs (or a JSONL export
+with "query"/"intent"/"classifier" keys via --input), keeping only queries
+GPT classified (classifier == "gpt"); rows the local fast path answered would
+measure the model against itself. Rows logged before the classifier column
+existed have no source and are skipped unless --include-untagged is given
+(only safe for logs that predate the local classifier). Runs the local model
+on each query and reports:
+- agreement with the logged label over all queries
+- coverage: share of queries answered locally at the threshold
+- agreement on the locally answered queries (what users would see change)
+- per-intent agreement and local classification latency (p50 / p95)
+
+Optionally writes the trained model as an .npz artifact (--save-model) for
+settings.local_intent_model_path.
+
+Usage:
+    python scripts/evaluate_local_intent.py [--input logs.jsonl] [--threshold 0.85] [--save-model model.npz]
+                                            [--include-untagged]
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import List, Tuple
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import settings
+from services.local_intent_classifier import LOCAL_INTENTS, LocalIntentClassifier
+
+
+def load_logged_labels(input_path: str = None, limit: int = None, include_untagged: bool = False) -> List[Tuple[str, str]]:
+    """(query, intent) pairs GPT labelled, for intents the local model covers."""
+    if input_path:
+        with open(input_path) as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        rows = [(row.get("query") or row.get("query_text"), row.get("intent"), row.get("classifier")) for row in rows]
+    else:
+        from database.pixeltable_setup import get_query_logs_table
+        logs = get_query_logs_table()
+        query = logs.select(logs.query_text, logs.intent, logs.classifier)
+        if limit:
+            query = query.limit(limit)
+        rows = [(r["query_text"], r["intent"], r["classifier"]) for r in query.collect()]
+    sources = {"gpt", "", None} if include_untagged else {"gpt"}
+    return [(text, intent) for text, intent, source in rows
+            if text and intent in LOCAL_INTENTS and source in sources]
+
+
+def evaluate(classifier: LocalIntentClassifier, pairs: List[Tuple[str, str]], threshold: float) -> dict:
+    agree = local = local_agree = 0
+    per_intent = defaultdict(Counter)
+    latencies = []
+
+    for text, label in pairs:
+        started_at = time.perf_counter()
+        prediction = classifier.predict(text)  # Normalized once, shared with classify
+        result = classifier.classify(text, threshold=threshold, prediction=prediction)
+        latencies.append((time.perf_counter() - started_at) * 1000)
+        predicted = prediction[0]
+
+        agree += predicted == label
+        per_intent[label]["total"] += 1
+        per_intent[label]["agree"] += predicted == label
+        if result is not None:
+            local += 1
+            local_agree += result["intent"] == label
+
+    latencies.sort()
+    total = len(pairs)
+    return {
+        "queries": total,
+        "agreement": round(agree / total, 3) if total else None,
+        "coverage": round(local / total, 3) if total else None,
+        "local_agreement": round(local_agree / local, 3) if local else None,
+        "latency_ms_p50": round(latencies[total // 2], 2) if total else None,
+        "latency_ms_p95": round(latencies[int(total * 0.95)], 2) if total else None,
+        "per_intent": {
+            intent: round(counts["agree"] / counts["total"], 3)
+            for intent, counts in sorted(per_intent.items())
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the local intent classifier against logged GPT labels")
+    parser.add_argument("--input", help="JSONL export with query/intent keys (default: brigade.query_logs)")
+    parser.add_argument("--limit", type=int, help="Max log rows to read")
+    parser.add_argument("--include-untagged", action="store_true",
+                        help="Also use rows with no classifier source (logs from before the local classifier)")
+    parser.add_argument("--threshold", type=float, default=settings.local_intent_threshold)
+    parser.add_argument("--model", default=settings.local_intent_model_path, help="Evaluate a saved .npz model")
+    parser.add_argument("--save-model", help="Write the trained model to this .npz path")
+    args = parser.parse_args()
+
+    classifier = LocalIntentClassifier(model_path=args.model)
+    if not classifier.ensure_ready():
+        print("Local intent model could not be loaded or trained")
+        sys.exit(1)
+    if args.save_model:
+        classifier.save(args.save_model)
+        print(f"Saved model to {args.save_model}")
+
+    pairs = load_logged_labels(args.input, args.limit, args.include_untagged)
+    if not pairs:
+        print("No GPT-labelled queries with supported intents found")
+        sys.exit(1)
+
+    report = evaluate(classifier, pairs, args.threshold)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+Bounded Store - Size- and age-limited in-process dicts.
+
+Session working copies, the Redis fallbacks, user profiles, calendar events
+and the sentiment cache used to be plain dicts that grew with every
+conversation until the worker was recycled. BoundedTTLStore is a drop-in
+MutableMapping with:
+
+- LRU eviction once `max_entries` is reached;
+- a TTL per entry (store default or per `set`), sliding on access unless
+  `sliding=False`;
+- a min-heap of expiry times, so a sweep only touches entries that are due
+  (heap entries are invalidated lazily when an entry's expiry moves).
+
+Expired entries are never returned, even between sweeps. `run_sweeper` is
+started from the app lifespan and sweeps every registered store; `store_stats`
+reports entries, evictions and approximate memory per store for /health.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+SIZE_SAMPLE = 32  # Entries sampled for the memory estimate
+_SIZE_DEPTH = 6
+
+# Every live store, for the sweeper and /health
+_registry: List["weakref.ref[BoundedTTLStore]"] = []
+_registry_lock = threading.Lock()
+
+
+def _deep_size(obj: Any, depth: int = 0, seen: Optional[set] = None) -> int:
+    """Approximate retained size of an object graph (shared objects counted once)."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen or depth > _SIZE_DEPTH:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj, 0)
+    if isinstance(obj, BaseModel):
+        return size + _deep_size(obj.__dict__, depth + 1, seen)
+    if isinstance(obj, dict):
+        return size + sum(_deep_size(k, depth + 1, seen) + _deep_size(v, depth + 1, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(_deep_size(item, depth + 1, seen) for item in obj)
+    return size
+
+
+class BoundedTTLStore(MutableMapping):
+    """Thread-safe dict bounded by entry count (LRU) and entry age (TTL)."""
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl_seconds: Optional[float] = None,
+        sliding: bool = True,
+        on_evict: Optional[Callable[[Hashable, Any, str], None]] = None,
+        clock: Optional[Callable[[], float]] = None
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sliding = sliding
+        self._on_evict = on_evict
+        self._clock = clock or (lambda: time.monotonic())
+        # key -> (value, expires_at or None, ttl or None), in LRU order (oldest first)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float], Optional[float]]]" = OrderedDict()
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+        with _registry_lock:
+            _registry[:] = [ref for ref in _registry if ref() is not None]
+            _registry.append(weakref.ref(self))
+
+    # ------------------------------------------------------------------
+    # Mapping interface
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                raise KeyError(key)
+            self._stats["hits"] += 1
+            value, expires_at, ttl = entry
+            self._entries.move_to_end(key)
+            if self.sliding and ttl is not None:
+                # The heap keeps the old expiry; the sweep re-queues the entry when it gets there
+                self._entries[key] = (value, self._clock() + ttl, ttl)
+            return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.set(key, value)
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            if self._live(key) is None:
+                raise KeyError(key)
+            del self._entries[key]
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return self._live(key) is not None
+
+    def __iter__(self) -> Iterator[Hashable]:
+        with self._lock:
+            now = self._clock()
+            keys = [key for key, (_, expires_at, _) in self._entries.items()
+                    if expires_at is None or expires_at > now]
+        return iter(keys)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Live entries, without touching their LRU position or TTL."""
+        with self._lock:
+            now = self._clock()
+            return [(key, value) for key, (value, expires_at, _) in self._entries.items()
+                    if expires_at is None or expires_at > now]
+
+    def values(self) -> List[Any]:
+        return [value for _, value in self.items()]
+
+    def keys(self) -> List[Hashable]:
+        return [key for key, _ in self.items()]
+
+    # ------------------------------------------------------------------
+    # Store operations
+    # ------------------------------------------------------------------
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Insert or replace an entry (`ttl` overrides the store default)."""
+        ttl = self.ttl_seconds if ttl is None else ttl
+        evicted = []
+        with self._lock:
+            expires_at = self._clock() + ttl if ttl is not None else None
+            self._entries[key] = (value, expires_at, ttl)
+            self._entries.move_to_end(key)
+            if expires_at is not None:
+                heapq.heappush(self._heap, (expires_at, next(self._seq), key))
+            while len(self._entries) > self.max_entries:
+                old_key, (old_value, _, _) = self._entries.popitem(last=False)
+                self._stats["evicted"] += 1
+                evicted.append((old_key, old_value))
+        for old_key, old_value in evicted:
+            self._evicted(old_key, old_value, "capacity")
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Value without touching its LRU position or TTL."""
+        with self._lock:
+            entry = self._live(key)
+            return entry[0] if entry is not None else default
+
+    def expire(self) -> int:
+        """Drop every entry whose TTL has passed; returns how many were dropped."""
+        expired = []
+        with self._lock:
+            now = self._clock()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, key = heapq.heappop(self._heap)
+                entry = self._entries.get(key)
+                if entry is None or entry[1] is None:
+                    continue
+                value, expires_at, _ = entry
+                if expires_at <= now:
+                    del self._entries[key]
+                    self._stats["expired"] += 1
+                    expired.append((key, value))
+                else:
+                    # Expiry moved later (sliding TTL): queue it at its new time
+                    heapq.heappush(self._heap, (expires_at, next(self._seq), key))
+            if len(self._heap) > 4 * max(len(self._entries), 16):
+                self._compact_heap()
+        for key, value in expired:
+            self._evicted(key, value, "expired")
+        return len(expired)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._heap.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = len(self._entries)
+            sample = [value for value, _, _ in itertools.islice(reversed(self._entries.values()), SIZE_SAMPLE)]
+            stats = dict(self._stats)
+        approx_bytes = int(sum(_deep_size(value) for value in sample) / len(sample) * entries) if sample else 0
+        return {
+            **stats,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "approx_bytes": approx_bytes,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _live(self, key: Hashable) -> Optional[Tuple[Any, Optional[float], Optional[float]]]:
+        """Entry for `key` unless it has expired (expired entries are dropped on sight)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= self._clock():
+            del self._entries[key]
+            self._stats["expired"] += 1
+            self._evicted(key, entry[0], "expired")
+            return None
+        return entry
+
+    def _compact_heap(self) -> None:
+        self._heap = [(expires_at, next(self._seq), key)
+                      for key, (_, expires_at, _) in self._entries.items() if expires_at is not None]
+        heapq.heapify(self._heap)
+
+    def _evicted(self, key: Hashable, value: Any, reason: str) -> None:
+        if self._on_evict is None:
+            return
+        try:
+            self._on_evict(key, value, reason)
+        except Exception as e:
+            logger.warning(f"{self.name}: eviction callback failed for {key}: {e}")
+
+
+def registered_stores() -> List[BoundedTTLStore]:
+    with _registry_lock:
+        stores = [ref() for ref in _registry]
+    return [store for store in stores if store is not None]
+
+
+def sweep_all() -> int:
+    """Expire due entries in every registered store."""
+    return sum(store.expire() for store in registered_stores())
+
+
+def store_stats() -> Dict[str, Dict[str, Any]]:
+    """Entries, evictions and approximate memory per store (for /health)."""
+    return {store.name: store.stats() for store in registered_stores()}
+
+
+async def run_sweeper(interval_seconds: float) -> None:
+    """Lifespan background task: sweep every store every `interval_seconds`."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            expired = sweep_all()
+            if expired:
+                logger.debug(f"Bounded stores: expired {expired} entries")
+        except Exception as e:
+            logger.warning(f"Bounded store sweep failed: {e}")
@@ -44,11 +44,13 @@ class BudgetRelaxationService:
         """
         logger.info(f"Starting budget relaxation for budget={budget}, location={location}")
 
+        # Build every relaxation step up front and search them in one pass
+        variants = []
         for multiplier in RELAX_STEPS:
             relaxed_budget = int(budget * multiplier)
 
             # Update filters with relaxed budget
-            filters_copy = filters.model_copy(deep=True)
+            filters_copy = filters.model_copy()
             filters_copy.max_price_inr = relaxed_budget
 
             # If location is provided, set it in filters
@@ -58,28 +60,28 @@ class BudgetRelaxationService:
                 if not filters_copy.area:
                     filters_copy.area = location
 
-            # Query database with relaxed budget
-            logger.info(f"Trying relaxation step {multiplier}x: budget={relaxed_budget}")
-
-            try:
-                result = await hybrid_retrieval.search_with_filters(
-                    query=query or f"projects under {relaxed_budget}",
-                    filters=filters_copy,
-                    use_llm_extraction=False
+            variants.append(filters_copy)
+
+        try:
+            results = await hybrid_retrieval.search_with_filter_variants(
+                query=query or f"projects under {budget}",
+                variants=variants
+            )
+        except Exception as e:
+            logger.error(f"Error querying relaxation steps: {e}", exc_info=True)
+            results = []
+
+        # Stop at the first step with matches
+        for multiplier, result in zip(RELAX_STEPS, results):
+            projects = result.get("projects", [])
+            logger.info(f"Relaxation step {multiplier}x: budget={int(budget * multiplier)}, {len(projects)} projects")
+
+            if projects:
+                logger.info(
+                    f"✅ Found {len(projects)} projects at {multiplier}x relaxation "
+                    f"(budget: {budget} → {int(budget * multiplier)})"
                 )
-
-                projects = result.get("projects", [])
-
-                if projects:
-                    logger.info(
-                        f"✅ Found {len(projects)} projects at {multiplier}x relaxation "
-                        f"(budget: {budget} → {relaxed_budget})"
-                    )
-                    return projects, multiplier
-
-            except Exception as e:
-                logger.error(f"Error querying at {multiplier}x: {e}", exc_info=True)
-                continue
+                return projects, multiplier
 
         # No results found even at 1.3x
         logger.warning(f"❌ No projects found even after 1.3x relaxation (budget: {budget} → {int(budget * 1.3)})")
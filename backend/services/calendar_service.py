@@ -15,8 +15,13 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime, date, time, timedelta
 from enum import Enum
 
+from services.bounded_store import BoundedTTLStore
+
 logger = logging.getLogger(__name__)
 
+EVENT_RETENTION_SECONDS = 90 * 24 * 3600  # Events are kept 90 days after creation
+MAX_EVENTS = 10000
+
 
 class CalendarProvider(str, Enum):
     """Supported calendar providers"""
@@ -58,7 +63,7 @@ class CalendarService:
         }
         
         # Calendar events created (in-memory, in production use database)
-        self.events: Dict[str, Dict[str, Any]] = {}
+        self.events = BoundedTTLStore("calendar_events", MAX_EVENTS, EVENT_RETENTION_SECONDS, sliding=False)
         self.event_counter = 0
     
     def check_availability(
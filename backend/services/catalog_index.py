@@ -0,0 +1,230 @@
+"""
+Catalog Index - Columnar in-memory view of the projects table.
+
+Built once per data snapshot so that hybrid retrieval does not re-convert
+every Pixeltable row and re-lowercase every string field on each search.
+String fields are stored pre-lowercased with a token inverted index per
+field; numeric fields are stored as NumPy arrays so budget and possession
+filters become vectorized masks.
+"""
+
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from services.geo_index import GeoIndex
+from services.name_index import NameIndex
+from services.project_payloads import render_project_payload
+from services.unit_table import UnitTable
+from utils.gazetteer import catalog_gazetteer
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Fields searched with substring semantics by hybrid retrieval filters
+INDEXED_TEXT_FIELDS = ("location", "zone", "full_address", "name", "builder", "developer")
+
+# Bound on memoized needle -> candidate lookups per field
+_LOOKUP_CACHE_SIZE = 1024
+
+
+def row_to_dict(row: Any) -> Optional[Dict[str, Any]]:
+    """Convert a Pixeltable Row (or dict) into a plain dict."""
+    if isinstance(row, dict):
+        return dict(row)
+    if hasattr(row, 'to_dict'):
+        return row.to_dict()
+    return {key: row[key] for key in row.keys()}
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text)
+
+
+def _to_float(value: Any) -> float:
+    """Numeric value or NaN for missing / non-numeric values."""
+    if value is None or isinstance(value, bool):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _to_year(value: Any) -> float:
+    """Possession year as float, NaN unless str(value) is all digits."""
+    if value is not None and str(value).isdigit():
+        return float(int(value))
+    return np.nan
+
+
+class _FieldIndex:
+    """Token inverted index over one pre-lowercased text column."""
+
+    def __init__(self, values: List[str]):
+        self.values = values
+        self.postings: Dict[str, Set[int]] = {}
+        for i, text in enumerate(values):
+            for token in set(_tokenize(text)):
+                self.postings.setdefault(token, set()).add(i)
+        self._lookup_cache: Dict[str, Set[int]] = {}
+
+    def _rows_for_token(self, token: str) -> Set[int]:
+        """Rows whose field contains a token that has `token` as a substring."""
+        cached = self._lookup_cache.get(token)
+        if cached is not None:
+            return cached
+
+        exact = self.postings.get(token)
+        rows: Set[int] = set(exact) if exact else set()
+        for vocab_token, posting in self.postings.items():
+            if vocab_token != token and token in vocab_token:
+                rows |= posting
+
+        if len(self._lookup_cache) >= _LOOKUP_CACHE_SIZE:
+            self._lookup_cache.clear()
+        self._lookup_cache[token] = rows
+        return rows
+
+    def contains(self, needle: str) -> Set[int]:
+        """
+        Rows where `needle` (already lowercased) is a substring of the field.
+
+        Every alphanumeric run of the needle must sit inside a single token of
+        a matching row, so the postings intersection is a superset of the
+        answer; candidates are then verified with a plain substring check.
+        """
+        tokens = _tokenize(needle)
+        if not tokens:
+            return {i for i, text in enumerate(self.values) if needle in text}
+
+        candidates: Optional[Set[int]] = None
+        for token in tokens:
+            rows = self._rows_for_token(token)
+            candidates = rows if candidates is None else candidates & rows
+            if not candidates:
+                return set()
+
+        if len(tokens) == 1 and needle == tokens[0]:
+            return set(candidates)
+        return {i for i in candidates if needle in self.values[i]}
+
+
+class CatalogIndex:
+    """
+    Columnar, read-only index over a snapshot of project rows.
+
+    Filters return boolean masks over row positions, so callers can chain
+    them in the same order as the original list-comprehension pipeline and
+    materialize only the surviving rows.
+    """
+
+    def __init__(self, rows: Iterable[Any]):
+        projects: List[Dict[str, Any]] = []
+        for row in rows:
+            try:
+                converted = row_to_dict(row)
+            except Exception as conv_err:
+                logger.error(f"Error converting row to dict: {conv_err}")
+                continue
+            if converted is not None:
+                projects.append(converted)
+
+        self.projects = projects
+        self.size = len(projects)
+
+        self.text = {
+            field: [str(p.get(field, '')).lower() for p in projects]
+            for field in INDEXED_TEXT_FIELDS
+        }
+        self._field_index = {field: _FieldIndex(values) for field, values in self.text.items()}
+
+        self.budget_min = np.array([_to_float(p.get('budget_min')) for p in projects], dtype=np.float64)
+        self.budget_max = np.array([_to_float(p.get('budget_max')) for p in projects], dtype=np.float64)
+        self.possession_year = np.array([_to_year(p.get('possession_year')) for p in projects], dtype=np.float64)
+
+        # Project-name lookup (exact / token / trigram)
+        self.names = NameIndex(p.get('name') for p in projects)
+
+        # Unit-level configurations parsed once per snapshot
+        self.units = UnitTable(p.get('configuration') for p in projects)
+
+        # Coordinates for radius / nearest-project queries
+        self.geo = GeoIndex(projects)
+
+        # Locations + this snapshot's project names for single-pass query tagging
+        self.gazetteer = catalog_gazetteer(p.get('name') for p in projects)
+
+        # Formatted response payloads, rendered once and shared by every search
+        self.payloads = [render_project_payload(p) for p in projects]
+
+        self._positions: Dict[str, int] = {}
+        for i, p in enumerate(projects):
+            for key in (p.get('project_id'), p.get('name')):
+                if key:
+                    self._positions.setdefault(str(key), i)
+
+        logger.info(f"CatalogIndex built: {self.size} projects, {len(self.units)} unit configurations, {len(self.geo)} geolocated")
+
+    def __len__(self) -> int:
+        return self.size
+
+    # ------------------------------------------------------------------
+    # Masks
+    # ------------------------------------------------------------------
+
+    def all_mask(self) -> np.ndarray:
+        return np.ones(self.size, dtype=bool)
+
+    def _mask_from(self, rows: Set[int]) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        if rows:
+            mask[np.fromiter(rows, dtype=np.intp, count=len(rows))] = True
+        return mask
+
+    def contains_any_field(self, needle: str, fields: Iterable[str]) -> np.ndarray:
+        """Mask of rows where lowercased `needle` is a substring of any of `fields`."""
+        needle = needle.lower()
+        rows: Set[int] = set()
+        for field in fields:
+            rows |= self._field_index[field].contains(needle)
+        return self._mask_from(rows)
+
+    def exact_name(self, name: str, mask: np.ndarray) -> Optional[int]:
+        """First row (in snapshot order) inside `mask` whose name equals `name` case-insensitively."""
+        pos = self.names.exact(name)
+        if pos is not None and mask[pos]:
+            return pos
+        name = name.lower()
+        candidates = sorted(i for i in self._field_index['name'].contains(name)
+                            if mask[i] and self.text['name'][i] == name)
+        return candidates[0] if candidates else None
+
+    def max_price_mask(self, max_lakhs: float) -> np.ndarray:
+        """budget_min known, positive and within `max_lakhs`."""
+        with np.errstate(invalid='ignore'):
+            return (self.budget_min > 0) & (self.budget_min <= max_lakhs)
+
+    def min_price_mask(self, min_lakhs: float) -> np.ndarray:
+        """budget_max unknown or at least `min_lakhs`."""
+        with np.errstate(invalid='ignore'):
+            return np.isnan(self.budget_max) | (self.budget_max >= min_lakhs)
+
+    def possession_by_mask(self, target_year: int) -> np.ndarray:
+        """Possession year known and no later than `target_year`."""
+        with np.errstate(invalid='ignore'):
+            return self.possession_year <= target_year
+
+    def position_of(self, project: Dict[str, Any]) -> Optional[int]:
+        """Row position of a project dict, matched on project_id then name."""
+        for key in (project.get('project_id'), project.get('name')):
+            if key and str(key) in self._positions:
+                return self._positions[str(key)]
+        return None
+
+    def rows(self, mask: np.ndarray) -> List[Dict[str, Any]]:
+        """Shallow copies of the rows selected by `mask`, in snapshot order."""
+        return [dict(self.projects[i]) for i in np.flatnonzero(mask)]
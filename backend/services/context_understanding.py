@@ -6,6 +6,7 @@ Builds rich context from session, conversation history, and query for ALL query
 import logging
 from typing import Dict, List, Any, Optional
 from services.session_manager import ConversationSession
+from utils.gazetteer import LOCATION_KINDS, location_gazetteer
 
 logger = logging.getLogger(__name__)
 
@@ -151,25 +152,9 @@ class ContextUnderstandingService:
     
     def _extract_locations_from_text(self, text: str) -> List[str]:
         """Extract location mentions from text."""
-        locations = []
-        text_lower = text.lower()
-        
-        bangalore_locations = [
-            "whitefield", "sarjapur", "electronic city", "hebbal", "yeshwantpur",
-            "koramangala", "indiranagar", "jayanagar", "hsr", "btm", "marathahalli",
-            "bellandur", "outer ring road", "orr", "bannerghatta", "hennur", "yelahanka",
-            "devanahalli", "kengeri", "jp nagar", "mg road", "brigade road",
-            "rajajinagar", "malleshwaram", "basavanagudi", "kr puram", "varthur",
-            "chandapura", "hosur road", "old madras road", "tumkur road", "mysore road",
-            "kanakpura road", "north bangalore", "south bangalore", "east bangalore",
-            "west bangalore", "central bangalore", "bagalur", "thanisandra"
-        ]
-        
-        for loc in bangalore_locations:
-            if loc in text_lower:
-                locations.append(loc.title())
-        
-        return locations
+        # Localities and zones in one gazetteer pass; overlapping shorter names
+        # ("sarjapur" inside "sarjapur road") are not reported separately
+        return [span.value.title() for span in location_gazetteer().longest(text, LOCATION_KINDS)]
     
     def _extract_budgets_from_text(self, text: str) -> List[str]:
         """Extract budget mentions from text."""
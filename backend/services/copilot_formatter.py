@@ -6,9 +6,9 @@ Generates strict JSON responses with bullets using GPT-4.
 import json
 import logging
 from typing import List, Dict, Any, Optional
-from openai import OpenAI
 
 from config import settings
+from services.llm_gateway import llm_gateway
 from models.copilot_response import CopilotResponse, BudgetRelaxationResponse, ProjectInfo, LiveCallStructure
 from prompts.sales_copilot_system import COPILOT_SYSTEM_PROMPT
 
@@ -22,15 +22,11 @@ class CopilotFormatter:
     """
 
     def __init__(self):
-        self.client = OpenAI(
-            api_key=settings.openai_api_key,
-            base_url=settings.openai_base_url,
-            timeout=10.0  # 10 second timeout for API calls
-        )
+        self.timeout = 10.0  # 10 second timeout for API calls
         self.model = settings.effective_gpt_model
         self.temperature = 0.3  # Low temp for consistent formatting
 
-    def format_response(
+    async def format_response(
         self,
         query: str,
         context: Dict[str, Any],
@@ -86,8 +82,9 @@ class CopilotFormatter:
             system_prompt += "\n\n⚠️ LIVE CALL MODE ENABLED: Generate live_call_structure with all 6 parts."
 
         try:
-            response = self.client.chat.completions.create(
+            response = await llm_gateway.chat(
                 model=self.model,
+                timeout=self.timeout,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": json.dumps(payload, indent=2)}
@@ -260,7 +257,7 @@ class CopilotFormatter:
 copilot_formatter = CopilotFormatter()
 
 
-def format_copilot_response(
+async def format_copilot_response(
     query: str,
     context: Dict[str, Any],
     db_projects: List[Dict[str, Any]],
@@ -273,7 +270,7 @@ def format_copilot_response(
     """
     Convenience function to call global copilot_formatter instance.
     """
-    return copilot_formatter.format_response(
+    return await copilot_formatter.format_response(
         query=query,
         context=context,
         db_projects=db_projects,
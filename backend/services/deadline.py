@@ -0,0 +1,125 @@
+"""
+Deadline - Request-scoped latency budget with graceful degradation.
+
+The chat and assist endpoints open a deadline scope; everything the request
+runs (GPT calls, retrieval, web search, enrichment, including work offloaded
+with asyncio.to_thread) sees it through a contextvar:
+
+    with deadline_scope() as deadline:
+        ...
+        if not has_budget(CLASSIFY_SECONDS):
+            degrade("intent_classification", "rule-based")
+            return keyword_intent(query)
+        timeout = clip_timeout(QUERY_TIMEOUT)
+
+Two limits apply:
+- the hard budget (settings.request_deadline_ms) caps every timeout, so no
+  stage can run past it; calls that cannot fit are not started at all
+- the target (settings.target_response_time) is what optional work
+  (enrichment, sentiment, web search) is measured against: once a request
+  is past it, optional stages are skipped
+
+Stages that take their fast path record it with `degrade`; the endpoints
+return the list as `degraded_stages`. Outside a scope every helper is a
+no-op (scripts, background jobs).
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Below this, a network call is not worth starting
+MIN_CALL_SECONDS = 0.5
+
+
+class DeadlineExceeded(TimeoutError):
+    """Not enough of the request budget left to start a call."""
+
+
+class Deadline:
+    def __init__(self, budget_ms: int, target_ms: Optional[int] = None):
+        self.started = time.monotonic()
+        self.budget = budget_ms / 1000.0
+        self.target = min(target_ms / 1000.0, self.budget) if target_ms else self.budget
+        self.degraded: List[str] = []
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> float:
+        """Seconds left before the hard deadline."""
+        return max(0.0, self.budget - self.elapsed())
+
+    def allows(self, seconds: float, optional: bool = False) -> bool:
+        """Whether a stage expected to take `seconds` fits (optional work: within the target)."""
+        limit = self.target if optional else self.budget
+        return self.elapsed() + seconds <= limit
+
+    def degrade(self, stage: str, reason: str = "") -> None:
+        if stage not in self.degraded:
+            self.degraded.append(stage)
+            logger.info(
+                f"⏱️ Deadline: '{stage}' degraded{f' ({reason})' if reason else ''} "
+                f"at {self.elapsed() * 1000:.0f}ms of {self.budget * 1000:.0f}ms"
+            )
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(budget_ms: Optional[int] = None, target_ms: Optional[int] = None) -> Iterator[Deadline]:
+    """
+    Bind a deadline for the enclosed request; nested scopes (e.g. /api/chat/sales
+    delegating to chat_query) share the outer one.
+    """
+    outer = _current_deadline.get()
+    if outer is not None:
+        yield outer
+        return
+    deadline = Deadline(
+        budget_ms or settings.request_deadline_ms,
+        target_ms if target_ms is not None else settings.target_response_time
+    )
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def has_budget(seconds: float, optional: bool = False) -> bool:
+    deadline = current_deadline()
+    return deadline is None or deadline.allows(seconds, optional)
+
+
+def degrade(stage: str, reason: str = "") -> None:
+    deadline = current_deadline()
+    if deadline is not None:
+        deadline.degrade(stage, reason)
+
+
+def clip_timeout(timeout: float) -> float:
+    """`timeout` capped to the time left; raises DeadlineExceeded when too little is left."""
+    deadline = current_deadline()
+    if deadline is None:
+        return timeout
+    remaining = deadline.remaining()
+    if remaining < MIN_CALL_SECONDS:
+        raise DeadlineExceeded(f"{remaining * 1000:.0f}ms left of the request budget")
+    return min(timeout, remaining)
+
+
+def degraded_stages() -> Optional[List[str]]:
+    deadline = current_deadline()
+    return list(deadline.degraded) if deadline is not None and deadline.degraded else None
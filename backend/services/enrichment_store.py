@@ -0,0 +1,307 @@
+"""
+Project Enrichment Store - GPT enrichment materialized per project.
+
+Amenities, nearby places, connectivity, neighborhood insights and the live
+call sales pitch only change when the catalog does, so they are generated
+by a background job (ProjectEnrichmentService, background priority) and
+stored in brigade.project_enrichment, one row per project, versioned by a
+hash of the project row. The chat path reads them with `lookup` / `enrich`
+instead of calling GPT on every detail view.
+
+Startup and /admin/refresh-projects call `schedule_refresh`: row hashes are
+recomputed immediately (entries for changed rows stop being served), then
+only changed or missing projects are re-enriched. The job holds a lock in
+the shared session store, so with several workers it runs once; the others
+wait, reload the stored entries and find nothing left to enrich.
+
+Every worker follows the project snapshot: when its version changes, row
+hashes are recomputed from the new rows and entries are reloaded from the
+table in the background.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from services.catalog_index import row_to_dict
+from services.session_store import SessionStore, session_store
+
+logger = logging.getLogger(__name__)
+
+ENRICHMENT_FIELDS = ("amenities", "nearby_places", "connectivity", "neighborhood_info", "sales_pitch")
+
+# Fields that always come from GPT; an entry missing one is retried on the next refresh
+GENERATED_FIELDS = ("nearby_places", "connectivity", "neighborhood_info", "sales_pitch")
+
+MAX_CONCURRENT_PROJECTS = 4
+
+JOB_LOCK_NAME = "project_enrichment_job"
+JOB_LOCK_TTL_SECONDS = 1800  # Released when the job ends; expires if its worker dies
+JOB_LOCK_POLL_SECONDS = 15.0
+
+
+def project_version(project: Dict[str, Any]) -> str:
+    """Hash of the project row; enrichment is regenerated when it changes."""
+    payload = json.dumps(project, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _load_from_pixeltable() -> List[Dict[str, Any]]:
+    from database.pixeltable_setup import get_project_enrichment_table
+    return [row_to_dict(row) for row in get_project_enrichment_table().collect()]
+
+
+def _save_to_pixeltable(entry: Dict[str, Any]) -> None:
+    from database.pixeltable_setup import get_project_enrichment_table
+    table = get_project_enrichment_table()
+    table.delete(where=table.project_id == entry["project_id"])
+    table.insert([entry])
+
+
+def _catalog_rows() -> List[Dict[str, Any]]:
+    from services.project_snapshot import project_snapshots
+    snapshot = project_snapshots.get()
+    return list(snapshot.rows) if snapshot is not None else []
+
+
+def _current_snapshot():
+    from services.project_snapshot import project_snapshots
+    return project_snapshots.current()
+
+
+async def _enrich_with_gpt(project: Dict[str, Any]) -> Dict[str, Any]:
+    from services.project_enrichment import project_enrichment
+    return await project_enrichment.enrich_project(project, list(ENRICHMENT_FIELDS))
+
+
+class ProjectEnrichmentStore:
+    """In-memory view of brigade.project_enrichment plus the job that fills it."""
+
+    def __init__(
+        self,
+        loader: Optional[Callable[[], List[Dict[str, Any]]]] = None,
+        saver: Optional[Callable[[Dict[str, Any]], None]] = None,
+        enricher: Optional[Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]] = None,
+        catalog: Optional[Callable[[], List[Dict[str, Any]]]] = None,
+        snapshot: Optional[Callable[[], Any]] = None,
+        store: Optional[SessionStore] = None
+    ):
+        self._loader = loader or _load_from_pixeltable
+        self._saver = saver or _save_to_pixeltable
+        self._enricher = enricher or _enrich_with_gpt
+        self._catalog = catalog or _catalog_rows
+        self._snapshot = snapshot or _current_snapshot
+        self._store = store or session_store
+
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, str] = {}  # project_id -> hash of the current catalog row
+        self._snapshot_version: Optional[int] = None  # Snapshot the versions were computed from
+        self._lock = threading.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._reload_scheduled = False
+        # Dedicated thread so table reloads never run on the request path
+        self._reloader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="project-enrichment")
+
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "enriched": 0, "failures": 0, "refreshes": 0,
+                       "reloads": 0, "lock_waits": 0}
+
+    # ------------------------------------------------------------------
+    # Read path
+    # ------------------------------------------------------------------
+
+    def lookup(self, project: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Stored enrichment for `project`; empty when missing, generated from an
+        older row, or before the store has been loaded.
+        """
+        self._sync_with_snapshot()
+        project_id = str(project.get("project_id") or "")
+        entry = self._entries.get(project_id)
+        if entry is None:
+            self._stats["misses"] += 1
+            return {}
+        current = self._versions.get(project_id)
+        if current is not None and entry.get("version") != current:
+            self._stats["stale"] += 1
+            return {}
+        self._stats["hits"] += 1
+        return {field: entry[field] for field in ENRICHMENT_FIELDS if entry.get(field)}
+
+    def enrich(self, project: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of `project` with its stored enrichment fields merged in."""
+        return {**project, **self.lookup(project)}
+
+    # ------------------------------------------------------------------
+    # Write path
+    # ------------------------------------------------------------------
+
+    async def refresh(self, projects: Optional[List[Dict[str, Any]]] = None, force: bool = False) -> Dict[str, int]:
+        """
+        Enrich every project whose row changed since it was last enriched
+        (all of them with `force`) and store the results.
+        """
+        await asyncio.to_thread(self._reload)  # Picks up entries written by other workers
+        if projects is None:
+            projects = await asyncio.to_thread(self._catalog)
+        rows = [row_to_dict(row) for row in projects]
+        self._set_versions(rows)
+        pending = [
+            row for row in rows
+            if row.get("project_id") and row.get("name") and row.get("location")
+            and (force or not self._is_current(row))
+        ]
+        self._stats["refreshes"] += 1
+        if not pending:
+            return {"enriched": 0, "failed": 0, "unchanged": len(rows)}
+
+        logger.info(f"Project enrichment: enriching {len(pending)} of {len(rows)} projects")
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PROJECTS)
+        results = await asyncio.gather(*[self._enrich_one(row, semaphore) for row in pending])
+        enriched = sum(results)
+        logger.info(f"Project enrichment: {enriched} enriched, {len(pending) - enriched} failed")
+        return {"enriched": enriched, "failed": len(pending) - enriched, "unchanged": len(rows) - len(pending)}
+
+    def schedule_refresh(self, projects: Optional[List[Dict[str, Any]]] = None) -> None:
+        """
+        Start a background refresh on the running event loop (startup, admin
+        refresh). Row hashes are updated right away when `projects` is given,
+        so entries for changed rows stop being served before the job gets to
+        them. A refresh already running is followed by one more.
+        """
+        if projects is not None:
+            self._set_versions([row_to_dict(row) for row in projects])
+        previous = self._refresh_task
+        self._refresh_task = asyncio.get_running_loop().create_task(self._background_refresh(previous, projects))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "projects": len(self._entries),
+            "snapshot_version": self._snapshot_version,
+            "current": sum(1 for project_id, version in self._versions.items()
+                           if self._entries.get(project_id, {}).get("version") == version),
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _reload(self) -> None:
+        """Replace entries with the table's (entries only this worker has are kept)."""
+        try:
+            entries = self._loader()
+        except Exception as e:
+            logger.warning(f"Project enrichment store unavailable, GPT enrichment runs on demand: {e}")
+            return
+        loaded = {str(entry["project_id"]): entry for entry in entries if entry.get("project_id")}
+        with self._lock:
+            self._entries = {**self._entries, **loaded}
+        self._stats["reloads"] += 1
+        logger.info(f"Project enrichment store loaded ({len(loaded)} projects)")
+
+    def _sync_with_snapshot(self) -> None:
+        """Recompute row hashes when the project snapshot changes and reload entries in the background."""
+        snapshot = self._snapshot()
+        if snapshot is None or snapshot.version == self._snapshot_version:
+            return
+        with self._lock:
+            if snapshot.version == self._snapshot_version:
+                return
+            self._snapshot_version = snapshot.version
+        self._set_versions([row_to_dict(row) for row in snapshot.rows])
+        self._schedule_reload()
+
+    def _schedule_reload(self) -> None:
+        with self._lock:
+            if self._reload_scheduled:
+                return
+            self._reload_scheduled = True
+        try:
+            self._reloader.submit(self._background_reload)
+        except RuntimeError as e:
+            # Executor shut down (interpreter exit)
+            logger.warning(f"Could not schedule project enrichment reload: {e}")
+            with self._lock:
+                self._reload_scheduled = False
+
+    def _background_reload(self) -> None:
+        try:
+            self._reload()
+        finally:
+            with self._lock:
+                self._reload_scheduled = False
+
+    def _set_versions(self, rows: List[Dict[str, Any]]) -> None:
+        self._versions = {
+            str(row["project_id"]): project_version(row) for row in rows if row.get("project_id")
+        }
+
+    def _is_current(self, row: Dict[str, Any]) -> bool:
+        entry = self._entries.get(str(row["project_id"]))
+        return (
+            entry is not None
+            and entry.get("version") == project_version(row)
+            and all(entry.get(field) for field in GENERATED_FIELDS)
+        )
+
+    async def _enrich_one(self, row: Dict[str, Any], semaphore: asyncio.Semaphore) -> bool:
+        async with semaphore:
+            try:
+                enriched = await self._enricher(dict(row))
+            except Exception as e:
+                logger.error(f"Project enrichment failed for {row.get('name')}: {e}")
+                enriched = {}
+        entry = {
+            "project_id": str(row["project_id"]),
+            "version": project_version(row),
+            **{field: enriched.get(field) for field in ENRICHMENT_FIELDS},
+            "enriched_at": datetime.now(),
+        }
+        if not all(entry[field] for field in GENERATED_FIELDS):
+            # Keep the previous entry; the next refresh retries this project
+            self._stats["failures"] += 1
+            return False
+        try:
+            await asyncio.to_thread(self._saver, entry)
+        except Exception as e:
+            logger.warning(f"Could not persist enrichment for {row.get('name')}: {e}")
+        self._entries[entry["project_id"]] = entry
+        self._stats["enriched"] += 1
+        return True
+
+    async def _background_refresh(
+        self,
+        previous: Optional[asyncio.Task],
+        projects: Optional[List[Dict[str, Any]]]
+    ) -> None:
+        if previous is not None and not previous.done():
+            await asyncio.wait([previous])
+        token = await self._acquire_job_lock()
+        try:
+            await self.refresh(projects)
+        except Exception as e:
+            logger.error(f"Project enrichment refresh failed: {e}")
+        finally:
+            await asyncio.to_thread(self._store.unlock, JOB_LOCK_NAME, token)
+
+    async def _acquire_job_lock(self) -> str:
+        """Wait until no other worker is running the job, then hold its lock."""
+        waited = False
+        while True:
+            token = await asyncio.to_thread(self._store.try_lock, JOB_LOCK_NAME, JOB_LOCK_TTL_SECONDS)
+            if token is not None:
+                return token
+            if not waited:
+                logger.info("Project enrichment: job running on another worker, waiting for it")
+                self._stats["lock_waits"] += 1
+                waited = True
+            await asyncio.sleep(JOB_LOCK_POLL_SECONDS)
+
+
+# Global instance
+enrichment_store = ProjectEnrichmentStore()
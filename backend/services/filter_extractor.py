@@ -5,8 +5,10 @@ Parses queries like "2bhk under 3cr in Bangalore" into structured SQL filters
 
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
-from openai import OpenAI
-from config import settings
+from services.llm_gateway import llm_gateway
+from utils.gazetteer import (
+    LOCALITY_ZONES, LOCALITY, ZONE, DIRECTION, location_gazetteer
+)
 import logging
 import re
 import json
@@ -163,10 +165,6 @@ class FilterExtractor:
     """Extract structured filters from natural language queries"""
 
     def __init__(self):
-        self.openai_client = OpenAI(
-            api_key=settings.openai_api_key,
-            base_url=settings.openai_base_url
-        )
         self.model = "gpt-4-turbo-preview"
 
         # Price conversion patterns (Indian numbering)
@@ -193,119 +191,16 @@ class FilterExtractor:
             'calcutta': 'Kolkata'
         }
 
-        # Intelligent Locality → Zone Mapping
+        # Intelligent Locality → Zone Mapping (shared with the location gazetteer)
         # Maps each locality to its zone for automatic zone inference
-        self.locality_to_zone = {
-            # ========== EAST BANGALORE ==========
-            'whitefield': 'East Bangalore',
-            'budigere': 'East Bangalore',
-            'budigere cross': 'East Bangalore',
-            'varthur': 'East Bangalore',
-            'gunjur': 'East Bangalore',
-            'sarjapur': 'East Bangalore',
-            'sarjapur road': 'East Bangalore',
-            'panathur': 'East Bangalore',
-            'panathur road': 'East Bangalore',
-            'kadugodi': 'East Bangalore',
-            'marathahalli': 'East Bangalore',
-            'bellandur': 'East Bangalore',
-            'brookefield': 'East Bangalore',
-            'kundanhalli': 'East Bangalore',
-            'mahadevpura': 'East Bangalore',
-            'kr puram': 'East Bangalore',
-            'krishnarajapuram': 'East Bangalore',
-            'harlur': 'East Bangalore',
-            'harlur road': 'East Bangalore',
-            'kodathi': 'East Bangalore',
-            'carmelaram': 'East Bangalore',
-            'dommasandra': 'East Bangalore',
-            'old madras road': 'East Bangalore',
-            'hoodi': 'East Bangalore',
-            'itpl': 'East Bangalore',
-            
-            # ========== NORTH BANGALORE ==========
-            'thanisandra': 'North Bangalore',
-            'jakkur': 'North Bangalore',
-            'baglur': 'North Bangalore',
-            'bagalur': 'North Bangalore',
-            'yelahanka': 'North Bangalore',
-            'devanahalli': 'North Bangalore',
-            'devanhalli': 'North Bangalore',  # Common misspelling
-            'airport': 'North Bangalore',
-            'kempegowda international airport': 'North Bangalore',
-            'kia': 'North Bangalore',
-            'bial': 'North Bangalore',
-            'hebbal': 'North Bangalore',
-            'hennur': 'North Bangalore',
-            'hennur road': 'North Bangalore',
-            'kothanur': 'North Bangalore',
-            'sahakara nagar': 'North Bangalore',
-            'nagawara': 'North Bangalore',
-            'kasturi nagar': 'North Bangalore',
-            'rachenahalli': 'North Bangalore',
-            'kogilu': 'North Bangalore',
-            
-            # ========== SOUTH BANGALORE ==========
-            'koramangala': 'South Bangalore',
-            'hsr layout': 'South Bangalore',
-            'hsr': 'South Bangalore',
-            'btm layout': 'South Bangalore',
-            'btm': 'South Bangalore',
-            'jp nagar': 'South Bangalore',
-            'jayanagar': 'South Bangalore',
-            'bannerghatta': 'South Bangalore',
-            'bannerghatta road': 'South Bangalore',
-            'electronic city': 'South Bangalore',
-            'e-city': 'South Bangalore',
-            'ecity': 'South Bangalore',
-            'bommanahalli': 'South Bangalore',
-            'begur': 'South Bangalore',
-            'begur road': 'South Bangalore',
-            'kanakapura': 'South Bangalore',
-            'kanakapura road': 'South Bangalore',
-            'basavanagudi': 'South Bangalore',
-            'bilekahalli': 'South Bangalore',
-            'arekere': 'South Bangalore',
-            'hebbegodi': 'South Bangalore',
-            'chandapura': 'South Bangalore',
-            'hosur road': 'South Bangalore',
-            'kudlu gate': 'South Bangalore',
-            'hulimavu': 'South Bangalore',
-            
-            # ========== WEST BANGALORE ==========
-            'rajajinagar': 'West Bangalore',
-            'yeshwanthpur': 'West Bangalore',
-            'malleshwaram': 'West Bangalore',
-            'vijayanagar': 'West Bangalore',
-            'nagarbhavi': 'West Bangalore',
-            'magadi': 'West Bangalore',
-            'magadi road': 'West Bangalore',
-            'tumkur road': 'West Bangalore',
-            'peenya': 'West Bangalore',
-            'jalahalli': 'West Bangalore',
-            'dasarahalli': 'West Bangalore',
-            'bangalore university': 'West Bangalore',
-            'kengeri': 'West Bangalore',
-            'mysore road': 'West Bangalore',
-            'rajarajeshwari nagar': 'West Bangalore',
-            'rr nagar': 'West Bangalore',
-            
-            # ========== CENTRAL BANGALORE ==========
-            'indiranagar': 'Central Bangalore',
-            'mg road': 'Central Bangalore',
-            'brigade road': 'Central Bangalore',
-            'ulsoor': 'Central Bangalore',
-            'richmond road': 'Central Bangalore',
-            'lavelle road': 'Central Bangalore',
-            'vasanth nagar': 'Central Bangalore',
-            'shivajinagar': 'Central Bangalore',
-            'cubbon park': 'Central Bangalore',
-            'richmond town': 'Central Bangalore',
-        }
+        self.locality_to_zone = dict(LOCALITY_ZONES)
         
         # Set of all known localities (for quick lookup)
         self.localities = set(self.locality_to_zone.keys())
 
+        # Compiled multi-pattern matcher for localities / zones / directions
+        self.gazetteer = location_gazetteer()
+
         # Dynamic Project Names (will be populated from DB or config)
         self.project_names = {
             "birla evara", "brigade citrine", "brigade avalon", "brigade el dorado",
@@ -474,22 +369,14 @@ class FilterExtractor:
         Prioritizes longer matches (e.g., 'sarjapur road' over 'sarjapur').
         Returns: 'Whitefield', 'Sarjapur', etc.
         """
-        # Sort localities by length (longest first) to prioritize specific matches
-        # e.g., 'sarjapur road' should match before 'sarjapur'
-        sorted_localities = sorted(self.localities, key=len, reverse=True)
-        
-        for locality in sorted_localities:
-            # Use word boundary for single words, substring for multi-word
-            if ' ' in locality:
-                # Multi-word: exact substring match
-                if locality in query:
-                    return locality.title()
-            else:
-                # Single word: word boundary match to avoid false positives
-                # e.g., 'hsr' shouldn't match inside 'thsr'
-                if re.search(r'\b' + re.escape(locality) + r'\b', query):
-                    return locality.title()
-        return None
+        # One gazetteer pass; matches are word-bounded so 'hsr' doesn't match inside 'thsr'
+        spans = [span for span in self.gazetteer.tag(query, (LOCALITY,))
+                 if span.value in self.locality_to_zone]
+        if not spans:
+            return None
+        # Longest match wins: 'sarjapur road' over 'sarjapur'
+        best = max(spans, key=lambda span: (span.end - span.start, -span.start))
+        return best.value.title()
     
     def get_zone_for_locality(self, locality: str) -> Optional[str]:
         """
@@ -527,33 +414,18 @@ class FilterExtractor:
         
         Example: 'sarjapur' → no explicit zone → infer 'East Bangalore' from locality
         """
-        zones = {
-            'north bangalore': 'North Bangalore',
-            'north bmr': 'North Bangalore',
-            'south bangalore': 'South Bangalore',
-            'east bangalore': 'East Bangalore',
-            'west bangalore': 'West Bangalore',
-            'central bangalore': 'Central Bangalore',
-        }
+        spans = self.gazetteer.tag(query, (ZONE, DIRECTION))
         
         # Check for explicit zone mentions (prioritize full zone name)
-        for key, value in zones.items():
-            if re.search(r'\b' + re.escape(key) + r'\b', query):
-                return value
-        
-        # Check for standalone direction words (less reliable but useful)
-        direction_zones = {
-            'north': 'North Bangalore',
-            'south': 'South Bangalore',
-            'east': 'East Bangalore',
-            'west': 'West Bangalore',
-            'central': 'Central Bangalore'
-        }
+        for span in spans:
+            if span.kind == ZONE:
+                return span.value
         
-        for direction, zone in direction_zones.items():
-            # Match 'north' but not in words like 'northstar' or 'northern'
-            if re.search(r'\b' + re.escape(direction) + r'\b(?!ern|star)', query):
-                return zone
+        # Standalone direction words (less reliable but useful); word boundaries
+        # keep 'northstar' or 'northern' from matching
+        for span in spans:
+            if span.kind == DIRECTION:
+                return span.value
         
         # INTELLIGENT INFERENCE: If no explicit zone, infer from locality
         if locality:
@@ -615,7 +487,7 @@ class FilterExtractor:
                 return developer
         return None
 
-    def extract_with_llm_fallback(self, query: str) -> PropertyFilters:
+    async def extract_with_llm_fallback(self, query: str) -> PropertyFilters:
         """
         Use GPT-4 to extract complex filters when regex patterns are insufficient.
 
@@ -657,9 +529,10 @@ Output: {"bedrooms": [2], "developer_name": "Brigade Group", "possession_year":
 
 Return ONLY valid JSON with extracted filters. If a field cannot be determined, omit it."""
 
-            response = self.openai_client.chat.completions.create(
+            response = await llm_gateway.chat(
                 model=self.model,
                 temperature=0.0,
+                cache="filter_extraction",
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": f"Extract filters from: {query}"}
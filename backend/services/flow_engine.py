@@ -1,12 +1,15 @@
 import json
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pydantic import BaseModel, Field
 import openai
 from config import settings
-from database.pixeltable_setup import get_projects_table
-import pixeltable as pxt
-import difflib
+from services.deadline import degrade, has_budget
+from services.enrichment_store import enrichment_store
+from services.llm_gateway import llm_gateway
+from services.llm_scheduler import Priority
+from services.response_stream import emit_projects, generate_text_sync
+from services.session_store import SessionCache, SessionStore, session_store
 import re
 from services.web_search import web_search_service
 from services.web_search import web_search_service
@@ -15,10 +18,18 @@ from services.web_search import web_search_service
 from services.sales_agent_prompt import SALES_AGENT_SYSTEM_PROMPT, LIGHT_INTENT_SYSTEM_PROMPT
 from services.sales_formatter import sales_formatter
 from services.sales_conversation import sales_conversation
-from utils.geolocation_utils import get_coordinates, calculate_distance
+from utils.geolocation_utils import get_coordinates
+from utils.gazetteer import LOCALITY, ZONE, CITY, PROJECT
+from services.unit_table import configuration_bhks
+from services.project_repository import project_repository, SEARCH_COLUMNS, DETAIL_COLUMNS
+from services.filter_extractor import filter_extractor
 
 logger = logging.getLogger(__name__)
 
+# Request budget (seconds) a stage needs before calling GPT; with less left it takes its fast path
+INTENT_BUDGET = 2.0
+GENERATION_BUDGET = 4.0
+
 def clean_configuration_string(config_raw: str) -> str:
     """Parses messy configuration strings to extract clean BHK types."""
     if not config_raw: return "Details on Request"
@@ -130,20 +141,53 @@ class FlowResponse(BaseModel):
     coaching_point: Optional[str] = None
 
 # --- LLM HELPERS ---
+# Requirement fields, shared by the extraction-only and the fused extraction+intent calls
+REQUIREMENTS_FIELDS_PROMPT = "configuration (e.g. 2BHK), location (locality like 'Sarjapur', 'Whitefield'), area (zone like 'East Bangalore', 'North Bangalore', 'South Bangalore', 'West Bangalore' - infer from location if not explicit), budget_max (float in Cr), possession_year (int), possession_type (RTMI/Under Construction), project_name (CRITICAL: extract project names like 'Birla Evara', 'Brigade Avalon', 'Nambiar D-25', 'Godrej Woods' - recognize these even in questions), feature_requested (e.g. 'carpet area', 'RM contact', 'price', 'amenities', 'possession', 'schools', 'distance', null if none). Return null if missing. IMPORTANT: For well-known Bangalore localities, infer the area/zone: Sarjapur/Whitefield/Marathahalli -> 'East Bangalore', Devanahalli/Yelahanka/Hebbal -> 'North Bangalore'."
+
+INTENT_CLASSIFICATION_TASK = """
+
+⸻
+
+TASK: INTENT & SENTIMENT CLASSIFICATION (INTERNAL)
+
+⚠️ OVERRIDE: IGNORE "LIVE CALL OUTPUT RULES".
+⚠️ OVERRIDE: OUTPUT JSON ONLY.
+
+Analyze user input and return JSON:
+Analyze user input and return JSON:
+- intent: [
+    project_discovery,      # "Show me 2BHKs in Whitefield", "Find projects"
+    project_specific,       # "Details of Birla Evara", "Tell me about X"
+    comparison,             # "Compare with Sarjapur", "Is this better than X?"
+    contextual_query,       # "Anything nearby?", "Schools near there?", "Same price elsewhere?"
+    sales_support,          # "Give me a pitch", "Convince values", "Why buy?"
+    objection_budget,       # "Too expensive"
+    objection_location,     # "Location is bad"
+    objection_possession,   # "Need ready to move"
+    schedule_visit,         # "Book a visit", "When can I see?"
+    ambiguous               # "Hello", "Thanks"
+]
+- confidence: float 0-1
+- sentiment: [positive, neutral, negative]
+- explanation: brief reason
+
+Use 'project_specific' if specific project mentioned.
+Use 'contextual_query' if referring to previous context ("nearby", "there", "similar").
+
+"""
+
 def extract_requirements_llm(user_input: str) -> FlowRequirements:
     """Extracts structured data from free text using LLM."""
     try:
-        client = openai.OpenAI(
-            api_key=settings.openai_api_key,
-            base_url=settings.openai_base_url
-        )
-        response = client.chat.completions.create(
+        response = llm_gateway.chat_sync(
             model=settings.effective_gpt_model,
             messages=[
-                {"role": "system", "content": "Extract JSON: configuration (e.g. 2BHK), location (locality like 'Sarjapur', 'Whitefield'), area (zone like 'East Bangalore', 'North Bangalore', 'South Bangalore', 'West Bangalore' - infer from location if not explicit), budget_max (float in Cr), possession_year (int), possession_type (RTMI/Under Construction), project_name (CRITICAL: extract project names like 'Birla Evara', 'Brigade Avalon', 'Nambiar D-25', 'Godrej Woods' - recognize these even in questions), feature_requested (e.g. 'carpet area', 'RM contact', 'price', 'amenities', 'possession', 'schools', 'distance', null if none). Return null if missing. IMPORTANT: For well-known Bangalore localities, infer the area/zone: Sarjapur/Whitefield/Marathahalli -> 'East Bangalore', Devanahalli/Yelahanka/Hebbal -> 'North Bangalore'."},
+                {"role": "system", "content": "Extract JSON: " + REQUIREMENTS_FIELDS_PROMPT},
                 {"role": "user", "content": user_input}
             ],
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            temperature=0,
+            cache="requirements_extraction"
         )
         data = json.loads(response.choices[0].message.content)
         return FlowRequirements(**data)
@@ -157,11 +201,7 @@ def extract_requirements_llm(user_input: str) -> FlowRequirements:
 def generate_persuasion_text(topic: str, context: str) -> str:
     """Generates persuasive sales text (no facts, only logic)."""
     try:
-        client = openai.OpenAI(
-            api_key=settings.openai_api_key,
-            base_url=settings.openai_base_url
-        )
-        response = client.chat.completions.create(
+        response = llm_gateway.chat_sync(
             model=settings.effective_gpt_model,
             messages=[
                 {"role": "system", "content": "You are a sales coach. Generate persuasive talking points (no fake data) for the agent."},
@@ -177,91 +217,102 @@ def generate_persuasion_text(topic: str, context: str) -> str:
 
 def classify_user_intent(user_input: str, context: str, chat_history: List[Dict[str, str]] = []) -> dict:
     """Uses LLM to classify user intent and sentiment in conversation."""
+    if not has_budget(INTENT_BUDGET):
+        degrade("intent_classification", "keyword rules")
+        return _keyword_intent(user_input)
     try:
-        client = openai.OpenAI(
-            api_key=settings.openai_api_key,
-            base_url=settings.openai_base_url
-        )
-        
         # Format history for context
         history_text = ""
         if chat_history:
             history_text = "\nRecent Conversation History:\n" + "\n".join([f"{msg['role']}: {msg['content']}" for msg in chat_history[-5:]])
 
-        response = client.chat.completions.create(
+        response = llm_gateway.chat_sync(
             model=settings.effective_gpt_model,
             messages=[
                 {
                     "role": "system",
-                    "content": LIGHT_INTENT_SYSTEM_PROMPT + """
-
-⸻
-
-TASK: INTENT & SENTIMENT CLASSIFICATION (INTERNAL)
+                    "content": LIGHT_INTENT_SYSTEM_PROMPT + INTENT_CLASSIFICATION_TASK
+                },
+                {"role": "user", "content": f"Context: {context}\n{history_text}\nUser said: {user_input}"}
+            ],
+            response_format={"type": "json_object"},
+            priority=Priority.INTERACTIVE
+        )
+        return json.loads(response.choices[0].message.content)
+    except openai.RateLimitError:
+        logger.error("OpenAI RateLimitError in classify_user_intent")
+        raise
+    except Exception as e:
+        logger.error(f"Intent classification failed: {e}")
+        return _keyword_intent(user_input)
 
-⚠️ OVERRIDE: IGNORE "LIVE CALL OUTPUT RULES".
-⚠️ OVERRIDE: OUTPUT JSON ONLY.
+def _keyword_intent(user_input: str) -> dict:
+    """Keyword-based intent detection, used when LLM classification fails."""
+    user_lower = user_input.lower()
+    if any(word in user_lower for word in ["expensive", "budget", "cost", "price", "afford"]):
+        return {"intent": "budget_objection", "confidence": 0.6, "sentiment": "negative", "explanation": "Keyword match"}
+    elif any(word in user_lower for word in ["ready", "move", "possession", "timeline", "date"]):
+        return {"intent": "possession_objection", "confidence": 0.6, "sentiment": "negative", "explanation": "Keyword match"}
+    elif any(word in user_lower for word in ["yes", "good", "interested", "book", "visit", "schedule"]):
+        return {"intent": "positive_interest", "confidence": 0.6, "sentiment": "positive", "explanation": "Keyword match"}
+    elif any(word in user_lower for word in ["tell me", "more about", "select", "pitch", "why"]):
+        return {"intent": "project_selection", "confidence": 0.6, "sentiment": "neutral", "explanation": "Keyword match for project details"}
+    else:
+        return {"intent": "ambiguous", "confidence": 0.5, "sentiment": "neutral", "explanation": "No clear match"}
 
-Analyze user input and return JSON:
-Analyze user input and return JSON:
-- intent: [
-    project_discovery,      # "Show me 2BHKs in Whitefield", "Find projects"
-    project_specific,       # "Details of Birla Evara", "Tell me about X"
-    comparison,             # "Compare with Sarjapur", "Is this better than X?"
-    contextual_query,       # "Anything nearby?", "Schools near there?", "Same price elsewhere?"
-    sales_support,          # "Give me a pitch", "Convince values", "Why buy?"
-    objection_budget,       # "Too expensive"
-    objection_location,     # "Location is bad"
-    objection_possession,   # "Need ready to move"
-    schedule_visit,         # "Book a visit", "When can I see?"
-    ambiguous               # "Hello", "Thanks"
-]
-- confidence: float 0-1
-- sentiment: [positive, neutral, negative]
-- explanation: brief reason
+def extract_requirements_and_intent(user_input: str, context: str, chat_history: List[Dict[str, str]] = []) -> Tuple[FlowRequirements, dict]:
+    """One LLM call returning both the extracted requirements and the classified intent."""
+    if not has_budget(INTENT_BUDGET):
+        degrade("intent_classification", "keyword rules")
+        return FlowRequirements(), _keyword_intent(user_input)
+    try:
+        history_text = ""
+        if chat_history:
+            history_text = "\nRecent Conversation History:\n" + "\n".join([f"{msg['role']}: {msg['content']}" for msg in chat_history[-5:]])
 
-Use 'project_specific' if specific project mentioned.
-Use 'contextual_query' if referring to previous context ("nearby", "there", "similar").
+        response = llm_gateway.chat_sync(
+            model=settings.effective_gpt_model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": LIGHT_INTENT_SYSTEM_PROMPT + INTENT_CLASSIFICATION_TASK + """
+ALSO extract the requirements stated in "User said" and return ONE JSON object:
+{"requirements": {...}, "intent": ..., "confidence": ..., "sentiment": ..., "explanation": ...}
 
-"""
+requirements fields: """ + REQUIREMENTS_FIELDS_PROMPT
                 },
                 {"role": "user", "content": f"Context: {context}\n{history_text}\nUser said: {user_input}"}
             ],
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            temperature=0,
+            cache="requirements_intent"
         )
-        return json.loads(response.choices[0].message.content)
+        data = json.loads(response.choices[0].message.content)
     except openai.RateLimitError:
-        logger.error("OpenAI RateLimitError in classify_user_intent")
+        logger.error("OpenAI RateLimitError in extract_requirements_and_intent")
         raise
     except Exception as e:
-        logger.error(f"Intent classification failed: {e}")
-        # Fallback to keyword-based detection
-        user_lower = user_input.lower()
-        if any(word in user_lower for word in ["expensive", "budget", "cost", "price", "afford"]):
-            return {"intent": "budget_objection", "confidence": 0.6, "sentiment": "negative", "explanation": "Keyword match"}
-        elif any(word in user_lower for word in ["ready", "move", "possession", "timeline", "date"]):
-            return {"intent": "possession_objection", "confidence": 0.6, "sentiment": "negative", "explanation": "Keyword match"}
-        elif any(word in user_lower for word in ["yes", "good", "interested", "book", "visit", "schedule"]):
-            return {"intent": "positive_interest", "confidence": 0.6, "sentiment": "positive", "explanation": "Keyword match"}
-        elif any(word in user_lower for word in ["tell me", "more about", "select", "pitch", "why"]):
-            return {"intent": "project_selection", "confidence": 0.6, "sentiment": "neutral", "explanation": "Keyword match for project details"}
-        else:
-            return {"intent": "ambiguous", "confidence": 0.5, "sentiment": "neutral", "explanation": "No clear match"}
+        logger.error(f"Fused extraction+intent failed: {e}")
+        return FlowRequirements(), _keyword_intent(user_input)
+
+    try:
+        reqs = FlowRequirements(**(data.get("requirements") or {}))
+    except Exception as e:
+        logger.error(f"Extraction failed: {e}")
+        reqs = FlowRequirements()
+    intent_data = {key: data[key] for key in ("intent", "confidence", "sentiment", "explanation") if key in data}
+    intent_data.setdefault("intent", "ambiguous")
+    return reqs, intent_data
 
 def generate_contextual_response(user_input: str, context: str, conversation_goal: str, chat_history: List[Dict[str, str]] = []) -> str:
     """Generates a contextual, natural response using LLM for continuous conversation."""
     try:
-        client = openai.OpenAI(
-            api_key=settings.openai_api_key,
-            base_url=settings.openai_base_url
-        )
-        
         # Format history
         history_text = ""
         if chat_history:
             history_text = "\nRecent Conversation History:\n" + "\n".join([f"{msg['role']}: {msg['content']}" for msg in chat_history[-6:]])
             
-        response = client.chat.completions.create(
+        response = llm_gateway.chat_sync(
             model=settings.effective_gpt_model,
             messages=[
                 {
@@ -318,12 +369,7 @@ def classify_followup_intent(user_input: str, project_name: str, project_locatio
     - confidence: float (0-1)
     """
     try:
-        client = openai.OpenAI(
-            api_key=settings.openai_api_key,
-            base_url=settings.openai_base_url
-        )
-
-        response = client.chat.completions.create(
+        response = llm_gateway.chat_sync(
             model=settings.effective_gpt_model,
             messages=[
                 {
@@ -367,7 +413,8 @@ Use needs_web_search=false for project_details (database has this) and investmen
                 {"role": "user", "content": user_input}
             ],
             response_format={"type": "json_object"},
-            temperature=0.1
+            temperature=0,
+            cache="followup_intent"
         )
 
         result = json.loads(response.choices[0].message.content)
@@ -386,6 +433,68 @@ Use needs_web_search=false for project_details (database has this) and investmen
             "reasoning": "Classification failed"
         }
 
+# --- LOCAL REQUIREMENT PARSING ---
+# Keyword -> feature_requested, in the vocabulary the project-specific handlers match on
+FEATURE_KEYWORDS = [
+    (r"\b(relationship manager|rm|contact|number)\b", "RM contact"),
+    (r"\bcarpet\b", "carpet area"),
+    (r"\b(price|cost)\b", "price"),
+    (r"\b(amenities|facilities)\b", "amenities"),
+    (r"\bpossession\b", "possession"),
+    (r"\bschools?\b", "schools"),
+    (r"\b(hospitals?|connectivity)\b", "connectivity"),
+    (r"\bdistance\b", "distance"),
+    (r"\b(location|map|address)\b", "location"),
+]
+
+STATUS_POSSESSION_TYPES = {"completed": "RTMI", "ongoing": "Under Construction", "upcoming": "Under Construction"}
+
+
+def parse_requirements_local(user_input: str) -> FlowRequirements:
+    """Regex + gazetteer parse of an utterance into FlowRequirements (no LLM call)."""
+    text = user_input.lower()
+    filters = filter_extractor.extract_filters(user_input)
+    budget_inr = filters.max_price_inr or filters.budget_inr
+
+    project = project_repository.catalog().gazetteer.best(text, (PROJECT,))
+    feature = next((name for pattern, name in FEATURE_KEYWORDS if re.search(pattern, text)), None)
+
+    return FlowRequirements(
+        configuration=" or ".join(f"{n}BHK" for n in filters.bedrooms) if filters.bedrooms else None,
+        location=filters.locality.title() if filters.locality else None,
+        area=filters.area,
+        budget_max=round(budget_inr / 1e7, 2) if budget_inr else None,
+        possession_year=filters.possession_year,
+        possession_type=STATUS_POSSESSION_TYPES.get(filters.status[0]) if filters.status else None,
+        project_name=project.value if project else None,
+        feature_requested=feature
+    )
+
+
+def requirements_complete(reqs: FlowRequirements) -> bool:
+    """
+    True when the local parse is enough to route without LLM extraction:
+    a full search (configuration + place + budget) or a project question
+    (catalog project + feature).
+    """
+    full_search = reqs.configuration and (reqs.location or reqs.area) and reqs.budget_max
+    project_question = reqs.project_name and reqs.feature_requested
+    return bool(full_search or project_question)
+
+
+def _router_context(state: FlowState) -> str:
+    """Conversation context passed to intent classification."""
+    context_parts = [f"Last Intent: {state.last_intent}"]
+    if state.selected_project_name:
+        context_parts.append(f"Last Project: {state.selected_project_name}")
+    if state.requirements.location:
+        context_parts.append(f"Location: {state.requirements.location}")
+    if state.last_shown_projects:
+        project_names = [p.get('name', p.get('project_name', str(p))) for p in state.last_shown_projects[:3]]
+        context_parts.append(f"Last Shown Projects: {', '.join(project_names)}")
+        context_parts.append("CRITICAL: Vague queries (e.g., 'price', 'more', 'details') refer to last shown project.")
+    return ". ".join(context_parts)
+
 # --- INTELLIGENT SALES COPILOT ROUTER ---
 def execute_sales_copilot_flow(state: FlowState, user_input: str, chat_history: List[Dict[str, str]] = []) -> FlowResponse:
     """
@@ -396,34 +505,14 @@ def execute_sales_copilot_flow(state: FlowState, user_input: str, chat_history:
     project = None
     results = []
 
-    # 1. Extract & Merge Context
-    # --------------------------
-    new_reqs = extract_requirements_llm(user_input)
-    
-    # Merge Logic:
-    # - If new specific project named -> Set it
-    # - If new location -> Update location
-    # - If new budget -> Update budget
-    # - If 'nearby' intent -> Keep location, expand radius (logic in search)
-    
+    # 1. Local parse + keyword pre-checks (no LLM)
+    # --------------------------------------------
+    # Run before any LLM call so forced intents never pay for classification,
+    # and a complete local parse never pays for extraction.
+    local_reqs = parse_requirements_local(user_input)
     current_reqs = state.requirements
-    
-    if new_reqs.project_name:
-        state.selected_project_name = new_reqs.project_name
-        # If specific project asked, we might clear filters to ensure we find it?
-        # Or just let search handle it.
-    
-    if new_reqs.location:
-        current_reqs.location = new_reqs.location
-    if new_reqs.area:
-        current_reqs.area = new_reqs.area
-    if new_reqs.budget_max:
-        current_reqs.budget_max = new_reqs.budget_max
-    if new_reqs.configuration:
-        current_reqs.configuration = new_reqs.configuration
-    
-    # 2. Classify Intent
-    # ------------------
+    intent = None
+
     # CRITICAL: Pre-check for property search patterns before LLM classification
     # This ensures queries like "3BHK in Whitefield" are always classified as property_search
     user_lower = user_input.lower()
@@ -442,25 +531,26 @@ def execute_sales_copilot_flow(state: FlowState, user_input: str, chat_history:
     if has_contextual_pattern and has_context:
         logger.info(f"🔗 Detected contextual pattern with context: '{user_input}' -> forcing contextual_query intent")
         intent = "contextual_query"
-        state.last_intent = intent
     # Distance query detection
     elif any(pattern in user_lower for pattern in ["distance", "how far", "km from", "kms from"]):
         logger.info(f"📏 Detected distance query: '{user_input}' -> forcing location_info intent")
         intent = "location_info"
-        state.last_intent = intent
     else:
         # Project-specific query detection (BEFORE LLM classification)
         project_feature_patterns = ["rm", "contact", "details", "carpet", "price", "amenities", "possession", "location", "map", "number"]
         has_project_feature = any(pattern in user_lower for pattern in project_feature_patterns)
 
-        # Check if common project name appears in query
+        # One gazetteer pass tags catalog project names, localities, zones and city names
+        query_spans = project_repository.catalog().gazetteer.tag(user_lower)
+
+        # Check if a catalog project name (or a common short name) appears in query
         common_projects = ["birla evara", "brigade avalon", "godrej woods", "nambiar", "folium", "avalon", "evara", "prestige", "sobha"]
-        potential_project_names = [proj for proj in common_projects if proj in user_lower]
+        potential_project_names = [span.value for span in query_spans if span.kind == PROJECT] \
+            or [proj for proj in common_projects if proj in user_lower]
 
         if has_project_feature and potential_project_names:
             logger.info(f"🎯 Forcing project_specific intent: '{user_input}' (found: {potential_project_names})")
             intent = "project_specific"
-            state.last_intent = intent
         else:
             # FIX #4: Removed generic keywords "in " and "at " to avoid false positives
             # (e.g., "tell me about investment in Sarjapur" should NOT be property search)
@@ -469,45 +559,54 @@ def execute_sales_copilot_flow(state: FlowState, user_input: str, chat_history:
                 "show me", "find me", "search for", "looking for", "need", "want", "options"
             ]
 
-            # Enhanced location detection: localities + zones
-            location_keywords = [
-                # Zones
-                "north bangalore", "south bangalore", "east bangalore", "west bangalore",
-                "north bengaluru", "south bengaluru", "east bengaluru", "west bengaluru",
-                # Localities
-                "whitefield", "sarjapur", "sarjapura", "marathahalli", "bellandur", "panathur",
-                "devanahalli", "devanahali", "yelahanka", "hebbal", "koramangala", "indiranagar",
-                "electronic city", "hsr layout", "jp nagar", "jayanagar",
-                # Generic
-                "bangalore", "bengaluru", "location", "area", "near"
-            ]
-
             has_property_keywords = any(kw in user_lower for kw in property_search_keywords)
-            has_location = any(loc in user_lower for loc in location_keywords)
+
+            # Enhanced location detection: localities + zones + city (gazetteer spans)
+            has_location = any(span.kind in (LOCALITY, ZONE, CITY) for span in query_spans) \
+                or any(w in user_lower for w in ("location", "area", "near"))
             has_budget = any(b in user_lower for b in ["under", "below", "budget", "price", "cr", "lakh", "lac"])
-            has_config = bool(new_reqs.configuration) or any(c in user_lower for c in ["1bhk", "2bhk", "2.5bhk", "3bhk", "4bhk", "5bhk"])
+            has_config = bool(local_reqs.configuration) or any(c in user_lower for c in ["1bhk", "2bhk", "2.5bhk", "3bhk", "4bhk", "5bhk"])
 
             # Only force property_discovery if EXPLICIT property intent (BHK or property keywords + location/budget)
             if has_config or (has_property_keywords and (has_location or has_budget)):
                 logger.info(f"🔍 Detected property search pattern: '{user_input}' -> forcing project_discovery intent")
                 intent = "project_discovery"
-                state.last_intent = intent
-            else:
-                # Build comprehensive context string including last_shown_projects
-                context_parts = [f"Last Intent: {state.last_intent}"]
-                if state.selected_project_name:
-                    context_parts.append(f"Last Project: {state.selected_project_name}")
-                if current_reqs.location:
-                    context_parts.append(f"Location: {current_reqs.location}")
-                if state.last_shown_projects:
-                    project_names = [p.get('name', p.get('project_name', str(p))) for p in state.last_shown_projects[:3]]
-                    context_parts.append(f"Last Shown Projects: {', '.join(project_names)}")
-                    context_parts.append("CRITICAL: Vague queries (e.g., 'price', 'more', 'details') refer to last shown project.")
-
-                context_str = ". ".join(context_parts)
-                intent_data = classify_user_intent(user_input, context_str, chat_history)
-                intent = intent_data.get("intent", "ambiguous")
-                state.last_intent = intent
+
+    # 2. Requirements + Intent (at most one LLM round trip)
+    # ----------------------------------------------------
+    if requirements_complete(local_reqs):
+        logger.info(f"Local parse complete, skipping LLM extraction: {local_reqs.model_dump(exclude_none=True)}")
+        new_reqs = local_reqs
+        if intent is None:
+            intent = classify_user_intent(user_input, _router_context(state), chat_history).get("intent", "ambiguous")
+    elif intent is not None:
+        new_reqs = extract_requirements_llm(user_input)
+    else:
+        new_reqs, intent_data = extract_requirements_and_intent(user_input, _router_context(state), chat_history)
+        intent = intent_data.get("intent", "ambiguous")
+
+    if not new_reqs.model_dump(exclude_none=True):
+        new_reqs = local_reqs  # LLM found nothing (or failed); keep what the local parser saw
+    state.last_intent = intent
+
+    # Merge Logic:
+    # - If new specific project named -> Set it
+    # - If new location -> Update location
+    # - If new budget -> Update budget
+    # - If 'nearby' intent -> Keep location, expand radius (logic in search)
+    if new_reqs.project_name:
+        state.selected_project_name = new_reqs.project_name
+        # If specific project asked, we might clear filters to ensure we find it?
+        # Or just let search handle it.
+    
+    if new_reqs.location:
+        current_reqs.location = new_reqs.location
+    if new_reqs.area:
+        current_reqs.area = new_reqs.area
+    if new_reqs.budget_max:
+        current_reqs.budget_max = new_reqs.budget_max
+    if new_reqs.configuration:
+        current_reqs.configuration = new_reqs.configuration
     
     logger.info(f"Router Intent: {intent} | Project: {state.selected_project_name}")
 
@@ -548,8 +647,6 @@ def execute_sales_copilot_flow(state: FlowState, user_input: str, chat_history:
     action_response = ""
     next_node = "ROUTER" # Placeholder
 
-    projects_table = get_projects_table()
-    
     # --- A. PROJECT SPECIFIC (Details, Brochure, RM) ---
     # Handle vague queries with context: if user asks "price", "more", "details" and we have last_shown_projects, use first one
     vague_patterns = ["price", "cost", "more", "details", "tell me", "about it", "what about"]
@@ -569,7 +666,7 @@ def execute_sales_copilot_flow(state: FlowState, user_input: str, chat_history:
         
         if target_name:
             # DB Lookup (Exact/Fuzzy)
-            project = _find_project_by_name(projects_table, target_name)
+            project = _find_project_by_name(target_name)
             
             if project:
                 state.selected_project_id = project['project_id']
@@ -669,36 +766,10 @@ def execute_sales_copilot_flow(state: FlowState, user_input: str, chat_history:
             center_coords = get_coordinates(current_reqs.location)
             if center_coords:
                 lat1, lon1 = center_coords
-                
-                # Fetch all projects
-                all_projs = []
-                if projects_table:
-                    try:
-                        all_projs = projects_table.select(
-                            projects_table.project_id, projects_table.name, projects_table.location, projects_table.zone,
-                            projects_table.budget_min, projects_table.budget_max,
-                            projects_table.configuration, projects_table.status
-                        ).collect()
-                    except Exception as e:
-                        logger.error(f"Radius search DB error: {e}")
-                        all_projs = []
-                
-                if not all_projs:
-                    all_projs = _get_mock_projects()
-                
-                for p in all_projs:
-                    # Naively assumes project location string can be geocoded or we simply fuzzy match location in DB
-                    # Real implementation needs lat/lon in DB. 
-                    # Fallback: check if we have lat/lon in DB columns (assuming they exist or we map location string)
-                    p_coords = get_coordinates(p['location'])
-                    if p_coords:
-                        dist = calculate_distance(lat1, lon1, p_coords[0], p_coords[1])
-                        if dist <= 10.0: # 10km radius
-                            p['_distance'] = dist
-                            radius_matches.append(p)
+                # Nearest-first projects within 10km from the catalog's geo index
+                radius_matches = project_repository.within_radius(lat1, lon1, 10.0, columns=SEARCH_COLUMNS)
                 
                 if radius_matches:
-                    radius_matches.sort(key=lambda x: x.get('_distance', 999))
                     results = radius_matches # Override text search results
         
         # Standard Search if no radius results or not a radius query
@@ -715,7 +786,7 @@ def execute_sales_copilot_flow(state: FlowState, user_input: str, chat_history:
                 else:
                     action_response = "That was all the options I found. Would you like to adjust your filters (location, budget, BHK) to see more?"
             else:
-                results = _search_projects(projects_table, current_reqs, user_input)
+                results = _search_projects(current_reqs, user_input)
 
         # AUTOMATIC BUDGET EXPANSION: If no results and budget specified, try progressively higher budgets
         budget_expanded = False
@@ -730,7 +801,7 @@ def execute_sales_copilot_flow(state: FlowState, user_input: str, chat_history:
 
                 relaxed_reqs = current_reqs.model_copy()
                 relaxed_reqs.budget_max = relaxed_budget
-                results = _search_projects(projects_table, relaxed_reqs, user_input)
+                results = _search_projects(relaxed_reqs, user_input)
 
                 if results:
                     # Found projects with expanded budget
@@ -744,6 +815,7 @@ def execute_sales_copilot_flow(state: FlowState, user_input: str, chat_history:
 
         state.last_search_results = results
         state.last_shown_projects = results[:5]
+        emit_projects(results[:5])
 
         if results:
             # Only set default context_msg if not already set by budget expansion
@@ -783,7 +855,7 @@ def execute_sales_copilot_flow(state: FlowState, user_input: str, chat_history:
                     for length in [4, 3, 2, 1]:
                         if i + length <= len(words):
                             potential_name = " ".join(words[i:i+length])
-                            proj = _find_project_by_name(projects_table, potential_name)
+                            proj = _find_project_by_name(potential_name)
                             if proj and proj.get('name') not in [p.get('name') for p in projects_mentioned]:
                                 projects_mentioned.append(proj)
                                 break
@@ -815,7 +887,7 @@ def execute_sales_copilot_flow(state: FlowState, user_input: str, chat_history:
             for length in [3, 2, 1]:  # Try 3-word, 2-word, 1-word combinations
                 if i + length <= len(words):
                     test_name = " ".join(words[i:i+length])
-                    potential_project = _find_project_by_name(projects_table, test_name)
+                    potential_project = _find_project_by_name(test_name)
                     if potential_project:
                         break
             if potential_project:
@@ -881,12 +953,14 @@ def _generate_project_details_response(project: dict, user_query: str) -> str:
     Generate conversational GPT response about project details/amenities.
     Uses project DB data as context for GPT to generate natural response.
     """
-    try:
-        import openai
-        import os
+    emit_projects([project])
+    project = enrichment_store.enrich(project)  # Pre-computed nearby places / connectivity, if any
 
-        client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    if not has_budget(GENERATION_BUDGET):
+        degrade("project_details", "template")
+        return sales_formatter.format_pitch_response(project)
 
+    try:
         # Prepare project context
         project_context = f"""
 Project: {project.get('name')}
@@ -900,6 +974,10 @@ USP: {project.get('usp')}
 Developer: {project.get('developer')}
 RERA: {project.get('rera_number')}
 """
+        for label, field in (("Nearby Places", "nearby_places"), ("Connectivity", "connectivity"),
+                             ("Neighborhood", "neighborhood_info")):
+            if project.get(field):
+                project_context += f"{label}:\n{project[field]}\n"
 
         prompt = f"""You are a real estate sales assistant helping a customer understand a project.
 
@@ -916,7 +994,8 @@ Generate a helpful, conversational response (3-5 bullet points) that:
 
 Format as bullet points starting with "•" or "-"."""
 
-        response = client.chat.completions.create(
+        # Streams tokens to the client on the /stream endpoints
+        return generate_text_sync(
             model="gpt-4-turbo-preview",
             messages=[
                 {"role": "system", "content": "You are a helpful real estate sales assistant."},
@@ -926,93 +1005,32 @@ Format as bullet points starting with "•" or "-"."""
             max_tokens=500
         )
 
-        return response.choices[0].message.content.strip()
-
     except openai.RateLimitError:
         logger.error("OpenAI RateLimitError in _generate_project_details_response")
         raise
     except Exception as e:
         logger.error(f"GPT project details generation failed: {e}")
         # Fallback to formatted response
-        from services.sales_formatter import sales_formatter
         return sales_formatter.format_pitch_response(project)
 
-def _get_mock_projects():
-    from services.hybrid_retrieval import hybrid_retrieval
-    if not hybrid_retrieval.mock_projects:
-        hybrid_retrieval._load_mock_data()
-    return hybrid_retrieval.mock_projects
-
-def _find_project_by_name(table, name_query):
+def _find_project_by_name(name_query):
     """Helper to find project name with case-insensitive matching."""
     if not name_query: return None
 
-    # Fetch all projects from DB
-    if table:
-        try:
-            all_projs = table.select(
-                table.project_id, table.name, table.location, table.zone, table.budget_min, table.budget_max,
-                table.configuration, table.status, table.possession_year, table.possession_quarter,
-                table.amenities, table.usp, table.brochure_url, table.rm_details
-            ).collect()
-        except Exception as e:
-            logger.error(f"DB Error finding project: {e}")
-            all_projs = _get_mock_projects()
-    else:
-        all_projs = _get_mock_projects()
-
-    # Step 1: Case-insensitive exact match (FIRST PRIORITY)
-    name_query_lower = name_query.lower()
-    for p in all_projs:
-        if p['name'].lower() == name_query_lower:
-            return p
-
-    # Step 2: Word-based partial match (NEW - SECOND PRIORITY)
-    # Match if any word in query matches any significant word in project name
-    query_words = set(name_query_lower.split())
-    # Filter out common words like "the", "of", "in"
-    stop_words = {"the", "of", "in", "at", "on", "and", "or"}
-    query_words = query_words - stop_words
-
-    for p in all_projs:
-        project_words = set(p['name'].lower().split())
-        project_words = project_words - stop_words
-
-        # Check for intersection (any common significant word)
-        if query_words & project_words:
-            logger.info(f"✓ Word-based match: '{name_query}' → '{p['name']}'")
-            return p
-
-    # Step 3: Fuzzy match fallback (THIRD PRIORITY)
-    import difflib
-    names = [p['name'] for p in all_projs]
-    matches = difflib.get_close_matches(name_query, names, n=1, cutoff=0.4)  # Lowered from 0.6
-    if matches:
-        target = matches[0]
-        for p in all_projs:
-            if p['name'] == target:
-                logger.info(f"✓ Fuzzy match: '{name_query}' → '{p['name']}' (score >= 0.4)")
-                return p
+    # Exact (case-insensitive) -> word-based -> typo-tolerant -> whole-name similarity
+    matches = project_repository.match_name(name_query, limit=1, columns=DETAIL_COLUMNS)
+    if not matches:
+        return None
 
-    return None
+    project, match = matches[0]
+    if match.method != "exact":
+        logger.info(f"✓ {match.method} match: '{name_query}' → '{project['name']}' (score {match.score:.2f})")
+    return project
 
-def _search_projects(table, reqs, query_text):
+def _search_projects(reqs, query_text):
     """Helper for search logic with locality priority scoring."""
 
-    all_rows = []
-    if table:
-        try:
-            # Fetch all (optimization: filter in DB if possible, but python filter is safer for complex logic)
-            all_rows = table.select(
-                table.project_id, table.name, table.location, table.zone, table.budget_min, table.budget_max,
-                table.configuration, table.status, table.possession_year
-            ).collect()
-        except Exception as e:
-            logger.error(f"DB Search error: {e}")
-            all_rows = []
-
-    if not all_rows:
-        all_rows = _get_mock_projects()
+    all_rows = project_repository.select(*SEARCH_COLUMNS)
 
     matches = []
     for p in all_rows:
@@ -1067,23 +1085,21 @@ def _search_projects(table, reqs, query_text):
             user_bhk = int(reqs.configuration[0]) if reqs.configuration[0].isdigit() else None
 
             if user_bhk:
-                config_str = str(p.get('configuration', '')).lower()
+                project_bhks = configuration_bhks(str(p.get('configuration', '')))
                 project_has_match = False
 
                 # Check for exact BHK match
-                if f"{user_bhk}bhk" in config_str or f"{user_bhk} bhk" in config_str:
+                if user_bhk in project_bhks:
                     project_has_match = True
                     score += 30  # Exact config match
 
                 # Check for higher BHK within budget
                 elif reqs.budget_max:
-                    for bhk in range(user_bhk + 1, 6):
-                        if f"{bhk}bhk" in config_str or f"{bhk} bhk" in config_str:
-                            if p.get('budget_max') and (p['budget_max']/100) <= reqs.budget_max:
-                                project_has_match = True
-                                score += 15  # Higher BHK within budget
-                                logger.debug(f"Including {p.get('name')}: {bhk}BHK within budget")
-                                break
+                    higher_bhks = sorted(b for b in project_bhks if user_bhk < b < 6)
+                    if higher_bhks and p.get('budget_max') and (p['budget_max']/100) <= reqs.budget_max:
+                        project_has_match = True
+                        score += 15  # Higher BHK within budget
+                        logger.debug(f"Including {p.get('name')}: {higher_bhks[0]:g}BHK within budget")
 
                 if not project_has_match:
                     continue  # Hard filter: no matching configuration
@@ -1109,14 +1125,28 @@ def execute_flow(state: FlowState, user_input: str, chat_history: List[Dict[str,
 class FlowEngine:
     """Wrapper class for flowchart-driven conversation logic."""
     
-    def __init__(self):
-        self.sessions: Dict[str, FlowState] = {}
+    def __init__(self, store: Optional[SessionStore] = None):
+        # Flow state is shared through the session store so any worker can continue a conversation
+        self._cache = SessionCache("flow", FlowState, store or session_store, ttl_seconds=settings.redis_ttl_seconds,
+                                   project_fields=("last_search_results", "last_shown_projects"),
+                                   max_entries=settings.session_cache_max_entries)
+
+    @property
+    def sessions(self) -> Dict[str, FlowState]:
+        """This worker's working copies (read-only view; the store holds the sessions)."""
+        return self._cache.sessions
+
+    def get_state(self, session_id: str) -> Optional[FlowState]:
+        """Existing flow state (from the store if this worker has not seen it), without creating one."""
+        return self._cache.get(session_id)
     
     def get_or_create_session(self, session_id: str) -> FlowState:
         """Get existing session or create new one."""
-        if session_id not in self.sessions:
-            self.sessions[session_id] = FlowState()
-        return self.sessions[session_id]
+        state = self._cache.get(session_id)
+        if state is None:
+            state = FlowState()
+            self._cache.save(session_id, state)
+        return state
     
     def process(self, session_id: str, user_input: str) -> FlowResponse:
         """Process user input and return flow response."""
@@ -1124,12 +1154,16 @@ class FlowEngine:
         response = execute_flow(state, user_input)
         # Update session state
         state.current_node = response.next_redirection
+        self._cache.save(session_id, state)
         return response
     
     def reset_session(self, session_id: str) -> None:
         """Reset a session to initial state."""
-        if session_id in self.sessions:
-            del self.sessions[session_id]
+        self._cache.delete(session_id)
+
+    def reset(self) -> None:
+        """Drop every flow session (tests)."""
+        self._cache.reset()
 
 
 # Global instance
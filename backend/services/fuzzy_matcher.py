@@ -4,11 +4,23 @@ Matches partial, misspelled, or informal project names to actual project names i
 """
 
 import logging
-import difflib
-from typing import Optional, List, Dict
+from functools import lru_cache
+from typing import Optional, List, Dict, Tuple
+
+from services.name_index import NameIndex
 
 logger = logging.getLogger(__name__)
 
+# Minimum trigram similarity for a query word to match a project-name word
+WORD_TRIGRAM_THRESHOLD = 0.45
+
+
+@lru_cache(maxsize=8)
+def _name_index_for(project_names: Tuple[str, ...]) -> NameIndex:
+    """Name index over a caller-supplied list of project names (rebuilt only when the list changes)."""
+    return NameIndex(project_names)
+
+
 # Known project name mappings (partial → full name)
 # This list should be expanded based on actual projects in database
 PROJECT_NAME_MAPPINGS = {
@@ -68,10 +80,11 @@ def extract_project_name_from_query(query: str, known_projects: Optional[List[st
     
     Args:
         query: User's query text
-        known_projects: List of known project names from database
+        known_projects: List of known project names (or project dicts); when
+            omitted, the catalog's own name index is used
         
     Returns:
-        Best matching project name or None
+        Best matching project name (or entry of `known_projects`) or None
     """
     query_lower = query.lower().strip()
     
@@ -81,39 +94,37 @@ def extract_project_name_from_query(query: str, known_projects: Optional[List[st
             logger.info(f"Fuzzy match (direct): '{partial}' -> '{full}'")
             return full
     
-    # 2. If we have known projects from database, do fuzzy matching
-    if known_projects:
-        # Extract potential project words from query (skip common words)
-        skip_words = {'need', 'details', 'of', 'about', 'tell', 'me', 'more', 'give', 'show', 
-                      'the', 'please', 'want', 'info', 'information', 'on', 'for', 'project',
-                      'full', 'complete', 'all', 'get', 'find', 'search'}
-        
-        query_words = [w for w in query_lower.split() if w not in skip_words and len(w) > 2]
-        
-        for word in query_words:
-            # Try fuzzy match against all known project names
-            for project in known_projects:
-                # Handle both dict and string formats
-                if isinstance(project, dict):
-                    project_name = project.get('name', '')
-                else:
-                    project_name = str(project)
-                
-                project_lower = project_name.lower()
-                # Check if word matches any part of project name
-                project_words = project_lower.split()
-                
-                for proj_word in project_words:
-                    # Exact substring match
-                    if word in proj_word or proj_word in word:
-                        logger.info(f"Fuzzy match (substring): '{word}' in '{project}'")
-                        return project
-                    
-                    # Fuzzy match with high cutoff
-                    close_matches = difflib.get_close_matches(word, [proj_word], n=1, cutoff=0.75)
-                    if close_matches:
-                        logger.info(f"Fuzzy match (difflib): '{word}' -> '{close_matches[0]}' in '{project}'")
-                        return project
+    # 2. Fuzzy matching against the catalog or the caller's list
+    # Extract potential project words from query (skip common words)
+    skip_words = {'need', 'details', 'of', 'about', 'tell', 'me', 'more', 'give', 'show', 
+                  'the', 'please', 'want', 'info', 'information', 'on', 'for', 'project',
+                  'full', 'complete', 'all', 'get', 'find', 'search'}
+    
+    query_words = [w for w in query_lower.split() if w not in skip_words and len(w) > 2]
+    if not query_words:
+        return None
+    
+    if known_projects is None:
+        # The snapshot's name index (built once per catalog version)
+        from services.project_repository import project_repository
+        name_index = project_repository.catalog().names
+        candidates = name_index.names
+    else:
+        # Handle both dict and string formats
+        project_names = tuple(
+            project.get('name', '') if isinstance(project, dict) else str(project)
+            for project in known_projects
+        )
+        name_index = _name_index_for(project_names)
+        candidates = known_projects
+    
+    for word in query_words:
+        # Exact word, substring either way, or trigram similarity (typos)
+        scores = name_index.word_matches(word, threshold=WORD_TRIGRAM_THRESHOLD)
+        if scores:
+            best = min(scores, key=lambda pos: (-scores[pos], pos))
+            logger.info(f"Fuzzy match (name index): '{word}' -> '{name_index.names[best]}' (score {scores[best]:.2f})")
+            return candidates[best]
     
     return None
 
@@ -129,50 +140,16 @@ def get_project_from_database(project_name: str) -> Optional[Dict]:
         Project dict or None
     """
     try:
-        from database.pixeltable_setup import get_projects_table
-        projects_table = get_projects_table()
-        
-        if not projects_table:
-            # Fall back to mock data
-            from services.hybrid_retrieval import hybrid_retrieval
-            mock_projects = hybrid_retrieval._get_mock_data()
-            
-            for project in mock_projects:
-                if project_name.lower() in project.get('name', '').lower():
-                    return project
-                # Fuzzy match
-                close = difflib.get_close_matches(
-                    project_name.lower(), 
-                    [project.get('name', '').lower()], 
-                    n=1, 
-                    cutoff=0.6
-                )
-                if close:
-                    return project
-            return None
-        
-        # Query database
-        results = list(projects_table.where(
-            projects_table.name.contains(project_name)
-        ).limit(1).collect())
+        from services.project_repository import project_repository
         
-        if results:
-            return dict(results[0])
+        # Substring match first, then the ranked name index (typo tolerant)
+        project = project_repository.find_by_name_fragment(project_name)
+        if project:
+            return project
         
-        # Try fuzzy match on all projects
-        all_projects = list(projects_table.limit(100).collect())
-        for project in all_projects:
-            proj_name = project.get('name', '')
-            if project_name.lower() in proj_name.lower():
-                return dict(project)
-            close = difflib.get_close_matches(
-                project_name.lower(),
-                [proj_name.lower()],
-                n=1,
-                cutoff=0.6
-            )
-            if close:
-                return dict(project)
+        matches = project_repository.match_name(project_name, limit=1)
+        if matches:
+            return matches[0][0]
                 
         return None
         
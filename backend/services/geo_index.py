@@ -0,0 +1,130 @@
+"""
+Geo Index - Grid-bucketed coordinates for radius and k-nearest project search.
+
+Built once per catalog snapshot. Each project gets a (lat, lon) from its
+stored latitude/longitude columns, falling back to the known-locality
+table in utils/geolocation_utils for its location, then its zone. Radius
+queries only compute Haversine distances for projects in the grid cells
+overlapping the search box, instead of geocoding and measuring every
+project per request.
+"""
+
+import logging
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from utils.geolocation_utils import get_coordinates, haversine_km
+
+logger = logging.getLogger(__name__)
+
+CELL_DEGREES = 0.1   # ~11 km cells at Bangalore's latitude
+KM_PER_DEGREE = 111.32
+
+
+def _coordinate(value: Any) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) and value != 0.0 else None
+
+
+def project_coordinates(project: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """Stored latitude/longitude, else the coordinates of the project's location or zone."""
+    lat, lon = _coordinate(project.get('latitude')), _coordinate(project.get('longitude'))
+    if lat is not None and lon is not None:
+        return lat, lon
+    for field in ('location', 'zone'):
+        value = project.get(field)
+        if value:
+            coords = get_coordinates(str(value))
+            if coords:
+                return coords
+    return None
+
+
+class GeoIndex:
+    """Positions bucketed into CELL_DEGREES grid cells; NaN coordinates are not indexed."""
+
+    def __init__(self, projects: Iterable[Dict[str, Any]], cell_degrees: float = CELL_DEGREES):
+        coords = [project_coordinates(p) or (np.nan, np.nan) for p in projects]
+        self.lat = np.array([c[0] for c in coords], dtype=np.float64)
+        self.lon = np.array([c[1] for c in coords], dtype=np.float64)
+        self.cell_degrees = cell_degrees
+
+        self.located = np.flatnonzero(~(np.isnan(self.lat) | np.isnan(self.lon)))
+        cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for pos in self.located:
+            cells[self._cell(self.lat[pos], self.lon[pos])].append(int(pos))
+        self._cells = {cell: np.array(positions, dtype=np.intp) for cell, positions in cells.items()}
+
+    def __len__(self) -> int:
+        return len(self.located)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_degrees)), int(math.floor(lon / self.cell_degrees))
+
+    def _candidates(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """Positions in every grid cell overlapping the radius' bounding box."""
+        dlat = radius_km / KM_PER_DEGREE
+        dlon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+        lat_lo, lon_lo = self._cell(lat - dlat, lon - dlon)
+        lat_hi, lon_hi = self._cell(lat + dlat, lon + dlon)
+
+        # A box wider than the occupied grid is cheaper to scan directly
+        if (lat_hi - lat_lo + 1) * (lon_hi - lon_lo + 1) > len(self._cells):
+            return self.located
+
+        chunks = [self._cells[(i, j)]
+                  for i in range(lat_lo, lat_hi + 1)
+                  for j in range(lon_lo, lon_hi + 1)
+                  if (i, j) in self._cells]
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.intp)
+
+    def distances(self, lat: float, lon: float) -> np.ndarray:
+        """Distance (km) from (lat, lon) to every project; NaN where coordinates are unknown."""
+        return haversine_km(lat, lon, self.lat, self.lon)
+
+    def within_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        mask: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(positions, distances_km) within `radius_km`, nearest first."""
+        candidates = self._candidates(lat, lon, radius_km)
+        if mask is not None and len(candidates):
+            candidates = candidates[mask[candidates]]
+        if not len(candidates):
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+
+        dist = haversine_km(lat, lon, self.lat[candidates], self.lon[candidates])
+        keep = dist <= radius_km
+        candidates, dist = candidates[keep], dist[keep]
+        order = np.lexsort((candidates, dist))
+        return candidates[order], dist[order]
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        mask: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(positions, distances_km) of the `k` closest located projects, nearest first."""
+        candidates = self.located if mask is None else self.located[mask[self.located]]
+        if k <= 0 or not len(candidates):
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+
+        dist = haversine_km(lat, lon, self.lat[candidates], self.lon[candidates])
+        if k < len(candidates):
+            top = np.argpartition(dist, k - 1)[:k]
+            candidates, dist = candidates[top], dist[top]
+        order = np.lexsort((candidates, dist))
+        return candidates[order], dist[order]
@@ -7,22 +7,14 @@ Generates persuasive, fact-grounded content about projects beyond basic database
 
 import logging
 from typing import Dict, Optional
-from openai import OpenAI
 from config import settings
+from services.llm_gateway import llm_gateway
 from services.master_prompt import get_content_prompt, get_objection_prompt, get_meeting_prompt, get_general_prompt
 from services.sales_agent_prompt import SALES_AGENT_SYSTEM_PROMPT
 
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client with timeout
-client = OpenAI(
-    api_key=settings.openai_api_key,
-    base_url=settings.openai_base_url,
-    timeout=30.0  # 30 second timeout for API calls
-)
-
-
-def generate_insights(
+async def generate_insights(
     project_facts: Dict,
     topic: str,
     query: str,
@@ -74,7 +66,7 @@ REMEMBER:
 """
 
     try:
-        response = client.chat.completions.create(
+        response = await llm_gateway.chat(
             model=settings.effective_gpt_model,
             temperature=0.7,  # Slightly creative for persuasive content
             messages=[
@@ -240,7 +232,7 @@ def _fallback_response(project_facts: Dict, topic: str) -> str:
 I'd be happy to provide more specific details about {topic} if you'd like. Would you also like to schedule a site visit to see the project in person?"""
 
 
-def enhance_with_gpt(project_facts: Dict, query: str) -> str:
+async def enhance_with_gpt(project_facts: Dict, query: str) -> str:
     """
     Hybrid response: Database facts + GPT persuasive framing.
 
@@ -288,7 +280,7 @@ USP: {usp}
 
 Write ONLY the introduction (2-3 sentences). Be persuasive but honest."""
 
-        response = client.chat.completions.create(
+        response = await llm_gateway.chat(
             model=settings.effective_gpt_model,
             temperature=0.7,
             messages=[{"role": "user", "content": prompt}],
@@ -310,7 +302,7 @@ Would you like to know more about the investment potential, sustainability featu
         return facts_section + "\n\nWould you like more details or schedule a site visit?"
 
 
-def generate_contextual_response_with_full_history(
+async def generate_contextual_response_with_full_history(
     query: str,
     conversation_history: list,
     session_context: Dict,
@@ -449,7 +441,7 @@ def generate_contextual_response_with_full_history(
     messages.append({"role": "user", "content": query})
     
     try:
-        response = client.chat.completions.create(
+        response = await llm_gateway.chat(
             model=settings.effective_gpt_model,
             temperature=0.7,
             messages=messages,
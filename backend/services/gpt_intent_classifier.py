@@ -8,8 +8,11 @@ GPT decides both the intent AND where to get the answer (database vs GPT generat
 import json
 import logging
 from typing import Dict, List, Optional
-from openai import OpenAI
 from config import settings
+from services.deadline import degrade, has_budget
+from services.llm_gateway import llm_gateway
+from services.single_flight import coalesce
+from services.local_intent_classifier import local_intent_classifier
 from services.sales_agent_prompt import SALES_AGENT_SYSTEM_PROMPT
 
 logger = logging.getLogger(__name__)
@@ -91,15 +94,14 @@ def needs_clarification(query: str, context: Dict) -> bool:
     
     return not has_context
 
-# Initialize OpenAI client with timeout
-client = OpenAI(
-    api_key=settings.openai_api_key,
-    base_url=settings.openai_base_url,
-    timeout=10.0  # 10 second timeout for API calls (reduced from 30s for faster response)
-)
+# 10 second timeout for classification calls (reduced from 30s for faster response)
+CLASSIFIER_TIMEOUT = 10.0
+# Budget a GPT classification needs; with less left the local classifier decides
+CLASSIFIER_BUDGET = 2.0
 
 
-def classify_intent_gpt_first(
+@coalesce("intent_classification")
+async def classify_intent_gpt_first(
     query: str,
     conversation_history: Optional[List[Dict]] = None,
     session_state: Optional[Dict] = None,
@@ -125,6 +127,19 @@ def classify_intent_gpt_first(
         }
     """
 
+    # Local fast path: GPT is only called when the local model is unsure
+    if settings.local_intent_enabled:
+        local_result = local_intent_classifier.classify(query, session_state)
+        if local_result is not None:
+            return local_result
+
+    # Not enough of the request budget left for a GPT call: take the local answer as-is
+    if not has_budget(CLASSIFIER_BUDGET):
+        degrade("intent_classification", "local classifier")
+        local_result = local_intent_classifier.classify(query, session_state, threshold=0.0)
+        if local_result is not None:
+            return local_result
+
     system_prompt = _build_system_prompt()
 
     # Preprocess query for mixed language (Hinglish) support
@@ -271,10 +286,12 @@ def classify_intent_gpt_first(
     messages.append({"role": "user", "content": user_message})
 
     try:
-        response = client.chat.completions.create(
+        response = await llm_gateway.chat(
             model=settings.effective_gpt_model,
             temperature=0.0,  # Deterministic classification
             messages=messages,
+            timeout=CLASSIFIER_TIMEOUT,
+            cache="intent_classification",
             max_tokens=500,  # Increased to ensure full extraction is returned
             response_format={"type": "json_object"}  # Force JSON output
         )
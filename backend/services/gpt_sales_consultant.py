@@ -13,19 +13,25 @@ Key Features:
 
 import logging
 from typing import Dict, List, Optional
-from openai import OpenAI
 from config import settings
+from services.deadline import degrade, has_budget
+from services.response_stream import generate_text
+from services.sales_intelligence import sales_intelligence
 from services.session_manager import ConversationSession  # Fixed import
 from services.sales_agent_prompt import SALES_AGENT_SYSTEM_PROMPT
 
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-client = OpenAI(
-    api_key=settings.openai_api_key,
-    base_url=settings.openai_base_url,
-    timeout=30.0  # 30 second timeout for API calls
-)
+# Request budget (seconds) a consultant GPT answer needs
+CONSULTANT_BUDGET = 3.0
+
+# detect_objection_type -> sales_intelligence FAQ used when GPT is skipped
+OBJECTION_FAQS = {
+    "budget": "stretch_budget",
+    "location": "convince_location",
+    "possession": "under_construction",
+    "trust": "pinclick",
+}
 
 
 async def generate_consultant_response(
@@ -88,6 +94,14 @@ async def generate_consultant_response(
         elif sentiment == "negative":
             goal += "\n\n⚠️ CUSTOMER HAS CONCERNS - Build trust through transparency and detailed explanations."
 
+    # Not enough of the request budget left for GPT: answer objections from the FAQ playbook
+    if not has_budget(CONSULTANT_BUDGET):
+        degrade("consultant", "cached FAQ")
+        objection = detect_objection_type(query)
+        if objection in OBJECTION_FAQS:
+            return sales_intelligence.get_faq_response(OBJECTION_FAQS[objection])
+        return _fallback_response(context)
+
     # Get conversation history
     conversation_history = []
     if session and hasattr(session, 'messages'):
@@ -516,28 +530,28 @@ FORMATTING OVERRIDE:
         # Use higher max_tokens for comprehensive sales questions (6-10 bullet points)
         max_tokens = 1000 if is_comprehensive_question else 600
         
-        # Call GPT
-        response = client.chat.completions.create(
+        # Call GPT (streams tokens to the client on the /stream endpoints)
+        return await generate_text(
             model=settings.effective_gpt_model,
             messages=messages,
             temperature=0.7,
             max_tokens=max_tokens
         )
 
-        return response.choices[0].message.content.strip()
-
     except Exception as e:
         logger.error(f"GPT consultant call failed: {e}")
+        return _fallback_response(context)
 
-        # Fallback response
-        if context.get("last_shown_projects"):
-            project_name = context["last_shown_projects"][0]["name"]
-            return f"""• I'd be happy to discuss **{project_name}** in more detail.
+
+def _fallback_response(context: dict) -> str:
+    """Static answer when GPT is unavailable."""
+    if context.get("last_shown_projects"):
+        project_name = context["last_shown_projects"][0]["name"]
+        return f"""• I'd be happy to discuss **{project_name}** in more detail.
 • **Great value** on location, amenities, and pricing for your requirements.
 • I can share more on **location advantages**, **investment potential**, or **amenities**.
 • Or we can **schedule a site visit**—just say when works for you."""
-        else:
-            return """• I'm here to help you find the perfect property in **Bangalore**!
+    return """• I'm here to help you find the perfect property in **Bangalore**!
 
 I can assist with:
 - **Property search** (budget, config, location)
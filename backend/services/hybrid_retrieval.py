@@ -12,13 +12,21 @@ import logging
 import asyncio
 import json
 import os
-import re
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
-from utils.geolocation_utils import get_coordinates, calculate_distance
+from utils.geolocation_utils import get_coordinates
 from typing import Callable
-from functools import lru_cache
 import hashlib
 
+import numpy as np
+
+from services.catalog_index import CatalogIndex
+from services.deadline import DeadlineExceeded, clip_timeout, degrade
+from services.project_payloads import search_result_payload
+from services.project_repository import project_repository
+from services.project_snapshot import project_snapshots
+from services.search_cache import search_cache
+from services.unit_table import UnitTable, configuration_bhks
+
 logger = logging.getLogger(__name__)
 
 # Thread pool for Pixeltable queries (avoids uvloop conflict)
@@ -29,17 +37,11 @@ QUERY_TIMEOUT = 5  # Maximum time for a single database query (reduced for faste
 TOTAL_TIMEOUT = 15  # Maximum total time for entire search operation
 MAX_RESULTS = 20  # Maximum number of projects to return (prevent large result set processing)
 
-MOCK_DATA_PATH = os.path.join(os.path.dirname(__file__), '../data/seed_projects.json')
-
-# Simple in-memory cache for all projects (refreshed periodically)
-_all_projects_cache = {
-    "data": None,
-    "timestamp": 0,
-    "ttl": 300  # 5 minutes cache
-}
+# Filters evaluated once per distinct combination when searching several variants
+SHARED_FILTER_FIELDS = ('city', 'area', 'locality', 'developer_name', 'project_name', 'possession_year')
 
+MOCK_DATA_PATH = os.path.join(os.path.dirname(__file__), '../data/seed_projects.json')
 
-@lru_cache(maxsize=1000)
 def parse_configuration_pricing(config_str: str) -> List[Dict[str, Any]]:
     """
     Parse configuration string to extract BHK and pricing per unit type.
@@ -49,58 +51,16 @@ def parse_configuration_pricing(config_str: str) -> List[Dict[str, Any]]:
 
     Returns:
     [
-        {"bhk": 2, "price_cr": 1.35, "sqft_range": "1249-1310"},
-        {"bhk": 3, "price_cr": 1.65, "sqft_range": "1539-1590"}
+        {"bhk": 2, "price_cr": 1.35, "sqft_range": "1249-1310", ...},
+        {"bhk": 3, "price_cr": 1.65, "sqft_range": "1539-1590", ...}
     ]
-    """
-    if not config_str or not isinstance(config_str, str):
-        return []
 
-    units = []
-
-    # Split by }, { to get individual configurations
-    # Handle both {}, and }, { as separators
-    configs = re.split(r'\},\s*\{', config_str.strip('{}'))
-
-    for config in configs:
-        try:
-            # Extract BHK: look for "2BHK" or "3 BHK" etc.
-            bhk_match = re.search(r'(\d+)\s*BHK', config, re.IGNORECASE)
-            if not bhk_match:
-                continue
-            bhk = int(bhk_match.group(1))
-
-            # Extract price: look for "1.35 Cr" or "1.35Cr" or "135 L"
-            price_cr = None
-            price_match_cr = re.search(r'(\d+\.?\d*)\s*Cr', config, re.IGNORECASE)
-            price_match_l = re.search(r'(\d+\.?\d*)\s*L', config, re.IGNORECASE)
-
-            if price_match_cr:
-                price_cr = float(price_match_cr.group(1))
-            elif price_match_l:
-                # Convert lakhs to crores
-                lakhs = float(price_match_l.group(1))
-                price_cr = lakhs / 100.0
-
-            if price_cr is None:
-                continue
-
-            # Extract sqft range (optional)
-            sqft_match = re.search(r'(\d+\s*-\s*\d+|\d+)', config)
-            sqft_range = sqft_match.group(1).strip() if sqft_match else None
-
-            units.append({
-                "bhk": bhk,
-                "price_cr": price_cr,
-                "price_lakhs": price_cr * 100,  # Also provide in lakhs for easier comparison
-                "sqft_range": sqft_range
-            })
-
-        except (ValueError, AttributeError) as e:
-            logger.warning(f"Failed to parse configuration segment '{config}': {e}")
-            continue
-
-    return units
+    Only priced units are returned. Parsing is shared with the unit table
+    (see services/unit_table.py) so each distinct string is parsed once.
+    """
+    table = UnitTable([config_str])
+    priced = np.flatnonzero(~np.isnan(table.price_cr))
+    return table.to_dicts(priced)
 
 class HybridRetrievalService:
     """
@@ -134,21 +94,7 @@ class HybridRetrievalService:
             if os.path.exists(MOCK_DATA_PATH):
                 with open(MOCK_DATA_PATH, 'r') as f:
                     self.mock_projects = json.load(f)
-                
-                # Add coordinates to mock data for radius search
-                for p in self.mock_projects:
-                    loc = p.get('location', '')
-                    coords = get_coordinates(loc)
-                    if coords:
-                        p['_lat'], p['_lon'] = coords
-                    else:
-                        # Fallback based on zone if location is too specific
-                        zone = p.get('zone', '')
-                        coords = get_coordinates(zone)
-                        if coords:
-                            p['_lat'], p['_lon'] = coords
-
-                logger.info(f"Loaded {len(self.mock_projects)} mock projects with coordinates")
+                logger.info(f"Loaded {len(self.mock_projects)} mock projects")
             else:
                 logger.error(f"Mock data file not found at {MOCK_DATA_PATH}")
                 self.mock_projects = []
@@ -186,6 +132,14 @@ class HybridRetrievalService:
 
         logger.info(f"Extracted filters: {filters.model_dump(exclude_none=True)}")
 
+        # Identical filters against the same snapshot return the cached, already formatted result
+        cache_key = self._search_cache_key(filters)
+        if cache_key is not None:
+            cached = search_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Search cache hit ({cached['total_matching_projects']} projects)")
+                return cached
+
         # Query Pixeltable or Mock Data with timeout protection
         try:
             if self.projects_table:
@@ -199,7 +153,7 @@ class HybridRetrievalService:
                         filters,
                         query
                     ),
-                    timeout=QUERY_TIMEOUT  # Use QUERY_TIMEOUT instead of TOTAL_TIMEOUT for individual queries
+                    timeout=clip_timeout(QUERY_TIMEOUT)  # Per query, and never past the request deadline
                 )
                 search_method = "pixeltable"
             else:
@@ -207,10 +161,11 @@ class HybridRetrievalService:
                 results = self._query_mock_projects_sync(filters, query)
                 search_method = "mock_data"
 
-        except asyncio.TimeoutError:
+        except (asyncio.TimeoutError, DeadlineExceeded):
             logger.error(f"Query timeout after {QUERY_TIMEOUT}s for query: {query}")
+            degrade("retrieval", "timeout fallback")
             # Fallback to cached data if available
-            if _all_projects_cache["data"] is not None:
+            if project_snapshots.current() is not None:
                 logger.info("Falling back to cached projects after timeout")
                 try:
                     # Try a simplified query with cached data
@@ -255,361 +210,344 @@ class HybridRetrievalService:
                 "error": str(e)
             }
 
-        return {
+        response = {
             "projects": results,
             "total_matching_projects": len(results),
             "filters_used": filters.model_dump(exclude_none=True),
             "search_method": search_method
         }
+        # Only cache a normal search whose snapshot is still current (not a timeout fallback)
+        if cache_key is not None and self._search_cache_key(filters) == cache_key \
+                and search_method in ("pixeltable", "mock_data"):
+            search_cache.put(cache_key, response)
+        return response
 
-    def _query_projects_sync(self, filters: PropertyFilters, query: str) -> List[Dict[str, Any]]:
-        """Query Pixeltable projects table with filters (runs in thread with caching)."""
-        try:
-            projects = self.projects_table
-            if projects is None:
-                logger.error("Projects table is None - cannot query")
-                return []
+    async def search_with_filter_variants(
+        self,
+        query: str,
+        variants: List[PropertyFilters]
+    ) -> List[Dict[str, Any]]:
+        """
+        Search several filter variants (budget relaxation steps, alternative
+        locations) in one pass instead of one search_with_filters call each.
 
-            # Use cached all_projects if available and fresh
-            import time as time_module
-            current_time = time_module.time()
+        Returns one search_with_filters-shaped result per variant, in order.
+        Cached variants are served from the search cache; the rest are
+        evaluated together in a single executor call that shares the
+        location / developer / possession predicates across variants.
+        """
+        if not variants:
+            return []
 
-            all_results = None
-            if (_all_projects_cache["data"] is not None and
-                current_time - _all_projects_cache["timestamp"] < _all_projects_cache["ttl"]):
-                all_results = _all_projects_cache["data"]
-                logger.info(f"Using cached projects ({len(all_results)} projects)")
-            else:
-                # Fetch all projects with timeout protection
-                try:
-                    # Get all projects - this is the slow operation
-                    all_results = projects.collect()
-                    logger.info(f"Total projects fetched: {len(all_results)}")
-
-                    # Cache the results
-                    _all_projects_cache["data"] = all_results
-                    _all_projects_cache["timestamp"] = current_time
-
-                except Exception as fetch_err:
-                    logger.error(f"Error fetching projects: {fetch_err}")
-                    # If we have stale cache, use it
-                    if _all_projects_cache["data"] is not None:
-                        logger.warning("Using stale cache due to fetch error")
-                        all_results = _all_projects_cache["data"]
-                    else:
-                        return []
+        if not self.projects_table and not self.mock_projects:
+            self._init_tables()
 
-            # Convert Pixeltable Row objects to dictionaries to avoid slice errors
-            filtered_results = []
-            for row in all_results:
-                try:
-                    # Convert Row to dict using to_dict() if available, otherwise dict()
-                    if hasattr(row, 'to_dict'):
-                        filtered_results.append(row.to_dict())
-                    else:
-                        # Fallback: create dict from row attributes
-                        row_dict = {}
-                        for key in row.keys():
-                            row_dict[key] = row[key]
-                        filtered_results.append(row_dict)
-                except Exception as conv_err:
-                    logger.error(f"Error converting row to dict: {conv_err}")
-                    continue
+        keys = [self._search_cache_key(f) for f in variants]
+        responses: List[Optional[Dict[str, Any]]] = [
+            search_cache.get(key) if key is not None else None for key in keys
+        ]
+        pending = [i for i, response in enumerate(responses) if response is None]
+        if not pending:
+            return responses
 
-            logger.info(f"Converted {len(filtered_results)} rows to dictionaries")
-            
-            # Apply city filter
-            # Logic: All projects are in Bangalore. 
-            # 1. If user asks for Bangalore, return all (don't filter out if 'Bangalore' string missing).
-            # 2. If user asks for Mumbai/Delhi, look for it strictly (will likely return 0).
-            if filters.city and filters.city.strip():
-                city_lower = filters.city.lower()
-                if city_lower != 'bangalore':
-                    filtered_results = [r for r in filtered_results 
-                                       if city_lower in str(r.get('location', '')).lower() or 
-                                          city_lower in str(r.get('zone', '')).lower() or
-                                          city_lower in str(r.get('full_address', '')).lower()]
-                    logger.info(f"After city filter '{filters.city}': {len(filtered_results)} results")
+        pending_filters = [variants[i] for i in pending]
+        error = None
+        try:
+            if self.projects_table:
+                loop = asyncio.get_event_loop()
+                batch = await asyncio.wait_for(
+                    loop.run_in_executor(_executor, self._query_variants_sync, pending_filters, query),
+                    timeout=clip_timeout(QUERY_TIMEOUT)
+                )
+                search_method = "pixeltable"
+            elif self.mock_projects:
+                batch = [self._query_mock_projects_sync(f, query) for f in pending_filters]
+                search_method = "mock_data"
+            else:
+                batch = [[] for _ in pending_filters]
+                search_method, error = "error", "Database not available"
+        except (asyncio.TimeoutError, DeadlineExceeded):
+            logger.error(f"Variant query timeout after {QUERY_TIMEOUT}s for {len(pending_filters)} variants")
+            degrade("retrieval", "timeout fallback")
+            if project_snapshots.current() is not None:
+                batch = self._query_variants_sync(pending_filters, query)
+                search_method = "cached_fallback"
+            elif self.mock_projects:
+                batch = [self._query_mock_projects_sync(f, query) for f in pending_filters]
+                search_method = "mock_data_fallback"
+            else:
+                batch = [[] for _ in pending_filters]
+                search_method = "timeout_error"
+                error = f"Query timeout after {QUERY_TIMEOUT}s - please try a simpler search"
+        except Exception as e:
+            logger.error(f"Error in search_with_filter_variants: {e}", exc_info=True)
+            batch = [[] for _ in pending_filters]
+            search_method, error = "error", str(e)
+
+        for i, results in zip(pending, batch):
+            response = {
+                "projects": results,
+                "total_matching_projects": len(results),
+                "filters_used": variants[i].model_dump(exclude_none=True),
+                "search_method": search_method
+            }
+            if error:
+                response["error"] = error
+            elif keys[i] is not None and self._search_cache_key(variants[i]) == keys[i] \
+                    and search_method in ("pixeltable", "mock_data"):
+                search_cache.put(keys[i], response)
+            responses[i] = response
+
+        logger.info(f"Searched {len(variants)} filter variants ({len(variants) - len(pending)} cached)")
+        return responses
+
+    def _search_cache_key(self, filters: PropertyFilters):
+        """Cache key for the active data source, or None while no snapshot is loaded yet."""
+        if self.projects_table:
+            snapshot = project_snapshots.current()
+            if snapshot is None:
+                return None
+            return search_cache.key(filters, "pixeltable", snapshot.version)
+        return search_cache.key(filters, "mock_data", len(self.mock_projects))
 
-            # Apply Zone filter (North/South/East/West Bangalore)
-            if filters.area and filters.area.strip():
-                area_lower = filters.area.lower()
-                filtered_results = [r for r in filtered_results 
-                                   if area_lower in str(r.get('zone', '')).lower() or 
-                                      area_lower in str(r.get('location', '')).lower() or
-                                      area_lower in str(r.get('full_address', '')).lower()]
-                logger.info(f"After zone filter '{filters.area}': {len(filtered_results)} results")
+    def _query_projects_sync(self, filters: PropertyFilters, query: str) -> List[Dict[str, Any]]:
+        """Query Pixeltable projects table with filters (runs in thread with caching)."""
+        return self._query_variants_sync([filters], query)[0]
 
-            # Apply locality filter - prioritize strict matches (location/address) over description
-            if filters.locality and filters.locality.strip():
-                locality_lower = filters.locality.lower()
-                
-                # First, try strict matching (location and address only - most accurate)
-                strict_matches = [r for r in filtered_results 
-                                 if locality_lower in str(r.get('location', '')).lower() or
-                                    locality_lower in str(r.get('full_address', '')).lower()]
-                
-                # If we have strict matches, use only those (exclude description-only matches)
-                if strict_matches:
-                    filtered_results = strict_matches
-                    logger.info(f"After strict locality filter '{filters.locality}': {len(filtered_results)} results (location/address matches only)")
-                else:
-                    # If no strict locality matches, check if we have zone filtering
-                    # If zone is set (auto-inferred or explicit), rely on that instead of returning empty
-                    if filters.area:
-                        logger.info(f"No strict locality matches for '{filters.locality}', but zone '{filters.area}' is set - relying on zone filtering")
-                        # Don't filter by locality, zone filter already applied above
-                    else:
-                        # No zone either - return empty to avoid false positives
-                        filtered_results = []
-                        logger.info(f"After strict locality filter '{filters.locality}': 0 results (no zone fallback available)")
-            
-            # Apply developer filter - search in name and builder
-            if filters.developer_name and filters.developer_name.strip():
-                dev_keywords = filters.developer_name.lower().split()
-                filtered_results = [r for r in filtered_results 
-                                   if any(kw in str(r.get('name', '')).lower() or 
-                                         kw in str(r.get('builder', '')).lower() 
-                                         for kw in dev_keywords)]
-                logger.info(f"After developer filter '{filters.developer_name}': {len(filtered_results)} results")
-
-            # Apply Project Name filter (Specific project search)
-            # FIX #5: Use same case-insensitive exact match approach as flow_engine
-            if filters.project_name and filters.project_name.strip():
-                p_name_lower = filters.project_name.lower()
-
-                # Step 1: Try exact match first (case-insensitive)
-                exact_match = None
-                for r in filtered_results:
-                    if str(r.get('name', '')).lower() == p_name_lower:
-                        exact_match = r
-                        break
-
-                if exact_match:
-                    filtered_results = [exact_match]
-                    logger.info(f"After project name filter (exact match) '{filters.project_name}': 1 result")
-                else:
-                    # Step 2: Fall back to substring match
-                    filtered_results = [r for r in filtered_results
-                                       if p_name_lower in str(r.get('name', '')).lower()]
-                    logger.info(f"After project name filter (substring) '{filters.project_name}': {len(filtered_results)} results")
+    def _query_variants_sync(self, variants: List[PropertyFilters], query: str) -> List[List[Dict[str, Any]]]:
+        """
+        Evaluate several filter variants against one snapshot in a single pass.
 
+        Location, developer, project-name and possession predicates are computed
+        once per distinct combination; only the budget / bedroom stage and the
+        formatting run per variant.
+        """
+        try:
+            projects = self.projects_table
+            if projects is None:
+                logger.error("Projects table is None - cannot query")
+                return [[] for _ in variants]
+
+            index = self._get_catalog_index()
+            if index is None:
+                return [[] for _ in variants]
+
+            shared_masks: Dict[tuple, np.ndarray] = {}
+            results = []
+            for filters in variants:
+                key = tuple(getattr(filters, field) for field in SHARED_FILTER_FIELDS)
+                if key not in shared_masks:
+                    shared_masks[key] = self._shared_filter_mask(index, filters)
+                results.append(self._apply_variant_filters(index, shared_masks[key], filters))
+            return results
             
-            # Apply budget filter (price in Cr)
-            if filters.max_price_inr:
-                # Convert max price (INR) to Lakhs for comparison
-                max_lakhs = filters.max_price_inr / 100000
-                # STRICT FILTERING: Exclude projects where price is Unknown (None or 0)
-                # Only include if budget_min exists AND is > 0 AND is <= max_lakhs
-                filtered_results = [r for r in filtered_results 
-                                   if r.get('budget_min') and r.get('budget_min') > 0 and r.get('budget_min') <= max_lakhs]
-                logger.info(f"After max price filter {max_lakhs}L: {len(filtered_results)} results")
-            
-            if filters.min_price_inr:
-                # Convert min price (INR) to Lakhs for comparison
-                min_lakhs = filters.min_price_inr / 100000
-                filtered_results = [r for r in filtered_results 
-                                   if r.get('budget_max') is None or r.get('budget_max', 99999) >= min_lakhs]
-                logger.info(f"After min price filter {min_lakhs}L: {len(filtered_results)} results")
-            
-            # Apply Possession Year filter
-            if filters.possession_year:
-                # Logic: Included if project possession year <= requested year (e.g. "Possession by 2027" -> 2025, 2026, 2027 projects)
-                # Or exact match? Usually "possession 2027" means "by 2027". 
-                # Let's go with exact match or earlier (ready by 2027 includes 2026).
-                target_year = filters.possession_year
-                filtered_results = [r for r in filtered_results 
-                                   if r.get('possession_year') and str(r.get('possession_year')).isdigit() and int(r.get('possession_year')) <= target_year]
-                logger.info(f"After possession filter <= {target_year}: {len(filtered_results)} results")
+        except Exception as e:
+            logger.error(f"Error querying projects: {e}", exc_info=True)
+            return [[] for _ in variants]
+
+    def _shared_filter_mask(self, index: CatalogIndex, filters: PropertyFilters) -> np.ndarray:
+        """City, zone, locality, developer, project-name and possession predicates."""
+        mask = index.all_mask()
+
+        # Apply city filter
+        # Logic: All projects are in Bangalore. 
+        # 1. If user asks for Bangalore, return all (don't filter out if 'Bangalore' string missing).
+        # 2. If user asks for Mumbai/Delhi, look for it strictly (will likely return 0).
+        if filters.city and filters.city.strip():
+            city_lower = filters.city.lower()
+            if city_lower != 'bangalore':
+                mask &= index.contains_any_field(city_lower, ('location', 'zone', 'full_address'))
+                logger.info(f"After city filter '{filters.city}': {int(mask.sum())} results")
+
+        # Apply Zone filter (North/South/East/West Bangalore)
+        if filters.area and filters.area.strip():
+            mask &= index.contains_any_field(filters.area, ('zone', 'location', 'full_address'))
+            logger.info(f"After zone filter '{filters.area}': {int(mask.sum())} results")
+
+        # Apply locality filter - prioritize strict matches (location/address) over description
+        if filters.locality and filters.locality.strip():
+            # First, try strict matching (location and address only - most accurate)
+            strict_mask = mask & index.contains_any_field(filters.locality, ('location', 'full_address'))
+
+            # If we have strict matches, use only those (exclude description-only matches)
+            if strict_mask.any():
+                mask = strict_mask
+                logger.info(f"After strict locality filter '{filters.locality}': {int(mask.sum())} results (location/address matches only)")
+            else:
+                # If no strict locality matches, check if we have zone filtering
+                # If zone is set (auto-inferred or explicit), rely on that instead of returning empty
+                if filters.area:
+                    logger.info(f"No strict locality matches for '{filters.locality}', but zone '{filters.area}' is set - relying on zone filtering")
+                    # Don't filter by locality, zone filter already applied above
+                else:
+                    # No zone either - return empty to avoid false positives
+                    mask = strict_mask
+                    logger.info(f"After strict locality filter '{filters.locality}': 0 results (no zone fallback available)")
+
+        # Apply developer filter - search in name and builder
+        if filters.developer_name and filters.developer_name.strip():
+            dev_mask = np.zeros(len(index), dtype=bool)
+            for kw in filters.developer_name.lower().split():
+                dev_mask |= index.contains_any_field(kw, ('name', 'builder'))
+            mask &= dev_mask
+            logger.info(f"After developer filter '{filters.developer_name}': {int(mask.sum())} results")
+
+        # Apply Project Name filter (Specific project search)
+        # FIX #5: Use same case-insensitive exact match approach as flow_engine
+        if filters.project_name and filters.project_name.strip():
+            # Step 1: Try exact match first (case-insensitive)
+            exact_idx = index.exact_name(filters.project_name, mask)
+
+            if exact_idx is not None:
+                mask = np.zeros(len(index), dtype=bool)
+                mask[exact_idx] = True
+                logger.info(f"After project name filter (exact match) '{filters.project_name}': 1 result")
+            else:
+                # Step 2: Fall back to substring match
+                mask &= index.contains_any_field(filters.project_name, ('name',))
+                logger.info(f"After project name filter (substring) '{filters.project_name}': {int(mask.sum())} results")
 
-            # Early exit if no results after filtering
-            if len(filtered_results) == 0:
-                logger.info("No results after filtering, returning empty list")
-                return []
-            
-            # Apply Bedroom Filter with Configuration-Level Budget Check
-            matching_results = []
-            if filters.bedrooms:
-                target_bhks = filters.bedrooms # List[int], e.g. [2, 3]
+        
+        # Apply Possession Year filter
+        if filters.possession_year:
+            # Logic: Included if project possession year <= requested year (e.g. "Possession by 2027" -> 2025, 2026, 2027 projects)
+            target_year = filters.possession_year
+            mask &= index.possession_by_mask(target_year)
+            logger.info(f"After possession filter <= {target_year}: {int(mask.sum())} results")
 
-                # If budget is also specified, do configuration-level filtering
-                if filters.max_price_inr:
-                    max_cr = filters.max_price_inr / 10000000  # Convert INR to Cr
+        return mask
 
-                    for r in filtered_results:
-                        # Parse configuration to get unit-level pricing
-                        config_str = r.get('configuration', '')
-                        units = parse_configuration_pricing(config_str)
+    def _apply_variant_filters(
+        self,
+        index: CatalogIndex,
+        shared_mask: np.ndarray,
+        filters: PropertyFilters
+    ) -> List[Dict[str, Any]]:
+        """Budget and bedroom filters on top of a shared mask, then formatting."""
+        mask = shared_mask.copy()  # The shared mask may serve other variants
+
+        # Apply budget filter (price in Cr)
+        if filters.max_price_inr:
+            # Convert max price (INR) to Lakhs for comparison
+            max_lakhs = filters.max_price_inr / 100000
+            # STRICT FILTERING: Exclude projects where price is Unknown (None or 0)
+            # Only include if budget_min exists AND is > 0 AND is <= max_lakhs
+            mask &= index.max_price_mask(max_lakhs)
+            logger.info(f"After max price filter {max_lakhs}L: {int(mask.sum())} results")
+        
+        if filters.min_price_inr:
+            # Convert min price (INR) to Lakhs for comparison
+            min_lakhs = filters.min_price_inr / 100000
+            mask &= index.min_price_mask(min_lakhs)
+            logger.info(f"After min price filter {min_lakhs}L: {int(mask.sum())} results")
+        
+        # Early exit if no results after filtering
+        if not mask.any():
+            logger.info("No results after filtering, returning empty list")
+            return []
 
-                        # Check if project has ANY unit matching BOTH BHK and budget
-                        matching_units = [
-                            u for u in units
-                            if u['bhk'] in target_bhks and u['price_cr'] <= max_cr
-                        ]
+        # Apply Bedroom Filter with Configuration-Level Budget Check
+        if filters.bedrooms:
+            target_bhks = filters.bedrooms # List[int], e.g. [2, 3]
+            units = index.units
+            max_cr = filters.max_price_inr / 10000000 if filters.max_price_inr else None  # Convert INR to Cr
+
+            # Units matching BHK (and budget, if specified) within the filtered projects
+            unit_mask = units.match(target_bhks, max_price_cr=max_cr, project_mask=mask)
+            matched_units = units.group_by_project(unit_mask)
+            match_mask = units.projects_with(unit_mask)
+            if max_cr is not None:
+                logger.info(f"After configuration-level BHK {target_bhks} + budget {max_cr}Cr filter: {int(match_mask.sum())} projects with matching units")
+            else:
+                logger.info(f"After bedroom filter {target_bhks}: {int(match_mask.sum())} strict matches")
+
+            # SALES LOGIC: Add better-value configurations (N+1 BHK if within budget)
+            better_value_mask = self._add_better_value_configurations(
+                index=index,
+                project_mask=mask,
+                requested_bedrooms=target_bhks,
+                max_budget_lakhs=filters.max_price_inr / 100000 if filters.max_price_inr else None
+            ) & ~match_mask
+
+            # Matching projects first, then better-value suggestions (snapshot order within each)
+            selected = []
+            for pos in np.flatnonzero(match_mask):
+                # Annotate project with matching configurations for transparency
+                matching_units = units.to_dicts(matched_units[int(pos)]) if max_cr is not None else None
+                selected.append((int(pos), matching_units))
+            selected.extend((int(pos), None) for pos in np.flatnonzero(better_value_mask))
+
+            logger.info(f"After adding better value options: {len(selected)} total results")
+        else:
+            selected = [(int(pos), None) for pos in np.flatnonzero(mask)]
+
+        # Apply Area (Sqft) filter
+        if filters.min_area_sqft:
+             selected = [(pos, matching_units) for pos, matching_units in selected
+                         if index.projects[pos].get('total_land_area') and str(index.projects[pos].get('total_land_area')).replace('Acres','').strip().replace('.','').isdigit()]
+             # Wait, total_land_area is in Acres usually in this schema. unit sizes are in units table (not here).
+             # This filter might not work on project level unless we have unit size ranges.
+             # Checking schema: 'configuration' string might have "1200 sqft". 
+             # Or we skip project-level area filter for now if data missing.
+             # Actually, let's skip area filter on project level to avoid false zeros, as unit sizes are complex.
+             pass
+
+        logger.info(f"Final result count: {len(selected)}")
+        
+        # Limit results to prevent large result set processing
+        if len(selected) > MAX_RESULTS:
+            logger.info(f"Limiting results from {len(selected)} to {MAX_RESULTS} projects")
+            selected = selected[:MAX_RESULTS]
+        
+        # Payloads are pre-rendered per snapshot; only the matching units vary per search
+        formatted = [search_result_payload(index.payloads[pos], matching_units)
+                     for pos, matching_units in selected
+                     if index.payloads[pos] is not None]
+        
+        logger.info(f"Found {len(formatted)} matching projects")
+        return formatted
 
-                        if matching_units:
-                            # Annotate project with matching configurations for transparency
-                            r['matching_units'] = matching_units
-                            r['_all_units'] = units  # For debugging/transparency
-                            matching_results.append(r)
+    def _get_catalog_index(self) -> Optional[CatalogIndex]:
+        """
+        Return the catalog index for the current projects snapshot.
 
-                    logger.info(f"After configuration-level BHK {target_bhks} + budget {max_cr}Cr filter: {len(matching_results)} projects with matching units")
-                else:
-                    # BHK filter only (no budget) - use existing simple logic
-                    def check_bhk(r):
-                        # Project config usually string: "2, 3 BHK" or "2BHK"
-                        conf = str(r.get('configuration', '')).lower().strip()
-                        for bhk in target_bhks:
-                            if f"{bhk}" in conf: # Simple substring check: "2" in "2, 3 BHK"
-                                return True
-                        return False
-
-                    matching_results = [r for r in filtered_results if check_bhk(r)]
-                    logger.info(f"After bedroom filter {target_bhks}: {len(matching_results)} strict matches")
-                
-                # SALES LOGIC: Add better-value configurations (N+1 BHK if within budget)
-                # We reuse the helper method _add_better_value_configurations
-                better_value_results = self._add_better_value_configurations(
-                    all_projects=filtered_results,
-                    requested_bedrooms=target_bhks,
-                    max_budget_lakhs=filters.max_price_inr / 100000 if filters.max_price_inr else None,
-                    normalize_func=lambda s: str(s).lower().strip()
-                )
-                
-                # Combine matching and better-value, avoiding duplicates
-                seen_ids = {r.get('project_id') or r.get('name') for r in matching_results}
-                for bv in better_value_results:
-                    bv_id = bv.get('project_id') or bv.get('name')
-                    if bv_id not in seen_ids:
-                        bv['_better_value'] = True  # Mark as better value suggestion
-                        matching_results.append(bv)
-                        seen_ids.add(bv_id)
-                
-                filtered_results = matching_results
-                logger.info(f"After adding better value options: {len(filtered_results)} total results")
-
-            # Apply Area (Sqft) filter
-            if filters.min_area_sqft:
-                 filtered_results = [r for r in filtered_results 
-                                   if r.get('total_land_area') and str(r.get('total_land_area')).replace('Acres','').strip().replace('.','').isdigit()] 
-                 # Wait, total_land_area is in Acres usually in this schema. unit sizes are in units table (not here).
-                 # This filter might not work on project level unless we have unit size ranges.
-                 # Checking schema: 'configuration' string might have "1200 sqft". 
-                 # Or we skip project-level area filter for now if data missing.
-                 # Actually, let's skip area filter on project level to avoid false zeros, as unit sizes are complex.
-                 pass
-
-            results = filtered_results
-            logger.info(f"Final result count: {len(results)}")
-            
-            # Limit results to prevent large result set processing
-            if len(results) > MAX_RESULTS:
-                logger.info(f"Limiting results from {len(results)} to {MAX_RESULTS} projects")
-                results = results[:MAX_RESULTS]
-            
-            # Format results
-            formatted = []
-            for r in results:
-                try:
-                    # Calculate price in Cr from Lakhs
-                    min_cr = r.get('budget_min', 0) / 100.0 if r.get('budget_min') else None
-                    max_cr = r.get('budget_max', 0) / 100.0 if r.get('budget_max') else None
-                    
-                    formatted.append({
-                        "id": r.get('project_id', ''), # Frontend expects 'id'
-                        "name": r.get('name', ''),     # Frontend expects 'name'
-                        "developer": r.get('developer', ''), # Frontend expects 'developer'
-                        "project_id": r.get('project_id', ''),
-                        "project_name": r.get('name', ''),
-                        "developer_name": r.get('developer', ''), 
-                        "location": r.get('location', ''),
-                        "city": r.get('zone', '') or r.get('location', ''),
-                        "locality": r.get('location', ''),
-                        "zone": r.get('zone', ''),
-                        "status": r.get('status', ''),
-                        "possession_year": r.get('possession_year'),
-                        "possession_quarter": r.get('possession_quarter', ''),
-                        "total_land_area": r.get('total_land_area', ''),
-                        "towers": r.get('towers', ''),
-                        "floors": r.get('floors', ''),
-                        "amenities": r.get('amenities', ''),
-                        "highlights": r.get('highlights', ''),
-                        "description": r.get('description', ''),
-                        "usp": r.get('usp', ''),
-                        "brochure_link": r.get('brochure_link', ''),
-                        "brochure_url": r.get('brochure_url', ''),
-                        "rm_contact": r.get('rm_contact', ''),
-                        "rm_details": r.get('rm_details', {}),
-                        "location_link": r.get('location_link', ''),
-                        "config_summary": r.get('configuration', ''),
-                        "configuration": r.get('configuration', ''),
-                        "rera_number": r.get('rera_number', ''),
-                        "registration_process": r.get('registration_process', ''),
-                        "price_range": {
-                            "min": min_cr,
-                            "max": max_cr,
-                            "min_display": f"₹{min_cr:.2f} Cr" if min_cr else "Price on request",
-                            "max_display": f"₹{max_cr:.2f} Cr" if max_cr else "Price on request"
-                        },
-                        "budget_min": r.get('budget_min'),  # In lakhs (for frontend calculations)
-                        "budget_max": r.get('budget_max'),  # In lakhs (for frontend calculations)
-                        "matching_units": r.get('matching_units', []),  # Include matching_units from filtering
-                        "unit_count": len(r.get('matching_units', [])),
-                        "can_expand": True,
-                        "relevant_chunks": []
-                    })
-                except Exception as format_err:
-                    logger.error(f"Error formatting project: {format_err}")
-                    continue
-            
-            logger.info(f"Found {len(formatted)} matching projects")
-            return formatted
-            
-        except Exception as e:
-            logger.error(f"Error querying projects: {e}", exc_info=True)
-            return []
+        Snapshots are managed by project_snapshots: stale data is served while
+        a background refresh runs, and only a cold start blocks on a load.
+        """
+        snapshot = project_snapshots.get()
+        if snapshot is None:
+            return None
+        logger.info(f"Using project snapshot v{snapshot.version} ({len(snapshot.index)} projects)")
+        return snapshot.index
 
     def _add_better_value_configurations(
         self,
-        all_projects: List[Dict[str, Any]],
+        index: CatalogIndex,
+        project_mask: np.ndarray,
         requested_bedrooms: List[int],
-        max_budget_lakhs: Optional[float],
-        normalize_func
-    ) -> List[Dict[str, Any]]:
+        max_budget_lakhs: Optional[float]
+    ) -> np.ndarray:
         """
         Add (N+1) BHK options if they fit within budget.
         Sales logic: Show better value when available.
         
         Args:
-            all_projects: All projects that passed other filters
+            index: Catalog index for the current snapshot
+            project_mask: Projects that passed other filters
             requested_bedrooms: List of requested BHK counts [2, 3]
             max_budget_lakhs: Maximum budget in lakhs (None if no budget filter)
-            normalize_func: Function to normalize configuration strings
             
         Returns:
-            List of better-value projects (N+1 BHK within budget)
+            Mask of better-value projects (N+1 BHK within budget)
         """
-        better_value = []
-        
-        for req_bhk in requested_bedrooms:
-            next_bhk = req_bhk + 1
-            
-            for project in all_projects:
-                # Check if project has (N+1) BHK configuration
-                conf = normalize_func(project.get('configuration', ''))
-                has_next_bhk = f"{next_bhk}" in conf
-                
-                if not has_next_bhk:
-                    continue
-                
-                # Check if it fits within budget
-                budget_min = project.get('budget_min', 0)
-                if budget_min and budget_min > 0:
-                    if max_budget_lakhs is None or budget_min <= max_budget_lakhs:
-                        # This is a better-value option
-                        better_value.append(project)
-        
-        logger.info(f"Found {len(better_value)} better-value configurations (N+1 BHK within budget)")
+        next_bhks = [req_bhk + 1 for req_bhk in requested_bedrooms]
+        has_next_bhk = index.units.projects_with(index.units.match(next_bhks, project_mask=project_mask))
+
+        # Check if it fits within budget
+        budget_cap = max_budget_lakhs if max_budget_lakhs is not None else np.inf
+        better_value = has_next_bhk & index.max_price_mask(budget_cap)
+
+        logger.info(f"Found {int(better_value.sum())} better-value configurations (N+1 BHK within budget)")
         return better_value
 
     def _get_project_units(self, project_id: str, bhk_filter: List[int] = None) -> List[Dict[str, Any]]:
@@ -740,29 +678,24 @@ class HybridRetrievalService:
             matching_results = []
             if filters.bedrooms:
                 target_bhks = filters.bedrooms # List[int], e.g. [2, 3]
-                def check_bhk(r):
-                    # Project config usually string: "2, 3 BHK" or "2BHK"
-                    conf = normalize(r.get('configuration', ''))
-                    for bhk in target_bhks:
-                        if f"{bhk}" in conf: # Simple substring check: "2" in "2, 3 BHK"
-                            return True
-                    return False
-                
-                matching_results = [r for r in filtered_results if check_bhk(r)]
+                matching_results = [r for r in filtered_results
+                                    if any(bhk in configuration_bhks(r.get('configuration', '')) for bhk in target_bhks)]
                 
                 # SALES LOGIC: Add better-value configurations (N+1 BHK if within budget)
-                better_value_results = self._add_better_value_configurations(
-                    all_projects=filtered_results,
-                    requested_bedrooms=target_bhks,
-                    max_budget_lakhs=filters.max_price_inr / 100000 if filters.max_price_inr else None,
-                    normalize_func=normalize
-                )
+                max_budget_lakhs = filters.max_price_inr / 100000 if filters.max_price_inr else None
+                better_value_results = [
+                    r for r in filtered_results
+                    if any(bhk + 1 in configuration_bhks(r.get('configuration', '')) for bhk in target_bhks)
+                    and r.get('budget_min') and r.get('budget_min') > 0
+                    and (max_budget_lakhs is None or r.get('budget_min') <= max_budget_lakhs)
+                ]
                 
                 # Combine matching and better-value, avoiding duplicates
                 seen_ids = {r.get('project_id') or r.get('name') for r in matching_results}
                 for bv in better_value_results:
                     bv_id = bv.get('project_id') or bv.get('name')
                     if bv_id not in seen_ids:
+                        bv = dict(bv)  # Don't mark the shared mock rows
                         bv['_better_value'] = True  # Mark as better value suggestion
                         matching_results.append(bv)
                         seen_ids.add(bv_id)
@@ -878,22 +811,10 @@ class HybridRetrievalService:
             return []
             
         lat, lon = center_coords
-        matches = []
-        
-        # Search in mock data (or Pixeltable if it had latent coords)
-        # For now we use the enriched mock data
-        source = self.mock_projects
-        
-        for p in source:
-            if '_lat' in p and '_lon' in p:
-                dist = calculate_distance(lat, lon, p['_lat'], p['_lon'])
-                if dist <= radius_km:
-                    p_copy = p.copy()
-                    p_copy['_distance'] = round(dist, 2)
-                    matches.append(p_copy)
-                    
-        # Sort by distance
-        matches.sort(key=lambda x: x.get('_distance', 999))
+        # Grid-indexed coordinates of the current snapshot (seed data when the DB is down)
+        matches = project_repository.within_radius(lat, lon, radius_km)
+        for p in matches:
+            p['_distance'] = round(p['_distance'], 2)
         return matches
 
     async def get_budget_alternatives(
@@ -910,13 +831,16 @@ class HybridRetrievalService:
         2. Slightly higher budget (better value)
         3. Same budget in emerging areas (better appreciation)
         
+        All variants are searched together in one pass.
+        
         Args:
-            original_filters: Customer's original search filters
+            original_filters: Customer's original search filters (PropertyFilters
+                or the session's current_filters dict)
             budget_adjustment_percent: How much to adjust budget (default 20%)
             max_results: Maximum alternatives per category
         
         Returns:
-            Dict with three categories of alternatives
+            Dict with three categories of alternatives (budgets in INR)
         """
         alternatives = {
             "lower_budget": [],
@@ -924,82 +848,55 @@ class HybridRetrievalService:
             "emerging_areas": []
         }
         
-        if not original_filters.budget_max:
+        if isinstance(original_filters, dict):
+            known = {k: v for k, v in original_filters.items() if k in PropertyFilters.model_fields}
+            original_filters = PropertyFilters(**known)
+        
+        original_budget = original_filters.max_price_inr or original_filters.budget_inr
+        if not original_budget:
             logger.warning("No budget specified, cannot generate alternatives")
+            alternatives["metadata"] = {"original_budget_max": None, "total_alternatives": 0}
             return alternatives
         
-        original_budget = original_filters.budget_max
+        lower_budget = int(original_budget * (1 - budget_adjustment_percent/100))
+        higher_budget = int(original_budget * (1 + budget_adjustment_percent/100))
+        base = original_filters.model_copy(update={"budget_inr": None})
         
         # 1. Lower budget alternatives (20% less)
-        lower_budget_filters = PropertyFilters(
-            configuration=original_filters.configuration,
-            budget_min=original_filters.budget_min,
-            budget_max=int(original_budget * (1 - budget_adjustment_percent/100)),
-            location=original_filters.location,
-            radius_km=original_filters.radius_km,
-            possession_year=original_filters.possession_year
-        )
-        
-        try:
-            lower_results = await self.search_with_filters(
-                query="affordable alternatives",
-                filters=lower_budget_filters
-            )
-            alternatives["lower_budget"] = lower_results.get("projects", [])[:max_results]
-            logger.info(f"Found {len(alternatives['lower_budget'])} lower budget alternatives")
-        except Exception as e:
-            logger.error(f"Error finding lower budget alternatives: {e}")
+        variants = [base.model_copy(update={"max_price_inr": lower_budget})]
+        # 2. Better value alternatives (up to 20% higher budget)
+        variants.append(base.model_copy(update={"min_price_inr": original_budget, "max_price_inr": higher_budget}))
         
-        # 2. Better value alternatives (10-20% higher budget)
-        higher_budget_filters = PropertyFilters(
-            configuration=original_filters.configuration,
-            budget_min=original_budget,
-            budget_max=int(original_budget * (1 + budget_adjustment_percent/100)),
-            location=original_filters.location,
-            radius_km=original_filters.radius_km,
-            possession_year=original_filters.possession_year
-        )
+        # 3. Emerging area alternatives (same budget, different location)
+        # Target emerging hotspots: Sarjapur, Devanahalli, Hennur
+        emerging_locations = ["Sarjapur", "Devanahalli", "Hennur", "Bannerghatta Road"]
+        current_location = (original_filters.locality or original_filters.area or "").lower()
+        emerging_locations = [loc for loc in emerging_locations if loc.lower() not in current_location]
+        for location in emerging_locations:
+            variants.append(base.model_copy(update={
+                "max_price_inr": original_budget,
+                "locality": location,
+                "area": filter_extractor.get_zone_for_locality(location)
+            }))
         
         try:
-            higher_results = await self.search_with_filters(
-                query="premium options",
-                filters=higher_budget_filters
+            results = await self.search_with_filter_variants(
+                query="budget alternatives",
+                variants=variants
             )
-            alternatives["better_value"] = higher_results.get("projects", [])[:max_results]
-            logger.info(f"Found {len(alternatives['better_value'])} better value alternatives")
         except Exception as e:
-            logger.error(f"Error finding better value alternatives: {e}")
+            logger.error(f"Error finding budget alternatives: {e}")
+            results = [{} for _ in variants]
         
-        # 3. Emerging area alternatives (same budget, different location)
-        # Target emerging hotspots: Sarjapur, Devanahalli, Hennur
-        emerging_locations = ["Sarjapur", "Devanahalli", "Hennur", "Bannerghatta Road"]
+        alternatives["lower_budget"] = results[0].get("projects", [])[:max_results]
+        logger.info(f"Found {len(alternatives['lower_budget'])} lower budget alternatives")
+        alternatives["better_value"] = results[1].get("projects", [])[:max_results]
+        logger.info(f"Found {len(alternatives['better_value'])} better value alternatives")
         
-        for location in emerging_locations:
-            if location.lower() in (original_filters.location or "").lower():
-                continue  # Skip if already searching in this area
-            
-            emerging_filters = PropertyFilters(
-                configuration=original_filters.configuration,
-                budget_min=original_filters.budget_min,
-                budget_max=original_budget,
-                location=location,
-                radius_km=15.0,  # Wider radius for emerging areas
-                possession_year=original_filters.possession_year
-            )
-            
-            try:
-                emerging_results = await self.search_with_filters(
-                    query=f"projects in {location}",
-                    filters=emerging_filters
-                )
-                
-                if emerging_results.get("projects"):
-                    alternatives["emerging_areas"].extend(emerging_results["projects"][:2])
-                    
-                    if len(alternatives["emerging_areas"]) >= max_results:
-                        break
-            except Exception as e:
-                logger.error(f"Error finding alternatives in {location}: {e}")
+        for location, result in zip(emerging_locations, results[2:]):
+            alternatives["emerging_areas"].extend(result.get("projects", [])[:2])
+            if len(alternatives["emerging_areas"]) >= max_results:
+                break
         
         alternatives["emerging_areas"] = alternatives["emerging_areas"][:max_results]
         logger.info(f"Found {len(alternatives['emerging_areas'])} emerging area alternatives")
@@ -1007,8 +904,8 @@ class HybridRetrievalService:
         # Add metadata
         alternatives["metadata"] = {
             "original_budget_max": original_budget,
-            "lower_budget_max": int(original_budget * (1 - budget_adjustment_percent/100)),
-            "higher_budget_max": int(original_budget * (1 + budget_adjustment_percent/100)),
+            "lower_budget_max": lower_budget,
+            "higher_budget_max": higher_budget,
             "adjustment_percent": budget_adjustment_percent,
             "total_alternatives": (
                 len(alternatives["lower_budget"]) +
@@ -7,20 +7,14 @@ Uses location proximity and value-focused sales pitches.
 from typing import Dict, List, Any, Optional, Tuple
 from services.filter_extractor import PropertyFilters
 from services.hybrid_retrieval import hybrid_retrieval
-from utils.geolocation_utils import get_coordinates, calculate_distance
-from openai import OpenAI
+from utils.geolocation_utils import get_coordinates
+from services.unit_table import UnitTable, configuration_bhks
 from config import settings
+from services.llm_gateway import llm_gateway
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-client = OpenAI(
-    api_key=settings.openai_api_key,
-    base_url=settings.openai_base_url,
-    timeout=30.0  # 30 second timeout for API calls
-)
-
 
 class IntelligentFallbackService:
     """
@@ -118,6 +112,7 @@ class IntelligentFallbackService:
             top_alternatives = ranked_projects[:max_results]
             
             logger.info(f"Returning {len(top_alternatives)} alternatives")
+            self._attach_closest_units(top_alternatives, filters)
             
             # Step 5: Generate value-focused sales pitches
             answer = await self._generate_answer_with_pitches(
@@ -248,16 +243,12 @@ class IntelligentFallbackService:
         """
         better_value = []
         
-        def normalize(s):
-            return str(s).lower().strip() if s else ""
-        
         for req_bhk in requested_bedrooms:
             next_bhk = req_bhk + 1
             
             for project in all_projects:
                 # Check if project has (N+1) BHK configuration
-                conf = normalize(project.get('configuration', ''))
-                has_next_bhk = f"{next_bhk}" in conf
+                has_next_bhk = next_bhk in configuration_bhks(project.get('configuration', '') or '')
                 
                 if not has_next_bhk:
                     continue
@@ -272,6 +263,35 @@ class IntelligentFallbackService:
         logger.info(f"Found {len(better_value)} better-value configurations in fallback")
         return better_value
 
+    def _attach_closest_units(
+        self,
+        alternatives: List[Dict[str, Any]],
+        filters: PropertyFilters
+    ) -> None:
+        """
+        Annotate each alternative with its configuration priced closest to the
+        customer's budget (restricted to the requested BHK when given).
+        """
+        requested_budget_lakhs = None
+        if filters.max_price_inr:
+            requested_budget_lakhs = filters.max_price_inr / 100000
+        elif filters.budget_inr:
+            requested_budget_lakhs = filters.budget_inr / 100000
+        if not requested_budget_lakhs or not alternatives:
+            return
+        
+        units = UnitTable(p.get('configuration') for p in alternatives)
+        unit_mask = units.match(filters.bedrooms) if filters.bedrooms else None
+        closest = {}
+        for unit in units.nearest_by_price(requested_budget_lakhs / 100, unit_mask=unit_mask):
+            closest.setdefault(int(units.project_idx[unit]), unit)
+            if len(closest) == len(alternatives):
+                break
+        
+        for idx, project in enumerate(alternatives):
+            if idx in closest:
+                project['matching_units'] = units.to_dicts([closest[idx]])
+
     def _calculate_score(
         self,
         project: Dict[str, Any],
@@ -308,11 +328,9 @@ class IntelligentFallbackService:
         
         # Configuration match score (20 points max)
         if filters.bedrooms:
-            project_config = project.get('configuration', '').lower()
-            for bedroom_count in filters.bedrooms:
-                if f"{bedroom_count}bhk" in project_config or f"{bedroom_count} bhk" in project_config:
-                    score += 20
-                    break
+            project_bhks = configuration_bhks(project.get('configuration', '') or '')
+            if any(bedroom_count in project_bhks for bedroom_count in filters.bedrooms):
+                score += 20
         else:
             score += 10  # No config filter = moderate score
         
@@ -339,12 +357,16 @@ class IntelligentFallbackService:
             budget_min = project.get('budget_min', 0) / 100  # Convert lakhs to Cr
             budget_max = project.get('budget_max', 0) / 100
             distance = project.get('_distance', 'N/A')
+            closest_unit = ""
+            if project.get('matching_units'):
+                unit = project['matching_units'][0]
+                closest_unit = f"\n   - Closest to budget: {unit['bhk']} BHK at ₹{unit['price_cr']:.2f} Cr"
             
             context_parts.append(f"""
 {idx}. {project.get('name')}
    - Location: {project.get('location')} ({distance} km from {location_name})
    - Budget: ₹{budget_min:.2f} - ₹{budget_max:.2f} Cr
-   - Configuration: {project.get('configuration', 'N/A')}
+   - Configuration: {project.get('configuration', 'N/A')}{closest_unit}
    - Amenities: {project.get('amenities', 'N/A')}
    - USP: {project.get('usp', 'N/A')}
    - Status: {project.get('status')}
@@ -393,7 +415,7 @@ Use emojis, be enthusiastic but professional. End with: "Would you like to sched
 Focus on VALUE and BENEFITS. No paragraphs."""
 
         try:
-            response = client.chat.completions.create(
+            response = await llm_gateway.chat(
                 model=settings.effective_gpt_model,
                 messages=[
                     {
@@ -456,6 +478,7 @@ Focus on VALUE and BENEFITS. No paragraphs."""
                 "zone": project.get('zone'),
                 "configuration": project.get('configuration'),
                 "config_summary": project.get('configuration'),
+                "matching_units": project.get('matching_units', []),
                 "budget_min": project.get('budget_min'),
                 "budget_max": project.get('budget_max'),
                 "price_range": f"₹{project.get('budget_min', 0)/100:.2f} - ₹{project.get('budget_max', 0)/100:.2f} Cr",
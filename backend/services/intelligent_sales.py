@@ -15,11 +15,12 @@ from typing import Dict, Any, Optional, List, Tuple
 from enum import Enum
 from pydantic import BaseModel
 import json
-import httpx
+from openai import APIStatusError
 
 from services.sales_intelligence import sales_intelligence
 from services.sales_conversation import SUGGESTED_ACTIONS
 from config import settings
+from services.llm_gateway import llm_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -253,8 +254,6 @@ class IntelligentSalesHandler:
     """
     
     def __init__(self):
-        self.api_key = settings.openai_api_key
-        self.api_base = settings.openai_base_url
         self.model = settings.effective_gpt_model
         
         # Try to initialize Pixeltable for pre-computed FAQs
@@ -305,33 +304,23 @@ class IntelligentSalesHandler:
         messages.append({"role": "user", "content": user_message})
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.api_base}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": messages,
-                        "temperature": 0.7,
-                        "max_tokens": 800
-                    }
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    return result["choices"][0]["message"]["content"]
-                else:
-                    logger.error(f"LLM API error: {response.status_code} - {response.text}")
-                    return None
-                    
+            response = await llm_gateway.chat(
+                model=self.model,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=800,
+                timeout=30.0
+            )
+            return response.choices[0].message.content
+
+        except APIStatusError as e:
+            logger.error(f"LLM API error: {e.status_code} - {e.message}")
+            return None
         except Exception as e:
             logger.error(f"Error calling LLM: {e}")
             return None
 
-    def classify_intent(self, query: str) -> SalesIntent:
+    async def classify_intent(self, query: str) -> SalesIntent:
         """
         Intelligent intent classification using GPT.
         Falls back to keyword matching if GPT fails.
@@ -341,7 +330,7 @@ class IntelligentSalesHandler:
         # Try GPT-first classification
         try:
             from services.gpt_intent_classifier import classify_intent_gpt_first
-            gpt_result = classify_intent_gpt_first(query)
+            gpt_result = await classify_intent_gpt_first(query)
             gpt_intent = gpt_result.get("intent", "")
             
             # Map GPT intents to SalesIntent
@@ -692,7 +681,7 @@ I'd love to help you further!
         Returns:
             (response_text, intent, should_fallback_to_rag, suggested_actions)
         """
-        intent = self.classify_intent(query)
+        intent = await self.classify_intent(query)
         logger.info(f"Classified sales intent: {intent.value}")
         
         # For property queries, always fallback to RAG
@@ -713,7 +702,7 @@ I'd love to help you further!
                     if not session_context:
                         session_context = self.session_manager.get_context_summary(session_id)
                     
-                    response = generate_contextual_response_with_full_history(
+                    response = await generate_contextual_response_with_full_history(
                         query=query,
                         conversation_history=conversation_history or session.messages[-10:],
                         session_context=session_context,
@@ -801,9 +790,9 @@ I'd love to help you further!
         }
         return context_map.get(intent, "general")
     
-    def should_handle(self, query: str) -> bool:
+    async def should_handle(self, query: str) -> bool:
         """Check if this handler should process the query."""
-        intent = self.classify_intent(query)
+        intent = await self.classify_intent(query)
         return intent not in [SalesIntent.UNKNOWN, SalesIntent.PROPERTY_QUERY]
 
 
@@ -0,0 +1,229 @@
+"""
+LLM Response Cache - Content-addressed cache for deterministic LLM calls.
+
+Temperature-0 JSON calls (intent classification, requirement/filter
+extraction) are keyed by a hash of model, messages and request params, so a
+repeated phrasing is answered from memory instead of a paid round trip.
+
+Two tiers:
+- L1: in-process bounded LRU (per worker)
+- L2: Redis at settings.redis_url (shared across workers and restarts);
+  skipped while Redis is unreachable, retried periodically
+
+Callers opt in per call site through `llm_gateway.chat(..., cache="<site>")`;
+each site has its own TTL in LLM_CACHE_TTLS. Calls without a site, or with a
+non-zero temperature, are never cached.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# TTL (seconds) per call site
+LLM_CACHE_TTLS = {
+    "intent_classification": 6 * 3600,
+    "followup_intent": 6 * 3600,
+    "requirements_intent": 6 * 3600,
+    "requirements_extraction": 24 * 3600,
+    "filter_extraction": 24 * 3600,
+}
+
+LLM_CACHE_MAX_ENTRIES = 2048
+REDIS_KEY_PREFIX = "llmcache:v1:"
+REDIS_RETRY_SECONDS = 60.0
+
+_EMPTY_STATS = {"hits_l1": 0, "hits_l2": 0, "misses": 0, "stores": 0, "errors": 0}
+
+
+def request_fingerprint(model: str, messages: List[Dict[str, Any]], params: Dict[str, Any]) -> str:
+    """Stable hash of everything that determines a deterministic completion."""
+    payload = json.dumps({"model": model, "messages": messages, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Two-tier (in-process LRU + Redis) cache of completion payloads."""
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        enabled: bool = True
+    ):
+        self.redis_url = redis_url
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_retry_at = 0.0
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def ttl_for(self, site: Optional[str]) -> Optional[int]:
+        return LLM_CACHE_TTLS.get(site) if site else None
+
+    def key(self, model: str, messages: List[Dict[str, Any]], params: Dict[str, Any]) -> str:
+        return request_fingerprint(model, messages, params)
+
+    # ------------------------------------------------------------------
+    # Sync API (flow engine, worker threads)
+    # ------------------------------------------------------------------
+
+    def get(self, site: str, key: str) -> Optional[Dict[str, Any]]:
+        payload = self._get_l1(site, key)
+        if payload is not None:
+            return payload
+        return self._get_l2(site, key)
+
+    def put(self, site: str, key: str, payload: Dict[str, Any], ttl: int) -> None:
+        expires_at = time.time() + ttl
+        self._put_l1(site, key, payload, expires_at)
+        self._put_l2(key, payload, expires_at, ttl)
+
+    # ------------------------------------------------------------------
+    # Async API (event loop): L1 inline, Redis on a worker thread
+    # ------------------------------------------------------------------
+
+    async def aget(self, site: str, key: str) -> Optional[Dict[str, Any]]:
+        payload = self._get_l1(site, key)
+        if payload is not None:
+            return payload
+        if self._redis_client() is None:
+            self._count(site, "misses")
+            return None
+        return await asyncio.to_thread(self._get_l2, site, key)
+
+    async def aput(self, site: str, key: str, payload: Dict[str, Any], ttl: int) -> None:
+        expires_at = time.time() + ttl
+        self._put_l1(site, key, payload, expires_at)
+        if self._redis_client() is not None:
+            await asyncio.to_thread(self._put_l2, key, payload, expires_at, ttl)
+
+    # ------------------------------------------------------------------
+    # Tiers
+    # ------------------------------------------------------------------
+
+    def _get_l1(self, site: str, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self._count(site, "hits_l1")
+                    return payload
+                del self._entries[key]
+        return None
+
+    def _put_l1(self, site: str, key: str, payload: Dict[str, Any], expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, payload)
+            self._entries.move_to_end(key)
+            self._count(site, "stores")
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_l2(self, site: str, key: str) -> Optional[Dict[str, Any]]:
+        client = self._redis_client()
+        if client is not None:
+            try:
+                raw = client.get(REDIS_KEY_PREFIX + key)
+                if raw:
+                    stored = json.loads(raw)
+                    if stored["expires_at"] > time.time():
+                        # Promote to L1 with the remaining TTL
+                        with self._lock:
+                            self._entries[key] = (stored["expires_at"], stored["response"])
+                            self._entries.move_to_end(key)
+                            self._count(site, "hits_l2")
+                        return stored["response"]
+            except Exception as e:
+                self._redis_failed(e)
+                self._count(site, "errors")
+        self._count(site, "misses")
+        return None
+
+    def _put_l2(self, key: str, payload: Dict[str, Any], expires_at: float, ttl: int) -> None:
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            client.setex(REDIS_KEY_PREFIX + key, ttl, json.dumps({"expires_at": expires_at, "response": payload}))
+        except Exception as e:
+            self._redis_failed(e)
+
+    def _redis_client(self):
+        """Redis client, or None while Redis is unconfigured or recently unreachable."""
+        if not self.redis_url:
+            return None
+        if self._redis is not None:
+            return self._redis
+        if time.time() < self._redis_retry_at:
+            return None
+        with self._lock:
+            if self._redis is None:
+                try:
+                    import redis
+                    client = redis.from_url(self.redis_url, decode_responses=True,
+                                            socket_connect_timeout=1, socket_timeout=1)
+                    client.ping()
+                    self._redis = client
+                    logger.info("LLM cache: Redis L2 connected")
+                except Exception as e:
+                    self._redis_retry_at = time.time() + REDIS_RETRY_SECONDS
+                    logger.warning(f"LLM cache: Redis L2 unavailable ({e}), using in-process cache only")
+        return self._redis
+
+    def _redis_failed(self, error: Exception) -> None:
+        logger.warning(f"LLM cache: Redis L2 error: {error}")
+        self._redis = None
+        self._redis_retry_at = time.time() + REDIS_RETRY_SECONDS
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def _count(self, site: str, counter: str) -> None:
+        self._stats.setdefault(site, dict(_EMPTY_STATS))[counter] += 1
+
+    def clear(self) -> None:
+        """Drop the in-process tier (Redis entries expire on their own)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        sites = {}
+        totals = dict(_EMPTY_STATS)
+        for site, counters in list(self._stats.items()):
+            lookups = counters["hits_l1"] + counters["hits_l2"] + counters["misses"]
+            hits = counters["hits_l1"] + counters["hits_l2"]
+            sites[site] = {**counters, "hit_rate": round(hits / lookups, 3) if lookups else None}
+            for name, value in counters.items():
+                totals[name] += value
+        lookups = totals["hits_l1"] + totals["hits_l2"] + totals["misses"]
+        hits = totals["hits_l1"] + totals["hits_l2"]
+        return {
+            **totals,
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "redis": self._redis is not None,
+            "hit_rate": round(hits / lookups, 3) if lookups else None,
+            "sites": sites,
+        }
+
+
+# Global instance
+llm_cache = LLMResponseCache(
+    redis_url=settings.redis_url,
+    enabled=settings.llm_cache_enabled
+)
@@ -0,0 +1,407 @@
+"""
+LLM Gateway - Shared, pooled access to the chat completions API.
+
+Every GPT-calling service goes through the global `llm_gateway` instead of
+constructing its own OpenAI client. Async handlers `await llm_gateway.chat(...)`
+so the event loop keeps serving other conversations during the round trip;
+the underlying httpx pool keeps connections alive between calls and speaks
+HTTP/2 when the optional `h2` package is installed (httpx[http2]).
+
+Code that still runs synchronously (the flow engine, offloaded to a worker
+thread by its async callers, and scripts) uses `chat_sync`, which shares the
+same pool settings and timeouts.
+
+Deterministic calls can opt into the response cache (services/llm_cache.py)
+by naming their call site: `chat(..., cache="intent_classification")`.
+Concurrent identical cacheable calls are also coalesced into one request
+(services/single_flight.py) while the first is still in flight.
+
+Before it is sent, every call waits for capacity in the rate-limit scheduler
+(services/llm_scheduler.py) at its priority: deterministic `cache=` sites
+default to INTERACTIVE, everything else to CONSULTANT, and background work
+passes `priority=Priority.BACKGROUND`. Transient 429s that survive the SDK's
+retries surface as LLMOverloadedError, so callers degrade instead of failing;
+quota exhaustion still raises openai.RateLimitError.
+
+User-facing text can be streamed as content deltas with `chat_stream` /
+`chat_stream_sync` (see services/response_stream.py for the SSE endpoints).
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+import openai
+from openai import AsyncOpenAI, OpenAI
+from openai.types.chat import ChatCompletion
+
+from config import settings
+from services.deadline import DeadlineExceeded, clip_timeout, current_deadline, degrade
+from services.llm_cache import LLMResponseCache, llm_cache
+from services.llm_scheduler import (
+    WAIT_BY_PRIORITY, LLMOverloadedError, LLMScheduler, Priority, estimate_tokens, llm_scheduler
+)
+from services.single_flight import single_flight
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Read timeouts (seconds) by model prefix; call sites can override per call
+MODEL_TIMEOUTS = {
+    "gpt-4o-mini": 20.0,
+    "gpt-4o": 30.0,
+    "gpt-4-turbo": 30.0,
+    "gpt-4": 30.0,
+    "gpt-3.5-turbo": 20.0,
+}
+DEFAULT_TIMEOUT = 30.0
+CONNECT_TIMEOUT = 5.0
+
+# Connection pool
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 60.0
+
+
+def timeout_for(model: str, timeout: Optional[float] = None) -> httpx.Timeout:
+    """
+    Request timeout for `model` (longest matching prefix), unless `timeout` is
+    given; capped to what is left of the request deadline, if any.
+    """
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUT
+        for prefix in sorted(MODEL_TIMEOUTS, key=len, reverse=True):
+            if model.startswith(prefix):
+                timeout = MODEL_TIMEOUTS[prefix]
+                break
+    timeout = clip_timeout(timeout)
+    return httpx.Timeout(timeout, connect=min(CONNECT_TIMEOUT, timeout))
+
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY
+    )
+
+
+class LLMGateway:
+    """Owns the pooled OpenAI clients (async and sync) used by all services."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        cache: Optional[LLMResponseCache] = None,
+        scheduler: Optional[LLMScheduler] = None
+    ):
+        self.api_key = api_key or settings.openai_api_key
+        self.base_url = base_url or settings.openai_base_url
+        self.cache = cache if cache is not None else llm_cache
+        self.scheduler = scheduler if scheduler is not None else llm_scheduler
+        self._async_client: Optional[AsyncOpenAI] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sync_client: Optional[OpenAI] = None
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "streams": 0, "errors": 0}
+
+    # ------------------------------------------------------------------
+    # Clients
+    # ------------------------------------------------------------------
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """AsyncOpenAI bound to the running event loop's connection pool."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # httpx pools are tied to the loop that created them (e.g. a new asyncio.run in scripts)
+            if self._async_client is None or self._async_loop is not loop:
+                self._async_client = AsyncOpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    timeout=DEFAULT_TIMEOUT,
+                    http_client=httpx.AsyncClient(
+                        http2=HTTP2_AVAILABLE,
+                        limits=_pool_limits(),
+                        timeout=DEFAULT_TIMEOUT,
+                        event_hooks={"response": [self._observe_response_async]}
+                    )
+                )
+                self._async_loop = loop
+                logger.info(f"LLM gateway: async pool ready (http2={HTTP2_AVAILABLE})")
+            return self._async_client
+
+    @property
+    def sync_client(self) -> OpenAI:
+        """Pooled synchronous OpenAI client for code running outside the event loop."""
+        with self._lock:
+            if self._sync_client is None:
+                self._sync_client = OpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    timeout=DEFAULT_TIMEOUT,
+                    http_client=httpx.Client(
+                        http2=HTTP2_AVAILABLE,
+                        limits=_pool_limits(),
+                        timeout=DEFAULT_TIMEOUT,
+                        event_hooks={"response": [self._observe_response]}
+                    )
+                )
+            return self._sync_client
+
+    def _observe_response(self, response: httpx.Response) -> None:
+        """Feed rate-limit headers (and 429s, including SDK retries) to the scheduler."""
+        try:
+            model = json.loads(response.request.content).get("model")
+        except Exception:
+            return
+        if model:
+            self.scheduler.observe(model, response.headers, response.status_code)
+
+    async def _observe_response_async(self, response: httpx.Response) -> None:
+        self._observe_response(response)
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _priority(priority: Optional[Priority], cache: Optional[str]) -> Priority:
+        if priority is not None:
+            return priority
+        # Deterministic call sites are classification / extraction on the user's turn
+        return Priority.INTERACTIVE if cache else Priority.CONSULTANT
+
+    @staticmethod
+    def _for_request(client):
+        """Under a request deadline the SDK must not retry: a retry would run past the budget."""
+        return client.with_options(max_retries=0) if current_deadline() is not None else client
+
+    def _failure(self, model: str, error: Exception, stage: str = "llm") -> Exception:
+        """Count a failed call; transient rate limits become LLMOverloadedError."""
+        self._stats["errors"] += 1
+        if isinstance(error, (DeadlineExceeded, openai.APITimeoutError)):
+            degrade(stage, "out of time")
+        if isinstance(error, openai.RateLimitError) and getattr(error, "code", None) != "insufficient_quota":
+            return LLMOverloadedError(f"{model} is rate limited: {error}")
+        return error
+
+    def _cache_plan(
+        self,
+        site: Optional[str],
+        model: str,
+        messages: List[Dict[str, Any]],
+        params: Dict[str, Any]
+    ) -> Optional[Tuple[str, int]]:
+        """(key, ttl) when this call may be served from / stored in the cache."""
+        if not site or not self.cache.enabled:
+            return None
+        ttl = self.cache.ttl_for(site)
+        if not ttl:
+            logger.warning(f"LLM cache: no TTL configured for call site '{site}', not caching")
+            return None
+        if params.get("temperature") != 0:
+            return None  # Creative / sampled output is never cached
+        return self.cache.key(model, messages, params), ttl
+
+    @staticmethod
+    def _cacheable(response: ChatCompletion) -> bool:
+        if not isinstance(response, ChatCompletion):
+            return False
+        choice = response.choices[0] if response.choices else None
+        return bool(choice and choice.message.content and choice.finish_reason != "length")
+
+    @staticmethod
+    def _from_cache(payload: Dict[str, Any]) -> Optional[ChatCompletion]:
+        try:
+            return ChatCompletion.model_validate(payload)
+        except Exception as e:
+            logger.warning(f"LLM cache: discarding unreadable entry: {e}")
+            return None
+
+    async def chat(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str] = None,
+        timeout: Optional[float] = None,
+        cache: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        max_wait: Any = WAIT_BY_PRIORITY,
+        **params: Any
+    ) -> ChatCompletion:
+        """
+        Chat completion (same response object as `client.chat.completions.create`).
+
+        `cache` names the call site for the response cache; omit it for
+        calls whose output must not be reused. `priority` is the scheduler
+        priority (see module docstring for the default); `max_wait` caps the
+        wait for capacity in seconds (None: wait as long as it takes).
+        """
+        model = model or settings.effective_gpt_model
+        priority = self._priority(priority, cache)
+        plan = self._cache_plan(cache, model, messages, params)
+        if plan:
+            cached = await self.cache.aget(cache, plan[0])
+            response = self._from_cache(cached) if cached is not None else None
+            if response is not None:
+                return response
+
+        async def fetch() -> ChatCompletion:
+            await self.scheduler.acquire(model, priority, estimate_tokens(messages, params.get("max_tokens")), max_wait)
+            self._stats["requests"] += 1
+            try:
+                response = await self._for_request(self.async_client).chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    timeout=timeout_for(model, timeout),
+                    **params
+                )
+            except Exception as e:
+                error = self._failure(model, e, cache or "llm")
+                if error is e:
+                    raise
+                raise error from e
+            if plan and self._cacheable(response):
+                await self.cache.aput(cache, plan[0], response.model_dump(mode="json"), plan[1])
+            return response
+
+        if plan:
+            # Identical deterministic calls already in flight share one request
+            return await single_flight.do(f"llm:{cache}", plan[0], fetch)
+        return await fetch()
+
+    def chat_sync(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str] = None,
+        timeout: Optional[float] = None,
+        cache: Optional[str] = None,
+        priority: Optional[Priority] = None,
+        max_wait: Any = WAIT_BY_PRIORITY,
+        **params: Any
+    ) -> ChatCompletion:
+        """Blocking chat completion; only for code that already runs off the event loop."""
+        model = model or settings.effective_gpt_model
+        priority = self._priority(priority, cache)
+        plan = self._cache_plan(cache, model, messages, params)
+        if plan:
+            cached = self.cache.get(cache, plan[0])
+            response = self._from_cache(cached) if cached is not None else None
+            if response is not None:
+                return response
+
+        def fetch() -> ChatCompletion:
+            self.scheduler.acquire_sync(model, priority, estimate_tokens(messages, params.get("max_tokens")), max_wait)
+            self._stats["requests"] += 1
+            try:
+                response = self._for_request(self.sync_client).chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    timeout=timeout_for(model, timeout),
+                    **params
+                )
+            except Exception as e:
+                error = self._failure(model, e, cache or "llm")
+                if error is e:
+                    raise
+                raise error from e
+            if plan and self._cacheable(response):
+                self.cache.put(cache, plan[0], response.model_dump(mode="json"), plan[1])
+            return response
+
+        if plan:
+            return single_flight.do_sync(f"llm:{cache}", plan[0], fetch)
+        return fetch()
+
+    async def chat_stream(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str] = None,
+        timeout: Optional[float] = None,
+        priority: Priority = Priority.CONSULTANT,
+        **params: Any
+    ) -> AsyncIterator[str]:
+        """
+        Streamed chat completion: yields content deltas as they arrive.
+
+        Streamed output is never cached (it is only used for sampled,
+        user-facing text).
+        """
+        model = model or settings.effective_gpt_model
+        await self.scheduler.acquire(model, priority, estimate_tokens(messages, params.get("max_tokens")))
+        self._stats["requests"] += 1
+        self._stats["streams"] += 1
+        try:
+            stream = await self._for_request(self.async_client).chat.completions.create(
+                model=model,
+                messages=messages,
+                timeout=timeout_for(model, timeout),
+                stream=True,
+                **params
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        except Exception as e:
+            error = self._failure(model, e, "generation")
+            if error is e:
+                raise
+            raise error from e
+
+    def chat_stream_sync(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str] = None,
+        timeout: Optional[float] = None,
+        priority: Priority = Priority.CONSULTANT,
+        **params: Any
+    ) -> Iterator[str]:
+        """Blocking variant of `chat_stream` for code running off the event loop."""
+        model = model or settings.effective_gpt_model
+        self.scheduler.acquire_sync(model, priority, estimate_tokens(messages, params.get("max_tokens")))
+        self._stats["requests"] += 1
+        self._stats["streams"] += 1
+        try:
+            stream = self._for_request(self.sync_client).chat.completions.create(
+                model=model,
+                messages=messages,
+                timeout=timeout_for(model, timeout),
+                stream=True,
+                **params
+            )
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        except Exception as e:
+            error = self._failure(model, e, "generation")
+            if error is e:
+                raise
+            raise error from e
+
+    async def aclose(self) -> None:
+        """Close pooled connections (app shutdown)."""
+        with self._lock:
+            async_client, self._async_client, self._async_loop = self._async_client, None, None
+            sync_client, self._sync_client = self._sync_client, None
+        if async_client is not None:
+            await async_client.close()
+        if sync_client is not None:
+            sync_client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "http2": HTTP2_AVAILABLE}
+
+
+# Global instance
+llm_gateway = LLMGateway()
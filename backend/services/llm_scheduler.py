@@ -0,0 +1,297 @@
+"""
+LLM Scheduler - Client-side rate limiting with priorities for OpenAI calls.
+
+Every gateway call takes capacity from per-model token buckets (requests per
+minute and tokens per minute) before it is sent. Buckets start from the
+configured limits and are corrected from the `x-ratelimit-*` headers of every
+response, so they follow the organisation-wide budget that other processes
+(ingestion runs, scripts) are spending too. A 429 pauses the model until the
+server's retry-after.
+
+Priorities, highest first:
+- INTERACTIVE: intent classification / requirement extraction on a user turn
+- CONSULTANT: user-facing answer generation
+- BACKGROUND: enrichment, sentiment, FAQ computed columns
+
+Lower priorities leave headroom in each bucket for the higher ones and wait
+while higher-priority calls are queued. A call that would wait longer than
+its priority allows is shed with LLMOverloadedError; callers' existing
+fallbacks turn that into a degraded answer instead of a failed turn.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from enum import IntEnum
+from typing import Any, Dict, List, Mapping, Optional
+
+from config import settings
+from services.deadline import current_deadline
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    CONSULTANT = 1
+    BACKGROUND = 2
+
+
+# Share of each bucket a priority must leave for higher priorities
+RESERVED_HEADROOM = {
+    Priority.INTERACTIVE: 0.0,
+    Priority.CONSULTANT: 0.1,
+    Priority.BACKGROUND: 0.3,
+}
+
+# Longest a call waits for capacity before it is shed (seconds)
+MAX_WAIT = {
+    Priority.INTERACTIVE: 15.0,
+    Priority.CONSULTANT: 10.0,
+    Priority.BACKGROUND: 2.0,
+}
+
+MAX_SLEEP = 0.25  # Re-check at least this often while waiting
+DEFAULT_RETRY_AFTER = 1.0
+DEFAULT_COMPLETION_TOKENS = 512
+WAIT_BY_PRIORITY = object()  # max_wait default: MAX_WAIT for the call's priority
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class LLMOverloadedError(RuntimeError):
+    """Call shed by the scheduler (or rate limited by the API) under pressure."""
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Seconds from OpenAI reset headers ("1s", "6m0s", "20ms") or plain numbers."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _retry_after(headers: Mapping[str, str]) -> float:
+    retry_after_ms = parse_duration(headers.get("retry-after-ms"))
+    if retry_after_ms is not None:
+        return retry_after_ms / 1000.0
+    retry_after = parse_duration(headers.get("retry-after"))
+    return DEFAULT_RETRY_AFTER if retry_after is None else retry_after
+
+
+def _within_deadline(max_wait: Optional[float]) -> Optional[float]:
+    """Never queue past the request deadline."""
+    deadline = current_deadline()
+    if deadline is None:
+        return max_wait
+    return deadline.remaining() if max_wait is None else min(max_wait, deadline.remaining())
+
+
+def estimate_tokens(messages: List[Dict[str, Any]], max_tokens: Optional[int] = None) -> int:
+    """Rough prompt + completion size (~4 characters per token)."""
+    prompt_chars = sum(len(str(message.get("content") or "")) for message in messages)
+    return prompt_chars // 4 + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+class _Bucket:
+    """Per-minute budget refilled continuously."""
+
+    def __init__(self, per_minute: int):
+        self.limit = float(per_minute)
+        self.available = float(per_minute)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.available = min(self.limit, self.available + (now - self.updated) * self.limit / 60.0)
+        self.updated = now
+
+    def wait_for(self, amount: float, headroom: float) -> float:
+        """Seconds until `amount` can be taken while leaving `headroom` of the limit."""
+        amount = min(amount, self.limit * (1.0 - headroom))  # Oversized calls still get through eventually
+        missing = amount + headroom * self.limit - self.available
+        return 0.0 if missing <= 0 else missing * 60.0 / self.limit
+
+    def observe(self, limit: Optional[float], remaining: Optional[float]) -> None:
+        if limit:
+            self.limit = limit
+        if remaining is not None:
+            # Trust the server when it has seen more usage than we have (other processes)
+            self.available = min(self.available, remaining)
+
+
+class _ModelLimits:
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = _Bucket(requests_per_minute)
+        self.tokens = _Bucket(tokens_per_minute)
+        self.paused_until = 0.0
+        self.waiting = Counter()
+
+
+class LLMScheduler:
+    """Token-bucket admission for LLM calls, by model and priority."""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.requests_per_minute = requests_per_minute or settings.llm_requests_per_minute
+        self.tokens_per_minute = tokens_per_minute or settings.llm_tokens_per_minute
+        self.enabled = settings.llm_scheduler_enabled if enabled is None else enabled
+        self._models: Dict[str, _ModelLimits] = {}
+        self._lock = threading.Lock()
+        self._granted = Counter()
+        self._shed = Counter()
+        self._rate_limited = 0
+
+    def _limits(self, model: str) -> _ModelLimits:
+        limits = self._models.get(model)
+        if limits is None:
+            limits = self._models[model] = _ModelLimits(self.requests_per_minute, self.tokens_per_minute)
+        return limits
+
+    def _try_acquire(self, model: str, priority: Priority, tokens: int) -> float:
+        """0 when capacity was taken, otherwise seconds to wait before retrying."""
+        with self._lock:
+            limits = self._limits(model)
+            now = time.monotonic()
+            if now < limits.paused_until:
+                return limits.paused_until - now
+            if any(limits.waiting[p] for p in Priority if p < priority):
+                return MAX_SLEEP  # Higher-priority calls are queued; let them go first
+            limits.requests.refill(now)
+            limits.tokens.refill(now)
+            headroom = RESERVED_HEADROOM[priority]
+            wait = max(limits.requests.wait_for(1, headroom), limits.tokens.wait_for(tokens, headroom))
+            if wait > 0:
+                return wait
+            limits.requests.available -= 1
+            limits.tokens.available -= tokens
+            self._granted[priority.name.lower()] += 1
+            return 0.0
+
+    def _queue(self, model: str, priority: Priority, delta: int) -> None:
+        with self._lock:
+            self._limits(model).waiting[priority] += delta
+
+    def _shed_call(self, model: str, priority: Priority, waited: float) -> LLMOverloadedError:
+        with self._lock:
+            self._shed[priority.name.lower()] += 1
+        logger.warning(f"LLM scheduler: shedding {priority.name.lower()} call to {model} after {waited:.1f}s")
+        return LLMOverloadedError(f"LLM capacity exhausted for {priority.name.lower()} work on {model}")
+
+    async def acquire(
+        self,
+        model: str,
+        priority: Priority = Priority.CONSULTANT,
+        tokens: int = DEFAULT_COMPLETION_TOKENS,
+        max_wait: Any = WAIT_BY_PRIORITY
+    ) -> None:
+        """
+        Wait for capacity to send one call of ~`tokens` tokens.
+
+        Raises LLMOverloadedError when that would take longer than `max_wait`
+        (default: by priority; None waits as long as it takes).
+        """
+        if not self.enabled:
+            return
+        max_wait = _within_deadline(MAX_WAIT[priority] if max_wait is WAIT_BY_PRIORITY else max_wait)
+        wait = self._try_acquire(model, priority, tokens)
+        if not wait:
+            return
+        started = time.monotonic()
+        self._queue(model, priority, 1)
+        try:
+            while wait:
+                waited = time.monotonic() - started
+                if max_wait is not None and waited + min(wait, MAX_SLEEP) > max_wait:
+                    raise self._shed_call(model, priority, waited)
+                await asyncio.sleep(min(wait, MAX_SLEEP))
+                wait = self._try_acquire(model, priority, tokens)
+        finally:
+            self._queue(model, priority, -1)
+
+    def acquire_sync(
+        self,
+        model: str,
+        priority: Priority = Priority.CONSULTANT,
+        tokens: int = DEFAULT_COMPLETION_TOKENS,
+        max_wait: Any = WAIT_BY_PRIORITY
+    ) -> None:
+        """Blocking `acquire` for code running off the event loop."""
+        if not self.enabled:
+            return
+        max_wait = _within_deadline(MAX_WAIT[priority] if max_wait is WAIT_BY_PRIORITY else max_wait)
+        wait = self._try_acquire(model, priority, tokens)
+        if not wait:
+            return
+        started = time.monotonic()
+        self._queue(model, priority, 1)
+        try:
+            while wait:
+                waited = time.monotonic() - started
+                if max_wait is not None and waited + min(wait, MAX_SLEEP) > max_wait:
+                    raise self._shed_call(model, priority, waited)
+                time.sleep(min(wait, MAX_SLEEP))
+                wait = self._try_acquire(model, priority, tokens)
+        finally:
+            self._queue(model, priority, -1)
+
+    def observe(self, model: str, headers: Mapping[str, str], status_code: int = 200) -> None:
+        """Sync the model's buckets with the API's rate-limit headers (and 429s)."""
+        def number(name: str) -> Optional[float]:
+            try:
+                return float(headers[name]) if headers.get(name) else None
+            except ValueError:
+                return None
+
+        with self._lock:
+            limits = self._limits(model)
+            now = time.monotonic()
+            limits.requests.refill(now)
+            limits.tokens.refill(now)
+            limits.requests.observe(number("x-ratelimit-limit-requests"), number("x-ratelimit-remaining-requests"))
+            limits.tokens.observe(number("x-ratelimit-limit-tokens"), number("x-ratelimit-remaining-tokens"))
+            if status_code == 429:
+                self._rate_limited += 1
+                retry_after = _retry_after(headers)
+                limits.paused_until = max(limits.paused_until, now + retry_after)
+                logger.warning(f"LLM scheduler: {model} rate limited, pausing {retry_after:.1f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            models = {}
+            for model, limits in self._models.items():
+                limits.requests.refill(now)
+                limits.tokens.refill(now)
+                models[model] = {
+                    "requests_available": int(limits.requests.available),
+                    "requests_per_minute": int(limits.requests.limit),
+                    "tokens_available": int(limits.tokens.available),
+                    "tokens_per_minute": int(limits.tokens.limit),
+                    "paused_s": round(max(0.0, limits.paused_until - now), 2),
+                    "waiting": {p.name.lower(): n for p, n in limits.waiting.items() if n},
+                }
+            return {
+                "enabled": self.enabled,
+                "granted": dict(self._granted),
+                "shed": dict(self._shed),
+                "rate_limited": self._rate_limited,
+                "models": models,
+            }
+
+
+# Global instance
+llm_scheduler = LLMScheduler()
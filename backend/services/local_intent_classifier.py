@@ -0,0 +1,490 @@
+"""
+Local Intent Classifier - CPU fast path in front of GPT classification.
+
+A character n-gram TF-IDF model with a softmax (multinomial logistic
+regression) head, trained at startup from the intent examples and keyword
+tables the repo already maintains (config.INTENT_EXAMPLES, the sales FAQ /
+objection keyword tables) plus LOCAL_INTENT_EXAMPLES below. Catalog project
+names and places are replaced by placeholder tokens before featurization, so
+"avalon price" and "citrine price" look the same to the model.
+
+Confidences are temperature-calibrated on out-of-fold predictions;
+`classify_intent_gpt_first` only calls GPT when the local confidence is
+below settings.local_intent_threshold. A trained model can be shipped as an
+.npz artifact (settings.local_intent_model_path) instead of training at
+startup.
+
+numpy only; classifying a query takes well under a millisecond once trained.
+"""
+
+import logging
+import re
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import settings, INTENT_EXAMPLES
+from services.name_index import TOKEN_TRIGRAM_THRESHOLD
+from utils.gazetteer import LOCALITY, ZONE, CITY, PROJECT
+
+logger = logging.getLogger(__name__)
+
+# Intents the local model can answer (the GPT classifier's label space)
+LOCAL_INTENTS = ["property_search", "project_facts", "nearby_properties", "show_more_projects", "sales_conversation"]
+
+INTENT_DATA_SOURCES = {
+    "property_search": "database",
+    "project_facts": "database",
+    "nearby_properties": "database",
+    "show_more_projects": "database",
+    "sales_conversation": "gpt_generation",
+}
+
+# config.INTENT_EXAMPLES categories -> GPT classifier intents
+EXAMPLE_INTENT_MAP = {
+    "property_search": "property_search",
+    "project_fact": "project_facts",
+    "sales_pitch": "sales_conversation",
+    "comparison": "sales_conversation",
+    "unsupported": "sales_conversation",
+    "sales_faq": "sales_conversation",
+    "sales_objection": "sales_conversation",
+}
+
+# Placeholders: "@project" = catalog project name, "@place" = locality/zone/city
+LOCAL_INTENT_EXAMPLES = {
+    "property_search": [
+        "show me 2bhk in @place", "3bhk under 2 cr", "2 bhk chahiye", "3 bhk budget 2 crore mein chahiye",
+        "@place mein projects dikhao", "find flats in @place", "looking for 3bhk in @place",
+        "projects in @place under 1.5cr", "need a 2bhk around 90 lakhs", "ready to move flats in @place",
+        "villas in @place", "4bhk options", "apartments under 3 cr", "1.7", "2 cr budget",
+        "what is available in @place", "show projects in @place", "any 3bhk possession 2027",
+        "cheapest 2bhk in @place", "minimum budget for 3bhk in @place", "under construction projects in @place",
+        "search 2bhk flats", "properties near @place under 2cr", "show me options in @place",
+    ],
+    "project_facts": [
+        "@project price", "@project ka price", "what is the price of @project", "tell me about @project",
+        "amenities in @project", "@project amenities", "@project rera number", "rera number of @project",
+        "@project possession date", "when is possession for @project", "@project location",
+        "@project ki location kahan hai", "details of @project", "lets pitch @project", "pitch @project",
+        "@project configuration", "what configurations does @project have", "@project carpet area",
+        "@project floor plan", "is @project ready to move", "@project status", "@project brochure",
+        "who is the developer of @project", "@project rm contact", "price batao @project", "@project address",
+    ],
+    "nearby_properties": [
+        "nearby", "nearby projects", "show nearby", "what's nearby", "more nearby", "nearby options",
+        "projects around here", "other options close by", "within 10km", "anything nearby",
+        "projects near @project", "options near @place", "show me projects close to @project",
+        "paas mein projects", "nearby properties", "any projects nearby",
+    ],
+    "show_more_projects": [
+        "more", "show more", "more options", "what else", "other projects", "any more", "see more",
+        "anything else", "other options", "remaining projects", "show me more projects",
+        "more projects", "next", "show the rest", "any other projects", "more like these",
+    ],
+    "sales_conversation": [
+        "how far is airport from @project", "distance of airport from @project", "how far is @place from @place",
+        "@project se airport kitna dur", "nearby schools to @project", "metro distance from @project",
+        "how to stretch my budget", "too expensive for me", "what is emi", "loan eligibility",
+        "why buy in @place", "@place vs @place", "is @place better than @place", "pros and cons of @place",
+        "investment potential of @place", "why should i invest", "registration process", "how to buy",
+        "hi", "hello", "good morning", "thanks", "ok", "can we schedule a site visit", "i want to meet",
+        "why under construction", "possession is too late", "location is too far", "why pinclick",
+        "what does pinclick do", "tell me more", "give me more points", "kyun invest kare", "kaunsa better hai",
+    ],
+}
+
+# fact_type / topic keywords for the extraction block
+FACT_TYPE_PATTERNS = [
+    (r"\brera\b", "rera_number"),
+    (r"\b(price|prise|cost|kitna)\b", "price"),
+    (r"\b(amenities|ammenities|facilities)\b", "amenities"),
+    (r"\b(possession|possesion|handover)\b", "possession"),
+    (r"\b(configuration|config|bhk|floor plan|carpet)\b", "configuration"),
+    (r"\b(location|locaton|address|kahan|kaha|where)\b", "location"),
+    (r"\bstatus\b", "status"),
+]
+
+TOPIC_PATTERNS = [
+    (r"\b(vs|versus|better than|compare|kaunsa)\b", "location_comparison"),
+    (r"\b(stretch|afford|expensive|costly)\b", "budget_stretch"),
+    (r"\b(emi|loan)\b", "emi"),
+    (r"\b(invest|investment|roi|appreciation)\b", "investment"),
+    (r"\b(visit|site)\b", "site_visit"),
+    (r"\b(meet|meeting|call me|callback)\b", "callback"),
+    (r"\b(far|distance|dur|metro|airport|school|schools)\b", "location_benefits"),
+]
+
+VAGUE_REFERENCE_RE = re.compile(r"\b(it|this|that|these|those|they|them|there|here)\b")
+_NUMBER_RE = re.compile(r"\d+(\.\d+)?")
+_SPACE_RE = re.compile(r"\s+")
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9]{3,}")
+
+N_FEATURES = 2 ** 14
+NGRAM_RANGE = (2, 4)
+
+# A query word counts as a project mention when it names at most this many projects
+PROJECT_WORD_MAX_PROJECTS = 2
+PROJECT_WORD_MIN_SCORE = TOKEN_TRIGRAM_THRESHOLD
+
+
+def project_mentions(text: str, catalog, vocabulary: frozenset = frozenset()) -> List[Tuple[int, int, str]]:
+    """
+    (start, end, project name) spans in lowercased `text`: full catalog names
+    from the gazetteer, plus single words that pick out one or two projects
+    in the name index ("avalon", typos like "avlon"). Words in `vocabulary`
+    (the intent vocabulary) are never project words.
+    """
+    if catalog is None:
+        return []
+    spans = [(span.start, span.end, span.value) for span in catalog.gazetteer.tag(text, (PROJECT,))]
+    for match in _WORD_RE.finditer(text):
+        word = match.group()
+        if word in vocabulary or any(start <= match.start() < end for start, end, _ in spans):
+            continue
+        scores = catalog.names.word_matches(word)
+        if 0 < len(scores) <= PROJECT_WORD_MAX_PROJECTS:
+            pos, score = max(scores.items(), key=lambda item: item[1])
+            if score >= PROJECT_WORD_MIN_SCORE:
+                spans.append((match.start(), match.end(), catalog.names.names[pos]))
+    return sorted(spans)
+
+
+def normalize_query(text: str, catalog=None, vocabulary: frozenset = frozenset()) -> str:
+    """Lowercase, swap project names / places for placeholders, collapse numbers."""
+    text = text.lower()
+    if catalog is not None:
+        spans = [(start, end, "@project") for start, end, _ in project_mentions(text, catalog, vocabulary)]
+        for span in catalog.gazetteer.tag(text, (LOCALITY, ZONE, CITY)):
+            if not any(start < span.end and span.start < end for start, end, _ in spans):
+                spans.append((span.start, span.end, "@place"))
+        for start, end, token in sorted(spans, reverse=True):
+            text = text[:start] + token + text[end:]
+    text = _NUMBER_RE.sub("9", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def _ngram_counts(text: str) -> Dict[int, float]:
+    """Hashed character n-gram counts (crc32, stable across processes)."""
+    padded = f" {text} "
+    counts: Dict[int, float] = {}
+    low, high = NGRAM_RANGE
+    for n in range(low, high + 1):
+        for i in range(len(padded) - n + 1):
+            idx = zlib.crc32(padded[i:i + n].encode("utf-8")) % N_FEATURES
+            counts[idx] = counts.get(idx, 0.0) + 1.0
+    return counts
+
+
+class LocalIntentClassifier:
+    """Char n-gram TF-IDF + softmax intent model with calibrated confidence."""
+
+    def __init__(self, model_path: Optional[str] = None):
+        self.model_path = model_path
+        self.labels: List[str] = []
+        self.idf: Optional[np.ndarray] = None
+        self.weights: Optional[np.ndarray] = None   # (N_FEATURES, n_labels)
+        self.bias: Optional[np.ndarray] = None
+        self.temperature = 1.0
+        self.vocabulary: frozenset = frozenset()
+        self._lock = threading.Lock()
+        self._warming = False
+        self._stats = {"local": 0, "escalated": 0}
+
+    # ------------------------------------------------------------------
+    # Features
+    # ------------------------------------------------------------------
+
+    def _vector(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Sparse (indices, values) of the l2-normalized sublinear TF-IDF vector."""
+        counts = _ngram_counts(text)
+        if not counts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        idx = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = 1.0 + np.log(np.fromiter(counts.values(), dtype=float, count=len(counts)))
+        values = tf * self.idf[idx]
+        norm = np.linalg.norm(values)
+        return idx, values / norm if norm else values
+
+    def _matrix(self, texts: Sequence[str]) -> np.ndarray:
+        X = np.zeros((len(texts), N_FEATURES))
+        for row, text in enumerate(texts):
+            idx, values = self._vector(text)
+            X[row, idx] = values
+        return X
+
+    # ------------------------------------------------------------------
+    # Training
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _fit_softmax(X: np.ndarray, y: np.ndarray, n_labels: int, l2: float = 1e-3, epochs: int = 300,
+                     lr: float = 2.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Full-batch gradient descent on class-balanced, L2-regularized softmax cross-entropy."""
+        W = np.zeros((X.shape[1], n_labels))
+        b = np.zeros(n_labels)
+        Y = np.eye(n_labels)[y]
+        # Keyword tables make sales_conversation the bulk of the corpus; weight classes equally
+        counts = np.bincount(y, minlength=n_labels)
+        sample_weight = (len(y) / (n_labels * np.maximum(counts, 1)))[y][:, None]
+        for _ in range(epochs):
+            logits = X @ W + b
+            logits -= logits.max(axis=1, keepdims=True)
+            P = np.exp(logits)
+            P /= P.sum(axis=1, keepdims=True)
+            grad = sample_weight * (P - Y) / len(y)
+            W -= lr * (X.T @ grad + l2 * W)
+            b -= lr * grad.sum(axis=0)
+        return W, b
+
+    @staticmethod
+    def _fit_temperature(logits: np.ndarray, y: np.ndarray) -> float:
+        """Temperature minimizing held-out negative log-likelihood (grid search)."""
+        best_t, best_nll = 1.0, float("inf")
+        for t in np.linspace(0.05, 3.0, 60):
+            z = logits / t
+            z = z - z.max(axis=1, keepdims=True)
+            log_p = z - np.log(np.exp(z).sum(axis=1, keepdims=True))
+            nll = -log_p[np.arange(len(y)), y].mean()
+            if nll < best_nll:
+                best_t, best_nll = float(t), nll
+        return best_t
+
+    def fit(self, texts: Sequence[str], intents: Sequence[str], folds: int = 5) -> "LocalIntentClassifier":
+        """Train on already-normalized texts; calibrates temperature with k-fold predictions."""
+        started_at = time.monotonic()
+        self.labels = sorted(set(intents))
+        y = np.array([self.labels.index(intent) for intent in intents])
+
+        # IDF over hashed n-grams (smoothed)
+        doc_freq = np.zeros(N_FEATURES)
+        for text in texts:
+            doc_freq[list(_ngram_counts(text))] += 1
+        self.idf = np.log((1 + len(texts)) / (1 + doc_freq)) + 1.0
+
+        # Train only on hashed columns that occur in the corpus; other weights stay zero
+        active = np.flatnonzero(doc_freq)
+        X = self._matrix(texts)[:, active]
+        n_labels = len(self.labels)
+
+        # Out-of-fold logits for calibration
+        order = np.random.default_rng(0).permutation(len(texts))
+        oof_logits = np.zeros((len(texts), n_labels))
+        for fold in range(folds):
+            held_out = order[fold::folds]
+            train = np.setdiff1d(order, held_out)
+            W, b = self._fit_softmax(X[train], y[train], n_labels)
+            oof_logits[held_out] = X[held_out] @ W + b
+        self.temperature = self._fit_temperature(oof_logits, y)
+
+        W, self.bias = self._fit_softmax(X, y, n_labels)
+        self.weights = np.zeros((N_FEATURES, n_labels))
+        self.weights[active] = W
+        oof_accuracy = float((oof_logits.argmax(axis=1) == y).mean())
+        logger.info(
+            f"Local intent model trained on {len(texts)} examples in {(time.monotonic() - started_at):.2f}s "
+            f"(cv accuracy={oof_accuracy:.2f}, temperature={self.temperature:.2f})"
+        )
+        return self
+
+    def training_examples(self, catalog=None) -> Tuple[List[str], List[str]]:
+        """Normalized (text, intent) pairs from the repo's intent examples and keyword tables."""
+        from services.sales_conversation import sales_conversation
+
+        keyword_examples: List[Tuple[str, str]] = []
+        for table in (sales_conversation.faq_keywords, sales_conversation.objection_keywords):
+            for phrases in table.values():
+                keyword_examples.extend((phrase, "sales_conversation") for phrase in phrases)
+        for intent, texts in LOCAL_INTENT_EXAMPLES.items():
+            keyword_examples.extend((text, intent) for text in texts)
+
+        # Intent vocabulary: words of the name-free sources (INTENT_EXAMPLES mentions projects)
+        self.vocabulary = frozenset(
+            word for text, _ in keyword_examples for word in _WORD_RE.findall(text.lower())
+        )
+
+        examples = list(keyword_examples)
+        for category, texts in INTENT_EXAMPLES.items():
+            intent = EXAMPLE_INTENT_MAP.get(category)
+            if intent:
+                examples.extend((text, intent) for text in texts)
+
+        texts = [normalize_query(text, catalog, self.vocabulary) for text, _ in examples]
+        return texts, [intent for _, intent in examples]
+
+    # ------------------------------------------------------------------
+    # Artifact
+    # ------------------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(
+            path, labels=np.array(self.labels), idf=self.idf, weights=self.weights,
+            bias=self.bias, temperature=np.array(self.temperature),
+            vocabulary=np.array(sorted(self.vocabulary))
+        )
+
+    def load(self, path: str) -> "LocalIntentClassifier":
+        with np.load(path) as data:
+            self.labels = [str(label) for label in data["labels"]]
+            self.idf = data["idf"]
+            self.weights = data["weights"]
+            self.bias = data["bias"]
+            self.temperature = float(data["temperature"])
+            self.vocabulary = frozenset(str(word) for word in data["vocabulary"])
+        logger.info(f"Local intent model loaded from {path}")
+        return self
+
+    def warm(self) -> None:
+        """Load / train in the background (startup); GPT answers until the model is ready."""
+        if self.weights is None and not self._warming:
+            self._warming = True
+            threading.Thread(target=self.ensure_ready, name="local-intent-warm", daemon=True).start()
+
+    def ensure_ready(self) -> bool:
+        """Load the shipped artifact or train from examples (once); False if unavailable."""
+        if self.weights is not None:
+            return True
+        with self._lock:
+            if self.weights is None:
+                try:
+                    if self.model_path:
+                        self.load(self.model_path)
+                    else:
+                        texts, intents = self.training_examples(_catalog())
+                        self.fit(texts, intents)
+                except Exception as e:
+                    logger.error(f"Local intent model unavailable: {e}")
+                    return False
+        return self.weights is not None
+
+    # ------------------------------------------------------------------
+    # Inference
+    # ------------------------------------------------------------------
+
+    def predict_normalized(self, text: str) -> Tuple[str, float]:
+        """(intent, calibrated confidence) for an already-normalized text."""
+        idx, values = self._vector(text)
+        logits = values @ self.weights[idx] + self.bias
+        z = logits / self.temperature
+        p = np.exp(z - z.max())
+        p /= p.sum()
+        best = int(p.argmax())
+        return self.labels[best], float(p[best])
+
+    def predict(self, query: str) -> Tuple[str, float]:
+        return self.predict_normalized(normalize_query(query, _catalog(), self.vocabulary))
+
+    def classify(
+        self,
+        query: str,
+        session_state: Optional[Dict] = None,
+        threshold: Optional[float] = None,
+        prediction: Optional[Tuple[str, float]] = None
+    ) -> Optional[Dict]:
+        """
+        Classification in the `classify_intent_gpt_first` result shape, or None
+        when the query should go to GPT (low confidence, unresolved references,
+        project question without a resolvable project). `prediction` is the
+        `predict(query)` result when the caller already has it (offline evaluation).
+        """
+        if self.weights is None:
+            self.warm()
+            return None
+        threshold = settings.local_intent_threshold if threshold is None else threshold
+        started_at = time.perf_counter()
+
+        catalog = _catalog()
+        text = query.lower()
+        if prediction is None:
+            prediction = self.predict_normalized(normalize_query(text, catalog, self.vocabulary))
+        intent, confidence = prediction
+        projects = project_mentions(text, catalog, self.vocabulary)
+        extraction = _extract(text, intent, projects, session_state or {})
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+
+        escalate = confidence < threshold
+        if not escalate and intent == "project_facts" and not extraction.get("project_name"):
+            escalate = True
+        if not escalate and intent != "project_facts" and VAGUE_REFERENCE_RE.search(text) and not session_state:
+            escalate = True
+        if escalate:
+            self._stats["escalated"] += 1
+            logger.info(f"Local intent: {intent} ({confidence:.2f}) below bar, escalating to GPT [{elapsed_ms:.1f}ms]")
+            return None
+
+        self._stats["local"] += 1
+        logger.info(f"Local intent: {intent} ({confidence:.2f}) [{elapsed_ms:.1f}ms]")
+        return {
+            "intent": intent,
+            "data_source": INTENT_DATA_SOURCES.get(intent, "database"),
+            "confidence": round(confidence, 3),
+            "reasoning": "Local classifier",
+            "extraction": extraction,
+            "classifier": "local",
+        }
+
+    def stats(self) -> Dict:
+        total = self._stats["local"] + self._stats["escalated"]
+        return {
+            **self._stats,
+            "ready": self.weights is not None,
+            "local_rate": round(self._stats["local"] / total, 3) if total else None,
+        }
+
+
+def _catalog():
+    try:
+        from services.project_repository import project_repository
+        return project_repository.catalog()
+    except Exception as e:
+        logger.warning(f"Local intent: catalog unavailable ({e})")
+        return None
+
+
+def _first_match(patterns: Iterable[Tuple[str, str]], text: str) -> Optional[str]:
+    return next((name for pattern, name in patterns if re.search(pattern, text)), None)
+
+
+def _extract(text: str, intent: str, projects: List[Tuple[int, int, str]], session_state: Dict) -> Dict:
+    """GPT-compatible extraction block (budget_max in lakhs); keys only when found."""
+    from services.filter_extractor import filter_extractor
+
+    extraction: Dict = {}
+    filters = filter_extractor.extract_filters(text)
+    if filters.bedrooms:
+        extraction["configuration"] = f"{filters.bedrooms[0]}BHK"
+    budget_inr = filters.max_price_inr or filters.budget_inr
+    if budget_inr:
+        extraction["budget_max"] = round(budget_inr / 1e5, 2)
+    if filters.locality or filters.area:
+        extraction["location"] = filters.locality.title() if filters.locality else filters.area
+
+    if projects:
+        extraction["project_name"] = projects[0][2]
+    elif intent == "project_facts":
+        # Same fallback GPT is told to use: selected / last shown / last interested project
+        last_shown = session_state.get("last_shown_projects") or []
+        interested = session_state.get("interested_projects") or []
+        fallback = session_state.get("selected_project_name") \
+            or (last_shown[0].get("name") if last_shown and isinstance(last_shown[0], dict) else None) \
+            or (interested[-1] if interested else None)
+        if fallback:
+            extraction["project_name"] = fallback
+
+    if intent == "project_facts":
+        fact_type = _first_match(FACT_TYPE_PATTERNS, text)
+        if fact_type:
+            extraction["fact_type"] = fact_type
+    elif intent == "sales_conversation":
+        topic = _first_match(TOPIC_PATTERNS, text)
+        if topic:
+            extraction["topic"] = topic
+    return extraction
+
+
+# Global instance
+local_intent_classifier = LocalIntentClassifier(model_path=settings.local_intent_model_path)
@@ -0,0 +1,222 @@
+"""
+Name Index - Project-name lookup (exact / token / trigram).
+
+Replaces the difflib linear scans used for project-specific turns:
+- exact: hash lookup on the lowercased name
+- token: stop-word-filtered inverted index over name words
+- trigram: character-trigram index (over name words and whole names) with a
+  similarity threshold, so typos like "citrne" or "avlon" still resolve
+
+`lookup` scores every candidate on all stages at once. Name words are
+weighted by how rare they are in the catalog (IDF), so a developer word
+shared by many names ("brigade", "prestige") counts for little next to the
+word that identifies the project.
+
+Built once per catalog snapshot; lookups touch only the postings of the
+query's tokens/trigrams, not every project.
+"""
+
+import logging
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Common words ignored when matching name tokens
+NAME_STOP_WORDS = frozenset({"the", "of", "in", "at", "on", "and", "or"})
+
+TOKEN_TRIGRAM_THRESHOLD = 0.4  # Per-word typo tolerance ("citrne" -> "citrine" = 0.5)
+NAME_TRIGRAM_THRESHOLD = 0.45  # Whole-name similarity (run-together or reordered words)
+MIN_LOOKUP_SCORE = 0.3         # Below this a candidate is not returned by `lookup`
+
+
+class NameMatch(NamedTuple):
+    position: int  # Row position in the snapshot
+    name: str
+    score: float   # 0..1, higher is better
+    method: str    # "exact" | "token" | "fuzzy_token" | "trigram"
+
+
+def trigrams(text: str) -> Set[str]:
+    """Padded character trigrams of each word ("  c", " ci", "cit", ..., "ne ")."""
+    grams: Set[str] = set()
+    for word in text.lower().split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _tokens(text: str, stop_words: frozenset) -> List[str]:
+    return [w for w in text.lower().split() if w not in stop_words]
+
+
+class _TrigramIndex:
+    """Trigram postings over a list of keys, scored with Jaccard similarity."""
+
+    def __init__(self, keys: Iterable[str]):
+        self.gram_counts: List[int] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        for key_id, key in enumerate(keys):
+            grams = trigrams(key)
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                self.postings[gram].append(key_id)
+
+    def similar(self, text: str, threshold: float) -> Dict[int, float]:
+        query_grams = trigrams(text)
+        if not query_grams:
+            return {}
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for key_id in self.postings.get(gram, ()):
+                shared[key_id] += 1
+        scores = {}
+        for key_id, common in shared.items():
+            score = common / (len(query_grams) + self.gram_counts[key_id] - common)
+            if score >= threshold:
+                scores[key_id] = score
+        return scores
+
+
+class NameIndex:
+    """Ranked project-name lookup built once per snapshot."""
+
+    def __init__(self, names: Iterable[Optional[str]], stop_words: frozenset = NAME_STOP_WORDS):
+        self.names: List[str] = [str(n) if n else "" for n in names]
+        self.stop_words = stop_words
+
+        self._exact: Dict[str, int] = {}
+        self._token_sets: List[Set[str]] = []
+        self._token_postings: Dict[str, Set[int]] = defaultdict(set)
+        for pos, name in enumerate(self.names):
+            if name:
+                self._exact.setdefault(name.lower(), pos)
+            tokens = set(_tokens(name, stop_words))
+            self._token_sets.append(tokens)
+            for token in tokens:
+                self._token_postings[token].add(pos)
+
+        self._vocabulary: List[str] = sorted(self._token_postings)
+        self._vocab_trigrams = _TrigramIndex(self._vocabulary)
+        self._name_trigrams = _TrigramIndex(self.names)
+
+        self._max_idf = math.log(1 + len(self.names))  # A word in a single name (or none)
+        self._idf: Dict[str, float] = {token: math.log(1 + len(self.names) / len(postings))
+                                       for token, postings in self._token_postings.items()}
+        self._name_weights: List[float] = [sum(self._idf[t] for t in tokens) for tokens in self._token_sets]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def exact(self, query: str) -> Optional[int]:
+        """Position of the first name equal to `query` (case-insensitive)."""
+        return self._exact.get(query.lower().strip()) if query else None
+
+    def trigram_matches(self, query: str, threshold: float = NAME_TRIGRAM_THRESHOLD) -> Dict[int, float]:
+        """Whole-name trigram similarity."""
+        return self._name_trigrams.similar(query, threshold)
+
+    def word_matches(self, word: str, threshold: float = TOKEN_TRIGRAM_THRESHOLD) -> Dict[int, float]:
+        """
+        Names containing a word that matches a single query word: exact token,
+        substring either way (tokens of 3+ chars), or trigram similarity.
+        """
+        word = word.lower()
+        scores: Dict[int, float] = {}
+
+        def add(token: str, score: float):
+            for pos in self._token_postings.get(token, ()):
+                scores[pos] = max(scores.get(pos, 0.0), score)
+
+        add(word, 1.0)
+        for token in self._vocabulary:
+            if token != word and len(token) >= 3 and (word in token or token in word):
+                add(token, 0.9)
+        for vocab_id, sim in self._vocab_trigrams.similar(word, threshold).items():
+            add(self._vocabulary[vocab_id], min(sim, 0.89))
+        return scores
+
+    # ------------------------------------------------------------------
+    # Combined lookup
+    # ------------------------------------------------------------------
+
+    def weighted_token_matches(self, query: str, threshold: float = TOKEN_TRIGRAM_THRESHOLD) -> Dict[int, float]:
+        """
+        IDF-weighted word overlap (exact or typo-tolerant) between the query
+        and each name: the share of the query's weight a name matches, scaled
+        by how much of the name's own weight the query covers.
+        """
+        query_tokens = set(_tokens(query, self.stop_words))
+        if not query_tokens:
+            return {}
+        query_weight = 0.0
+        query_credit: Dict[int, float] = defaultdict(float)
+        name_credit: Dict[int, float] = defaultdict(float)
+        for token in query_tokens:
+            # Trigram Jaccard understates one-letter typos in short words ("avlon" -> "avalon" = 0.44)
+            similar = {self._vocabulary[vocab_id]: math.sqrt(sim)
+                       for vocab_id, sim in self._vocab_trigrams.similar(token, threshold).items()}
+            if token in self._token_postings:
+                similar[token] = 1.0
+            # A typo weighs as much as the word it most resembles; an unknown word as a rare one
+            closest = max(similar, key=lambda word: (similar[word], word), default=None)
+            weight = self._idf[closest] if closest is not None else self._max_idf
+            query_weight += weight
+
+            best: Dict[int, Tuple[float, float]] = {}
+            for word, sim in similar.items():
+                for pos in self._token_postings[word]:
+                    if pos not in best or sim > best[pos][0]:
+                        best[pos] = (sim, self._idf[word])
+            for pos, (sim, word_weight) in best.items():
+                query_credit[pos] += sim * weight
+                name_credit[pos] += sim * word_weight
+
+        return {
+            pos: (credit / query_weight) * (0.5 + 0.5 * min(1.0, name_credit[pos] / self._name_weights[pos]))
+            for pos, credit in query_credit.items()
+        }
+
+    # ------------------------------------------------------------------
+    # Combined lookup
+    # ------------------------------------------------------------------
+
+    def lookup(self, query: str, limit: int = 5, min_score: float = MIN_LOOKUP_SCORE) -> List[NameMatch]:
+        """
+        Ranked candidates for a project-name query. An exact name wins
+        outright; otherwise every name is scored on weighted word overlap and
+        whole-name trigram similarity together. Candidates tied on score are
+        ordered by whole-name similarity, then by name.
+        """
+        if not query or not query.strip():
+            return []
+
+        pos = self.exact(query)
+        if pos is not None:
+            return [NameMatch(pos, self.names[pos], 1.0, "exact")]
+
+        query_tokens = set(_tokens(query, self.stop_words))
+        word_scores = self.weighted_token_matches(query)
+        name_scores = self.trigram_matches(query)
+
+        candidates = []
+        for pos in set(word_scores) | set(name_scores):
+            word_score, name_score = word_scores.get(pos, 0.0), name_scores.get(pos, 0.0)
+            # The weaker signal, when present, adds to the stronger one
+            score = max(word_score, name_score) + 0.5 * min(word_score, name_score) * (1 - max(word_score, name_score))
+            if score < min_score:
+                continue
+            if word_score >= name_score:
+                method = "token" if query_tokens <= self._token_sets[pos] else "fuzzy_token"
+            else:
+                method = "trigram"
+            candidates.append((round(score, 4), name_score, self.names[pos].lower(), pos, method))
+
+        candidates.sort(key=lambda c: (-c[0], -c[1], c[2]))
+        return [NameMatch(pos, self.names[pos], score, method)
+                for score, _, _, pos, method in candidates[:limit]]
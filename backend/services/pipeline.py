@@ -0,0 +1,127 @@
+"""
+Pipeline - Declared request stages with dependencies, run as a DAG.
+
+Each stage names the stages it depends on; a stage starts as soon as its
+dependencies finish, so independent stages (session load, profile load,
+catalog fetch, ...) overlap instead of adding up. Blocking stages run on a
+worker thread; coroutine stages run on the event loop.
+
+    pipeline = Pipeline([
+        Stage("session", load_session),
+        Stage("projects", load_projects, critical=False, default=[]),
+        Stage("classify", classify, deps=("session", "projects")),
+    ])
+    run = await pipeline.run({"request": request})
+    run["classify"], run.timings
+
+Stage callables receive the shared results dict (initial context plus the
+outputs of finished stages). A failing non-critical stage logs and yields
+its `default`; a failing critical stage cancels the rest and re-raises.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[[Dict[str, Any]], Any]
+    deps: Tuple[str, ...] = ()
+    critical: bool = True
+    default: Any = None
+    blocking: bool = True  # Sync callables run on a worker thread unless False (cheap CPU work)
+
+
+@dataclass
+class PipelineRun:
+    results: Dict[str, Any]
+    timings: Dict[str, float] = field(default_factory=dict)  # Stage -> ms
+    failed: List[str] = field(default_factory=list)
+    total_ms: float = 0.0
+
+    def __getitem__(self, name: str) -> Any:
+        return self.results[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.results.get(name, default)
+
+    def summary(self) -> str:
+        stages = ", ".join(f"{name}={ms:.0f}ms" for name, ms in self.timings.items())
+        return f"{stages} | wall={self.total_ms:.0f}ms (sequential would be {sum(self.timings.values()):.0f}ms)"
+
+
+class Pipeline:
+    """A validated, topologically ordered set of stages."""
+
+    def __init__(self, stages: Iterable[Stage]):
+        self.stages = self._ordered(list(stages))
+
+    @staticmethod
+    def _ordered(stages: List[Stage]) -> List[Stage]:
+        by_name = {stage.name: stage for stage in stages}
+        if len(by_name) != len(stages):
+            raise ValueError("Duplicate stage names in pipeline")
+        ordered, visiting, done = [], set(), set()
+
+        def visit(stage: Stage):
+            if stage.name in done:
+                return
+            if stage.name in visiting:
+                raise ValueError(f"Pipeline dependency cycle at stage '{stage.name}'")
+            visiting.add(stage.name)
+            for dep in stage.deps:
+                if dep not in by_name:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+                visit(by_name[dep])
+            visiting.discard(stage.name)
+            done.add(stage.name)
+            ordered.append(stage)
+
+        for stage in stages:
+            visit(stage)
+        return ordered
+
+    async def run(self, context: Optional[Dict[str, Any]] = None) -> PipelineRun:
+        run = PipelineRun(results=dict(context or {}))
+        tasks: Dict[str, asyncio.Future] = {}
+        started_at = time.perf_counter()
+
+        async def execute(stage: Stage) -> None:
+            if stage.deps:
+                await asyncio.gather(*(tasks[dep] for dep in stage.deps))
+            stage_started = time.perf_counter()
+            try:
+                if inspect.iscoroutinefunction(stage.fn):
+                    value = await stage.fn(run.results)
+                elif stage.blocking:
+                    value = await asyncio.to_thread(stage.fn, run.results)
+                else:
+                    value = stage.fn(run.results)
+            except Exception as e:
+                if stage.critical:
+                    raise
+                logger.warning(f"Pipeline stage '{stage.name}' failed (non-critical): {e}")
+                run.failed.append(stage.name)
+                value = stage.default
+            finally:
+                run.timings[stage.name] = (time.perf_counter() - stage_started) * 1000
+            run.results[stage.name] = value
+
+        for stage in self.stages:
+            tasks[stage.name] = asyncio.ensure_future(execute(stage))
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        finally:
+            run.total_ms = (time.perf_counter() - started_at) * 1000
+        return run
@@ -7,6 +7,7 @@ Maintains API compatibility with existing codebase.
 from typing import List, Dict, Any, Optional
 import logging
 import os
+from services.single_flight import coalesce
 
 logger = logging.getLogger(__name__)
 
@@ -88,6 +89,7 @@ class PixeltableRetrievalService:
 
         return expanded_query
 
+    @coalesce("pixeltable_similarity_search")
     async def retrieve_similar_chunks(
         self,
         query: str,
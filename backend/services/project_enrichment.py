@@ -6,18 +6,46 @@ ONLY enriches projects that exist in the database - never creates new projects.
 
 import logging
 from typing import Dict, List, Any, Optional
-from openai import OpenAI
 from config import settings
+from services.llm_gateway import llm_gateway
+from services.llm_scheduler import Priority
 from services.sales_agent_prompt import SALES_AGENT_SYSTEM_PROMPT
 
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client with timeout
-client = OpenAI(
-    api_key=settings.openai_api_key,
-    base_url=settings.openai_base_url,
-    timeout=30.0  # 30 second timeout for API calls
-)
+
+def sales_pitch_prompt(project: Dict[str, Any]) -> str:
+    """Prompt for the live-call sales pitch shown under project facts."""
+    return f"""You are a real estate sales coach. Generate a SALES PITCH for this project that a salesperson can USE ON A LIVE CALL.
+
+PROJECT: {project.get('name')}
+LOCATION: {project.get('location')}
+PRICE: ₹{(project.get('budget_min') or 0)/100:.1f} - ₹{(project.get('budget_max') or 0)/100:.1f} Cr
+CONFIG: {project.get('configuration')}
+POSSESSION: {project.get('possession_year', 'N/A')}
+
+Generate EXACTLY this format (bullet points only):
+
+🎯 **WHY BUY THIS PROJECT:**
+• [Strong selling point 1]
+• [Strong selling point 2]
+• [Strong selling point 3]
+
+📍 **NEARBY AMENITIES:**
+• [Schools/colleges within 5km]
+• [Hospitals within 5km]
+• [Metro/transport connectivity]
+• [Shopping malls/tech parks]
+
+💰 **INVESTMENT ANGLE:**
+• [Appreciation potential]
+• [ROI argument]
+• [Urgency hook]
+
+🎤 **CLOSING LINE:**
+[One sentence to push for site visit]
+
+Be specific to {project.get('location')} area. Make it persuasive and speakable."""
 
 
 class ProjectEnrichmentService:
@@ -41,7 +69,8 @@ class ProjectEnrichmentService:
         
         Args:
             project: Project dictionary from database
-            enrichment_types: List of types to enrich ["amenities", "nearby_places", "connectivity"]
+            enrichment_types: List of types to enrich ["amenities", "nearby_places", "connectivity",
+                "neighborhood_info", "sales_pitch"]
             query: Optional user query for context
         
         Returns:
@@ -64,6 +93,8 @@ class ProjectEnrichmentService:
                     enriched = await self._enrich_connectivity(enriched, query)
                 elif enrichment_type == "neighborhood_info":
                     enriched = await self._enrich_neighborhood(enriched, query)
+                elif enrichment_type == "sales_pitch":
+                    enriched = await self._enrich_sales_pitch(enriched, query)
                 else:
                     logger.warning(f"Unknown enrichment type: {enrichment_type}")
             except Exception as e:
@@ -107,7 +138,7 @@ Example format:
 • Landscaped gardens"""
 
         try:
-            response = client.chat.completions.create(
+            response = await llm_gateway.chat(
                 model=settings.effective_gpt_model,
                 messages=[
                     {
@@ -128,7 +159,8 @@ TASK: Generate amenities for a real estate project.
                     }
                 ],
                 temperature=0.7,
-                max_tokens=200
+                max_tokens=200,
+                priority=Priority.BACKGROUND
             )
             
             amenities = response.choices[0].message.content.strip()
@@ -164,7 +196,7 @@ Example format:
 • International School (1.5 km)"""
 
         try:
-            response = client.chat.completions.create(
+            response = await llm_gateway.chat(
                 model=settings.effective_gpt_model,
                 messages=[
                     {
@@ -185,7 +217,8 @@ TASK: Generate nearby places for a real estate project.
                     }
                 ],
                 temperature=0.7,
-                max_tokens=200
+                max_tokens=200,
+                priority=Priority.BACKGROUND
             )
             
             nearby_places = response.choices[0].message.content.strip()
@@ -221,7 +254,7 @@ Example format:
 • 30 mins to Airport"""
 
         try:
-            response = client.chat.completions.create(
+            response = await llm_gateway.chat(
                 model=settings.effective_gpt_model,
                 messages=[
                     {
@@ -242,7 +275,8 @@ TASK: Generate connectivity information for a real estate project.
                     }
                 ],
                 temperature=0.7,
-                max_tokens=200
+                max_tokens=200,
+                priority=Priority.BACKGROUND
             )
             
             connectivity = response.choices[0].message.content.strip()
@@ -278,7 +312,7 @@ Example format:
 • Well-planned layout with good connectivity"""
 
         try:
-            response = client.chat.completions.create(
+            response = await llm_gateway.chat(
                 model=settings.effective_gpt_model,
                 messages=[
                     {
@@ -299,7 +333,8 @@ TASK: Generate neighborhood insights for a real estate project.
                     }
                 ],
                 temperature=0.7,
-                max_tokens=200
+                max_tokens=200,
+                priority=Priority.BACKGROUND
             )
             
             neighborhood = response.choices[0].message.content.strip()
@@ -311,6 +346,30 @@ TASK: Generate neighborhood insights for a real estate project.
         
         return project
 
+    async def _enrich_sales_pitch(
+        self,
+        project: Dict[str, Any],
+        query: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Generate the live-call sales pitch using GPT."""
+
+        try:
+            response = await llm_gateway.chat(
+                model=settings.effective_gpt_model,
+                messages=[{"role": "user", "content": sales_pitch_prompt(project)}],
+                temperature=0.7,
+                max_tokens=600,
+                priority=Priority.BACKGROUND
+            )
+
+            project['sales_pitch'] = response.choices[0].message.content.strip()
+            logger.info(f"Enriched sales pitch for {project.get('name', '')}")
+
+        except Exception as e:
+            logger.error(f"Error enriching sales pitch: {e}")
+
+        return project
+
 
 # Global instance
 project_enrichment = ProjectEnrichmentService()
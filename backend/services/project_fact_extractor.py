@@ -6,9 +6,11 @@ NEVER invents or estimates - returns actual database facts only.
 """
 
 import logging
+import math
 import re
 from typing import Dict, Optional, List
-from database.pixeltable_setup import get_projects_table
+from services.project_repository import project_repository
+from services.unit_table import parse_configuration_units
 
 logger = logging.getLogger(__name__)
 
@@ -26,38 +28,19 @@ def extract_carpet_area_from_config(configuration: str, bhk: str = None) -> Dict
     if not configuration:
         return None
     
+    # Shared parser with the retrieval unit table (cached per configuration string)
     results = []
-    
-    # Pattern 1: {2BHK, 1127 - 1461, 2.20Cr}
-    pattern1 = r'\{([0-9.]+\s*BHK),\s*([0-9]+)\s*-\s*([0-9]+)'
-    matches1 = re.findall(pattern1, configuration, re.IGNORECASE)
-    
-    for match in matches1:
-        config_type = match[0].strip()
-        min_area = int(match[1])
-        max_area = int(match[2])
+    for bhk, min_sqft, max_sqft, _price_cr in parse_configuration_units(configuration):
+        if math.isnan(min_sqft):
+            continue
+        min_area = int(min_sqft)
+        max_area = int(max_sqft)
         
         results.append({
-            "configuration": config_type,
+            "configuration": f"{bhk:g} BHK",
             "carpet_area_min": min_area,
             "carpet_area_max": max_area,
-            "area_range": f"{min_area} - {max_area} sq ft"
-        })
-    
-    # Pattern 2: 2 BHK: 1200-1400 sqft
-    pattern2 = r'([0-9.]+\s*BHK)[:\s]+([0-9]+)\s*-\s*([0-9]+)'
-    matches2 = re.findall(pattern2, configuration, re.IGNORECASE)
-    
-    for match in matches2:
-        config_type = match[0].strip()
-        min_area = int(match[1])
-        max_area = int(match[2])
-        
-        results.append({
-            "configuration": config_type,
-            "carpet_area_min": min_area,
-            "carpet_area_max": max_area,
-            "area_range": f"{min_area} - {max_area} sq ft"
+            "area_range": f"{min_area} - {max_area} sq ft" if max_area != min_area else f"{min_area} sq ft"
         })
     
     # Filter by BHK type if specified
@@ -81,19 +64,13 @@ def get_project_fact(project_name: str, fact_type: str, bhk_type: str = None) ->
         Dict with actual database facts, or None if not found
     """
     try:
-        projects_table = get_projects_table()
+        # Query for the specific project (in-memory catalog)
+        project = project_repository.find_by_name_fragment(project_name)
         
-        # Query for the specific project
-        results = list(projects_table.where(
-            projects_table.name.contains(project_name)
-        ).limit(1).collect())
-        
-        if not results:
+        if not project:
             logger.warning(f"Project not found in database: {project_name}")
             return None
         
-        project = results[0]
-        
         # Extract the requested fact
         if fact_type == "carpet_area":
             config_data = extract_carpet_area_from_config(
@@ -0,0 +1,151 @@
+"""
+Project Payloads - Formatted project dicts rendered once per catalog snapshot.
+
+Search results used to rebuild the same ~35-key response dict for every
+matching project on every search. The static part now lives on the
+CatalogIndex (`index.payloads`), so a search only overlays its per-query
+fields (`matching_units`, `unit_count`) on a shallow copy. Nested values
+(`price_range`, `rm_details`) are shared by reference and must be treated
+as read-only.
+
+Responses can be projected to a subset of fields: list views ask for the
+slim `card` preset and fetch full details (description, amenities,
+registration process, ...) lazily via /api/projects/{project_id}/details.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Always returned, whatever projection is requested (frontend keys + identity)
+IDENTITY_FIELDS = ("id", "project_id", "name", "project_name", "price_range")
+
+# Slim payload for result lists / cards
+PROJECT_CARD_FIELDS = IDENTITY_FIELDS + (
+    "developer", "developer_name", "location", "locality", "city", "zone",
+    "status", "possession_year", "possession_quarter",
+    "budget_min", "budget_max", "configuration", "config_summary", "usp",
+    "brochure_url", "matching_units", "unit_count", "can_expand",
+)
+
+FIELD_PRESETS = {
+    "card": PROJECT_CARD_FIELDS,
+}
+
+FieldsSpec = Optional[Union[str, Sequence[str]]]
+
+
+def render_project_payload(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Static response payload for one project row (None if the row cannot be formatted)."""
+    r = row
+    try:
+        # Calculate price in Cr from Lakhs
+        min_cr = r.get('budget_min', 0) / 100.0 if r.get('budget_min') else None
+        max_cr = r.get('budget_max', 0) / 100.0 if r.get('budget_max') else None
+
+        return {
+            "id": r.get('project_id', ''), # Frontend expects 'id'
+            "name": r.get('name', ''),     # Frontend expects 'name'
+            "developer": r.get('developer', ''), # Frontend expects 'developer'
+            "project_id": r.get('project_id', ''),
+            "project_name": r.get('name', ''),
+            "developer_name": r.get('developer', ''),
+            "location": r.get('location', ''),
+            "city": r.get('zone', '') or r.get('location', ''),
+            "locality": r.get('location', ''),
+            "zone": r.get('zone', ''),
+            "status": r.get('status', ''),
+            "possession_year": r.get('possession_year'),
+            "possession_quarter": r.get('possession_quarter', ''),
+            "total_land_area": r.get('total_land_area', ''),
+            "towers": r.get('towers', ''),
+            "floors": r.get('floors', ''),
+            "amenities": r.get('amenities', ''),
+            "highlights": r.get('highlights', ''),
+            "description": r.get('description', ''),
+            "usp": r.get('usp', ''),
+            "brochure_link": r.get('brochure_link', ''),
+            "brochure_url": r.get('brochure_url', ''),
+            "rm_contact": r.get('rm_contact', ''),
+            "rm_details": r.get('rm_details', {}),
+            "location_link": r.get('location_link', ''),
+            "config_summary": r.get('configuration', ''),
+            "configuration": r.get('configuration', ''),
+            "rera_number": r.get('rera_number', ''),
+            "registration_process": r.get('registration_process', ''),
+            "price_range": {
+                "min": min_cr,
+                "max": max_cr,
+                "min_display": f"₹{min_cr:.2f} Cr" if min_cr else "Price on request",
+                "max_display": f"₹{max_cr:.2f} Cr" if max_cr else "Price on request"
+            },
+            "budget_min": r.get('budget_min'),  # In lakhs (for frontend calculations)
+            "budget_max": r.get('budget_max'),  # In lakhs (for frontend calculations)
+            "matching_units": [],
+            "unit_count": 0,
+            "can_expand": True,
+            "relevant_chunks": []
+        }
+    except Exception as format_err:
+        logger.error(f"Error formatting project {row.get('name')}: {format_err}")
+        return None
+
+
+def resolve_fields(fields: FieldsSpec) -> Optional[Tuple[str, ...]]:
+    """
+    Normalize a field projection.
+
+    None / "full" / "all" -> None (every field); a preset name ("card") ->
+    that preset; a comma-separated string or list -> identity fields plus
+    the requested ones.
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        key = fields.strip().lower()
+        if key in ("", "full", "all"):
+            return None
+        if key in FIELD_PRESETS:
+            return FIELD_PRESETS[key]
+        fields = fields.split(",")
+    requested = [f.strip() for f in fields if f and f.strip()]
+    if any(f.lower() in ("full", "all") for f in requested):
+        return None
+    resolved: List[str] = list(IDENTITY_FIELDS)
+    for field in requested:
+        for name in FIELD_PRESETS.get(field.lower(), (field,)):
+            if name not in resolved:
+                resolved.append(name)
+    return tuple(resolved)
+
+
+def project_fields(payload: Dict[str, Any], fields: FieldsSpec) -> Dict[str, Any]:
+    """`payload` restricted to the requested fields (missing fields are omitted)."""
+    resolved = resolve_fields(fields)
+    if resolved is None:
+        return payload
+    return {key: payload[key] for key in resolved if key in payload}
+
+
+def project_list_fields(projects: Iterable[Dict[str, Any]], fields: FieldsSpec) -> List[Dict[str, Any]]:
+    """Apply a field projection to every project in a response list."""
+    resolved = resolve_fields(fields)
+    if resolved is None:
+        return list(projects)
+    return [{key: p[key] for key in resolved if key in p} for p in projects]
+
+
+def search_result_payload(
+    base: Dict[str, Any],
+    matching_units: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """Per-search result: shallow copy of the snapshot payload plus the matching units."""
+    payload = dict(base)
+    if matching_units:
+        payload["matching_units"] = matching_units
+        payload["unit_count"] = len(matching_units)
+    else:
+        payload["matching_units"] = []
+    payload["relevant_chunks"] = []
+    return payload
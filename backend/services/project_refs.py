@@ -0,0 +1,87 @@
+"""
+Project References - Compact form of project lists kept in conversation context.
+
+Call context (`last_results`) and session state (`last_shown_projects`,
+`last_search_results`) used to persist full project rows or response
+payloads on every turn. Persisted lists now hold a reference per project:
+the catalog key, which view it was taken from (raw row or rendered
+payload) and only the fields that differ from that view, which covers
+per-result annotations such as `_match_score`, `_distance` and
+`matching_units`. Loading rehydrates them from the current catalog snapshot.
+
+Dicts that do not match a catalog project (web results, ad-hoc summaries)
+are kept as they are. References to projects no longer in the catalog are
+dropped on load.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from services.catalog_index import CatalogIndex
+from services.project_repository import project_repository
+
+logger = logging.getLogger(__name__)
+
+REF_KEY = "_ref"
+VIEW_KEY = "_view"
+
+_MISSING = object()
+
+
+def _base(index: CatalogIndex, pos: int, view: str) -> Optional[Dict[str, Any]]:
+    return index.projects[pos] if view == "row" else index.payloads[pos]
+
+
+def _overrides(project: Dict[str, Any], base: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in project.items() if base.get(key, _MISSING) != value}
+
+
+def compact_project(project: Any, index: CatalogIndex) -> Any:
+    """Reference for a catalog project dict; anything else is returned unchanged."""
+    if not isinstance(project, dict) or REF_KEY in project:
+        return project
+    pos = index.position_of(project)
+    if pos is None:
+        return project
+    row = index.projects[pos]
+    name = project.get("name") or project.get("project_name")
+    if name and name != row.get("name"):
+        return project  # Same id or name fragment, different project
+
+    best = None
+    for view in ("row", "payload"):
+        base = _base(index, pos, view)
+        if base is not None:
+            overrides = _overrides(project, base)
+            if best is None or len(overrides) < len(best[1]):
+                best = (view, overrides)
+    view, overrides = best
+    return {REF_KEY: row.get("project_id") or row.get("name"), VIEW_KEY: view, **overrides}
+
+
+def resolve_project(item: Any, index: CatalogIndex) -> Optional[Any]:
+    """Full project dict for a reference (None if it left the catalog); other items unchanged."""
+    if not isinstance(item, dict) or REF_KEY not in item:
+        return item
+    pos = index.position_of({"project_id": item[REF_KEY]})
+    base = _base(index, pos, item.get(VIEW_KEY, "row")) if pos is not None else None
+    if base is None:
+        logger.debug(f"Project reference {item[REF_KEY]} no longer in catalog, dropping it")
+        return None
+    return {**base, **{key: value for key, value in item.items() if key not in (REF_KEY, VIEW_KEY)}}
+
+
+def compact_projects(projects: Optional[List[Any]], index: Optional[CatalogIndex] = None) -> List[Any]:
+    if not projects:
+        return []
+    index = index or project_repository.catalog()
+    return [compact_project(project, index) for project in projects]
+
+
+def resolve_projects(items: Optional[List[Any]], index: Optional[CatalogIndex] = None) -> List[Any]:
+    if not items:
+        return []
+    if not any(isinstance(item, dict) and REF_KEY in item for item in items):
+        return list(items)
+    index = index or project_repository.catalog()
+    return [project for project in (resolve_project(item, index) for item in items) if project is not None]
@@ -0,0 +1,206 @@
+"""
+Project Repository - Process-wide, in-memory access to the project catalog.
+
+Every lookup is served from the current ProjectSnapshot (see
+services/project_snapshot.py) instead of running its own full-table
+Pixeltable select(...).collect(). When the database is unavailable the
+repository falls back to the bundled seed data, as the mock-data paths did.
+
+Returned rows are shallow copies, so callers may annotate them freely
+(e.g. `_distance`, `_match_score`) without touching the shared snapshot.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.catalog_index import CatalogIndex
+from services.name_index import NameMatch
+from services.project_payloads import FieldsSpec, project_fields
+from services.project_snapshot import ProjectSnapshotManager, project_snapshots
+
+logger = logging.getLogger(__name__)
+
+SEED_DATA_PATH = os.path.join(os.path.dirname(__file__), '../data/seed_projects.json')
+
+# Column projections used by the flow engine and chat endpoints
+SEARCH_COLUMNS = (
+    'project_id', 'name', 'location', 'zone', 'budget_min', 'budget_max',
+    'configuration', 'status', 'possession_year'
+)
+DETAIL_COLUMNS = SEARCH_COLUMNS + (
+    'possession_quarter', 'amenities', 'usp', 'brochure_url', 'rm_details'
+)
+
+
+def _project(row: Dict[str, Any], columns: Optional[Sequence[str]]) -> Dict[str, Any]:
+    if columns is None:
+        return dict(row)
+    return {col: row.get(col) for col in columns}
+
+
+class ProjectRepository:
+    """Lookups by id and name, column projections and search primitives over the catalog."""
+
+    def __init__(
+        self,
+        snapshots: ProjectSnapshotManager = project_snapshots,
+        fallback_path: str = SEED_DATA_PATH
+    ):
+        self._snapshots = snapshots
+        self._fallback_path = fallback_path
+        self._fallback_index: Optional[CatalogIndex] = None
+        self._fallback_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "fallbacks": 0}
+
+    # ------------------------------------------------------------------
+    # Snapshot access
+    # ------------------------------------------------------------------
+
+    def catalog(self) -> CatalogIndex:
+        """Catalog index for the current snapshot (or the seed-data fallback)."""
+        if self._snapshots.current() is not None:
+            self._stats["hits"] += 1
+        else:
+            self._stats["misses"] += 1
+
+        snapshot = self._snapshots.get()
+        if snapshot is not None:
+            return snapshot.index
+
+        self._stats["fallbacks"] += 1
+        return self._get_fallback_index()
+
+    @property
+    def version(self) -> Optional[int]:
+        """Version of the active snapshot (None while serving fallback data)."""
+        snapshot = self._snapshots.current()
+        return snapshot.version if snapshot else None
+
+    def _get_fallback_index(self) -> CatalogIndex:
+        with self._fallback_lock:
+            if self._fallback_index is None:
+                rows = []
+                try:
+                    if os.path.exists(self._fallback_path):
+                        with open(self._fallback_path, 'r') as f:
+                            rows = json.load(f)
+                        logger.warning(f"ProjectRepository: database unavailable, using {len(rows)} seed projects")
+                    else:
+                        logger.error(f"Seed data file not found at {self._fallback_path}")
+                except Exception as e:
+                    logger.error(f"Failed to load seed data: {e}")
+                self._fallback_index = CatalogIndex(rows)
+            return self._fallback_index
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def select(self, *columns: str) -> List[Dict[str, Any]]:
+        """All projects, projected to `columns` (all columns when none given)."""
+        index = self.catalog()
+        cols = columns or None
+        return [_project(p, cols) for p in index.projects]
+
+    def rows(self, mask: np.ndarray, columns: Optional[Sequence[str]] = None,
+             index: Optional[CatalogIndex] = None) -> List[Dict[str, Any]]:
+        """Projects selected by a catalog mask (masks must come from the same index)."""
+        index = index or self.catalog()
+        return [_project(index.projects[i], columns) for i in np.flatnonzero(mask)]
+
+    def by_id(self, project_id: str, columns: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        if not project_id:
+            return None
+        index = self.catalog()
+        pos = index.position_of({'project_id': project_id})
+        if pos is None or str(index.projects[pos].get('project_id')) != str(project_id):
+            return None
+        return _project(index.projects[pos], columns)
+
+    def by_name(self, name: str, columns: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        """Case-insensitive exact name match."""
+        if not name:
+            return None
+        index = self.catalog()
+        pos = index.exact_name(name, index.all_mask())
+        return _project(index.projects[pos], columns) if pos is not None else None
+
+    def find_by_name_fragment(self, fragment: str, columns: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Replacement for `where(name.contains(fragment)).limit(1)`:
+        exact (case-insensitive) name first, then the first name containing the fragment.
+        """
+        if not fragment:
+            return None
+        index = self.catalog()
+        pos = index.exact_name(fragment, index.all_mask())
+        if pos is None:
+            matches = np.flatnonzero(index.contains_any_field(fragment, ('name',)))
+            pos = int(matches[0]) if len(matches) else None
+        return _project(index.projects[pos], columns) if pos is not None else None
+
+    def payload(self, project_id: str, fields: FieldsSpec = None) -> Optional[Dict[str, Any]]:
+        """Pre-rendered response payload for a project (by id, then exact name), optionally projected."""
+        if not project_id:
+            return None
+        index = self.catalog()
+        pos = index.position_of({'project_id': project_id})
+        if pos is None:
+            pos = index.exact_name(project_id, index.all_mask())
+        if pos is None or index.payloads[pos] is None:
+            return None
+        return dict(project_fields(index.payloads[pos], fields))
+
+    def match_name(
+        self,
+        query: str,
+        limit: int = 5,
+        columns: Optional[Sequence[str]] = None
+    ) -> List[Tuple[Dict[str, Any], NameMatch]]:
+        """Ranked (project, match) candidates from the snapshot's name index."""
+        index = self.catalog()
+        return [(_project(index.projects[m.position], columns), m)
+                for m in index.names.lookup(query, limit=limit)]
+
+    def within_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        columns: Optional[Sequence[str]] = None,
+        distance_key: str = '_distance'
+    ) -> List[Dict[str, Any]]:
+        """Projects within `radius_km` of (lat, lon), nearest first, with the distance (km) under `distance_key`."""
+        index = self.catalog()
+        positions, distances = index.geo.within_radius(lat, lon, radius_km)
+        return [{**_project(index.projects[pos], columns), distance_key: float(dist)}
+                for pos, dist in zip(positions, distances)]
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        columns: Optional[Sequence[str]] = None,
+        distance_key: str = '_distance'
+    ) -> List[Dict[str, Any]]:
+        """The `k` projects closest to (lat, lon), nearest first."""
+        index = self.catalog()
+        positions, distances = index.geo.nearest(lat, lon, k)
+        return [{**_project(index.projects[pos], columns), distance_key: float(dist)}
+                for pos, dist in zip(positions, distances)]
+
+    def names(self) -> List[str]:
+        return [p.get('name') for p in self.catalog().projects if p.get('name')]
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "snapshot": self._snapshots.stats()}
+
+
+# Global instance
+project_repository = ProjectRepository()
@@ -0,0 +1,220 @@
+"""
+Project Snapshot Manager - Stale-while-revalidate view of brigade.projects.
+
+Readers always get the current snapshot (rows + CatalogIndex) without
+blocking. Once a snapshot is older than `ttl - refresh_ahead` a single
+background refresh is scheduled; a cold miss triggers exactly one load that
+concurrent callers wait on; admin refreshes swap a new snapshot in
+atomically. After a failed load, readers get None (callers fall back to seed
+data) without loading again until LOAD_RETRY_SECONDS pass; the retry then
+runs in the background.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from services.catalog_index import CatalogIndex
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_TTL_SECONDS = 300  # 5 minutes, same as the previous dict cache
+REFRESH_AHEAD_SECONDS = 60  # Start refreshing this long before expiry
+LOAD_RETRY_SECONDS = 30.0   # Backoff after a failed load
+
+
+def _load_from_pixeltable() -> List[Any]:
+    """Fetch every project row (table handle resolved per load so re-created tables are picked up)."""
+    from database.pixeltable_setup import get_projects_table
+    return list(get_projects_table().collect())
+
+
+class ProjectSnapshot:
+    """Immutable, versioned copy of the projects table with its catalog index."""
+
+    def __init__(self, version: int, rows: List[Any], started_at: float):
+        self.version = version
+        self.index = CatalogIndex(rows)
+        self.rows = self.index.projects
+        self.started_at = started_at  # monotonic time the load began (orders racing loads)
+        self.loaded_at = time.time()
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.loaded_at
+
+
+class _InFlightLoad:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class ProjectSnapshotManager:
+    """Holds the current ProjectSnapshot and coordinates refreshes."""
+
+    def __init__(
+        self,
+        loader: Optional[Callable[[], List[Any]]] = None,
+        ttl_seconds: int = SNAPSHOT_TTL_SECONDS,
+        refresh_ahead_seconds: int = REFRESH_AHEAD_SECONDS,
+        retry_seconds: float = LOAD_RETRY_SECONDS
+    ):
+        self._loader = loader or _load_from_pixeltable
+        self.ttl_seconds = ttl_seconds
+        self.refresh_ahead_seconds = min(refresh_ahead_seconds, ttl_seconds)
+        self.retry_seconds = retry_seconds
+
+        self._snapshot: Optional[ProjectSnapshot] = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self._inflight: Optional[_InFlightLoad] = None
+        self._refresh_scheduled = False
+        self._retry_at = 0.0  # monotonic time before which failed loads are not retried
+        # Dedicated thread so refreshes never occupy the query executor
+        self._refresher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="project-snapshot")
+
+        self._stats = {"loads": 0, "load_failures": 0, "background_refreshes": 0, "coalesced_waits": 0}
+
+    # ------------------------------------------------------------------
+    # Read path
+    # ------------------------------------------------------------------
+
+    def current(self) -> Optional[ProjectSnapshot]:
+        """The current snapshot, without triggering any load."""
+        return self._snapshot
+
+    def get(self) -> Optional[ProjectSnapshot]:
+        """
+        Return the current snapshot, loading it on a cold start.
+
+        Stale snapshots are still served; a background refresh is scheduled
+        once the snapshot enters the refresh-ahead window. While a failed load
+        is backing off, nothing is loaded in the caller's thread.
+        """
+        snapshot = self._snapshot
+        backing_off = time.monotonic() < self._retry_at
+        if snapshot is None:
+            if self._retry_at == 0.0:
+                return self._load_single_flight()
+            if not backing_off:
+                self._schedule_refresh()
+            return None
+
+        if snapshot.age_seconds >= self.ttl_seconds - self.refresh_ahead_seconds and not backing_off:
+            self._schedule_refresh()
+            if snapshot.age_seconds >= self.ttl_seconds:
+                logger.info(f"Serving stale project snapshot v{snapshot.version} ({snapshot.age_seconds:.0f}s old) while refreshing")
+        return snapshot
+
+    # ------------------------------------------------------------------
+    # Write path
+    # ------------------------------------------------------------------
+
+    def refresh(self, rows: Optional[List[Any]] = None) -> Optional[ProjectSnapshot]:
+        """
+        Synchronously load (or use the given rows) and swap in a new snapshot.
+
+        Used by /admin/refresh-projects; readers keep the old snapshot until
+        the new one is fully built.
+        """
+        started_at = time.monotonic()
+        if rows is None:
+            rows = self._loader()
+        return self._swap(rows, started_at)
+
+    def warm(self) -> None:
+        """Schedule an initial load in the background (startup)."""
+        if self._snapshot is None:
+            self._schedule_refresh()
+
+    def invalidate(self) -> None:
+        """Drop the current snapshot; the next reader reloads it."""
+        with self._lock:
+            self._snapshot = None
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            **self._stats,
+            "version": snapshot.version if snapshot else None,
+            "projects": len(snapshot.rows) if snapshot else 0,
+            "age_seconds": round(snapshot.age_seconds, 1) if snapshot else None,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _swap(self, rows: List[Any], started_at: float) -> Optional[ProjectSnapshot]:
+        with self._lock:
+            version = self._version + 1
+            self._version = version
+        snapshot = ProjectSnapshot(version, rows, started_at)  # Index built outside the lock
+        with self._lock:
+            current = self._snapshot
+            # A load that began before the current snapshot's load must not overwrite it
+            if current is not None and current.started_at > started_at:
+                logger.info(f"Discarding project snapshot v{version}: superseded by v{current.version}")
+                return current
+            self._snapshot = snapshot
+            self._retry_at = 0.0
+        self._stats["loads"] += 1
+        logger.info(f"Project snapshot v{version} active ({len(snapshot.rows)} projects)")
+        return snapshot
+
+    def _load_single_flight(self) -> Optional[ProjectSnapshot]:
+        """Run one load; concurrent callers wait for it instead of loading again."""
+        with self._lock:
+            flight = self._inflight
+            leader = flight is None
+            if leader:
+                flight = self._inflight = _InFlightLoad()
+
+        if not leader:
+            self._stats["coalesced_waits"] += 1
+            flight.done.wait()
+            return self._snapshot
+
+        try:
+            started_at = time.monotonic()
+            rows = self._loader()
+            logger.info(f"Total projects fetched: {len(rows)}")
+            self._swap(rows, started_at)
+        except Exception as e:
+            self._stats["load_failures"] += 1
+            self._retry_at = time.monotonic() + self.retry_seconds
+            logger.error(f"Error fetching projects: {e} (retrying in {self.retry_seconds:.0f}s)")
+            if self._snapshot is not None:
+                logger.warning("Keeping stale project snapshot due to fetch error")
+        finally:
+            with self._lock:
+                self._inflight = None
+            flight.done.set()
+        return self._snapshot
+
+    def _schedule_refresh(self) -> None:
+        with self._lock:
+            if self._refresh_scheduled:
+                return
+            self._refresh_scheduled = True
+        try:
+            self._refresher.submit(self._background_refresh)
+        except RuntimeError as e:
+            # Executor shut down (interpreter exit)
+            logger.warning(f"Could not schedule project snapshot refresh: {e}")
+            with self._lock:
+                self._refresh_scheduled = False
+
+    def _background_refresh(self) -> None:
+        try:
+            self._stats["background_refreshes"] += 1
+            self._load_single_flight()
+        finally:
+            with self._lock:
+                self._refresh_scheduled = False
+
+
+# Global instance
+project_snapshots = ProjectSnapshotManager()
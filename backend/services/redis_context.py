@@ -1,16 +1,84 @@
 """
 Redis Context Manager for Multi-Turn Conversation Persistence
 Replaces in-memory session storage with Redis for production durability.
+
+Request handlers use the async methods (aload_context / asave_context),
+which run on a bounded redis.asyncio connection pool: a load and its sliding
+TTL reset are one GETEX round trip, and multi-key operations are pipelined.
+The sync methods remain for scripts. Round-trip latency per operation is
+reported by health_check.
+
+`last_results` is stored as project references (services/project_refs.py)
+and rehydrated from the catalog snapshot on load.
 """
 
+import asyncio
+import bisect
 import redis
+import redis.asyncio as aioredis
 import json
 import logging
-from typing import Optional, Dict, Any
+import threading
+import time
+from typing import Optional, Dict, Any, List
 from datetime import timedelta
 
+from services.bounded_store import BoundedTTLStore
+from services.project_refs import compact_projects, resolve_projects
+
 logger = logging.getLogger(__name__)
 
+# Upper bounds (ms) of the round-trip latency histogram buckets
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+POOL_TIMEOUT_SECONDS = 2.0  # Longest a request waits for a free pooled connection
+
+
+class LatencyHistogram:
+    """Fixed-bucket round-trip latency histogram per Redis operation."""
+
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._counts: Dict[str, List[int]] = {}
+        self._totals: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, operation: str, seconds: float) -> None:
+        elapsed_ms = seconds * 1000.0
+        with self._lock:
+            counts = self._counts.setdefault(operation, [0] * (len(self.buckets_ms) + 1))
+            counts[bisect.bisect_left(self.buckets_ms, elapsed_ms)] += 1
+            self._totals[operation] = self._totals.get(operation, 0.0) + elapsed_ms
+
+    def percentile(self, operation: str, fraction: float) -> Optional[float]:
+        """Upper bound (ms) of the bucket holding the given fraction; None above the last bucket."""
+        with self._lock:
+            counts = list(self._counts.get(operation, ()))
+        total = sum(counts)
+        if not total:
+            return None
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= fraction * total:
+                return self.buckets_ms[index] if index < len(self.buckets_ms) else None
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            operations = {operation: (list(counts), self._totals[operation])
+                          for operation, counts in self._counts.items()}
+        labels = [f"le_{bound}ms" for bound in self.buckets_ms] + ["inf"]
+        return {
+            operation: {
+                "count": sum(counts),
+                "mean_ms": round(total / sum(counts), 3),
+                "p50_ms": self.percentile(operation, 0.5),
+                "p99_ms": self.percentile(operation, 0.99),
+                "buckets": {label: count for label, count in zip(labels, counts) if count},
+            }
+            for operation, (counts, total) in operations.items()
+        }
+
 
 class RedisContextManager:
     """
@@ -22,7 +90,7 @@ class RedisContextManager:
         "active_project": None | str,
         "last_budget": None | int (INR),
         "last_location": None | str,
-        "last_results": [],  # List of project dicts
+        "last_results": [],  # List of project dicts (stored as catalog references)
         "last_filters": {},  # Quick filters dict
         "signals": {
             "price_sensitive": False,
@@ -35,7 +103,9 @@ class RedisContextManager:
         self,
         redis_url: str,
         ttl_seconds: int = 5400,  # 90 minutes (spec requirement)
-        fallback_to_memory: bool = True
+        fallback_to_memory: bool = True,
+        max_connections: int = 50,
+        memory_max_entries: int = 10000
     ):
         """
         Initialize Redis context manager.
@@ -44,11 +114,20 @@ class RedisContextManager:
             redis_url: Redis connection URL (e.g., redis://localhost:6379/0)
             ttl_seconds: TTL for context keys (default: 5400s = 90min)
             fallback_to_memory: If True, fallback to in-memory dict on Redis failure
+            max_connections: Size of the async connection pool
+            memory_max_entries: Bound on contexts kept by the in-memory fallback
         """
+        self.redis_url = redis_url
         self.ttl = ttl_seconds
         self.fallback_to_memory = fallback_to_memory
-        self.memory_store: Dict[str, Dict[str, Any]] = {}  # Fallback storage
+        self.max_connections = max_connections
+        # Fallback storage, with the same sliding TTL as Redis
+        self.memory_store = BoundedTTLStore("call_context_memory", memory_max_entries, ttl_seconds)
         self.redis_available = False
+        self.latency = LatencyHistogram()
+        self._async_client: Optional[aioredis.Redis] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
 
         try:
             self.client = redis.from_url(redis_url, decode_responses=True, socket_connect_timeout=2)
@@ -74,23 +153,53 @@ class RedisContextManager:
         Returns:
             Context dict (default structure if not found)
         """
-        key = f"call:{call_id}"
-
         # Try Redis first
         if self.redis_available and self.client:
             try:
-                data = self.client.get(key)
+                started = time.perf_counter()
+                # Sliding window: GETEX resets the TTL in the same round trip
+                data = self.client.getex(self._key(call_id), ex=self.ttl)
+                self.latency.observe("load", time.perf_counter() - started)
                 if data:
-                    # Sliding window: reset TTL on access
-                    self.client.expire(key, self.ttl)
-                    context = json.loads(data)
                     logger.debug(f"📥 Loaded context from Redis for call_id={call_id}")
-                    return context
+                    return self._decode(data)
             except Exception as e:
                 logger.error(f"Redis load error for {call_id}: {e}")
                 if not self.fallback_to_memory:
                     raise
 
+        return self._load_fallback(call_id)
+
+    async def aload_context(self, call_id: str) -> Dict[str, Any]:
+        """Async load_context: one GETEX round trip on the connection pool."""
+        return (await self.aload_contexts([call_id]))[call_id]
+
+    async def aload_contexts(self, call_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Load several contexts in one pipelined round trip (sliding TTL reset
+        on each).
+
+        Returns:
+            Context dict per call_id (default structure if not found)
+        """
+        found: Dict[str, Any] = {}
+        client = self._get_async_client()
+        if client is not None:
+            try:
+                started = time.perf_counter()
+                async with client.pipeline(transaction=False) as pipe:
+                    for call_id in call_ids:
+                        pipe.getex(self._key(call_id), ex=self.ttl)
+                    values = await pipe.execute()
+                self.latency.observe("load" if len(call_ids) == 1 else "load_many", time.perf_counter() - started)
+                found = {call_id: self._decode(data) for call_id, data in zip(call_ids, values) if data}
+            except Exception as e:
+                logger.error(f"Redis load error for {call_ids}: {e}")
+                if not self.fallback_to_memory:
+                    raise
+        return {call_id: found[call_id] if call_id in found else self._load_fallback(call_id) for call_id in call_ids}
+
+    def _load_fallback(self, call_id: str) -> Dict[str, Any]:
         # Fallback to in-memory storage
         if call_id in self.memory_store:
             logger.debug(f"📥 Loaded context from memory for call_id={call_id}")
@@ -111,16 +220,16 @@ class RedisContextManager:
         Returns:
             True if saved successfully, False otherwise
         """
-        key = f"call:{call_id}"
-
         # Ensure call_id is set in context
         context["call_id"] = call_id
 
         # Try Redis first
         if self.redis_available and self.client:
             try:
-                serialized = json.dumps(context)
-                self.client.setex(key, self.ttl, serialized)
+                serialized = self._encode(context)
+                started = time.perf_counter()
+                self.client.setex(self._key(call_id), self.ttl, serialized)
+                self.latency.observe("save", time.perf_counter() - started)
                 logger.debug(f"💾 Saved context to Redis for call_id={call_id} (TTL={self.ttl}s)")
                 return True
             except Exception as e:
@@ -133,6 +242,42 @@ class RedisContextManager:
         logger.debug(f"💾 Saved context to memory for call_id={call_id}")
         return True
 
+    async def asave_context(self, call_id: str, context: Dict[str, Any]) -> bool:
+        """Async save_context (SETEX on the connection pool)."""
+        return await self.asave_contexts({call_id: context})
+
+    async def asave_contexts(self, contexts: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Save several contexts in one pipelined round trip.
+
+        Returns:
+            True if saved successfully, False otherwise
+        """
+        for call_id, context in contexts.items():
+            # Ensure call_id is set in context
+            context["call_id"] = call_id
+
+        client = self._get_async_client()
+        if client is not None:
+            try:
+                started = time.perf_counter()
+                async with client.pipeline(transaction=False) as pipe:
+                    for call_id, context in contexts.items():
+                        pipe.setex(self._key(call_id), self.ttl, self._encode(context))
+                    await pipe.execute()
+                self.latency.observe("save" if len(contexts) == 1 else "save_many", time.perf_counter() - started)
+                logger.debug(f"💾 Saved context to Redis for call_ids={list(contexts)} (TTL={self.ttl}s)")
+                return True
+            except Exception as e:
+                logger.error(f"Redis save error for {list(contexts)}: {e}")
+                if not self.fallback_to_memory:
+                    raise
+
+        # Fallback to in-memory storage
+        self.memory_store.update(contexts)
+        logger.debug(f"💾 Saved context to memory for call_ids={list(contexts)}")
+        return True
+
     def delete_context(self, call_id: str) -> bool:
         """
         Delete conversation context (e.g., on explicit user logout).
@@ -143,12 +288,10 @@ class RedisContextManager:
         Returns:
             True if deleted successfully, False otherwise
         """
-        key = f"call:{call_id}"
-
         # Delete from Redis
         if self.redis_available and self.client:
             try:
-                self.client.delete(key)
+                self.client.delete(self._key(call_id))
                 logger.debug(f"🗑️ Deleted context from Redis for call_id={call_id}")
             except Exception as e:
                 logger.error(f"Redis delete error for {call_id}: {e}")
@@ -160,6 +303,63 @@ class RedisContextManager:
 
         return True
 
+    async def adelete_context(self, call_id: str) -> bool:
+        """Async delete_context."""
+        client = self._get_async_client()
+        if client is not None:
+            try:
+                await client.delete(self._key(call_id))
+                logger.debug(f"🗑️ Deleted context from Redis for call_id={call_id}")
+            except Exception as e:
+                logger.error(f"Redis delete error for {call_id}: {e}")
+
+        self.memory_store.pop(call_id, None)
+        return True
+
+    async def aclose(self) -> None:
+        """Close pooled async connections (app shutdown)."""
+        with self._lock:
+            client, self._async_client, self._async_loop = self._async_client, None, None
+        if client is not None:
+            await client.aclose()
+
+    @staticmethod
+    def _key(call_id: str) -> str:
+        return f"call:{call_id}"
+
+    @staticmethod
+    def _encode(context: Dict[str, Any]) -> str:
+        if context.get("last_results"):
+            context = {**context, "last_results": compact_projects(context["last_results"])}
+        return json.dumps(context)
+
+    @staticmethod
+    def _decode(data: str) -> Dict[str, Any]:
+        context = json.loads(data)
+        if context.get("last_results"):
+            context["last_results"] = resolve_projects(context["last_results"])
+        return context
+
+    def _get_async_client(self) -> Optional[aioredis.Redis]:
+        """Pooled async client, or None when Redis was unreachable at startup."""
+        if not self.redis_available:
+            return None
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # Pooled connections are tied to the loop that opened them (e.g. a new asyncio.run in scripts)
+            if self._async_client is None or self._async_loop is not loop:
+                pool = aioredis.BlockingConnectionPool.from_url(
+                    self.redis_url,
+                    max_connections=self.max_connections,
+                    timeout=POOL_TIMEOUT_SECONDS,
+                    decode_responses=True,
+                    socket_connect_timeout=2,
+                    socket_timeout=2
+                )
+                self._async_client = aioredis.Redis(connection_pool=pool)
+                self._async_loop = loop
+            return self._async_client
+
     def _default_context(self, call_id: str) -> Dict[str, Any]:
         """
         Create default context structure (spec-compliant).
@@ -199,11 +399,15 @@ class RedisContextManager:
             }
 
         try:
+            started = time.perf_counter()
             self.client.ping()
+            self.latency.observe("ping", time.perf_counter() - started)
             return {
                 "redis_available": True,
                 "fallback_mode": None,
-                "status": "healthy"
+                "status": "healthy",
+                "pool_max_connections": self.max_connections,
+                "latency": self.latency.snapshot()
             }
         except Exception as e:
             logger.error(f"Redis health check failed: {e}")
@@ -234,7 +438,12 @@ def get_redis_context_manager() -> RedisContextManager:
     return redis_context_manager
 
 
-def init_redis_context_manager(redis_url: str, ttl_seconds: int = 5400) -> RedisContextManager:
+def init_redis_context_manager(
+    redis_url: str,
+    ttl_seconds: int = 5400,
+    max_connections: int = 50,
+    memory_max_entries: int = 10000
+) -> RedisContextManager:
     """
     Initialize global RedisContextManager instance.
     Should be called once at application startup.
@@ -242,10 +451,13 @@ def init_redis_context_manager(redis_url: str, ttl_seconds: int = 5400) -> Redis
     Args:
         redis_url: Redis connection URL
         ttl_seconds: TTL for context keys (default: 5400s = 90min)
+        max_connections: Size of the async connection pool
+        memory_max_entries: Bound on contexts kept by the in-memory fallback
 
     Returns:
         Initialized RedisContextManager instance
     """
     global redis_context_manager
-    redis_context_manager = RedisContextManager(redis_url, ttl_seconds)
+    redis_context_manager = RedisContextManager(redis_url, ttl_seconds, max_connections=max_connections,
+                                                memory_max_entries=memory_max_entries)
     return redis_context_manager
@@ -0,0 +1,183 @@
+"""
+Response Stream - Server-sent events for the streaming chat endpoints.
+
+The /stream variants of /api/chat/query and /api/assist run the regular
+handler with a `ResponseStream` bound to the request context. Code deep in
+the handler reports progress through the module helpers, which are no-ops
+when nothing is streaming:
+
+    emit_projects(results)                          # after retrieval
+    text = await generate_text(messages, ...)       # tokens stream as they arrive
+    text = generate_text_sync(messages, ...)        # same, from worker threads
+
+The client receives, in order:
+
+    event: projects   project cards, as soon as retrieval finishes
+    event: token      {"text": ...} consultant text deltas
+    event: coaching   coaching / pitch fields of the finished response
+    event: final      the complete ChatQueryResponse / CopilotResponse
+
+The `final` event is authoritative: streamed tokens are for display while
+the answer is being written, and the final answer may add framing (e.g. a
+welcome-back line) or replace a failed generation with its fallback.
+"""
+
+import asyncio
+import json
+import logging
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from services.llm_gateway import llm_gateway
+
+logger = logging.getLogger(__name__)
+
+EVENT_PROJECTS = "projects"
+EVENT_TOKEN = "token"
+EVENT_COACHING = "coaching"
+EVENT_FINAL = "final"
+EVENT_ERROR = "error"
+
+# Disable proxy buffering so events reach the browser as they are written
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+_current_stream: ContextVar[Optional["ResponseStream"]] = ContextVar("response_stream", default=None)
+
+
+def sse_event(event: str, data: Any) -> str:
+    """One server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class ResponseStream:
+    """Event queue for one streaming request; safe to emit into from worker threads."""
+
+    def __init__(self, format_projects: Optional[Callable[[List[Dict[str, Any]]], List[Any]]] = None):
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.format_projects = format_projects
+        self.projects_sent = False
+        self.tokens_sent = 0
+
+    def emit(self, event: str, data: Any) -> None:
+        try:
+            on_loop = asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self.queue.put_nowait((event, data))
+        else:
+            # Flow engine code runs in asyncio.to_thread workers
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, (event, data))
+
+    def projects(self, projects: List[Dict[str, Any]]) -> None:
+        if not projects:
+            return
+        try:
+            cards = self.format_projects(projects) if self.format_projects else projects
+        except Exception as e:
+            logger.warning(f"Response stream: could not format project cards: {e}")
+            return
+        self.projects_sent = True
+        self.emit(EVENT_PROJECTS, cards)
+
+    def token(self, text: str) -> None:
+        if text:
+            self.tokens_sent += 1
+            self.emit(EVENT_TOKEN, {"text": text})
+
+    def close(self) -> None:
+        self.emit(None, None)
+
+
+def current_stream() -> Optional[ResponseStream]:
+    """The stream bound to this request, or None for regular JSON requests."""
+    return _current_stream.get()
+
+
+def emit_projects(projects: List[Dict[str, Any]]) -> None:
+    stream = current_stream()
+    if stream is not None:
+        stream.projects(projects)
+
+
+def emit_token(text: str) -> None:
+    stream = current_stream()
+    if stream is not None:
+        stream.token(text)
+
+
+async def generate_text(messages: List[Dict[str, Any]], **params: Any) -> str:
+    """
+    Sampled completion text; streamed token by token when a stream is active,
+    otherwise a regular `llm_gateway.chat` call.
+    """
+    stream = current_stream()
+    if stream is None:
+        response = await llm_gateway.chat(messages=messages, **params)
+        return response.choices[0].message.content.strip()
+
+    parts = []
+    async for delta in llm_gateway.chat_stream(messages=messages, **params):
+        parts.append(delta)
+        stream.token(delta)
+    return "".join(parts).strip()
+
+
+def generate_text_sync(messages: List[Dict[str, Any]], **params: Any) -> str:
+    """Blocking `generate_text` for code running in a worker thread."""
+    stream = current_stream()
+    if stream is None:
+        response = llm_gateway.chat_sync(messages=messages, **params)
+        return response.choices[0].message.content.strip()
+
+    parts = []
+    for delta in llm_gateway.chat_stream_sync(messages=messages, **params):
+        parts.append(delta)
+        stream.token(delta)
+    return "".join(parts).strip()
+
+
+async def sse_events(
+    handler: Callable[[], Awaitable[Any]],
+    format_projects: Optional[Callable[[List[Dict[str, Any]]], List[Any]]] = None,
+    coaching_fields: Sequence[str] = ()
+) -> AsyncIterator[str]:
+    """
+    Run `handler` (returning the endpoint's response model) with a stream
+    bound, yielding SSE frames as it progresses and the full response last.
+    """
+    stream = ResponseStream(format_projects)
+    token = _current_stream.set(stream)
+    try:
+        # The task copies the current context, so the handler (and the worker
+        # threads it starts with asyncio.to_thread) sees the stream
+        task = asyncio.ensure_future(handler())
+    finally:
+        _current_stream.reset(token)
+    task.add_done_callback(lambda _: stream.close())
+
+    try:
+        while True:
+            event, data = await stream.queue.get()
+            if event is None:
+                break
+            yield sse_event(event, data)
+
+        try:
+            response = task.result()
+        except Exception as e:
+            detail = getattr(e, "detail", None) or str(e)
+            logger.error(f"Streaming handler failed: {detail}")
+            yield sse_event(EVENT_ERROR, {"detail": detail})
+            return
+
+        payload = response.model_dump(mode="json") if hasattr(response, "model_dump") else response
+        if not stream.projects_sent and payload.get("projects"):
+            yield sse_event(EVENT_PROJECTS, payload["projects"])
+        yield sse_event(EVENT_COACHING, {field: payload.get(field) for field in coaching_fields})
+        yield sse_event(EVENT_FINAL, payload)
+    finally:
+        if not task.done():
+            # Client went away mid-stream
+            task.cancel()
@@ -7,6 +7,7 @@ from typing import List, Dict, Any, Optional
 from openai import OpenAI
 from config import settings
 from database.pixeltable_client import pixeltable_client
+from services.single_flight import coalesce
 import logging
 
 logger = logging.getLogger(__name__)
@@ -80,6 +81,7 @@ class RetrievalService:
 
         return expanded_query
 
+    @coalesce("similarity_search")
     async def retrieve_similar_chunks(
         self,
         query: str,
@@ -0,0 +1,110 @@
+"""
+Search Result Cache - Bounded LRU of formatted search results.
+
+Keyed by a canonical hash of PropertyFilters (model_dump(exclude_none=True))
+plus the data source and catalog snapshot version, so a refreshed snapshot
+never serves results computed from the previous one: entries for older
+versions are simply unreachable and are purged as soon as a newer version
+is seen.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Optional, Tuple
+
+if TYPE_CHECKING:
+    from services.filter_extractor import PropertyFilters
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CACHE_MAX_ENTRIES = 512
+
+CacheKey = Tuple[str, Hashable, str]
+
+
+def filters_fingerprint(filters: "PropertyFilters") -> str:
+    """Canonical hash of the filters that are actually set."""
+    payload = json.dumps(filters.model_dump(exclude_none=True), sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a search result whose project dicts callers may annotate freely."""
+    copied = dict(result)
+    copied["projects"] = [dict(p) for p in result.get("projects", [])]
+    return copied
+
+
+class SearchResultCache:
+    """Thread-safe LRU of search_with_filters results."""
+
+    def __init__(self, max_entries: int = SEARCH_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._versions: Dict[str, Hashable] = {}  # Latest snapshot version seen per source
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "invalidations": 0}
+
+    def key(self, filters: "PropertyFilters", source: str, version: Hashable) -> CacheKey:
+        return (source, version, filters_fingerprint(filters))
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._observe_version(key[0], key[1])
+            result = self._entries.get(key)
+            if result is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+        return _copy_result(result)
+
+    def put(self, key: CacheKey, result: Dict[str, Any]) -> None:
+        stored = _copy_result(result)
+        with self._lock:
+            self._observe_version(key[0], key[1])
+            if self._versions.get(key[0]) != key[1]:
+                return  # Computed from a snapshot that has since been replaced
+            self._entries[key] = stored
+            self._entries.move_to_end(key)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else None,
+        }
+
+    def _observe_version(self, source: str, version: Hashable) -> None:
+        """Purge a source's entries once a newer snapshot version shows up (lock held)."""
+        current = self._versions.get(source)
+        if current == version:
+            return
+        if current is not None and isinstance(version, int) and isinstance(current, int) and version < current:
+            return  # Late reader of an old snapshot; keep the newer entries
+        stale = [k for k in self._entries if k[0] == source]
+        for k in stale:
+            del self._entries[k]
+        if stale:
+            self._stats["invalidations"] += 1
+            logger.info(f"Search cache: dropped {len(stale)} {source} entries for snapshot v{current}")
+        self._versions[source] = version
+
+
+# Global instance
+search_cache = SearchResultCache()
@@ -6,18 +6,12 @@ Analyzes customer sentiment and provides tone adaptation recommendations
 import logging
 import json
 from typing import Dict, List, Optional, Any
-from openai import OpenAI
-from config import settings
+from services.bounded_store import BoundedTTLStore
+from services.llm_gateway import llm_gateway
+from services.llm_scheduler import Priority
 
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-client = OpenAI(
-    api_key=settings.openai_api_key,
-    base_url=settings.openai_base_url,
-    timeout=30.0  # 30 second timeout for API calls
-)
-
 
 class SentimentAnalyzer:
     """
@@ -32,7 +26,7 @@ class SentimentAnalyzer:
     """
     
     def __init__(self):
-        self.sentiment_cache = {}  # Cache recent analyses
+        self.sentiment_cache = BoundedTTLStore("sentiment_cache", max_entries=100, ttl_seconds=3600)  # Cache recent analyses
     
     def analyze_sentiment_quick(self, message: str) -> Dict[str, Any]:
         """
@@ -173,14 +167,15 @@ Important:
 - engagement_level reflects how invested they are in the conversation"""
 
         try:
-            response = client.chat.completions.create(
+            response = await llm_gateway.chat(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are an expert at analyzing customer sentiment in sales conversations. Provide accurate, actionable sentiment analysis."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
-                max_tokens=400
+                max_tokens=400,
+                priority=Priority.BACKGROUND  # Shed under pressure; falls back to quick analysis
             )
             
             result = json.loads(response.choices[0].message.content)
@@ -188,14 +183,9 @@ Important:
             # Add method indicator
             result["method"] = "gpt_analysis"
             
-            # Cache result
+            # Cache result (least recently used entries are evicted past 100)
             self.sentiment_cache[cache_key] = result
             
-            # Limit cache size
-            if len(self.sentiment_cache) > 100:
-                # Remove oldest entry
-                self.sentiment_cache.pop(next(iter(self.sentiment_cache)))
-            
             logger.info(f"GPT sentiment analysis: {result['sentiment']} (confidence: {result['confidence']})")
             
             return result
@@ -9,6 +9,9 @@ from datetime import datetime, timedelta
 import logging
 import uuid
 
+from config import settings
+from services.session_store import SessionCache, SessionStore, session_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -68,21 +71,50 @@ class ConversationSession(BaseModel):
 
 
 class SessionManager:
-    """Manage conversation sessions with in-memory storage."""
+    """
+    Manage conversation sessions.
+
+    Sessions live in the shared session store (Redis, or in process when
+    Redis is unavailable); `sessions` holds this worker's working copies.
+    Every change is persisted as a field-level delta; inside a session turn
+    (services/session_store.py) the accessors share one load and one save.
+    """
     
-    def __init__(self, session_timeout_minutes: int = 240):  # 4 hours (240 minutes)
-        self.sessions: Dict[str, ConversationSession] = {}
+    def __init__(self, session_timeout_minutes: int = 240, store: Optional[SessionStore] = None):  # 4 hours (240 minutes)
         self.session_timeout = timedelta(minutes=session_timeout_minutes)
+        self._cache = SessionCache(
+            "conversation", ConversationSession, store or session_store,
+            ttl_seconds=session_timeout_minutes * 60,  # Sliding: reset on every load and save
+            project_fields=("last_shown_projects",),  # Stored as catalog references
+            max_entries=settings.session_cache_max_entries
+        )
+
+    @property
+    def sessions(self) -> Dict[str, ConversationSession]:
+        """This worker's working copies (read-only view; the store holds the sessions)."""
+        return self._cache.sessions
+
+    def reset(self) -> None:
+        """Drop every conversation session (tests)."""
+        self._cache.reset()
+
+    def _get(self, session_id: Optional[str]) -> Optional[ConversationSession]:
+        """Existing session (from the store if this worker has not seen it), without creating one."""
+        return self._cache.get(session_id) if session_id else None
+
+    def _persist(self, session: ConversationSession) -> None:
+        self._cache.save(session.session_id, session)
     
     def get_or_create_session(self, session_id: Optional[str] = None) -> ConversationSession:
         """Get existing session or create new one."""
-        if session_id and session_id in self.sessions:
-            session = self.sessions[session_id]
+        session = self._get(session_id)
+        if session is not None:
             # Check if session expired
             if datetime.now() - session.last_activity > self.session_timeout:
                 logger.info(f"Session {session_id} expired, creating new one")
                 return self._create_session(session_id)
             session.last_activity = datetime.now()
+            self._persist(session)
             return session
         
         # Create new session
@@ -92,63 +124,72 @@ class SessionManager:
     def _create_session(self, session_id: str) -> ConversationSession:
         """Create a new session."""
         session = ConversationSession(session_id=session_id)
-        self.sessions[session_id] = session
+        self._cache.delete(session_id)  # An expired session's fields must not survive in the store
+        self._persist(session)
         logger.info(f"Created new session: {session_id}")
         return session
     
     def add_message(self, session_id: str, role: str, content: str):
         """Add a message to session history."""
-        if session_id in self.sessions:
+        session = self._get(session_id)
+        if session is not None:
             current_time = datetime.now()
-            self.sessions[session_id].messages.append({
+            session.messages.append({
                 "role": role,
                 "content": content,
                 "timestamp": current_time.isoformat()
             })
             # Update last message time for silence detection
-            self.sessions[session_id].last_message_time = current_time
+            session.last_message_time = current_time
             # Keep only last 10 messages
-            self.sessions[session_id].messages = self.sessions[session_id].messages[-10:]
-            self.sessions[session_id].engagement_score += 1
+            session.messages = session.messages[-10:]
+            session.engagement_score += 1
+            self._persist(session)
     
     def record_objection(self, session_id: str, objection_type: str):
         """Record an objection raised by the customer."""
-        if session_id in self.sessions:
-            if objection_type not in self.sessions[session_id].objections_raised:
-                self.sessions[session_id].objections_raised.append(objection_type)
-                self.sessions[session_id].objection_count += 1  # Track total objections
+        session = self._get(session_id)
+        if session is not None:
+            if objection_type not in session.objections_raised:
+                session.objections_raised.append(objection_type)
+                session.objection_count += 1  # Track total objections
+                self._persist(session)
                 logger.info(f"Session {session_id}: Recorded objection '{objection_type}'")
     
     def record_interest(self, session_id: str, project_name: str):
         """Record a project the customer showed interest in."""
-        if session_id in self.sessions:
-            if project_name not in self.sessions[session_id].interested_projects:
-                self.sessions[session_id].interested_projects.append(project_name)
+        session = self._get(session_id)
+        if session is not None:
+            if project_name not in session.interested_projects:
+                session.interested_projects.append(project_name)
+                self._persist(session)
                 logger.info(f"Session {session_id}: Recorded interest in '{project_name}'")
     
     def update_filters(self, session_id: str, filters: Dict[str, Any]):
         """Update the current search filters for the session."""
-        if session_id in self.sessions:
-            self.sessions[session_id].current_filters.update(filters)
+        session = self._get(session_id)
+        if session is not None:
+            session.current_filters.update(filters)
+            self._persist(session)
     
     def mark_cta_suggested(self, session_id: str, cta_type: str):
         """Mark that a specific CTA has been suggested."""
-        if session_id in self.sessions:
-            session = self.sessions[session_id]
+        session = self._get(session_id)
+        if session is not None:
             if cta_type == "meeting":
                 session.meeting_suggested = True
             elif cta_type == "site_visit":
                 session.site_visit_suggested = True
             elif cta_type == "callback":
                 session.callback_suggested = True
+            self._persist(session)
     
     def get_next_cta(self, session_id: str) -> Optional[str]:
         """Determine the next best CTA based on conversation state."""
-        if session_id not in self.sessions:
+        session = self._get(session_id)
+        if session is None:
             return "meeting"
         
-        session = self.sessions[session_id]
-        
         # Priority: Meeting -> Site Visit -> Callback
         if not session.meeting_suggested:
             return "meeting"
@@ -162,10 +203,9 @@ class SessionManager:
     
     def get_conversation_summary(self, session_id: str) -> Dict[str, Any]:
         """Get a summary of the conversation for context."""
-        if session_id not in self.sessions:
+        session = self._get(session_id)
+        if session is None:
             return {}
-        
-        session = self.sessions[session_id]
         return {
             "message_count": len(session.messages),
             "objections": session.objections_raised,
@@ -181,9 +221,10 @@ class SessionManager:
     
     def get_recent_messages(self, session_id: str, count: int = 5) -> List[Dict[str, str]]:
         """Get recent messages for LLM context."""
-        if session_id not in self.sessions:
+        session = self._get(session_id)
+        if session is None:
             return []
-        return self.sessions[session_id].messages[-count:]
+        return session.messages[-count:]
     
     def save_session(self, session: ConversationSession) -> None:
         """Persist session state after updates. CRITICAL: Never lose context."""
@@ -193,12 +234,9 @@ class SessionManager:
         if not hasattr(session, 'current_filters'):
             session.current_filters = {}
         
-        # Save session
-        if session.session_id in self.sessions:
-            self.sessions[session.session_id] = session
-        else:
-            self.sessions[session.session_id] = session
+        # Save session (only the fields that changed are written)
         session.last_activity = datetime.now()
+        self._persist(session)
         logger.info(f"✅ Session saved: Context preserved (projects: {len(session.last_shown_projects)}, filters: {bool(session.current_filters)})")
     
     def get_context_summary(self, session_id: str) -> Dict[str, Any]:
@@ -206,14 +244,13 @@ class SessionManager:
         Get enriched context summary for GPT fallback.
         Returns comprehensive conversation context for intelligent responses.
         """
-        if session_id not in self.sessions:
+        session = self._get(session_id)
+        if session is None:
             return {
                 "has_context": False,
                 "summary": "New conversation"
             }
         
-        session = self.sessions[session_id]
-        
         # Build context summary
         context = {
             "has_context": True,
@@ -397,8 +434,8 @@ class SessionManager:
             session_id: Session identifier
             prompt_type: Type of coaching prompt shown
         """
-        if session_id in self.sessions:
-            session = self.sessions[session_id]
+        session = self._get(session_id)
+        if session is not None:
             if not hasattr(session, 'coaching_prompts_shown'):
                 session.coaching_prompts_shown = []
             session.coaching_prompts_shown.append(prompt_type)
@@ -415,8 +452,8 @@ class SessionManager:
             session_id: Session identifier
             projects: List of project dicts shown to user
         """
-        if session_id in self.sessions:
-            session = self.sessions[session_id]
+        session = self._get(session_id)
+        if session is not None:
             # Track unique project names
             existing_names = {p.get("name") for p in session.last_shown_projects}
             new_projects = [p for p in projects if p.get("name") not in existing_names]
@@ -431,8 +468,9 @@ class SessionManager:
             if now - session.last_activity > self.session_timeout
         ]
         for sid in expired:
-            del self.sessions[sid]
+            self._cache.forget(sid)
             logger.info(f"Cleaned up expired session: {sid}")
+        self._cache.store.cleanup_expired()
 
         if expired:
             logger.info(f"Cleaned up {len(expired)} expired sessions")
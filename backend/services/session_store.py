@@ -0,0 +1,429 @@
+"""
+Session Store - Shared, compact persistence for conversation sessions.
+
+SessionManager (ConversationSession) and FlowEngine (FlowState) keep the
+sessions they are working on in a per-process dict; this store is where
+sessions live between turns, so any uvicorn worker can serve any turn and a
+deploy does not drop live conversations.
+
+- Redis backend: one hash per session (`session:v1:<kind>:<id>`), one hash
+  field per model field, each value encoded with msgpack (JSON when msgpack
+  is not installed; values are tagged, so workers can mix).
+- Saves write only the fields whose encoding changed since the session was
+  loaded or last saved.
+- Sliding TTL as in RedisContextManager: every load and save resets expiry.
+- Project lists named by the cache (`project_fields`) are stored as catalog
+  references (services/project_refs.py) and rehydrated on load.
+- `_schema` records SESSION_SCHEMA_VERSION. Sessions are rebuilt with
+  model_validate, so fields added later get their defaults and removed
+  fields are ignored.
+- While Redis is unconfigured or unreachable (retried periodically, like the
+  LLM cache) sessions are kept in process, in a BoundedTTLStore.
+
+Chat endpoints run each turn in a session turn, so a turn costs one store
+read and at most one write per session however many accessors it calls:
+
+    async with session_turn():
+        ...  # first get() of a session loads it; later gets and saves stay local
+    # on exit, each session touched is written (changed fields only) off the event loop
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from config import settings
+from services.bounded_store import BoundedTTLStore
+from services.project_refs import compact_projects, resolve_projects
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+SESSION_SCHEMA_VERSION = 1
+SCHEMA_FIELD = "_schema"
+REDIS_KEY_PREFIX = "session:v1:"
+LOCK_KEY_PREFIX = "lock:v1:"
+REDIS_RETRY_SECONDS = 30.0
+
+EncodedFields = Dict[str, bytes]
+
+
+def encode_value(value: Any) -> bytes:
+    """Compact, tagged encoding of one JSON-compatible field value."""
+    if MSGPACK_AVAILABLE:
+        return b"m" + msgpack.packb(value, use_bin_type=True)
+    return b"j" + json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def decode_value(data: bytes) -> Any:
+    tag, body = data[:1], data[1:]
+    if tag == b"m":
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body)
+
+
+def encode_model(model: BaseModel, project_fields: Tuple[str, ...] = ()) -> EncodedFields:
+    """One encoded value per model field (project lists in `project_fields` as references)."""
+    values = model.model_dump(mode="json")
+    for name in project_fields:
+        values[name] = compact_projects(values.get(name))
+    fields = {name: encode_value(value) for name, value in values.items()}
+    fields[SCHEMA_FIELD] = encode_value(SESSION_SCHEMA_VERSION)
+    return fields
+
+
+def decode_model(
+    model_class: Type[BaseModel],
+    fields: EncodedFields,
+    project_fields: Tuple[str, ...] = ()
+) -> Optional[BaseModel]:
+    """
+    Rebuild a session from its stored fields. Fields that no longer validate
+    fall back to their defaults; None when the session cannot be rebuilt.
+    """
+    values = {name: decode_value(data) for name, data in fields.items()}
+    for name in project_fields:
+        if name in values:
+            values[name] = resolve_projects(values[name])
+    version = values.pop(SCHEMA_FIELD, None)
+    if version != SESSION_SCHEMA_VERSION:
+        logger.info(f"Session store: upgrading {model_class.__name__} from schema v{version}")
+    try:
+        return model_class.model_validate(values)
+    except ValidationError as e:
+        invalid = {error["loc"][0] for error in e.errors() if error["loc"]}
+        logger.warning(f"Session store: resetting unreadable {model_class.__name__} fields {sorted(invalid)}")
+    try:
+        return model_class.model_validate({name: value for name, value in values.items() if name not in invalid})
+    except ValidationError as e:
+        logger.warning(f"Session store: discarding unreadable {model_class.__name__}: {e}")
+        return None
+
+
+class SessionStore:
+    """Field-level session persistence in Redis, with an in-process fallback."""
+
+    def __init__(self, redis_url: Optional[str] = None, max_entries: int = 10000):
+        self.redis_url = redis_url
+        # (kind, session_id) -> fields, each with its own sliding TTL
+        self._memory = BoundedTTLStore("session_store_memory", max_entries)
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_retry_at = 0.0
+        self._stats = {"loads": 0, "saves": 0, "fields_written": 0, "bytes_written": 0, "errors": 0}
+
+    def load(self, kind: str, session_id: str, ttl: int) -> Optional[EncodedFields]:
+        """Stored fields of a session (resetting its TTL), or None."""
+        self._stats["loads"] += 1
+        client = self._redis_client()
+        if client is not None:
+            key = self._key(kind, session_id)
+            try:
+                pipe = client.pipeline()
+                pipe.hgetall(key)
+                pipe.expire(key, ttl)
+                raw, _ = pipe.execute()
+                return {name.decode("utf-8"): value for name, value in raw.items()} if raw else None
+            except Exception as e:
+                self._redis_failed(e)
+
+        fields = self._memory.get((kind, session_id))
+        return dict(fields) if fields is not None else None
+
+    def save(self, kind: str, session_id: str, changed: EncodedFields, ttl: int) -> None:
+        """Write the changed fields of a session and reset its TTL."""
+        self._stats["saves"] += 1
+        self._stats["fields_written"] += len(changed)
+        self._stats["bytes_written"] += sum(len(value) for value in changed.values())
+        client = self._redis_client()
+        if client is not None:
+            key = self._key(kind, session_id)
+            try:
+                pipe = client.pipeline()
+                if changed:
+                    pipe.hset(key, mapping=changed)
+                pipe.expire(key, ttl)
+                pipe.execute()
+                return
+            except Exception as e:
+                self._redis_failed(e)
+
+        with self._lock:
+            fields = self._memory.peek((kind, session_id), {})
+            self._memory.set((kind, session_id), {**fields, **changed}, ttl=ttl)
+
+    def delete(self, kind: str, session_id: str) -> None:
+        client = self._redis_client()
+        if client is not None:
+            try:
+                client.delete(self._key(kind, session_id))
+            except Exception as e:
+                self._redis_failed(e)
+        self._memory.pop((kind, session_id), None)
+
+    def cleanup_expired(self) -> int:
+        """Drop expired in-process sessions (Redis expires its own)."""
+        return self._memory.expire()
+
+    def clear(self, kind: str) -> int:
+        """Delete every stored session of one kind (tests, admin resets)."""
+        removed = 0
+        client = self._redis_client()
+        if client is not None:
+            try:
+                keys = list(client.scan_iter(match=f"{REDIS_KEY_PREFIX}{kind}:*"))
+                if keys:
+                    removed += client.delete(*keys)
+            except Exception as e:
+                self._redis_failed(e)
+        with self._lock:
+            for key in [key for key in self._memory.keys() if key[0] == kind]:
+                self._memory.pop(key, None)
+                removed += 1
+        return removed
+
+    def try_lock(self, name: str, ttl: int) -> Optional[str]:
+        """
+        Take a lock shared by every worker on this store (e.g. one background
+        job per deployment); returns a token for `unlock`, or None while held.
+        """
+        token = uuid.uuid4().hex
+        client = self._redis_client()
+        if client is not None:
+            try:
+                return token if client.set(f"{LOCK_KEY_PREFIX}{name}", token, nx=True, ex=ttl) else None
+            except Exception as e:
+                self._redis_failed(e)
+        with self._lock:
+            if self._memory.get(("lock", name)) is not None:
+                return None
+            self._memory.set(("lock", name), token, ttl=ttl)
+        return token
+
+    def unlock(self, name: str, token: str) -> None:
+        """Release a lock taken with `try_lock` (no-op if it expired and was taken over)."""
+        client = self._redis_client()
+        if client is not None:
+            key = f"{LOCK_KEY_PREFIX}{name}"
+            try:
+                if client.get(key) == token.encode("utf-8"):
+                    client.delete(key)
+            except Exception as e:
+                self._redis_failed(e)
+        with self._lock:
+            if self._memory.peek(("lock", name)) == token:
+                self._memory.pop(("lock", name), None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "backend": "redis" if self._redis is not None else "memory",
+            "codec": "msgpack" if MSGPACK_AVAILABLE else "json",
+            "memory_sessions": len(self._memory),
+        }
+
+    # ------------------------------------------------------------------
+    # Redis connection
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _key(kind: str, session_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}{kind}:{session_id}"
+
+    def _redis_client(self):
+        """Redis client, or None while Redis is unconfigured or recently unreachable."""
+        if not self.redis_url:
+            return None
+        if self._redis is not None:
+            return self._redis
+        if time.time() < self._redis_retry_at:
+            return None
+        with self._lock:
+            if self._redis is None:
+                try:
+                    import redis
+                    client = redis.from_url(self.redis_url, decode_responses=False,
+                                            socket_connect_timeout=1, socket_timeout=1)
+                    client.ping()
+                    self._redis = client
+                    logger.info("Session store: Redis connected")
+                except Exception as e:
+                    self._redis_retry_at = time.time() + REDIS_RETRY_SECONDS
+                    logger.warning(f"Session store: Redis unavailable ({e}), keeping sessions in process")
+        return self._redis
+
+    def _redis_failed(self, error: Exception) -> None:
+        logger.warning(f"Session store: Redis error: {error}")
+        self._stats["errors"] += 1
+        self._redis = None
+        self._redis_retry_at = time.time() + REDIS_RETRY_SECONDS
+
+
+class SessionTurn:
+    """Sessions loaded during one request; written back once when it ends."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions: Dict[Tuple["SessionCache", str], BaseModel] = {}
+
+    def get(self, cache: "SessionCache", session_id: str) -> Optional[BaseModel]:
+        with self._lock:
+            return self._sessions.get((cache, session_id))
+
+    def hold(self, cache: "SessionCache", session_id: str, session: BaseModel) -> None:
+        with self._lock:
+            self._sessions[(cache, session_id)] = session
+
+    def drop(self, cache: "SessionCache", session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop((cache, session_id), None)
+
+    def flush(self) -> int:
+        """Persist every session held by the turn; returns how many fields were written."""
+        with self._lock:
+            held, self._sessions = self._sessions, {}
+        return sum(cache._write(session_id, session) for (cache, session_id), session in held.items())
+
+
+_current_turn: ContextVar[Optional[SessionTurn]] = ContextVar("session_turn", default=None)
+
+
+@asynccontextmanager
+async def session_turn() -> AsyncIterator[SessionTurn]:
+    """
+    Scope session reads and writes to one request; nested scopes (e.g.
+    /api/chat/sales delegating to chat_query) share the outer one.
+    """
+    outer = _current_turn.get()
+    if outer is not None:
+        yield outer
+        return
+    turn = SessionTurn()
+    token = _current_turn.set(turn)
+    try:
+        yield turn
+    finally:
+        _current_turn.reset(token)
+        await asyncio.to_thread(turn.flush)
+
+
+class SessionCache:
+    """
+    A process's working set of sessions of one kind, synced with the store.
+
+    `get` returns the same object while no other worker has changed the
+    session, so in-place updates made during a turn are kept; `save` writes
+    only what changed since the last load or save. Inside a session turn a
+    session is loaded once and saved when the turn ends.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        model_class: Type[BaseModel],
+        store: SessionStore,
+        ttl_seconds: int,
+        project_fields: Tuple[str, ...] = (),
+        max_entries: int = 10000
+    ):
+        self.kind = kind
+        self.model_class = model_class
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.project_fields = project_fields
+        # Working copies only: an evicted session is reloaded from the store on its next turn
+        self.sessions = BoundedTTLStore(f"{kind}_sessions", max_entries, ttl_seconds,
+                                        on_evict=lambda session_id, _, __: self._persisted.pop(session_id, None))
+        self._persisted: Dict[str, EncodedFields] = {}
+
+    def get(self, session_id: str) -> Optional[BaseModel]:
+        """The session, refreshed from the store if another worker updated it."""
+        turn = _current_turn.get()
+        if turn is not None:
+            held = turn.get(self, session_id)
+            if held is not None:
+                return held
+        session = self._load(session_id)
+        if session is not None and turn is not None:
+            turn.hold(self, session_id, session)
+        return session
+
+    def save(self, session_id: str, session: BaseModel) -> int:
+        """
+        Persist the fields that changed; returns how many were written.
+        Inside a session turn the write is deferred to the end of the turn.
+        """
+        turn = _current_turn.get()
+        if turn is not None:
+            self.sessions[session_id] = session
+            turn.hold(self, session_id, session)
+            return 0
+        return self._write(session_id, session)
+
+    def _load(self, session_id: str) -> Optional[BaseModel]:
+        fields = self.store.load(self.kind, session_id, self.ttl_seconds)
+        if fields is None:
+            self.sessions.pop(session_id, None)
+            self._persisted.pop(session_id, None)
+            return None
+        cached = self.sessions.get(session_id)
+        if cached is not None and fields == self._persisted.get(session_id):
+            return cached
+        session = decode_model(self.model_class, fields, self.project_fields)
+        if session is None:
+            return None
+        self.sessions[session_id] = session
+        self._persisted[session_id] = fields
+        return session
+
+    def _write(self, session_id: str, session: BaseModel) -> int:
+        self.sessions[session_id] = session
+        try:
+            encoded = encode_model(session, self.project_fields)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Session store: could not serialize {self.kind} session {session_id}: {e}")
+            return 0
+        persisted = self._persisted.get(session_id, {})
+        changed = {name: value for name, value in encoded.items() if persisted.get(name) != value}
+        self.store.save(self.kind, session_id, changed, self.ttl_seconds)
+        self._persisted[session_id] = encoded
+        return len(changed)
+
+    def delete(self, session_id: str) -> None:
+        turn = _current_turn.get()
+        if turn is not None:
+            turn.drop(self, session_id)
+        self.store.delete(self.kind, session_id)
+        self.sessions.pop(session_id, None)
+        self._persisted.pop(session_id, None)
+
+    def reset(self) -> None:
+        """Drop every session of this kind, locally and in the store."""
+        self.store.clear(self.kind)
+        self.sessions.clear()
+        self._persisted.clear()
+
+    def forget(self, session_id: str) -> None:
+        """Drop the local copy only (the store keeps the session until its TTL)."""
+        self.sessions.pop(session_id, None)
+        self._persisted.pop(session_id, None)
+
+
+# Global instance
+session_store = SessionStore(
+    redis_url=settings.redis_url if settings.session_store == "redis" else None,
+    max_entries=settings.session_cache_max_entries
+)
@@ -0,0 +1,166 @@
+"""
+Single Flight - Coalesce concurrent identical calls into one execution.
+
+When the same call (same group and arguments) is already in flight, later
+callers wait for the running one instead of paying for their own GPT call,
+web search or similarity search. Nothing is kept once the call finishes;
+reuse across time is the caches' job (services/llm_cache.py,
+services/search_cache.py).
+
+    @coalesce("intent_classification")
+    async def classify_intent_gpt_first(query, ...): ...
+
+    result = await single_flight.do("web_search", key, fetch)      # coroutine fn
+    result = single_flight.do_sync("web_search", key, fetch)       # worker threads
+
+Waiters get a deep copy of the shared result, so one request annotating its
+projects / chunks never leaks into another. Exceptions are shared too: every
+waiter of a failed call sees the same error. The shared execution runs as its
+own task, so a caller that disconnects does not cancel it for the others.
+"""
+
+import asyncio
+import concurrent.futures
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import threading
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+FlightKey = Tuple[str, Hashable]
+
+
+def call_key(*args: Any, **kwargs: Any) -> str:
+    """Canonical hash of call arguments (JSON-ish, order-independent kwargs)."""
+    payload = json.dumps([args, kwargs], sort_keys=True, default=repr)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    """A running call and how many callers joined it."""
+
+    __slots__ = ("future", "waiters")
+
+    def __init__(self, future):
+        self.future = future
+        self.waiters = 0
+
+
+class SingleFlight:
+    """In-flight call registry for coroutine and thread callers."""
+
+    def __init__(self):
+        self._async_calls: Dict[Tuple[FlightKey, asyncio.AbstractEventLoop], _Flight] = {}
+        self._sync_calls: Dict[FlightKey, _Flight] = {}
+        self._lock = threading.Lock()
+        self._executed = Counter()
+        self._coalesced = Counter()
+
+    async def do(self, group: str, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await `fn()`, or the identical call already running in this event loop."""
+        flight = ((group, key), asyncio.get_running_loop())
+        with self._lock:
+            call = self._async_calls.get(flight)
+            leader = call is None
+            if leader:
+                call = _Flight(asyncio.ensure_future(fn()))
+                self._async_calls[flight] = call
+                call.future.add_done_callback(lambda _: self._async_calls.pop(flight, None))
+                self._executed[group] += 1
+            else:
+                call.waiters += 1
+                self._coalesced[group] += 1
+        if not leader:
+            logger.debug(f"Single flight: joined in-flight '{group}' call")
+        result = await asyncio.shield(call.future)
+        # Once shared, nobody gets the original (the leader may resume first and mutate it)
+        return copy.deepcopy(result) if call.waiters else result
+
+    def do_sync(self, group: str, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Blocking `do` for code running in worker threads."""
+        flight = (group, key)
+        with self._lock:
+            call = self._sync_calls.get(flight)
+            leader = call is None
+            if leader:
+                call = _Flight(concurrent.futures.Future())
+                self._sync_calls[flight] = call
+                self._executed[group] += 1
+            else:
+                call.waiters += 1
+                self._coalesced[group] += 1
+        if not leader:
+            logger.debug(f"Single flight: joined in-flight '{group}' call")
+            return copy.deepcopy(call.future.result())
+
+        try:
+            result = fn()
+        except BaseException as e:
+            call.future.set_exception(e)
+            raise
+        else:
+            call.future.set_result(result)
+        finally:
+            with self._lock:
+                self._sync_calls.pop(flight, None)
+        return copy.deepcopy(result) if call.waiters else result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._async_calls) + len(self._sync_calls)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            groups = sorted(set(self._executed) | set(self._coalesced))
+            return {
+                "executed": sum(self._executed.values()),
+                "coalesced": sum(self._coalesced.values()),
+                "in_flight": len(self._async_calls) + len(self._sync_calls),
+                "groups": {
+                    group: {"executed": self._executed[group], "coalesced": self._coalesced[group]}
+                    for group in groups
+                },
+            }
+
+
+# Global instance
+single_flight = SingleFlight()
+
+
+def coalesce(group: str, skip_self: bool = True) -> Callable:
+    """
+    Decorator: coalesce concurrent calls with identical arguments.
+
+    Works on coroutine functions and plain functions (the latter for callers
+    in worker threads). For methods the instance is left out of the key
+    (`skip_self`), which is right for the module-level service singletons.
+    """
+    def decorator(fn: Callable) -> Callable:
+        signature = inspect.signature(fn)
+
+        def key_for(args: tuple, kwargs: dict) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            if skip_self:
+                arguments.pop("self", None)
+            return call_key(**arguments)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                return await single_flight.do(group, key_for(args, kwargs), lambda: fn(*args, **kwargs))
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def sync_wrapper(*args, **kwargs):
+            return single_flight.do_sync(group, key_for(args, kwargs), lambda: fn(*args, **kwargs))
+        return sync_wrapper
+
+    return decorator
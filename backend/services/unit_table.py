@@ -0,0 +1,203 @@
+"""
+Unit Table - Materialized unit-level configurations.
+
+Project `configuration` strings are free text such as
+"{2BHK, 1249 - 1310, 1.35 Cr* }, {3 BHK + 2 T, 1539 - 1590, 1.65 Cr* }".
+They are parsed once per snapshot into parallel NumPy arrays
+(project index, bhk, min/max sqft, price in Cr) so BHK and budget queries
+are a single vectorized mask plus a group-by-project, and "nearest
+configuration" lookups use a sorted price index.
+"""
+
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_BHK_RE = re.compile(r'(\d+(?:\.\d+)?)\s*BHK', re.IGNORECASE)
+_PRICE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(Cr|L)', re.IGNORECASE)
+_TOILET_RE = re.compile(r'\+\s*\d+\s*T\b', re.IGNORECASE)
+_SQFT_RE = re.compile(r'\b(\d{3,5})\b(?:\s*-\s*(\d{3,5})\b)?')
+
+
+def _format_bhk(bhk: float):
+    """2.0 -> 2, 2.5 -> 2.5"""
+    return int(bhk) if float(bhk).is_integer() else float(bhk)
+
+
+@lru_cache(maxsize=2048)
+def parse_configuration_units(config_str: str) -> Tuple[Tuple[float, float, float, float], ...]:
+    """
+    Parse a configuration string into (bhk, min_sqft, max_sqft, price_cr) tuples.
+
+    Missing sqft or price values are NaN. Handles both the seed format
+    "{2BHK, 1127 - 1461, 2.20Cr}" and "2 BHK: 1200-1400 sqft".
+    """
+    if not config_str or not isinstance(config_str, str):
+        return ()
+
+    matches = list(_BHK_RE.finditer(config_str))
+    units = []
+    for i, match in enumerate(matches):
+        try:
+            bhk = float(match.group(1))
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(config_str)
+            segment = config_str[match.end():end]
+
+            price_cr = np.nan
+            price_match = _PRICE_RE.search(segment)
+            if price_match:
+                value = float(price_match.group(1))
+                # Convert lakhs to crores
+                price_cr = value if price_match.group(2).lower() == 'cr' else value / 100.0
+                segment = segment[:price_match.start()] + segment[price_match.end():]
+
+            min_sqft = max_sqft = np.nan
+            sqft_match = _SQFT_RE.search(_TOILET_RE.sub(' ', segment))
+            if sqft_match:
+                min_sqft = float(sqft_match.group(1))
+                max_sqft = float(sqft_match.group(2)) if sqft_match.group(2) else min_sqft
+
+            units.append((bhk, min_sqft, max_sqft, price_cr))
+        except ValueError as e:
+            logger.warning(f"Failed to parse configuration segment '{match.group(0)}': {e}")
+            continue
+
+    return tuple(units)
+
+
+def configuration_bhks(config_str: str) -> frozenset:
+    """Set of BHK counts offered by a configuration string."""
+    return frozenset(u[0] for u in parse_configuration_units(config_str))
+
+
+class UnitTable:
+    """Parallel arrays of every parsed unit configuration in a snapshot."""
+
+    def __init__(self, configurations: Iterable[Any]):
+        project_idx, bhk, min_sqft, max_sqft, price_cr = [], [], [], [], []
+        n_projects = 0
+        for p_idx, config in enumerate(configurations):
+            n_projects += 1
+            for unit in parse_configuration_units(config if isinstance(config, str) else ''):
+                project_idx.append(p_idx)
+                bhk.append(unit[0])
+                min_sqft.append(unit[1])
+                max_sqft.append(unit[2])
+                price_cr.append(unit[3])
+
+        self.n_projects = n_projects
+        self.project_idx = np.array(project_idx, dtype=np.intp)
+        self.bhk = np.array(bhk, dtype=np.float64)
+        self.min_sqft = np.array(min_sqft, dtype=np.float64)
+        self.max_sqft = np.array(max_sqft, dtype=np.float64)
+        self.price_cr = np.array(price_cr, dtype=np.float64)
+
+        # Units are appended project by project, so each project's units are a contiguous slice
+        self._offsets = np.searchsorted(self.project_idx, np.arange(n_projects + 1))
+
+        # Sorted price index (priced units only) for nearest-configuration lookups
+        priced = np.flatnonzero(~np.isnan(self.price_cr))
+        order = np.argsort(self.price_cr[priced], kind='stable')
+        self._price_order = priced[order]
+        self._sorted_prices = self.price_cr[self._price_order]
+
+    def __len__(self) -> int:
+        return len(self.project_idx)
+
+    def match(
+        self,
+        bhks: Optional[Iterable[float]] = None,
+        max_price_cr: Optional[float] = None,
+        min_price_cr: Optional[float] = None,
+        project_mask: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Boolean mask over units matching BHK, price bounds and project mask."""
+        mask = np.ones(len(self), dtype=bool)
+        if bhks:
+            mask &= np.isin(self.bhk, np.array(list(bhks), dtype=np.float64))
+        with np.errstate(invalid='ignore'):
+            if max_price_cr is not None:
+                mask &= self.price_cr <= max_price_cr
+            if min_price_cr is not None:
+                mask &= self.price_cr >= min_price_cr
+        if project_mask is not None:
+            mask &= project_mask[self.project_idx]
+        return mask
+
+    def projects_with(self, unit_mask: np.ndarray) -> np.ndarray:
+        """Boolean mask over projects that own at least one selected unit."""
+        mask = np.zeros(self.n_projects, dtype=bool)
+        mask[self.project_idx[unit_mask]] = True
+        return mask
+
+    def group_by_project(self, unit_mask: np.ndarray) -> Dict[int, np.ndarray]:
+        """Map project index -> selected unit indices."""
+        selected = np.flatnonzero(unit_mask)
+        if not len(selected):
+            return {}
+        owners = self.project_idx[selected]
+        splits = np.flatnonzero(np.diff(owners)) + 1
+        return {int(group[0]): units
+                for group, units in zip(np.split(owners, splits), np.split(selected, splits))}
+
+    def units_of(self, project_idx: int) -> np.ndarray:
+        """All unit indices of one project."""
+        return np.arange(self._offsets[project_idx], self._offsets[project_idx + 1])
+
+    def nearest_by_price(
+        self,
+        target_cr: float,
+        unit_mask: Optional[np.ndarray] = None,
+        limit: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Priced unit indices ordered by distance from `target_cr`.
+
+        Walks outward from the binary-search position in the sorted price
+        index, so the closest `limit` units are found without a full sort.
+        """
+        prices = self._sorted_prices
+        order = self._price_order
+        left = int(np.searchsorted(prices, target_cr)) - 1
+        right = left + 1
+        result = []
+        while (left >= 0 or right < len(prices)) and (limit is None or len(result) < limit):
+            take_left = right >= len(prices) or (
+                left >= 0 and target_cr - prices[left] <= prices[right] - target_cr)
+            if take_left:
+                unit = order[left]
+                left -= 1
+            else:
+                unit = order[right]
+                right += 1
+            if unit_mask is None or unit_mask[unit]:
+                result.append(unit)
+        return np.array(result, dtype=np.intp)
+
+    def to_dicts(self, unit_indices: Iterable[int]) -> List[Dict[str, Any]]:
+        """Unit dicts in the shape returned by `parse_configuration_pricing`."""
+        units = []
+        for u in unit_indices:
+            price_cr = None if np.isnan(self.price_cr[u]) else float(self.price_cr[u])
+            min_sqft = None if np.isnan(self.min_sqft[u]) else int(self.min_sqft[u])
+            max_sqft = None if np.isnan(self.max_sqft[u]) else int(self.max_sqft[u])
+            if min_sqft is None:
+                sqft_range = None
+            elif max_sqft == min_sqft:
+                sqft_range = str(min_sqft)
+            else:
+                sqft_range = f"{min_sqft}-{max_sqft}"
+            units.append({
+                "bhk": _format_bhk(self.bhk[u]),
+                "price_cr": price_cr,
+                "price_lakhs": price_cr * 100 if price_cr is not None else None,
+                "sqft_range": sqft_range,
+                "min_sqft": min_sqft,
+                "max_sqft": max_sqft,
+            })
+        return units
@@ -14,6 +14,8 @@ from datetime import datetime, timedelta
 from pydantic import BaseModel
 import json
 
+from services.bounded_store import BoundedTTLStore
+
 # Import database utilities
 try:
     from database.connection import get_db_connection, has_database
@@ -25,6 +27,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+PROFILE_CACHE_MAX_ENTRIES = 10000
+PROFILE_TTL_SECONDS = 7 * 24 * 3600  # In-memory profiles are dropped after a week without activity
+
 
 class UserProfile(BaseModel):
     """User profile model"""
@@ -99,12 +104,13 @@ class UserProfileManager:
         # Check if database is available
         self.use_database = DB_AVAILABLE and has_database()
         
+        # In-memory storage fallback (also used when a database call fails)
+        self.profiles = BoundedTTLStore("user_profiles", PROFILE_CACHE_MAX_ENTRIES, PROFILE_TTL_SECONDS)
+        
         if self.use_database:
             logger.info("✓ Using Railway PostgreSQL for user profiles")
         else:
             logger.warning("⚠ No DATABASE_URL - using in-memory storage for user profiles")
-            # In-memory storage fallback
-            self.profiles: Dict[str, UserProfile] = {}
     
     def get_or_create_profile(self, user_id: str) -> UserProfile:
         """
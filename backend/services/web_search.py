@@ -6,11 +6,16 @@ Uses Tavily API for real web search with LLM synthesis.
 from typing import Dict, Any, Optional, List
 from openai import OpenAI
 from config import settings
+from services.deadline import degrade, has_budget
+from services.single_flight import coalesce
 import logging
 import re
 
 logger = logging.getLogger(__name__)
 
+# Typical Tavily advanced search + synthesis time (seconds)
+WEB_SEARCH_BUDGET = 3.0
+
 # Try to import Tavily, fall back to LLM-only mode if not available
 try:
     from tavily import TavilyClient
@@ -36,6 +41,7 @@ class WebSearchService:
             except Exception as e:
                 logger.warning(f"Failed to initialize Tavily: {e}. Falling back to LLM knowledge.")
 
+    @coalesce("web_search")
     def search_and_answer(
         self,
         query: str,
@@ -53,6 +59,11 @@ class WebSearchService:
         Returns:
             Dict with answer, sources, confidence, is_external
         """
+        # Web search is optional work: skipped once the request is past its latency target
+        if not has_budget(WEB_SEARCH_BUDGET, optional=True):
+            degrade("web_search", "skipped")
+            return self._refusal_response(query)
+
         # If Tavily is available, use real web search
         if self.tavily_client:
             return self._tavily_search(query, context, topic_hint)
@@ -52,20 +52,16 @@ MOCK_GEO_FAR = {
 
 @patch('services.flow_engine.classify_user_intent')
 @patch('services.flow_engine.extract_requirements_llm')
-@patch('services.flow_engine.get_projects_table')
-def test_strict_budget_logic_exact(mock_get_table, mock_extract_reqs, mock_classify):
+@patch('services.flow_engine.project_repository')
+def test_strict_budget_logic_exact(mock_repo, mock_extract_reqs, mock_classify):
     """
     Test Case: Exact Budget '80 Lakhs'. 
     """
     mock_extract_reqs.return_value = FlowRequirements()
     mock_classify.return_value = {"intent": "search_projects", "confidence": 0.9}
     
-    # Setup Mock DB
-    mock_table = MagicMock()
-    # Mock the .select().collect() chain
-    mock_table.select.return_value.collect.return_value = [MOCK_PROJECT_A, MOCK_PROJECT_B, MOCK_PROJECT_C]
-    
-    mock_get_table.return_value = mock_table
+    # Setup Mock DB (in-memory catalog returns the mock projects)
+    mock_repo.select.return_value = [MOCK_PROJECT_A, MOCK_PROJECT_B, MOCK_PROJECT_C]
     
     state = FlowState(current_node="NODE 2")
     state.requirements = FlowRequirements(budget_max=0.8, location="Bangalore") # 0.8 Cr = 80L
@@ -86,8 +82,8 @@ def test_strict_budget_logic_exact(mock_get_table, mock_extract_reqs, mock_class
 
 @patch('services.flow_engine.classify_user_intent')
 @patch('services.flow_engine.extract_requirements_llm')
-@patch('services.flow_engine.get_projects_table')
-def test_pagination_persistence(mock_get_table, mock_extract_reqs, mock_classify):
+@patch('services.flow_engine.project_repository')
+def test_pagination_persistence(mock_repo, mock_extract_reqs, mock_classify):
     """
     Test Case: Verify 'Show More' uses cached results and increments offset.
     """
@@ -97,9 +93,8 @@ def test_pagination_persistence(mock_get_table, mock_extract_reqs, mock_classify
     # Setup Mock with 10 projects
     mock_projects = [{"project_id": str(i), "name": f"Project {i}", "budget_min": 50, "budget_max": 60, "location": "Loc", "configuration": "2BHK", "status": "New", "possession_quarter": "Q1", "possession_year": 2025} for i in range(1, 11)]
     
-    mock_table = MagicMock()
-    mock_table.select.return_value.collect.return_value = mock_projects
-    mock_get_table.return_value = mock_table
+    # In-memory catalog returns the mock projects
+    mock_repo.select.return_value = mock_projects
     
     # Initial Search
     state = FlowState(current_node="NODE 2")
@@ -123,8 +118,8 @@ def test_pagination_persistence(mock_get_table, mock_extract_reqs, mock_classify
 
 @patch('services.flow_engine.classify_user_intent')
 @patch('services.flow_engine.extract_requirements_llm')
-@patch('services.flow_engine.get_projects_table')
-def test_nearest_match_prioritization(mock_get_table, mock_extract_reqs, mock_classify):
+@patch('services.flow_engine.project_repository')
+def test_nearest_match_prioritization(mock_repo, mock_extract_reqs, mock_classify):
     """
     Test Case: Req 80L. No exact match. 
     Avail: 1.3Cr (130L), 2.0Cr (200L).
@@ -134,9 +129,8 @@ def test_nearest_match_prioritization(mock_get_table, mock_extract_reqs, mock_cl
     mock_classify.return_value = {"intent": "search_projects", "confidence": 0.9}
     
     # Mock DB with only expensive projects
-    mock_table = MagicMock()
-    mock_table.select.return_value.collect.return_value = [MOCK_NEAR_130, MOCK_FAR_200]
-    mock_get_table.return_value = mock_table
+    # In-memory catalog returns the mock projects
+    mock_repo.select.return_value = [MOCK_NEAR_130, MOCK_FAR_200]
     
     state = FlowState(current_node="NODE 2")
     state.requirements = FlowRequirements(budget_max=0.80, location="Bangalore") # 80L
@@ -154,8 +148,8 @@ def test_nearest_match_prioritization(mock_get_table, mock_extract_reqs, mock_cl
 
 @patch('services.flow_engine.classify_user_intent')
 @patch('services.flow_engine.extract_requirements_llm')
-@patch('services.flow_engine.get_projects_table')
-def test_nearby_projects(mock_get_table, mock_extract_reqs, mock_classify):
+@patch('services.flow_engine.project_repository')
+def test_nearby_projects(mock_repo, mock_extract_reqs, mock_classify):
     """
     Test Case: 'Show nearby' projects within 10km of Whitefield.
     """
@@ -165,9 +159,8 @@ def test_nearby_projects(mock_get_table, mock_extract_reqs, mock_classify):
     mock_extract_reqs.return_value = FlowRequirements()
     
     # Mock DB
-    mock_table = MagicMock()
-    mock_table.select.return_value.collect.return_value = [MOCK_GEO_CLOSE, MOCK_GEO_FAR]
-    mock_get_table.return_value = mock_table
+    # In-memory catalog returns the mock projects
+    mock_repo.select.return_value = [MOCK_GEO_CLOSE, MOCK_GEO_FAR]
     
     state = FlowState(current_node="NODE 2")
     state.requirements = FlowRequirements(location="Whitefield") # Anchor location
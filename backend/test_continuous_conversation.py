@@ -1,5 +1,6 @@
 """Test continuous conversation routing"""
 
+import asyncio
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -112,11 +113,11 @@ def test_continuous_conversation():
         description = test["description"]
 
         try:
-            result = classify_intent_gpt_first(
+            result = asyncio.run(classify_intent_gpt_first(
                 query=query,
                 conversation_history=[],
                 session_state=session_state
-            )
+            ))
 
             intent = result.get("intent", "")
             source = result.get("data_source", "")
@@ -49,11 +49,11 @@ def test_routing():
 
     for query, expected_intent, expected_source in test_cases:
         try:
-            result = classify_intent_gpt_first(
+            result = asyncio.run(classify_intent_gpt_first(
                 query=query,
                 conversation_history=[],
                 session_state={}
-            )
+            ))
 
             intent = result.get("intent", "")
             source = result.get("data_source", "")
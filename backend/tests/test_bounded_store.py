@@ -0,0 +1,93 @@
+import unittest
+import sys
+import os
+import asyncio
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.bounded_store import BoundedTTLStore, run_sweeper, store_stats, sweep_all
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBoundedTTLStore(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.evicted = []
+        self.store = BoundedTTLStore("test_store", max_entries=3, ttl_seconds=60, clock=self.clock,
+                                     on_evict=lambda key, value, reason: self.evicted.append((key, reason)))
+
+    def test_lru_eviction_at_capacity(self):
+        for key in ("a", "b", "c"):
+            self.store[key] = key.upper()
+        self.assertEqual(self.store["a"], "A")  # "a" becomes most recently used
+        self.store["d"] = "D"
+        self.assertEqual(sorted(self.store), ["a", "c", "d"])
+        self.assertEqual(self.evicted, [("b", "capacity")])
+
+    def test_sliding_ttl_and_sweep(self):
+        self.store["a"] = 1
+        self.store["b"] = 2
+        self.clock.now += 50
+        self.assertEqual(self.store["a"], 1)  # Access resets a's TTL
+        self.clock.now += 20
+
+        self.assertNotIn("b", self.store)  # Expired entries are never served, even before a sweep
+        self.assertEqual(self.store.peek("a"), 1)
+        self.assertEqual(self.store.expire(), 0)  # b was already dropped on sight; a re-queued
+        self.clock.now += 45
+        self.assertEqual(self.store.expire(), 1)
+        self.assertEqual(len(self.store), 0)
+        self.assertEqual(self.evicted, [("b", "expired"), ("a", "expired")])
+
+    def test_fixed_ttl_and_per_entry_ttl(self):
+        fixed = BoundedTTLStore("fixed", max_entries=10, ttl_seconds=60, sliding=False, clock=self.clock)
+        fixed["event"] = {"status": "scheduled"}
+        fixed.set("short", 1, ttl=5)
+        self.clock.now += 30
+        fixed["event"]["status"] = "completed"  # Reads do not extend a fixed TTL
+        self.clock.now += 31
+        self.assertEqual(fixed.expire(), 2)
+        self.assertEqual(fixed.stats()["expired"], 2)
+
+    def test_dict_interface_and_gauges(self):
+        self.store.update({"a": {"messages": ["x" * 1000]}, "b": {}})
+        self.assertEqual(self.store.pop("b"), {})
+        self.assertEqual(self.store.get("missing", "default"), "default")
+        self.assertEqual(self.store.items(), [("a", {"messages": ["x" * 1000]})])
+        del self.store["a"]
+        with self.assertRaises(KeyError):
+            del self.store["a"]
+
+        self.store["big"] = ["y" * 5000]
+        stats = store_stats()["test_store"]
+        self.assertEqual((stats["entries"], stats["max_entries"]), (1, 3))
+        self.assertGreater(stats["approx_bytes"], 5000)
+
+    def test_sweeper_expires_every_registered_store(self):
+        other = BoundedTTLStore("other_store", max_entries=10, ttl_seconds=1, clock=self.clock)
+        self.store["a"] = 1
+        other["b"] = 2
+        self.clock.now += 120
+        self.assertEqual(sweep_all(), 2)
+
+        async def run():
+            other["c"] = 3
+            self.clock.now += 2
+            task = asyncio.create_task(run_sweeper(0.01))
+            await asyncio.sleep(0.05)
+            task.cancel()
+
+        asyncio.run(run())
+        self.assertEqual(len(other), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+import json
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.catalog_index import CatalogIndex
+
+SEED_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'seed_projects.json')
+
+
+def _lower(r, key):
+    return str(r.get(key, '')).lower()
+
+
+class TestCatalogIndex(unittest.TestCase):
+    """The index must reproduce the list-comprehension filters exactly."""
+
+    @classmethod
+    def setUpClass(cls):
+        with open(SEED_PATH) as f:
+            cls.projects = json.load(f)
+        cls.index = CatalogIndex(cls.projects)
+
+    def _names(self, mask):
+        return [r['name'] for r in self.index.rows(mask)]
+
+    def test_zone_and_locality_substring_semantics(self):
+        for needle in ['east', 'east bangalore', 'whitefield', 'sarjapur road', 'hebbal', 'road', 'nowhere']:
+            expected = [r['name'] for r in self.projects
+                        if needle in _lower(r, 'zone') or needle in _lower(r, 'location')
+                        or needle in _lower(r, 'full_address')]
+            mask = self.index.contains_any_field(needle, ('zone', 'location', 'full_address'))
+            self.assertEqual(self._names(mask), expected, needle)
+
+    def test_partial_token_match(self):
+        # "white" is only a prefix of the "whitefield" token
+        mask = self.index.contains_any_field('white', ('location',))
+        expected = [r['name'] for r in self.projects if 'white' in _lower(r, 'location')]
+        self.assertEqual(self._names(mask), expected)
+
+    def test_budget_and_possession_masks(self):
+        max_lakhs, min_lakhs, year = 150, 100, 2027
+        mask = (self.index.max_price_mask(max_lakhs)
+                & self.index.min_price_mask(min_lakhs)
+                & self.index.possession_by_mask(year))
+        expected = [
+            r['name'] for r in self.projects
+            if r.get('budget_min') and r['budget_min'] > 0 and r['budget_min'] <= max_lakhs
+            and (r.get('budget_max') is None or r['budget_max'] >= min_lakhs)
+            and r.get('possession_year') and str(r['possession_year']).isdigit()
+            and int(r['possession_year']) <= year
+        ]
+        self.assertEqual(self._names(mask), expected)
+
+    def test_exact_name_respects_mask(self):
+        name = self.projects[0]['name']
+        all_rows = self.index.all_mask()
+        self.assertEqual(self.index.exact_name(name.upper(), all_rows), 0)
+        all_rows[0] = False
+        self.assertIsNone(self.index.exact_name(name, all_rows))
+
+    def test_rows_are_copies(self):
+        row = self.index.rows(self.index.all_mask())[0]
+        row['matching_units'] = [1]
+        self.assertNotIn('matching_units', self.index.projects[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
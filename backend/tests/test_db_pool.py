@@ -0,0 +1,141 @@
+import unittest
+import sys
+import os
+import asyncio
+import threading
+import time
+from unittest import mock
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.executor import run_db
+
+try:
+    from database.connection import ConnectionPool, PoolTimeout, get_db_connection
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    PSYCOPG2_AVAILABLE = False
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.commits = 0
+        self.rollbacks = 0
+        self.queries = []
+
+    def cursor(self):
+        conn = self
+
+        class Cursor:
+            def execute(self, sql, params=None):
+                if conn.broken:
+                    raise RuntimeError("server closed the connection unexpectedly")
+                conn.queries.append(sql)
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        if self.broken:
+            raise RuntimeError("connection already closed")
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
+
+
+@unittest.skipUnless(PSYCOPG2_AVAILABLE, "psycopg2 not installed")
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.opened = []
+
+    def make_pool(self, **kwargs):
+        def connect():
+            conn = FakeConnection()
+            self.opened.append(conn)
+            return conn
+        return ConnectionPool(connect=connect, **kwargs)
+
+    def test_connections_are_reused(self):
+        pool = self.make_pool(max_size=2)
+        for _ in range(5):
+            conn = pool.acquire()
+            pool.release(conn)
+
+        self.assertEqual(len(self.opened), 1)
+        stats = pool.stats()
+        self.assertEqual((stats["acquired"], stats["opened"], stats["size"], stats["idle"]), (5, 1, 1, 1))
+
+    def test_waits_for_a_free_connection_and_times_out(self):
+        pool = self.make_pool(max_size=1, timeout=0.05)
+        held = pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+
+        pool.timeout = 2.0
+        threading.Timer(0.05, pool.release, args=(held,)).start()
+        self.assertIs(pool.acquire(), held)
+        self.assertEqual(pool.stats()["timeouts"], 1)
+        self.assertEqual(len(self.opened), 1)
+
+    def test_stale_idle_connection_is_replaced(self):
+        pool = self.make_pool(health_check_idle_seconds=0.0)
+        stale = pool.acquire()
+        pool.release(stale)
+        stale.broken = True
+
+        fresh = pool.acquire()
+        self.assertIsNot(fresh, stale)
+        self.assertTrue(stale.closed)
+        stats = pool.stats()
+        self.assertEqual((stats["discarded"], stats["size"]), (1, 1))
+
+    def test_warm_and_close(self):
+        pool = self.make_pool(min_size=3, max_size=5)
+        pool.warm()
+        self.assertEqual((pool.stats()["size"], pool.stats()["idle"]), (3, 3))
+
+        pool.close()
+        self.assertTrue(all(conn.closed for conn in self.opened))
+        self.assertEqual(pool.stats()["size"], 0)
+
+    def test_failed_rollback_discards_connection(self):
+        pool = self.make_pool()
+        with mock.patch("database.connection.db_pool", pool), \
+             mock.patch("database.connection.get_database_url", return_value="postgres://test"):
+            with get_db_connection() as conn:
+                conn.cursor().execute("INSERT ...")
+            self.assertEqual(conn.commits, 1)
+
+            with self.assertRaises(RuntimeError):
+                with get_db_connection() as conn:
+                    conn.broken = True
+                    conn.cursor().execute("UPDATE ...")
+
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()["size"], 0)
+
+
+class TestRunDb(unittest.TestCase):
+    def test_runs_off_the_event_loop(self):
+        async def main():
+            loop_thread = threading.get_ident()
+            started = time.perf_counter()
+            results = await asyncio.gather(*(run_db(lambda: (time.sleep(0.1), threading.get_ident())[1]) for _ in range(3)))
+            return loop_thread, results, time.perf_counter() - started
+
+        loop_thread, results, elapsed = asyncio.run(main())
+        self.assertNotIn(loop_thread, results)
+        self.assertLess(elapsed, 0.25)  # Ran concurrently
+
+
+if __name__ == '__main__':
+    unittest.main()
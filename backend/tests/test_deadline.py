@@ -0,0 +1,105 @@
+import unittest
+import sys
+import os
+import asyncio
+import time
+from unittest import mock
+
+import httpx
+from openai import AsyncOpenAI
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.deadline import (
+    DeadlineExceeded, clip_timeout, current_deadline, deadline_scope, degrade, degraded_stages, has_budget
+)
+from services.flow_engine import _generate_project_details_response
+from services.llm_cache import LLMResponseCache
+from services.llm_gateway import LLMGateway, timeout_for
+from services.llm_scheduler import LLMOverloadedError, LLMScheduler, Priority
+from services.sales_formatter import sales_formatter
+
+
+class TestDeadline(unittest.TestCase):
+    def test_helpers_are_noops_outside_a_scope(self):
+        self.assertIsNone(current_deadline())
+        self.assertTrue(has_budget(3600))
+        self.assertEqual(clip_timeout(30.0), 30.0)
+        degrade("retrieval")
+        self.assertIsNone(degraded_stages())
+
+    def test_budget_target_and_clipping(self):
+        with deadline_scope(budget_ms=2000, target_ms=500) as deadline:
+            self.assertTrue(has_budget(1.0))
+            self.assertFalse(has_budget(1.0, optional=True))  # Optional work is measured against the target
+            self.assertFalse(has_budget(5.0))
+            self.assertLessEqual(clip_timeout(30.0), 2.0)
+            self.assertLessEqual(timeout_for("gpt-4o").read, 2.0)
+            with deadline_scope(budget_ms=60000) as inner:
+                self.assertIs(inner, deadline)  # Nested endpoints share the outer budget
+            degrade("enrichment", "skipped")
+            degrade("enrichment", "skipped")
+            self.assertEqual(degraded_stages(), ["enrichment"])
+        self.assertIsNone(current_deadline())
+
+        with deadline_scope(budget_ms=300):
+            with self.assertRaises(DeadlineExceeded):
+                clip_timeout(5.0)
+
+    def test_deadline_follows_work_into_threads(self):
+        async def run():
+            with deadline_scope(budget_ms=5000) as deadline:
+                await asyncio.to_thread(degrade, "intent_classification", "keyword rules")
+                return deadline.degraded
+
+        self.assertEqual(asyncio.run(run()), ["intent_classification"])
+
+    def test_scheduler_never_queues_past_the_deadline(self):
+        scheduler = LLMScheduler(requests_per_minute=600, tokens_per_minute=100000, enabled=True)
+        scheduler.observe("gpt-4o", {"retry-after": "5"}, status_code=429)
+        started = time.monotonic()
+        with deadline_scope(budget_ms=300):
+            with self.assertRaises(LLMOverloadedError):
+                scheduler.acquire_sync("gpt-4o", Priority.INTERACTIVE, tokens=10)
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_gateway_call_out_of_time_is_not_sent_and_marks_stage(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(500)
+
+        gateway = LLMGateway(api_key="test", base_url="http://llm.test/v1",
+                             cache=LLMResponseCache(redis_url=None),
+                             scheduler=LLMScheduler(enabled=False))
+
+        async def run():
+            gateway._async_client = AsyncOpenAI(
+                api_key="test", base_url="http://llm.test/v1",
+                http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            )
+            gateway._async_loop = asyncio.get_running_loop()
+            with deadline_scope(budget_ms=200) as deadline:
+                with self.assertRaises(DeadlineExceeded):
+                    await gateway.chat(model="gpt-4o", messages=[{"role": "user", "content": "hi"}],
+                                       cache="intent_classification", temperature=0)
+                return deadline.degraded
+
+        self.assertEqual(asyncio.run(run()), ["intent_classification"])
+        self.assertEqual(requests, [])
+
+    def test_project_details_out_of_time_returns_template(self):
+        project = {"name": "Brigade Avalon", "location": "Whitefield", "configuration": "2BHK, 3BHK",
+                   "budget_min": 120, "budget_max": 250}
+        with mock.patch("services.flow_engine.generate_text_sync",
+                        side_effect=AssertionError("LLM should not be called")):
+            with deadline_scope(budget_ms=1000) as deadline:  # Less than the generation budget
+                response = _generate_project_details_response(project, "What amenities does it have?")
+        self.assertEqual(response, sales_formatter.format_pitch_response(project))
+        self.assertEqual(deadline.degraded, ["project_details"])
+
+
+if __name__ == '__main__':
+    unittest.main()
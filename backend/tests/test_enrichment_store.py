@@ -0,0 +1,142 @@
+import unittest
+import sys
+import os
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import enrichment_store as enrichment_module
+from services.enrichment_store import ProjectEnrichmentStore, project_version
+from services.session_store import SessionStore
+
+
+def _project(project_id, location="Whitefield", **fields):
+    return {"project_id": project_id, "name": f"Project {project_id}", "location": location,
+            "budget_min": 150, "budget_max": 300, **fields}
+
+
+class TestProjectEnrichmentStore(unittest.TestCase):
+    def setUp(self):
+        self.saved = []
+        self.enriched = []
+        self.fail = set()
+
+        async def enricher(project):
+            self.enriched.append(project["project_id"])
+            if project["project_id"] in self.fail:
+                return project  # GPT calls failed: nothing generated
+            return {**project, "nearby_places": f"near {project['location']}", "connectivity": "ORR 5 mins",
+                    "neighborhood_info": "IT corridor", "sales_pitch": f"Buy {project['name']}"}
+
+        self.store = ProjectEnrichmentStore(loader=lambda: [], saver=self.saved.append,
+                                            enricher=enricher, catalog=lambda: [], snapshot=lambda: None,
+                                            store=SessionStore(redis_url=None))
+
+    def test_refresh_materializes_and_lookup_serves_without_gpt(self):
+        result = asyncio.run(self.store.refresh([_project("p1"), _project("p2")]))
+        self.assertEqual(result, {"enriched": 2, "failed": 0, "unchanged": 0})
+        self.assertEqual([entry["project_id"] for entry in self.saved], ["p1", "p2"])
+        self.assertEqual(self.saved[0]["version"], project_version(_project("p1")))
+
+        self.enriched.clear()
+        fields = self.store.lookup(_project("p1"))
+        self.assertEqual(fields["sales_pitch"], "Buy Project p1")
+        merged = self.store.enrich({"project_id": "p1", "name": "Project p1", "amenities": "Pool"})
+        self.assertEqual(merged["nearby_places"], "near Whitefield")
+        self.assertEqual(merged["amenities"], "Pool")
+        self.assertEqual(self.enriched, [])  # Lookups never call GPT
+        self.assertEqual(self.store.lookup({"project_id": "unknown"}), {})
+
+    def test_only_changed_or_failed_projects_are_re_enriched(self):
+        self.fail = {"p2"}
+        asyncio.run(self.store.refresh([_project("p1"), _project("p2"), _project("p3")]))
+        self.assertEqual(self.store.stats()["failures"], 1)
+
+        self.fail = set()
+        self.enriched.clear()
+        moved = _project("p3", location="Sarjapur")
+        result = asyncio.run(self.store.refresh([_project("p1"), _project("p2"), moved]))
+        self.assertEqual(sorted(self.enriched), ["p2", "p3"])
+        self.assertEqual(result, {"enriched": 2, "failed": 0, "unchanged": 1})
+        self.assertEqual(self.store.lookup(moved)["nearby_places"], "near Sarjapur")
+
+    def test_changed_rows_stop_being_served_before_the_job_runs(self):
+        asyncio.run(self.store.refresh([_project("p1")]))
+        changed = _project("p1", location="Hebbal")
+
+        async def admin_refresh():
+            self.store.schedule_refresh([changed])
+            stale = self.store.lookup(changed)  # Row hash updated immediately
+            await self.store._refresh_task
+            return stale
+
+        self.assertEqual(asyncio.run(admin_refresh()), {})
+        self.assertEqual(self.store.lookup(changed)["nearby_places"], "near Hebbal")
+        self.assertEqual(self.store.stats()["current"], 1)
+
+    def test_persisted_entries_are_loaded_on_first_refresh(self):
+        row = _project("p1")
+        persisted = {"project_id": "p1", "version": project_version(row), "nearby_places": "stored",
+                     "connectivity": "c", "neighborhood_info": "n", "sales_pitch": "s", "amenities": None}
+        store = ProjectEnrichmentStore(loader=lambda: [persisted], saver=self.saved.append,
+                                       enricher=self.store._enricher, catalog=lambda: [row],
+                                       snapshot=lambda: None, store=SessionStore(redis_url=None))
+        result = asyncio.run(store.refresh())
+        self.assertEqual(result["unchanged"], 1)
+        self.assertEqual(self.enriched, [])
+        self.assertEqual(store.lookup(row)["nearby_places"], "stored")
+
+    def test_job_runs_once_across_workers(self):
+        table = {}
+        shared = SessionStore(redis_url=None)
+        rows = [_project("p1"), _project("p2")]
+        workers = [
+            ProjectEnrichmentStore(loader=lambda: list(table.values()),
+                                   saver=lambda entry: table.__setitem__(entry["project_id"], entry),
+                                   enricher=self.store._enricher, catalog=lambda: rows,
+                                   snapshot=lambda: None, store=shared)
+            for _ in range(2)
+        ]
+
+        async def startup():
+            for worker in workers:
+                worker.schedule_refresh()
+            await asyncio.gather(*[worker._refresh_task for worker in workers])
+
+        with mock.patch.object(enrichment_module, "JOB_LOCK_POLL_SECONDS", 0.01):
+            asyncio.run(startup())
+        self.assertEqual(sorted(self.enriched), ["p1", "p2"])  # GPT paid once, not per worker
+        for worker in workers:
+            self.assertEqual(worker.lookup(rows[0])["sales_pitch"], "Buy Project p1")
+
+    def test_follows_snapshot_changes(self):
+        table = {}
+        row = _project("p1")
+        snapshot = SimpleNamespace(version=1, rows=[row])
+        writer = ProjectEnrichmentStore(loader=lambda: [], saver=lambda entry: table.__setitem__("p1", entry),
+                                        enricher=self.store._enricher, catalog=lambda: [row],
+                                        snapshot=lambda: None, store=SessionStore(redis_url=None))
+        reader = ProjectEnrichmentStore(loader=lambda: list(table.values()), saver=self.saved.append,
+                                        enricher=self.store._enricher, catalog=lambda: [row],
+                                        snapshot=lambda: snapshot, store=SessionStore(redis_url=None))
+        asyncio.run(writer.refresh())
+
+        # First sight of the snapshot: entries written by the other worker reload in the background
+        for _ in range(100):
+            if reader.lookup(row):
+                break
+            time.sleep(0.01)
+        self.assertEqual(reader.lookup(row)["nearby_places"], "near Whitefield")
+
+        changed = _project("p1", location="Hebbal")
+        snapshot = SimpleNamespace(version=2, rows=[changed])  # Background snapshot refresh, no admin call
+        self.assertEqual(reader.lookup(changed), {})
+        self.assertEqual(reader.stats()["snapshot_version"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+import json
+import asyncio
+from unittest.mock import patch
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.hybrid_retrieval import hybrid_retrieval
+from services.filter_extractor import PropertyFilters
+from services.project_snapshot import ProjectSnapshotManager
+from services.search_cache import SearchResultCache
+
+SEED_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'seed_projects.json')
+
+
+class TestFilterVariants(unittest.TestCase):
+    def setUp(self):
+        with open(SEED_PATH) as f:
+            rows = json.load(f)
+        snapshots = ProjectSnapshotManager(loader=lambda: rows)
+        snapshots.refresh()
+        self.patches = [
+            patch('services.hybrid_retrieval.project_snapshots', snapshots),
+            patch('services.hybrid_retrieval.search_cache', SearchResultCache()),
+            patch.object(hybrid_retrieval, 'projects_table', object()),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def test_batch_matches_individual_searches(self):
+        base = PropertyFilters(bedrooms=[3], locality='Whitefield', area='East Bangalore')
+        variants = [base.model_copy(update={"max_price_inr": int(1.5e7 * m)}) for m in (1.0, 1.1, 1.2, 1.3)]
+        variants.append(PropertyFilters(bedrooms=[2], locality='Hennur', area='North Bangalore', max_price_inr=int(1.5e7)))
+
+        batch = hybrid_retrieval._query_variants_sync(variants, "")
+        for filters, results in zip(variants, batch):
+            single = hybrid_retrieval._query_projects_sync(filters, "")
+            self.assertEqual([p['name'] for p in results], [p['name'] for p in single])
+            self.assertEqual([p['unit_count'] for p in results], [p['unit_count'] for p in single])
+
+    def test_variant_results_are_cached(self):
+        variants = [PropertyFilters(area='North Bangalore', max_price_inr=n * 10**7) for n in (1, 2)]
+        first = asyncio.run(hybrid_retrieval.search_with_filter_variants("", variants))
+        with patch.object(hybrid_retrieval, '_query_variants_sync') as query:
+            second = asyncio.run(hybrid_retrieval.search_with_filter_variants("", variants))
+            query.assert_not_called()
+        self.assertEqual(first, second)
+
+    def test_budget_alternatives_accepts_session_filters(self):
+        alternatives = asyncio.run(hybrid_retrieval.get_budget_alternatives(
+            {"bedrooms": [2], "max_price_inr": 12000000, "locality": "Whitefield", "unknown": 1},
+            max_results=2
+        ))
+        self.assertEqual(alternatives["metadata"]["lower_budget_max"], 9600000)
+        for project in alternatives["lower_budget"]:
+            self.assertLessEqual(project["budget_min"], 96)
+
+
+if __name__ == '__main__':
+    unittest.main()
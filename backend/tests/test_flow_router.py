@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+import json
+from unittest.mock import MagicMock, patch
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.flow_engine import (
+    FlowState, extract_requirements_and_intent, parse_requirements_local,
+    requirements_complete, execute_sales_copilot_flow
+)
+
+
+def _reply(payload):
+    return MagicMock(choices=[MagicMock(message=MagicMock(content=json.dumps(payload)))])
+
+
+class TestFlowRouter(unittest.TestCase):
+    def test_local_parse(self):
+        reqs = parse_requirements_local("2bhk in whitefield under 1.5cr")
+        self.assertEqual(reqs.configuration, "2BHK")
+        self.assertEqual(reqs.location, "Whitefield")
+        self.assertEqual(reqs.budget_max, 1.5)
+        self.assertTrue(requirements_complete(reqs))
+
+        reqs = parse_requirements_local("rm contact for birla evara")
+        self.assertEqual((reqs.project_name, reqs.feature_requested), ("Birla Evara", "RM contact"))
+        self.assertTrue(requirements_complete(reqs))
+
+        self.assertFalse(requirements_complete(parse_requirements_local("2bhk in whitefield")))
+
+    @patch('services.flow_engine.llm_gateway.chat_sync')
+    def test_complete_local_parse_skips_llm(self, mock_chat):
+        mock_chat.side_effect = AssertionError("LLM should not be called")
+        state = FlowState()
+        execute_sales_copilot_flow(state, "3bhk in whitefield under 2.5 cr")
+        mock_chat.assert_not_called()
+        self.assertEqual(state.last_intent, "project_discovery")
+        self.assertEqual(state.requirements.configuration, "3BHK")
+        self.assertEqual(state.requirements.location, "Whitefield")
+
+    @patch('services.flow_engine.llm_gateway.chat_sync')
+    def test_single_fused_call(self, mock_chat):
+        mock_chat.return_value = _reply({
+            "requirements": {"location": "Hebbal", "budget_max": 2.0},
+            "intent": "comparison",
+            "confidence": 0.9
+        })
+        reqs, intent = extract_requirements_and_intent("is hebbal better than yelahanka around 2cr", "")
+        self.assertEqual(mock_chat.call_count, 1)
+        self.assertEqual(mock_chat.call_args.kwargs["cache"], "requirements_intent")
+        self.assertEqual((reqs.location, reqs.budget_max), ("Hebbal", 2.0))
+        self.assertEqual(intent["intent"], "comparison")
+
+    @patch('services.flow_engine.llm_gateway.chat_sync')
+    def test_fused_call_failure_falls_back_to_keywords(self, mock_chat):
+        mock_chat.side_effect = Exception("API down")
+        reqs, intent = extract_requirements_and_intent("this is too expensive", "")
+        self.assertEqual(reqs.model_dump(exclude_none=True), {})
+        self.assertIn("intent", intent)
+
+
+if __name__ == '__main__':
+    unittest.main()
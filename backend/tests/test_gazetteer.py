@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.gazetteer import (
+    Gazetteer, LOCALITY, ZONE, DIRECTION, CITY, PROJECT,
+    catalog_gazetteer, location_gazetteer
+)
+from utils.geolocation_utils import BANGALORE_COORDINATES, get_coordinates
+
+
+class TestGazetteer(unittest.TestCase):
+    def test_overlapping_matches_in_one_pass(self):
+        g = Gazetteer([("he", "x", "he"), ("she", "x", "she"), ("hers", "x", "hers"), ("his", "x", "his")])
+        self.assertEqual([s.text for s in g.tag("ushers his she")], ["his", "she"])
+        self.assertEqual([s.text for s in Gazetteer([("she", "x", "she"), ("he", "x", "he")]).tag("she")],
+                         ["she"])
+        self.assertEqual([s.text for s in Gazetteer([("a b", "x", "ab"), ("b", "x", "b")]).tag("a b")],
+                         ["a b", "b"])
+
+    def test_word_boundaries(self):
+        g = location_gazetteer()
+        self.assertEqual(g.tag("thsr northern"), [])
+        self.assertEqual([s.value for s in g.tag("hsr, north")], ["hsr", "North Bangalore"])
+
+    def test_longest_and_kinds(self):
+        g = location_gazetteer()
+        text = "2bhk off sarjapur road in east bengaluru"
+        self.assertEqual([s.text for s in g.tag(text, (LOCALITY,))], ["sarjapur road", "sarjapur"])
+        self.assertEqual([(s.kind, s.value) for s in g.longest(text)],
+                         [(LOCALITY, "sarjapur road"), (ZONE, "East Bangalore")])
+        self.assertEqual(g.best(text, (LOCALITY,)).value, "sarjapur road")
+        self.assertEqual([s.kind for s in g.tag("east", (DIRECTION, CITY))], [DIRECTION])
+
+    def test_aliases_map_to_canonical(self):
+        self.assertEqual(location_gazetteer().best("flats in sarjapura").value, "sarjapur")
+
+    def test_catalog_names(self):
+        g = catalog_gazetteer(["Brigade Citrine", None, "Sobha Neopolis"])
+        spans = g.tag("price of brigade citrine in whitefield", (PROJECT, LOCALITY))
+        self.assertEqual([(s.kind, s.value) for s in spans],
+                         [(PROJECT, "Brigade Citrine"), (LOCALITY, "whitefield")])
+        self.assertEqual(location_gazetteer().tag("brigade citrine", (PROJECT,)), [])
+
+
+class TestGetCoordinates(unittest.TestCase):
+    def test_most_specific_place_wins(self):
+        self.assertEqual(get_coordinates("Sarjapur Road, Bangalore, East Bangalore"),
+                         BANGALORE_COORDINATES["sarjapur road"])
+        self.assertEqual(get_coordinates("Hebbal, North Bangalore"), BANGALORE_COORDINATES["hebbal"])
+        self.assertEqual(get_coordinates("East Bangalore"), BANGALORE_COORDINATES["east bangalore"])
+
+    def test_partial_names_and_misses(self):
+        self.assertEqual(get_coordinates("budigere"), BANGALORE_COORDINATES["budigere cross"])
+        self.assertIsNone(get_coordinates("mysuru"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+import json
+
+import numpy as np
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.geo_index import GeoIndex, project_coordinates
+from utils.geolocation_utils import calculate_distance, get_coordinates, haversine_km
+
+SEED_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'seed_projects.json')
+
+
+class TestHaversine(unittest.TestCase):
+    def test_matches_scalar_distance(self):
+        lats = np.array([12.9698, 13.1986, np.nan])
+        lons = np.array([77.7500, 77.7066, 77.0])
+        dist = haversine_km(12.9716, 77.5946, lats, lons)
+        self.assertAlmostEqual(dist[0], calculate_distance(12.9716, 77.5946, 12.9698, 77.7500), places=6)
+        self.assertAlmostEqual(dist[1], calculate_distance(12.9716, 77.5946, 13.1986, 77.7066), places=6)
+        self.assertTrue(np.isnan(dist[2]))
+
+
+class TestGeoIndex(unittest.TestCase):
+    def setUp(self):
+        self.projects = [
+            {"name": "Stored", "latitude": 12.9900, "longitude": 77.7200, "location": "Yelahanka"},
+            {"name": "By Location", "location": "Sarjapur Road"},
+            {"name": "By Zone", "location": "Somewhere", "zone": "Whitefield"},
+            {"name": "Unknown", "location": "Nowhere"},
+            {"name": "Far", "latitude": 13.1986, "longitude": 77.7066},
+        ]
+        self.geo = GeoIndex(self.projects)
+
+    def test_coordinate_sources(self):
+        self.assertEqual(project_coordinates(self.projects[0]), (12.9900, 77.7200))
+        self.assertEqual(project_coordinates(self.projects[1]), get_coordinates("sarjapur road"))
+        self.assertEqual(project_coordinates(self.projects[2]), get_coordinates("whitefield"))
+        self.assertIsNone(project_coordinates(self.projects[3]))
+        self.assertEqual(len(self.geo), 4)
+
+    def test_within_radius_sorted_and_masked(self):
+        lat, lon = get_coordinates("whitefield")
+        positions, dist = self.geo.within_radius(lat, lon, 10.0)
+        self.assertEqual(positions.tolist()[:2], [2, 0])
+        self.assertTrue(np.all(np.diff(dist) >= 0))
+        self.assertNotIn(4, positions.tolist())
+
+        mask = np.array([True, True, False, True, True])
+        positions, _ = self.geo.within_radius(lat, lon, 10.0, mask=mask)
+        self.assertNotIn(2, positions.tolist())
+
+    def test_nearest(self):
+        lat, lon = get_coordinates("whitefield")
+        positions, dist = self.geo.nearest(lat, lon, 2)
+        self.assertEqual(positions.tolist(), [2, 0])
+        self.assertEqual(len(self.geo.nearest(lat, lon, 10)[0]), 4)
+
+    def test_grid_matches_brute_force_on_seed(self):
+        with open(SEED_PATH) as f:
+            projects = json.load(f)
+        geo = GeoIndex(projects)
+        for center in ("whitefield", "hebbal", "electronic city"):
+            lat, lon = get_coordinates(center)
+            for radius in (3.0, 10.0, 25.0):
+                positions, _ = geo.within_radius(lat, lon, radius)
+                expected = [i for i, p in enumerate(projects)
+                            if project_coordinates(p)
+                            and calculate_distance(lat, lon, *project_coordinates(p)) <= radius]
+                self.assertEqual(sorted(positions.tolist()), expected, (center, radius))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import sys
+import os
+import json
+import asyncio
+from unittest.mock import patch
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.llm_cache import LLMResponseCache, request_fingerprint
+from services.llm_gateway import LLMGateway
+
+MESSAGES = [{"role": "user", "content": "2bhk under 1.5cr in whitefield"}]
+
+
+def _completion(content):
+    return {
+        "id": "cmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+        "choices": [{"index": 0, "finish_reason": "stop",
+                     "message": {"role": "assistant", "content": content}}],
+    }
+
+
+class _FakeRedis:
+    """Dict-backed stand-in for the get/setex calls the cache makes."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+
+        def handler(request):
+            self.requests.append(json.loads(request.content))
+            return httpx.Response(200, json=_completion('{"intent": "property_search"}'))
+
+        self.transport = httpx.MockTransport(handler)
+
+    def _gateway(self, cache):
+        gateway = LLMGateway(api_key="test", base_url="http://llm.test/v1", cache=cache)
+        gateway._sync_client = OpenAI(api_key="test", base_url="http://llm.test/v1",
+                                      http_client=httpx.Client(transport=self.transport))
+        return gateway
+
+    def test_fingerprint(self):
+        a = request_fingerprint("gpt-4o", MESSAGES, {"temperature": 0, "max_tokens": 5})
+        b = request_fingerprint("gpt-4o", MESSAGES, {"max_tokens": 5, "temperature": 0})
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, request_fingerprint("gpt-4o", MESSAGES, {"temperature": 0, "max_tokens": 6}))
+        self.assertNotEqual(a, request_fingerprint("gpt-4o-mini", MESSAGES, {"temperature": 0, "max_tokens": 5}))
+
+    def test_repeat_served_from_l1(self):
+        cache = LLMResponseCache()
+        gateway = self._gateway(cache)
+        first = gateway.chat_sync(MESSAGES, model="gpt-4o", temperature=0, cache="intent_classification")
+        second = gateway.chat_sync(MESSAGES, model="gpt-4o", temperature=0, cache="intent_classification")
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(second.choices[0].message.content, first.choices[0].message.content)
+        stats = cache.stats()
+        self.assertEqual(stats["sites"]["intent_classification"]["hits_l1"], 1)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_opt_out_and_creative_calls_bypass(self):
+        cache = LLMResponseCache()
+        gateway = self._gateway(cache)
+        for _ in range(2):
+            gateway.chat_sync(MESSAGES, model="gpt-4o", temperature=0)
+            gateway.chat_sync(MESSAGES, model="gpt-4o", temperature=0.7, cache="intent_classification")
+        self.assertEqual(len(self.requests), 4)
+        self.assertEqual(cache.stats()["size"], 0)
+
+        disabled = LLMResponseCache(enabled=False)
+        gateway = self._gateway(disabled)
+        gateway.chat_sync(MESSAGES, model="gpt-4o", temperature=0, cache="intent_classification")
+        self.assertEqual(disabled.stats()["size"], 0)
+
+    def test_l2_shared_across_workers_and_expiry(self):
+        redis = _FakeRedis()
+        worker_a = LLMResponseCache(redis_url="redis://test")
+        worker_b = LLMResponseCache(redis_url="redis://test")
+        worker_a._redis = worker_b._redis = redis
+
+        self._gateway(worker_a).chat_sync(MESSAGES, model="gpt-4o", temperature=0, cache="filter_extraction")
+        self._gateway(worker_b).chat_sync(MESSAGES, model="gpt-4o", temperature=0, cache="filter_extraction")
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(worker_b.stats()["hits_l2"], 1)
+        self.assertEqual(worker_b.stats()["size"], 1)  # Promoted to L1
+
+        key = worker_a.key("gpt-4o", MESSAGES, {"temperature": 0})
+        with patch('services.llm_cache.time.time', return_value=10**12):
+            self.assertIsNone(worker_a.get("filter_extraction", key))
+
+    def test_async_path(self):
+        cache = LLMResponseCache()
+        gateway = LLMGateway(api_key="test", base_url="http://llm.test/v1", cache=cache)
+
+        async def run():
+            gateway._async_client = AsyncOpenAI(api_key="test", base_url="http://llm.test/v1",
+                                                http_client=httpx.AsyncClient(transport=self.transport))
+            gateway._async_loop = asyncio.get_running_loop()
+            for _ in range(3):
+                await gateway.chat(MESSAGES, model="gpt-4o", temperature=0, cache="intent_classification")
+
+        asyncio.run(run())
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(cache.stats()["hits_l1"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
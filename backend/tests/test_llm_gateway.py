@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+import json
+import asyncio
+
+import httpx
+from openai import AsyncOpenAI
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.llm_gateway import DEFAULT_TIMEOUT, LLMGateway, timeout_for
+
+
+def _completion(content):
+    return {
+        "id": "cmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+        "choices": [{"index": 0, "finish_reason": "stop",
+                     "message": {"role": "assistant", "content": content}}],
+    }
+
+
+class TestLLMGateway(unittest.TestCase):
+    def test_timeouts_by_model_prefix(self):
+        self.assertEqual(timeout_for("gpt-4o-mini-2024-07-18").read, 20.0)
+        self.assertEqual(timeout_for("gpt-4o").read, 30.0)
+        self.assertEqual(timeout_for("some-proxy-model").read, DEFAULT_TIMEOUT)
+        self.assertEqual(timeout_for("gpt-4o", timeout=10.0).read, 10.0)
+
+    def test_async_client_pooled_per_event_loop(self):
+        gateway = LLMGateway(api_key="test", base_url="http://llm.test/v1")
+
+        async def clients():
+            return gateway.async_client, gateway.async_client
+
+        first, again = asyncio.run(clients())
+        self.assertIs(first, again)
+        second, _ = asyncio.run(clients())
+        self.assertIsNot(first, second)
+        self.assertIs(gateway.sync_client, gateway.sync_client)
+
+    def test_chat_uses_shared_client(self):
+        gateway = LLMGateway(api_key="test", base_url="http://llm.test/v1")
+        seen = []
+
+        def handler(request):
+            body = json.loads(request.content)
+            seen.append((body["model"], body["messages"][-1]["content"]))
+            return httpx.Response(200, json=_completion("ok"))
+
+        async def run():
+            gateway._async_client = AsyncOpenAI(
+                api_key="test", base_url="http://llm.test/v1",
+                http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            )
+            gateway._async_loop = asyncio.get_running_loop()
+            results = await asyncio.gather(*[
+                gateway.chat(model="gpt-4o", messages=[{"role": "user", "content": f"q{i}"}])
+                for i in range(3)
+            ])
+            await gateway.aclose()
+            return results
+
+        results = asyncio.run(run())
+        self.assertEqual([r.choices[0].message.content for r in results], ["ok"] * 3)
+        self.assertEqual(sorted(q for _, q in seen), ["q0", "q1", "q2"])
+        self.assertEqual(gateway.stats()["requests"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import sys
+import os
+import asyncio
+import time
+
+import httpx
+import openai
+from openai import AsyncOpenAI
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.llm_cache import LLMResponseCache
+from services.llm_gateway import LLMGateway
+from services.llm_scheduler import LLMOverloadedError, LLMScheduler, Priority, parse_duration
+
+
+class TestLLMScheduler(unittest.TestCase):
+    def test_parse_duration(self):
+        self.assertEqual(parse_duration("1s"), 1.0)
+        self.assertEqual(parse_duration("6m0s"), 360.0)
+        self.assertAlmostEqual(parse_duration("20ms"), 0.02)
+        self.assertEqual(parse_duration("2"), 2.0)
+        self.assertIsNone(parse_duration(None))
+
+    def test_background_sheds_while_interactive_gets_headroom(self):
+        scheduler = LLMScheduler(requests_per_minute=10, tokens_per_minute=100000, enabled=True)
+        # Background may only use 70% of the request budget
+        for _ in range(7):
+            scheduler.acquire_sync("gpt-4o", Priority.BACKGROUND, tokens=100)
+        with self.assertRaises(LLMOverloadedError):
+            scheduler.acquire_sync("gpt-4o", Priority.BACKGROUND, tokens=100, max_wait=0.1)
+        # Interactive still goes straight through on the reserved headroom
+        started = time.monotonic()
+        for _ in range(3):
+            scheduler.acquire_sync("gpt-4o", Priority.INTERACTIVE, tokens=100)
+        self.assertLess(time.monotonic() - started, 0.05)
+        stats = scheduler.stats()
+        self.assertEqual(stats["granted"], {"background": 7, "interactive": 3})
+        self.assertEqual(stats["shed"], {"background": 1})
+
+    def test_queued_interactive_goes_before_background(self):
+        scheduler = LLMScheduler(requests_per_minute=600, tokens_per_minute=100000, enabled=True)
+        scheduler.observe("gpt-4o", {"retry-after-ms": "300"}, status_code=429)
+        order = []
+
+        async def call(name, priority):
+            await scheduler.acquire("gpt-4o", priority, tokens=10, max_wait=None)
+            order.append(name)
+
+        async def run():
+            background = asyncio.ensure_future(call("background", Priority.BACKGROUND))
+            await asyncio.sleep(0.01)
+            await asyncio.gather(background, call("interactive", Priority.INTERACTIVE))
+
+        asyncio.run(run())
+        self.assertEqual(order, ["interactive", "background"])
+
+    def test_headers_and_429_update_buckets(self):
+        scheduler = LLMScheduler(requests_per_minute=500, tokens_per_minute=100000, enabled=True)
+        scheduler.observe("gpt-4o", {
+            "x-ratelimit-limit-requests": "10000", "x-ratelimit-remaining-requests": "9000",
+            "x-ratelimit-limit-tokens": "2000000", "x-ratelimit-remaining-tokens": "50000",
+        })
+        model = scheduler.stats()["models"]["gpt-4o"]
+        self.assertEqual(model["requests_per_minute"], 10000)
+        self.assertLessEqual(model["tokens_available"], 50100)
+        scheduler.observe("gpt-4o", {"retry-after-ms": "2000"}, status_code=429)
+        self.assertGreater(scheduler.stats()["models"]["gpt-4o"]["paused_s"], 1.5)  # 429 pauses the model
+        with self.assertRaises(LLMOverloadedError):
+            scheduler.acquire_sync("gpt-4o", Priority.INTERACTIVE, tokens=10, max_wait=0.2)
+
+    def test_gateway_degrades_transient_rate_limits_only(self):
+        codes = iter(["rate_limit_exceeded", "insufficient_quota"])
+
+        def handler(request):
+            return httpx.Response(429, headers={"retry-after": "0"},
+                                  json={"error": {"message": "slow down", "type": "requests", "code": next(codes)}})
+
+        scheduler = LLMScheduler(requests_per_minute=100, tokens_per_minute=100000, enabled=True)
+        gateway = LLMGateway(api_key="test", base_url="http://llm.test/v1",
+                             cache=LLMResponseCache(redis_url=None), scheduler=scheduler)
+
+        async def run():
+            gateway._async_client = AsyncOpenAI(
+                api_key="test", base_url="http://llm.test/v1", max_retries=0,
+                http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler),
+                                              event_hooks={"response": [gateway._observe_response_async]})
+            )
+            gateway._async_loop = asyncio.get_running_loop()
+            messages = [{"role": "user", "content": "hi"}]
+            with self.assertRaises(LLMOverloadedError):
+                await gateway.chat(model="gpt-4o", messages=messages, cache="intent_classification", temperature=0)
+            with self.assertRaises(openai.RateLimitError):
+                await gateway.chat(model="gpt-4o", messages=messages)
+
+        asyncio.run(run())
+        stats = scheduler.stats()
+        self.assertEqual(stats["rate_limited"], 2)
+        self.assertEqual(stats["granted"], {"interactive": 1, "consultant": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
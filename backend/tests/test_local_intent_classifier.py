@@ -0,0 +1,74 @@
+import unittest
+import sys
+import os
+import asyncio
+import tempfile
+from unittest.mock import AsyncMock, patch
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.local_intent_classifier import LocalIntentClassifier, normalize_query, _catalog
+
+
+class TestLocalIntentClassifier(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.classifier = LocalIntentClassifier()
+        cls.classifier.ensure_ready()
+
+    def test_placeholders(self):
+        catalog = _catalog()
+        vocabulary = self.classifier.vocabulary
+        self.assertEqual(normalize_query("Brigade Avalon price", catalog, vocabulary), "@project price")
+        self.assertEqual(normalize_query("avlon ka price", catalog, vocabulary), "@project ka price")
+        self.assertEqual(normalize_query("2bhk in Whitefield", catalog, vocabulary), "9bhk in @place")
+
+    def test_confident_local_answers(self):
+        cases = {
+            "show me 3bhk in whitefield under 2 cr": "property_search",
+            "what is the price of brigade citrine": "project_facts",
+            "nearby projects": "nearby_properties",
+            "show more": "show_more_projects",
+            "how to stretch my budget": "sales_conversation",
+        }
+        for query, intent in cases.items():
+            result = self.classifier.classify(query)
+            self.assertIsNotNone(result, query)
+            self.assertEqual(result["intent"], intent, query)
+            self.assertEqual(result["classifier"], "local")
+
+        result = self.classifier.classify("avalon ka price")
+        self.assertEqual(result["extraction"], {"project_name": "Brigade Avalon", "fact_type": "price"})
+        result = self.classifier.classify("3bhk in whitefield under 2 cr")
+        self.assertEqual(result["extraction"]["budget_max"], 200.0)  # Lakhs, like the GPT extraction
+
+    def test_escalation(self):
+        # Below the threshold
+        self.assertIsNone(self.classifier.classify("show more", threshold=1.01))
+        # Project question with no resolvable project
+        self.assertIsNone(self.classifier.classify("what is the rera number of it"))
+        # Vague fact question resolves the project from session state, like the GPT prompt does
+        result = self.classifier.classify("what is the price", {"selected_project_name": "Birla Evara"}, threshold=0.5)
+        self.assertEqual(result["extraction"]["project_name"], "Birla Evara")
+
+    def test_artifact_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "intent.npz")
+            self.classifier.save(path)
+            loaded = LocalIntentClassifier(model_path=path)
+            self.assertTrue(loaded.ensure_ready())
+        for query in ("birla evara amenities", "too expensive", "2bhk in hebbal"):
+            self.assertEqual(loaded.predict(query), self.classifier.predict(query))
+
+    def test_gpt_first_uses_local_path(self):
+        from services import gpt_intent_classifier
+        with patch.object(gpt_intent_classifier, 'local_intent_classifier', self.classifier), \
+                patch.object(gpt_intent_classifier.llm_gateway, 'chat', new_callable=AsyncMock) as mock_chat:
+            result = asyncio.run(gpt_intent_classifier.classify_intent_gpt_first("2bhk in sarjapur under 1.5 cr"))
+            self.assertEqual(result["intent"], "property_search")
+            mock_chat.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
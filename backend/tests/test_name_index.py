@@ -0,0 +1,97 @@
+import unittest
+import sys
+import os
+import json
+import time
+from unittest import mock
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.catalog_index import CatalogIndex
+from services.name_index import NameIndex
+from services import fuzzy_matcher
+from services.fuzzy_matcher import extract_project_name_from_query
+
+
+def _seed_names():
+    with open(os.path.join(os.path.dirname(__file__), '..', 'data', 'seed_projects.json')) as f:
+        return [p['name'] for p in json.load(f)]
+
+
+NAMES = ["Brigade Citrine", "Brigade Avalon", "Sobha Neopolis", "The Prestige City 2.0", "Brigade Citrine Phase 2"]
+
+
+class TestNameIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = NameIndex(NAMES)
+
+    def test_exact_is_case_insensitive(self):
+        match = self.index.lookup("brigade CITRINE")[0]
+        self.assertEqual((match.name, match.method, match.score), ("Brigade Citrine", "exact", 1.0))
+
+    def test_token_matches_are_ranked(self):
+        matches = self.index.lookup("citrine")
+        self.assertEqual([m.name for m in matches], ["Brigade Citrine", "Brigade Citrine Phase 2"])
+        self.assertEqual(matches[0].method, "token")
+        self.assertGreater(matches[0].score, matches[1].score)
+
+    def test_stop_words_ignored(self):
+        self.assertEqual(self.index.lookup("the"), [])
+
+    def test_typos(self):
+        self.assertEqual(self.index.lookup("citrne")[0].name, "Brigade Citrine")
+        self.assertEqual(self.index.lookup("avlon")[0].name, "Brigade Avalon")
+        self.assertEqual(self.index.lookup("avlon")[0].method, "fuzzy_token")
+
+    def test_no_match(self):
+        self.assertEqual(self.index.lookup("xyzzy"), [])
+
+    def test_developer_name_with_typo(self):
+        index = NameIndex(_seed_names())
+        self.assertEqual(index.lookup("prestige somervile", limit=1)[0].name, "Prestige Somerville")
+        self.assertEqual(index.lookup("brigade citrne", limit=1)[0].name, "Brigade Citrine")
+        self.assertEqual(index.lookup("brigade avlon", limit=1)[0].name, "Brigade Avalon")
+
+    def test_shared_developer_word_alone_does_not_match(self):
+        index = NameIndex(_seed_names())
+        self.assertEqual(index.lookup("sobha dream acre"), [])  # Not in the catalog
+        self.assertEqual(index.lookup("prestige xyz"), [])
+
+    def test_ties_are_not_broken_by_position(self):
+        self.assertEqual(NameIndex(["Brigade Eternia", "Brigade Avalon"]).lookup("avalon brigade", limit=1)[0].name,
+                         "Brigade Avalon")
+        self.assertEqual([m.name for m in NameIndex(["Sobha Neopolis", "Sobha Ayana"]).lookup("sobha")],
+                         [m.name for m in NameIndex(["Sobha Ayana", "Sobha Neopolis"]).lookup("sobha")])
+
+    def test_lookup_speed_on_large_catalog(self):
+        names = [f"{n} Tower {i}" for i in range(40) for n in _seed_names()]  # ~3000 names
+        index = NameIndex(names)
+        start = time.perf_counter()
+        for _ in range(20):
+            index.lookup("prestige city")
+        self.assertLess((time.perf_counter() - start) / 20, 0.05)
+
+
+class TestFuzzyMatcher(unittest.TestCase):
+    def test_known_projects_word_match(self):
+        known = NAMES + ["Godrej Woodsville"]
+        self.assertEqual(extract_project_name_from_query("details of woodsville please", known), "Godrej Woodsville")
+
+    def test_known_projects_typo(self):
+        known = [{"name": "Godrej Woodsville"}]
+        self.assertEqual(extract_project_name_from_query("tell me about woodsvile", known), known[0])
+
+    def test_catalog_name_index_is_reused(self):
+        catalog = CatalogIndex([{"name": name} for name in NAMES + ["Godrej Woodsville"]])
+        fuzzy_matcher._name_index_for.cache_clear()
+        with mock.patch("services.project_repository.project_repository.catalog", return_value=catalog):
+            self.assertEqual(extract_project_name_from_query("tell me about woodsvile"), "Godrej Woodsville")
+        self.assertEqual(fuzzy_matcher._name_index_for.cache_info().currsize, 0)  # No second index built
+
+    def test_unrelated_query(self):
+        self.assertIsNone(extract_project_name_from_query("show me options", NAMES))
+
+
+if __name__ == '__main__':
+    unittest.main()
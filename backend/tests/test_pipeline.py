@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+import asyncio
+import time
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.pipeline import Pipeline, Stage
+
+
+class TestPipeline(unittest.TestCase):
+    def test_independent_stages_overlap(self):
+        def slow_load(ctx):
+            time.sleep(0.1)
+            return "loaded"
+
+        async def slow_fetch(ctx):
+            await asyncio.sleep(0.1)
+            return ["p1", "p2"]
+
+        order = []
+
+        def combine(ctx):
+            order.append("combine")
+            return f"{ctx['session']}:{len(ctx['projects'])}:{ctx['query']}"
+
+        pipeline = Pipeline([
+            Stage("combine", combine, deps=("session", "projects"), blocking=False),
+            Stage("session", slow_load),
+            Stage("projects", slow_fetch),
+        ])
+        started = time.perf_counter()
+        run = asyncio.run(pipeline.run({"query": "q"}))
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(run["combine"], "loaded:2:q")
+        self.assertLess(elapsed, 0.18)  # Overlapped, not 0.2s
+        self.assertEqual(set(run.timings), {"session", "projects", "combine"})
+        self.assertGreaterEqual(run.timings["session"], 100)
+        self.assertIn("wall=", run.summary())
+
+    def test_non_critical_failure_uses_default(self):
+        def broken(ctx):
+            raise RuntimeError("profile db down")
+
+        run = asyncio.run(Pipeline([
+            Stage("profile", broken, critical=False, default=(None, None)),
+            Stage("answer", lambda ctx: ctx["profile"], deps=("profile",), blocking=False),
+        ]).run())
+        self.assertEqual(run["answer"], (None, None))
+        self.assertEqual(run.failed, ["profile"])
+
+    def test_critical_failure_raises(self):
+        def broken(ctx):
+            raise RuntimeError("session store down")
+
+        pipeline = Pipeline([Stage("session", broken), Stage("after", lambda ctx: 1, deps=("session",))])
+        with self.assertRaises(RuntimeError):
+            asyncio.run(pipeline.run())
+
+    def test_invalid_graphs(self):
+        with self.assertRaises(ValueError):
+            Pipeline([Stage("a", len, deps=("b",)), Stage("b", len, deps=("a",))])
+        with self.assertRaises(ValueError):
+            Pipeline([Stage("a", len, deps=("missing",))])
+
+
+if __name__ == '__main__':
+    unittest.main()
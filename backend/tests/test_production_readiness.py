@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, PropertyMock, patch
 import sys
 import os
 import json
@@ -12,14 +12,14 @@ from services.hybrid_retrieval import hybrid_retrieval
 
 class TestProductionReadiness(unittest.TestCase):
     def setUp(self):
-        flow_engine.sessions = {}
+        flow_engine.reset()
         self.session_id = "prod_user_999"
         # Ensure mock data
         if not hybrid_retrieval.mock_projects:
             hybrid_retrieval._load_mock_data()
 
-    @patch('services.flow_engine.openai.OpenAI')
-    @patch('services.flow_engine.get_projects_table')
+    @patch('services.llm_gateway.LLMGateway.sync_client', new_callable=PropertyMock)
+    @patch('services.project_snapshot.ProjectSnapshotManager.get')
     def test_complex_comparison_flow(self, mock_get_table, mock_openai):
         """
         Scenario: User compares two locations.
@@ -33,10 +33,9 @@ class TestProductionReadiness(unittest.TestCase):
 
         # Mocks
         mock_client.chat.completions.create.side_effect = [
-            # Extraction
-            MagicMock(choices=[MagicMock(message=MagicMock(content=json.dumps({})))]),
-            # Intent: Comparison
+            # Extraction + Intent: Comparison
             MagicMock(choices=[MagicMock(message=MagicMock(content=json.dumps({
+                "requirements": {},
                 "intent": "comparison",
                 "confidence": 0.9
             })))]),
@@ -52,7 +51,7 @@ class TestProductionReadiness(unittest.TestCase):
         self.assertIn("connectivity", response.system_action)
 
     @patch('services.flow_engine.sales_conversation.handle_sales_query')
-    @patch('services.flow_engine.openai.OpenAI')
+    @patch('services.llm_gateway.LLMGateway.sync_client', new_callable=PropertyMock)
     def test_objection_handling(self, mock_openai, mock_handle_sales):
         """
         Scenario: User says "Too expensive".
@@ -64,10 +63,9 @@ class TestProductionReadiness(unittest.TestCase):
 
         # Mocks
         mock_client.chat.completions.create.side_effect = [
-            # Extraction
-            MagicMock(choices=[MagicMock(message=MagicMock(content=json.dumps({})))]),
-            # Intent: Objection
+            # Extraction + Intent: Objection
             MagicMock(choices=[MagicMock(message=MagicMock(content=json.dumps({
+                "requirements": {},
                 "intent": "objection_budget",
                 "confidence": 0.95
             })))]),
@@ -82,8 +80,8 @@ class TestProductionReadiness(unittest.TestCase):
         
         self.assertIn("strategic investment", response.system_action)
 
-    @patch('services.flow_engine.openai.OpenAI')
-    @patch('services.flow_engine.get_projects_table')
+    @patch('services.llm_gateway.LLMGateway.sync_client', new_callable=PropertyMock)
+    @patch('services.project_snapshot.ProjectSnapshotManager.get')
     def test_error_resilience_llm_failure(self, mock_get_table, mock_openai):
         """
         Scenario: LLM returns garbage JSON or fails.
@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import json
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.catalog_index import CatalogIndex
+from services.project_payloads import (
+    IDENTITY_FIELDS, PROJECT_CARD_FIELDS,
+    project_fields, project_list_fields, render_project_payload, resolve_fields, search_result_payload
+)
+from services.project_repository import ProjectRepository
+from services.project_snapshot import ProjectSnapshotManager
+
+SEED_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'seed_projects.json')
+
+
+class TestProjectPayloads(unittest.TestCase):
+    def setUp(self):
+        with open(SEED_PATH) as f:
+            self.rows = json.load(f)
+
+    def test_rendered_once_per_snapshot(self):
+        index = CatalogIndex(self.rows)
+        self.assertEqual(len(index.payloads), len(self.rows))
+        payload = index.payloads[0]
+        self.assertEqual(payload["project_name"], self.rows[0]["name"])
+        self.assertEqual(payload["config_summary"], self.rows[0].get("configuration", ""))
+        self.assertEqual(payload["price_range"]["min"], self.rows[0]["budget_min"] / 100.0)
+
+    def test_unformattable_row_is_skipped(self):
+        self.assertIsNone(render_project_payload({"name": "Bad", "budget_min": "n/a"}))
+
+    def test_search_overlay_does_not_touch_snapshot(self):
+        base = render_project_payload(self.rows[0])
+        units = [{"bhk": 2, "price_cr": 1.1}]
+        result = search_result_payload(base, units)
+        self.assertEqual(result["unit_count"], 1)
+        self.assertIs(result["price_range"], base["price_range"])
+        result["_distance"] = 2.0
+        self.assertEqual(base["matching_units"], [])
+        self.assertNotIn("_distance", base)
+
+    def test_field_projection(self):
+        payload = render_project_payload(self.rows[0])
+        self.assertIsNone(resolve_fields(None))
+        self.assertIsNone(resolve_fields("full"))
+        self.assertEqual(set(project_fields(payload, "card")), set(PROJECT_CARD_FIELDS))
+        self.assertNotIn("description", project_fields(payload, "card"))
+
+        projected = project_fields(payload, "amenities, description")
+        self.assertEqual(list(projected), list(IDENTITY_FIELDS) + ["amenities", "description"])
+        self.assertEqual(project_list_fields([payload], ["card", "registration_process"])[0].keys(),
+                         set(PROJECT_CARD_FIELDS) | {"registration_process"})
+
+    def test_repository_details_lookup(self):
+        snapshots = ProjectSnapshotManager(loader=lambda: self.rows)
+        snapshots.refresh()
+        repo = ProjectRepository(snapshots=snapshots)
+        row = self.rows[1]
+        by_id = repo.payload(row["project_id"], "description")
+        self.assertEqual(by_id["description"], row.get("description", ""))
+        self.assertEqual(repo.payload(row["name"].upper())["project_id"], row["project_id"])
+        self.assertIsNone(repo.payload("no-such-project"))
+
+
+if __name__ == '__main__':
+    unittest.main()
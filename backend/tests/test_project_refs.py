@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import json
+from unittest import mock
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.catalog_index import CatalogIndex
+from services.project_refs import REF_KEY, compact_projects, resolve_projects
+from services.redis_context import RedisContextManager
+from services.session_store import decode_model, decode_value, encode_model
+from services.flow_engine import FlowState
+
+PROJECTS = [
+    {"project_id": "p1", "name": "Brigade Citrine", "location": "Whitefield", "budget_min": 120, "budget_max": 180,
+     "configuration": "2BHK, 3BHK", "description": "Premium apartments " * 50, "amenities": "Pool, Gym, Clubhouse"},
+    {"project_id": "p2", "name": "Sobha Neopolis", "location": "Panathur", "budget_min": 200, "budget_max": 320,
+     "configuration": "3BHK", "description": "Lakeside towers " * 50, "amenities": "Pool"},
+]
+
+
+class TestProjectRefs(unittest.TestCase):
+    def setUp(self):
+        self.index = CatalogIndex(PROJECTS)
+
+    def test_rows_and_payloads_round_trip_with_annotations(self):
+        row = {**PROJECTS[0], "_match_score": 0.92, "_distance": 1.4}
+        payload = {**self.index.payloads[1], "matching_units": [{"bhk": 3, "price": 2.1}], "unit_count": 1}
+        compact = compact_projects([row, payload], self.index)
+
+        self.assertEqual(compact[0], {REF_KEY: "p1", "_view": "row", "_match_score": 0.92, "_distance": 1.4})
+        self.assertEqual(compact[1][REF_KEY], "p2")
+        self.assertEqual(compact[1]["_view"], "payload")
+        self.assertEqual(resolve_projects(json.loads(json.dumps(compact)), self.index), [row, payload])
+
+    def test_non_catalog_dicts_are_kept_and_removed_projects_dropped(self):
+        summary = {"name": "Godrej Woods", "location": "Noida"}  # Not in the catalog
+        renamed = {"project_id": "p1", "name": "Some Other Project"}
+        compact = compact_projects([summary, renamed, PROJECTS[1]], self.index)
+        self.assertEqual(compact[:2], [summary, renamed])
+
+        smaller = CatalogIndex(PROJECTS[:1])
+        self.assertEqual(resolve_projects(compact, smaller), [summary, renamed])
+
+    def test_call_context_stores_references(self):
+        manager = RedisContextManager("redis://localhost:1/0")
+        context = {"call_id": "c1", "last_location": "Whitefield", "last_results": [dict(p) for p in PROJECTS]}
+        with mock.patch("services.project_refs.project_repository.catalog", return_value=self.index):
+            encoded = manager._encode(context)
+            decoded = manager._decode(encoded)
+
+        self.assertLess(len(encoded), 300)
+        self.assertEqual(len(context["last_results"][0]), len(PROJECTS[0]))  # Caller's context untouched
+        self.assertEqual(decoded["last_results"], PROJECTS)
+
+    def test_session_project_lists_store_references(self):
+        state = FlowState(last_search_results=[dict(p) for p in PROJECTS], last_shown_projects=[dict(PROJECTS[0])])
+        fields_spec = ("last_search_results", "last_shown_projects")
+        with mock.patch("services.project_refs.project_repository.catalog", return_value=self.index):
+            fields = encode_model(state, fields_spec)
+            restored = decode_model(FlowState, fields, fields_spec)
+
+        self.assertEqual(decode_value(fields["last_shown_projects"]), [{REF_KEY: "p1", "_view": "row"}])
+        self.assertEqual(restored, state)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import sys
+import os
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.project_snapshot import ProjectSnapshotManager
+from services.project_repository import ProjectRepository
+
+PROJECTS = [
+    {"project_id": "p1", "name": "Brigade Citrine", "location": "Whitefield", "budget_min": 120},
+    {"project_id": "p2", "name": "Brigade Citrine Phase 2", "location": "Whitefield", "budget_min": 150},
+    {"project_id": "p3", "name": "Sobha Neopolis", "location": "Panathur", "budget_min": 200},
+]
+
+
+class TestProjectRepository(unittest.TestCase):
+    def setUp(self):
+        self.repo = ProjectRepository(snapshots=ProjectSnapshotManager(loader=lambda: PROJECTS))
+
+    def test_lookups(self):
+        self.assertEqual(self.repo.by_id("p3")["name"], "Sobha Neopolis")
+        self.assertIsNone(self.repo.by_id("Sobha Neopolis"))
+        self.assertEqual(self.repo.by_name("brigade citrine")["project_id"], "p1")
+        self.assertEqual(self.repo.find_by_name_fragment("Citrine Phase")["project_id"], "p2")
+        self.assertEqual(self.repo.find_by_name_fragment("neopolis")["project_id"], "p3")
+        self.assertIsNone(self.repo.find_by_name_fragment("Avalon"))
+
+    def test_projection_returns_copies(self):
+        rows = self.repo.select("name", "location")
+        self.assertEqual(rows[0], {"name": "Brigade Citrine", "location": "Whitefield"})
+        rows[0]["_distance"] = 1.0
+        self.assertNotIn("_distance", self.repo.select()[0])
+
+    def test_hit_miss_counters(self):
+        self.repo.names()
+        self.repo.names()
+        stats = self.repo.stats()
+        self.assertEqual((stats["misses"], stats["hits"], stats["fallbacks"]), (1, 1, 0))
+        self.assertEqual(stats["snapshot"]["loads"], 1)
+
+    def test_seed_fallback_when_database_unavailable(self):
+        def failing_loader():
+            raise RuntimeError("db down")
+
+        repo = ProjectRepository(snapshots=ProjectSnapshotManager(loader=failing_loader))
+        self.assertGreater(len(repo.names()), 0)
+        self.assertEqual(repo.stats()["fallbacks"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
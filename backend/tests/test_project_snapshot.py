@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.project_snapshot import ProjectSnapshotManager
+
+
+def _rows(tag):
+    return [{"project_id": f"{tag}-1", "name": f"Project {tag}", "configuration": "{2 BHK, 1100, 1 Cr}"}]
+
+
+class TestProjectSnapshotManager(unittest.TestCase):
+    def test_cold_miss_loads_once_for_concurrent_readers(self):
+        calls = []
+        gate = threading.Event()
+
+        def loader():
+            calls.append(1)
+            gate.wait(1)
+            return _rows("a")
+
+        manager = ProjectSnapshotManager(loader=loader)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(manager.get())) for _ in range(8)]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        gate.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual({s.version for s in results}, {1})
+
+    def test_stale_snapshot_served_while_refreshing(self):
+        tags = iter(["a", "b"])
+        refreshed = threading.Event()
+
+        def loader():
+            rows = _rows(next(tags))
+            if manager.current() is not None:
+                refreshed.set()
+            return rows
+
+        manager = ProjectSnapshotManager(loader=loader, ttl_seconds=10, refresh_ahead_seconds=5)
+        first = manager.get()
+        first.loaded_at -= 6  # Inside the refresh-ahead window
+
+        self.assertIs(manager.get(), first)
+        self.assertTrue(refreshed.wait(1))
+        for _ in range(100):
+            if manager.current() is not first:
+                break
+            time.sleep(0.01)
+        self.assertEqual(manager.current().rows[0]["name"], "Project b")
+
+    def test_failed_load_keeps_stale_snapshot(self):
+        state = {"fail": False}
+
+        def loader():
+            if state["fail"]:
+                raise RuntimeError("db down")
+            return _rows("a")
+
+        manager = ProjectSnapshotManager(loader=loader)
+        first = manager.get()
+        state["fail"] = True
+        manager.invalidate()
+        self.assertIsNone(manager.get())
+        manager.refresh(rows=_rows("c"))
+        self.assertEqual(manager.get().rows[0]["name"], "Project c")
+        self.assertGreater(manager.get().version, first.version)
+        self.assertEqual(manager.stats()["load_failures"], 1)
+
+    def test_failed_load_backs_off_before_retrying(self):
+        calls = []
+        state = {"fail": True}
+
+        def loader():
+            calls.append(1)
+            if state["fail"]:
+                raise RuntimeError("db down")
+            return _rows("a")
+
+        manager = ProjectSnapshotManager(loader=loader, retry_seconds=60)
+        for _ in range(5):
+            self.assertIsNone(manager.get())
+        self.assertEqual(len(calls), 1)  # Only the first reader paid for the failed load
+
+        state["fail"] = False
+        manager._retry_at = time.monotonic()  # Backoff expired
+        self.assertIsNone(manager.get())  # Retry runs in the background, not in the reader
+        for _ in range(100):
+            if manager.current() is not None:
+                break
+            time.sleep(0.01)
+        self.assertEqual(manager.get().rows[0]["name"], "Project a")
+        self.assertEqual(len(calls), 2)
+
+    def test_older_load_cannot_overwrite_newer_snapshot(self):
+        manager = ProjectSnapshotManager(loader=lambda: _rows("a"))
+        newer = manager.refresh(rows=_rows("new"))
+        older = manager._swap(_rows("old"), started_at=newer.started_at - 1)
+        self.assertIs(older, newer)
+        self.assertEqual(manager.current().rows[0]["name"], "Project new")
+
+
+if __name__ == '__main__':
+    unittest.main()
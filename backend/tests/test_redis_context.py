@@ -0,0 +1,124 @@
+import unittest
+import sys
+import os
+import asyncio
+import json
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.redis_context import LatencyHistogram, RedisContextManager
+
+
+class _FakeAsyncPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def getex(self, key, ex):
+        self.calls.append(("getex", key, ex))
+
+    def setex(self, key, ttl, value):
+        self.calls.append(("setex", key, ttl, value))
+
+    async def execute(self):
+        self.redis.round_trips.append([call[:2] for call in self.calls])
+        if self.redis.fail:
+            raise ConnectionError("connection reset")
+        results = []
+        for call in self.calls:
+            if call[0] == "getex":
+                self.redis.ttls[call[1]] = call[2]
+                results.append(self.redis.data.get(call[1]))
+            else:
+                self.redis.ttls[call[1]] = call[2]
+                self.redis.data[call[1]] = call[3]
+                results.append(True)
+        return results
+
+
+class _FakeAsyncRedis:
+    """Dict-backed stand-in for the pooled redis.asyncio client."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.round_trips = []
+        self.fail = False
+
+    def pipeline(self, transaction=True):
+        return _FakeAsyncPipeline(self)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+class TestRedisContextManager(unittest.TestCase):
+    def setUp(self):
+        # Nothing listens on port 1: the manager starts in its in-memory fallback
+        self.manager = RedisContextManager("redis://localhost:1/0", ttl_seconds=5400)
+        self.redis = _FakeAsyncRedis()
+
+    def _run(self, coro_factory):
+        async def run():
+            self.manager.redis_available = True
+            self.manager._async_client = self.redis
+            self.manager._async_loop = asyncio.get_running_loop()
+            return await coro_factory()
+        return asyncio.run(run())
+
+    def test_load_and_sliding_ttl_is_one_round_trip(self):
+        self.redis.data["call:c1"] = json.dumps({"call_id": "c1", "last_location": "Whitefield"})
+        ctx = self._run(lambda: self.manager.aload_context("c1"))
+        self.assertEqual(ctx["last_location"], "Whitefield")
+        self.assertEqual(self.redis.round_trips, [[("getex", "call:c1")]])
+        self.assertEqual(self.redis.ttls["call:c1"], 5400)
+
+        fresh = self._run(lambda: self.manager.aload_context("c2"))
+        self.assertEqual(fresh["call_id"], "c2")
+        self.assertIsNone(fresh["active_project"])
+
+    def test_multi_key_operations_are_pipelined(self):
+        contexts = {"c1": {"last_budget": 150}, "c2": {"last_budget": 300}}
+        self._run(lambda: self.manager.asave_contexts(contexts))
+        loaded = self._run(lambda: self.manager.aload_contexts(["c1", "c2", "c3"]))
+        self.assertEqual(len(self.redis.round_trips), 2)
+        self.assertEqual(len(self.redis.round_trips[1]), 3)
+        self.assertEqual([loaded[c]["last_budget"] for c in ("c1", "c2", "c3")], [150, 300, None])
+        self.assertEqual(loaded["c1"]["call_id"], "c1")
+
+        latency = self.manager.latency.snapshot()
+        self.assertEqual(latency["save_many"]["count"], 1)
+        self.assertEqual(latency["load_many"]["count"], 1)
+
+    def test_redis_errors_fall_back_to_memory(self):
+        self.redis.fail = True
+        self._run(lambda: self.manager.asave_context("c1", {"last_location": "Hebbal"}))
+        self.assertEqual(self._run(lambda: self.manager.aload_context("c1"))["last_location"], "Hebbal")
+
+        self.manager.redis_available = False
+        self.assertEqual(asyncio.run(self.manager.aload_context("c1"))["last_location"], "Hebbal")
+        asyncio.run(self.manager.adelete_context("c1"))
+        self.assertNotIn("c1", self.manager.memory_store)
+
+    def test_latency_histogram_percentiles(self):
+        histogram = LatencyHistogram(buckets_ms=(1, 5, 50))
+        for seconds in [0.0005] * 98 + [0.004, 0.2]:
+            histogram.observe("load", seconds)
+        self.assertEqual(histogram.percentile("load", 0.5), 1)
+        self.assertEqual(histogram.percentile("load", 0.99), 5)
+        self.assertIsNone(histogram.percentile("load", 1.0))  # Slowest call is beyond the last bucket
+        snapshot = histogram.snapshot()["load"]
+        self.assertEqual(snapshot["count"], 100)
+        self.assertEqual(snapshot["buckets"], {"le_1ms": 98, "le_5ms": 1, "inf": 1})
+        self.assertIsNone(histogram.percentile("save", 0.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
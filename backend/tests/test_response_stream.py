@@ -0,0 +1,121 @@
+import unittest
+import sys
+import os
+import json
+import asyncio
+from unittest.mock import patch
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import response_stream
+from services.llm_gateway import LLMGateway
+from services.response_stream import emit_projects, generate_text, generate_text_sync, sse_events
+
+
+def _chunk(content):
+    return {
+        "id": "cmpl-1", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o",
+        "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}],
+    }
+
+
+def _stream_body(deltas):
+    frames = [f"data: {json.dumps(_chunk(delta))}\n\n" for delta in deltas]
+    return "".join(frames) + "data: [DONE]\n\n"
+
+
+def _handler(request):
+    body = json.loads(request.content)
+    if body.get("stream"):
+        return httpx.Response(200, text=_stream_body(["• Great ", "choice"]),
+                              headers={"content-type": "text/event-stream"})
+    return httpx.Response(200, json={
+        "id": "cmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+        "choices": [{"index": 0, "finish_reason": "stop",
+                     "message": {"role": "assistant", "content": "• Great choice"}}],
+    })
+
+
+def _gateway():
+    gateway = LLMGateway(api_key="test", base_url="http://llm.test/v1")
+    gateway._sync_client = OpenAI(
+        api_key="test", base_url="http://llm.test/v1",
+        http_client=httpx.Client(transport=httpx.MockTransport(_handler))
+    )
+    return gateway
+
+
+def _bind_async_client(gateway):
+    gateway._async_client = AsyncOpenAI(
+        api_key="test", base_url="http://llm.test/v1",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    )
+    gateway._async_loop = asyncio.get_running_loop()
+
+
+def _parse(frames):
+    events = []
+    for frame in frames:
+        event_line, data_line = frame.strip().split("\n")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return events
+
+
+class TestResponseStream(unittest.TestCase):
+    def test_event_order_and_final_payload(self):
+        gateway = _gateway()
+
+        async def handler():
+            _bind_async_client(gateway)
+            # Retrieval in a worker thread, like the flow engine
+            await asyncio.to_thread(emit_projects, [{"name": "Brigade Avalon", "location": "Whitefield"}])
+            answer = await generate_text(model="gpt-4o", messages=[{"role": "user", "content": "q"}])
+            return {"answer": answer, "projects": [{"name": "Brigade Avalon"}], "coaching_point": "Push the visit"}
+
+        async def run():
+            return [frame async for frame in sse_events(
+                handler,
+                format_projects=lambda projects: [p["name"] for p in projects],
+                coaching_fields=("coaching_point",)
+            )]
+
+        with patch.object(response_stream, "llm_gateway", gateway):
+            events = _parse(asyncio.run(run()))
+
+        self.assertEqual([name for name, _ in events], ["projects", "token", "token", "coaching", "final"])
+        self.assertEqual(events[0][1], ["Brigade Avalon"])
+        self.assertEqual("".join(data["text"] for name, data in events if name == "token"), "• Great choice")
+        self.assertEqual(events[3][1], {"coaching_point": "Push the visit"})
+        self.assertEqual(events[-1][1]["answer"], "• Great choice")
+        self.assertEqual(gateway.stats()["streams"], 1)
+
+    def test_handler_error_becomes_error_event(self):
+        async def handler():
+            raise RuntimeError("flow failed")
+
+        async def run():
+            return [frame async for frame in sse_events(handler)]
+
+        self.assertEqual(_parse(asyncio.run(run())), [("error", {"detail": "flow failed"})])
+
+    def test_without_stream_uses_plain_completion(self):
+        gateway = _gateway()
+
+        async def run():
+            _bind_async_client(gateway)
+            return await generate_text(model="gpt-4o", messages=[{"role": "user", "content": "q"}])
+
+        with patch.object(response_stream, "llm_gateway", gateway):
+            self.assertEqual(asyncio.run(run()), "• Great choice")
+            self.assertEqual(generate_text_sync(model="gpt-4o", messages=[{"role": "user", "content": "q"}]),
+                             "• Great choice")
+            emit_projects([{"name": "ignored"}])  # No-op outside a stream
+        self.assertEqual(gateway.stats()["streams"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
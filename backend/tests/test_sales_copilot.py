@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, PropertyMock, patch
 import sys
 import os
 import json
@@ -13,15 +13,15 @@ from services.hybrid_retrieval import hybrid_retrieval
 class TestSalesCopilot(unittest.TestCase):
     def setUp(self):
         # Reset engine state
-        flow_engine.sessions = {}
+        flow_engine.reset()
         self.session_id = "test_user_123"
         
         # Ensure mock data is loaded
         if not hybrid_retrieval.mock_projects:
             hybrid_retrieval._load_mock_data()
 
-    @patch('services.flow_engine.openai.OpenAI')
-    @patch('services.flow_engine.get_projects_table')
+    @patch('services.llm_gateway.LLMGateway.sync_client', new_callable=PropertyMock)
+    @patch('services.project_snapshot.ProjectSnapshotManager.get')
     def test_scenario_1_discovery_and_persistence(self, mock_get_table, mock_openai):
         """
         Scenario 1: Discovery & Persistence
@@ -37,20 +37,8 @@ class TestSalesCopilot(unittest.TestCase):
         mock_client = MagicMock()
         mock_openai.return_value = mock_client
         
-        # 1. Extraction Mock
-        mock_client.chat.completions.create.side_effect = [
-            # Call 1: Extraction
-            MagicMock(choices=[MagicMock(message=MagicMock(content=json.dumps({
-                "configuration": "3 BHK",
-                "location": "Sarjapur Road",
-                "budget_max": 2.5 # Using 2.5 to match potential mock data
-            })))]) ,
-            # Call 2: Intent Classification
-            MagicMock(choices=[MagicMock(message=MagicMock(content=json.dumps({
-                "intent": "project_discovery",
-                "confidence": 0.9
-            })))]),
-        ]
+        # Configuration + location + budget parse locally: no LLM round trip
+        mock_client.chat.completions.create.side_effect = AssertionError("LLM should not be called")
 
         response = flow_engine.process(self.session_id, "Show me 3BHKs in Sarjapur Road under 2.5 Cr")
         
@@ -58,13 +46,13 @@ class TestSalesCopilot(unittest.TestCase):
         print(f"System Action: {response.system_action}")
         
         # Verify Context Persistence
-        state = flow_engine.sessions[self.session_id]
+        state = flow_engine.get_state(self.session_id)
         self.assertEqual(state.requirements.location, "Sarjapur Road")
         self.assertIn("Sarjapur", response.system_action)
         self.assertTrue(len(state.last_shown_projects) > 0, "Should have found projects")
 
-    @patch('services.flow_engine.openai.OpenAI')
-    @patch('services.flow_engine.get_projects_table')
+    @patch('services.llm_gateway.LLMGateway.sync_client', new_callable=PropertyMock)
+    @patch('services.project_snapshot.ProjectSnapshotManager.get')
     def test_scenario_2_radius_search(self, mock_get_table, mock_openai):
         """
         Scenario 2: Contextual Radius Search
@@ -83,10 +71,9 @@ class TestSalesCopilot(unittest.TestCase):
         
         # Mocks for this turn
         mock_client.chat.completions.create.side_effect = [
-            # Extraction (Empty, reused context)
-            MagicMock(choices=[MagicMock(message=MagicMock(content=json.dumps({})))]),
-            # Intent: Contextual Query
+            # Extraction + Intent (empty requirements, reused context)
             MagicMock(choices=[MagicMock(message=MagicMock(content=json.dumps({
+                "requirements": {},
                 "intent": "contextual_query",
                 "confidence": 0.95
             })))]),
@@ -100,8 +87,8 @@ class TestSalesCopilot(unittest.TestCase):
         self.assertIn("within 10km", response.system_action)
         self.assertIn("Whitefield", response.system_action)
 
-    @patch('services.flow_engine.openai.OpenAI')
-    @patch('services.flow_engine.get_projects_table')
+    @patch('services.llm_gateway.LLMGateway.sync_client', new_callable=PropertyMock)
+    @patch('services.project_snapshot.ProjectSnapshotManager.get')
     def test_scenario_3_specific_pitch(self, mock_get_table, mock_openai):
         """
         Scenario 3: Specific Pitch
@@ -112,18 +99,15 @@ class TestSalesCopilot(unittest.TestCase):
         
         # Pre-seed logic to ensure "Birla Evara" exists in mock or we pick one that does
         mock_get_table.return_value = None
-        target_project = "Brigade Sanctuary" # Present in seed_projects.json usually
+        target_project = "Brigade Avalon" # Present in seed_projects.json
         
         mock_client = MagicMock()
         mock_openai.return_value = mock_client
         
         mock_client.chat.completions.create.side_effect = [
-            # Extraction
-            MagicMock(choices=[MagicMock(message=MagicMock(content=json.dumps({
-                "project_name": target_project
-            })))]),
-            # Intent
+            # Extraction + Intent
             MagicMock(choices=[MagicMock(message=MagicMock(content=json.dumps({
+                "requirements": {"project_name": target_project},
                 "intent": "project_specific",
                 "confidence": 0.99
             })))]),
@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.search_cache import SearchResultCache, filters_fingerprint
+
+
+class _Filters(BaseModel):
+    """Stand-in with PropertyFilters' model_dump interface."""
+    bedrooms: Optional[List[int]] = None
+    locality: Optional[str] = None
+    max_price_inr: Optional[int] = None
+
+
+def _result(name):
+    return {"projects": [{"name": name}], "total_matching_projects": 1, "search_method": "pixeltable"}
+
+
+class TestSearchResultCache(unittest.TestCase):
+    def test_fingerprint_ignores_unset_fields_and_order(self):
+        a = _Filters(bedrooms=[2], locality="Whitefield")
+        b = _Filters(locality="Whitefield", bedrooms=[2], max_price_inr=None)
+        self.assertEqual(filters_fingerprint(a), filters_fingerprint(b))
+        self.assertNotEqual(filters_fingerprint(a), filters_fingerprint(_Filters(bedrooms=[3], locality="Whitefield")))
+
+    def test_hit_returns_independent_copies(self):
+        cache = SearchResultCache()
+        key = cache.key(_Filters(bedrooms=[2]), "pixeltable", 1)
+        self.assertIsNone(cache.get(key))
+        cache.put(key, _result("A"))
+        first = cache.get(key)
+        first["projects"][0]["_distance"] = 3
+        self.assertNotIn("_distance", cache.get(key)["projects"][0])
+        self.assertEqual(cache.stats()["hits"], 2)
+        self.assertEqual(cache.stats()["hit_rate"], 0.667)
+
+    def test_new_snapshot_version_invalidates(self):
+        cache = SearchResultCache()
+        filters = _Filters(bedrooms=[2])
+        cache.put(cache.key(filters, "pixeltable", 1), _result("old"))
+        self.assertIsNone(cache.get(cache.key(filters, "pixeltable", 2)))
+        self.assertEqual(cache.stats()["size"], 0)
+
+        # A late store computed from the old snapshot is dropped
+        cache.put(cache.key(filters, "pixeltable", 1), _result("late"))
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_lru_eviction(self):
+        cache = SearchResultCache(max_entries=2)
+        keys = [cache.key(_Filters(bedrooms=[n]), "mock_data", 76) for n in (1, 2, 3)]
+        cache.put(keys[0], _result("1"))
+        cache.put(keys[1], _result("2"))
+        cache.get(keys[0])
+        cache.put(keys[2], _result("3"))
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
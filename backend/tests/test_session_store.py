@@ -0,0 +1,176 @@
+import unittest
+import sys
+import os
+import asyncio
+from unittest import mock
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import session_store as store_module
+from services.session_store import SessionStore, decode_model, encode_model, session_turn
+from services.session_manager import ConversationSession, SessionManager
+from services.flow_engine import FlowEngine, FlowState
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return queue
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class _FakeRedis:
+    """Dict-backed stand-in for the hash commands the session store makes."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.hset_calls = []
+
+    def pipeline(self):
+        return _FakePipeline(self)
+
+    def hgetall(self, key):
+        return {name.encode("utf-8"): value for name, value in self.data.get(key, {}).items()}
+
+    def scan_iter(self, match):
+        return [key for key in self.data if key.startswith(match.rstrip("*"))]
+
+    def hset(self, key, mapping):
+        self.hset_calls.append(sorted(mapping))
+        self.data.setdefault(key, {}).update(mapping)
+
+    def expire(self, key, ttl):
+        self.ttls[key] = ttl
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+
+def _redis_store():
+    store = SessionStore(redis_url="redis://test")
+    store._redis = _FakeRedis()
+    return store
+
+
+class TestSessionStore(unittest.TestCase):
+    def test_workers_sharing_redis_see_each_others_sessions(self):
+        store = _redis_store()
+        worker_a, worker_b = SessionManager(store=store), SessionManager(store=store)
+
+        session = worker_a.get_or_create_session("s1")
+        worker_a.add_message("s1", "user", "2BHK in Whitefield")
+        worker_a.update_filters("s1", {"location": "Whitefield"})
+
+        self.assertEqual(len(worker_b.get_recent_messages("s1")), 1)
+        worker_b.record_objection("s1", "budget")
+        refreshed = worker_a.get_or_create_session("s1")
+        self.assertEqual(refreshed.objections_raised, ["budget"])
+        self.assertEqual(refreshed.current_filters, {"location": "Whitefield"})
+        self.assertIsNot(refreshed, session)  # Rebuilt: worker B changed it
+        self.assertIs(worker_a.get_or_create_session("s1"), refreshed)  # Unchanged since: same object
+        self.assertEqual(store._redis.ttls["session:v1:conversation:s1"], 240 * 60)
+
+    def test_save_writes_only_changed_fields(self):
+        store = _redis_store()
+        manager = SessionManager(store=store)
+        manager.get_or_create_session("s1")
+        store._redis.hset_calls.clear()
+
+        manager.record_interest("s1", "Brigade Avalon")
+        self.assertEqual(store._redis.hset_calls, [["interested_projects"]])
+
+        session = manager.get_or_create_session("s1")
+        session.last_topic = "investment"
+        manager.save_session(session)
+        self.assertEqual(sorted(store._redis.hset_calls[-1]), ["last_activity", "last_topic"])
+
+    def test_flow_state_is_persisted_and_reset(self):
+        store = _redis_store()
+        worker_a, worker_b = FlowEngine(store=store), FlowEngine(store=store)
+        state = worker_a.get_or_create_session("s1")
+        state.requirements.location = "Sarjapur"
+        state.current_node = "NODE_2"
+        worker_a._cache.save("s1", state)
+
+        shared = worker_b.get_or_create_session("s1")
+        self.assertEqual(shared.requirements.location, "Sarjapur")
+        self.assertIs(worker_b.sessions["s1"], shared)
+
+        worker_b.reset_session("s1")
+        self.assertEqual(worker_a.get_or_create_session("s1").current_node, "ROUTER")
+
+    def test_turn_loads_once_and_saves_once(self):
+        store = _redis_store()
+        manager = SessionManager(store=store)
+        manager.get_or_create_session("s1")
+        store._redis.hset_calls.clear()
+        loads = store.stats()["loads"]
+
+        async def turn():
+            async with session_turn():
+                manager.get_or_create_session("s1")
+                await asyncio.to_thread(manager.add_message, "s1", "user", "2BHK in Whitefield")
+                manager.update_filters("s1", {"location": "Whitefield"})
+                manager.record_interest("s1", "Brigade Avalon")
+                self.assertEqual(store._redis.hset_calls, [])  # Nothing written mid-turn
+                return manager.get_context_summary("s1")
+
+        asyncio.run(turn())
+        self.assertEqual(store.stats()["loads"] - loads, 1)
+        self.assertEqual(len(store._redis.hset_calls), 1)
+        self.assertTrue({"messages", "current_filters", "interested_projects"} <= set(store._redis.hset_calls[0]))
+
+        restored = SessionManager(store=store).get_or_create_session("s1")
+        self.assertEqual(restored.interested_projects, ["Brigade Avalon"])
+        self.assertEqual(len(restored.messages), 1)
+
+    def test_reset_clears_working_set_and_store(self):
+        store = _redis_store()
+        engine = FlowEngine(store=store)
+        engine.get_or_create_session("s1").current_node = "NODE_3"
+        engine.reset()
+        self.assertIsNone(engine.get_state("s1"))
+        self.assertEqual(len(engine.sessions), 0)
+        with self.assertRaises(AttributeError):
+            engine.sessions = {}  # Read-only: the store is the source of truth
+
+    def test_memory_backend_and_sliding_ttl(self):
+        store = SessionStore(redis_url=None)
+        manager = SessionManager(store=store)
+        manager.get_or_create_session("s1")
+        self.assertEqual(store.stats()["backend"], "memory")
+
+        with mock.patch("services.bounded_store.time.monotonic", return_value=10**10):
+            self.assertEqual(store.cleanup_expired(), 1)
+            self.assertEqual(manager.get_recent_messages("s1"), [])
+            self.assertNotIn("s1", manager.sessions)
+            self.assertFalse(manager.get_or_create_session("s1").messages)
+
+    def test_codecs_and_schema_tolerance(self):
+        session = ConversationSession(session_id="s1", interested_projects=["Brigade Avalon"])
+        for msgpack_available in (True, False):
+            with mock.patch.object(store_module, "MSGPACK_AVAILABLE", msgpack_available and store_module.MSGPACK_AVAILABLE):
+                fields = encode_model(session)
+            self.assertEqual(decode_model(ConversationSession, fields), session)
+
+        fields = encode_model(session)
+        fields["retired_field"] = store_module.encode_value(1)  # Written by an older release
+        fields["coaching_prompts_shown"] = store_module.encode_value(["site_visit_trigger"])  # Invalid shape
+        restored = decode_model(ConversationSession, fields)
+        self.assertEqual(restored.interested_projects, ["Brigade Avalon"])
+        self.assertEqual(restored.coaching_prompts_shown, [])
+
+        self.assertEqual(decode_model(FlowState, encode_model(FlowState())), FlowState())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import sys
+import os
+import json
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from openai import AsyncOpenAI
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.single_flight import SingleFlight, coalesce, single_flight
+from services.llm_cache import LLMResponseCache
+from services.llm_gateway import LLMGateway
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_identical_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def search():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"chunks": [{"id": 1}]}
+
+        async def run():
+            results = await asyncio.gather(*[flight.do("search", "q", search) for _ in range(5)])
+            other = await flight.do("search", "other", search)
+            return results, other
+
+        results, _ = asyncio.run(run())
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(all(r == {"chunks": [{"id": 1}]} for r in results))
+        results[0]["chunks"].append("mutated")
+        self.assertEqual(results[1]["chunks"], [{"id": 1}])  # Callers get independent copies
+        stats = flight.stats()
+        self.assertEqual((stats["executed"], stats["coalesced"], stats["in_flight"]), (2, 4, 0))
+        self.assertEqual(stats["groups"]["search"], {"executed": 2, "coalesced": 4})
+
+    def test_errors_are_shared_and_cancellation_is_not(self):
+        flight = SingleFlight()
+
+        async def broken():
+            await asyncio.sleep(0.02)
+            raise RuntimeError("search down")
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def run():
+            errors = await asyncio.gather(*[flight.do("g", "k", broken) for _ in range(3)], return_exceptions=True)
+            leader = asyncio.ensure_future(flight.do("g", "slow", slow))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do("g", "slow", slow))
+            await asyncio.sleep(0.01)
+            leader.cancel()  # The first caller disconnects
+            return errors, await follower
+
+        errors, result = asyncio.run(run())
+        self.assertTrue(all(isinstance(e, RuntimeError) for e in errors))
+        self.assertEqual(result, "done")
+
+    def test_threads_and_decorated_methods(self):
+        class Search:
+            def __init__(self):
+                self.calls = 0
+                self.lock = threading.Lock()
+
+            @coalesce("test_web_search")
+            def search_and_answer(self, query, topic_hint=None):
+                with self.lock:
+                    self.calls += 1
+                time.sleep(0.1)
+                return {"answer": query}
+
+        first, second = Search(), Search()
+        before = single_flight.stats()["groups"].get("test_web_search", {"coalesced": 0})["coalesced"]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(first.search_and_answer, "metro"),
+                       pool.submit(second.search_and_answer, query="metro"),
+                       pool.submit(first.search_and_answer, "metro", None)]
+            results = [f.result() for f in futures]
+        self.assertEqual(results, [{"answer": "metro"}] * 3)
+        self.assertEqual(first.calls + second.calls, 1)  # Key ignores the instance and how args are passed
+        after = single_flight.stats()["groups"]["test_web_search"]["coalesced"]
+        self.assertEqual(after - before, 2)
+
+    def test_gateway_coalesces_identical_deterministic_calls(self):
+        requests = []
+
+        async def handler(request):
+            requests.append(json.loads(request.content))
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={
+                "id": "cmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": "property_search"}}],
+            })
+
+        gateway = LLMGateway(api_key="test", base_url="http://llm.test/v1",
+                             cache=LLMResponseCache(redis_url=None))
+
+        async def run():
+            gateway._async_client = AsyncOpenAI(
+                api_key="test", base_url="http://llm.test/v1",
+                http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            )
+            gateway._async_loop = asyncio.get_running_loop()
+            messages = [{"role": "user", "content": "2bhk whitefield"}]
+            deterministic = [gateway.chat(model="gpt-4o", messages=messages, temperature=0,
+                                          cache="intent_classification") for _ in range(3)]
+            sampled = [gateway.chat(model="gpt-4o", messages=messages, temperature=0.7) for _ in range(2)]
+            return await asyncio.gather(*deterministic, *sampled)
+
+        results = asyncio.run(run())
+        self.assertEqual([r.choices[0].message.content for r in results], ["property_search"] * 5)
+        self.assertEqual(len(requests), 3)  # One shared deterministic call + two sampled ones
+
+
+if __name__ == '__main__':
+    unittest.main()
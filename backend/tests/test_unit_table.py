@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+import json
+
+import numpy as np
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.unit_table import UnitTable, parse_configuration_units, configuration_bhks
+from services.catalog_index import CatalogIndex
+
+SEED_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'seed_projects.json')
+
+
+class TestParseConfigurationUnits(unittest.TestCase):
+    def test_seed_format(self):
+        units = parse_configuration_units("{2BHK, 1249 - 1310, 1.35 Cr* }, {3 BHK + 2 T, 1539 - 1590, 1.65 Cr* }")
+        self.assertEqual(units, ((2.0, 1249.0, 1310.0, 1.35), (3.0, 1539.0, 1590.0, 1.65)))
+
+    def test_half_bhk_single_area_and_lakhs(self):
+        units = parse_configuration_units("{2.5 BHK, 1490, 95 L}")
+        self.assertEqual(units, ((2.5, 1490.0, 1490.0, 0.95),))
+
+    def test_area_only_format(self):
+        bhk, min_sqft, max_sqft, price = parse_configuration_units("2 BHK: 1200-1400 sqft")[0]
+        self.assertEqual((bhk, min_sqft, max_sqft), (2.0, 1200.0, 1400.0))
+        self.assertTrue(np.isnan(price))
+
+    def test_configuration_bhks(self):
+        self.assertEqual(configuration_bhks("{2 BHK, 1100, 1 Cr}, {3 BHK, 1500, 1.5 Cr}"), {2, 3})
+        self.assertEqual(configuration_bhks(None), frozenset())
+
+
+class TestUnitTable(unittest.TestCase):
+    def setUp(self):
+        self.table = UnitTable([
+            "{2 BHK, 1100, 1.0 Cr}, {3 BHK, 1500, 1.6 Cr}",
+            None,
+            "{2 BHK, 1200, 1.4 Cr}, {3 BHK, 1700, 2.1 Cr}, {4 BHK, 2200, 3 Cr}",
+        ])
+
+    def test_match_and_group_by_project(self):
+        unit_mask = self.table.match([2, 3], max_price_cr=1.5)
+        grouped = self.table.group_by_project(unit_mask)
+        self.assertEqual(sorted(grouped), [0, 2])
+        self.assertEqual([u['bhk'] for u in self.table.to_dicts(grouped[0])], [2])
+        self.assertEqual(self.table.projects_with(unit_mask).tolist(), [True, False, True])
+
+    def test_project_mask(self):
+        project_mask = np.array([False, False, True])
+        grouped = self.table.group_by_project(self.table.match([3], project_mask=project_mask))
+        self.assertEqual(list(grouped), [2])
+
+    def test_units_of(self):
+        self.assertEqual(len(self.table.units_of(1)), 0)
+        self.assertEqual(len(self.table.units_of(2)), 3)
+
+    def test_nearest_by_price(self):
+        nearest = self.table.nearest_by_price(1.5, limit=3)
+        self.assertEqual(self.table.price_cr[nearest].tolist(), [1.4, 1.6, 1.0])
+        only_3bhk = self.table.nearest_by_price(2.5, unit_mask=self.table.match([3]))
+        self.assertEqual(self.table.price_cr[only_3bhk].tolist(), [2.1, 1.6])
+
+
+class TestCatalogUnits(unittest.TestCase):
+    def test_seed_snapshot_matches_per_row_parse(self):
+        with open(SEED_PATH) as f:
+            projects = json.load(f)
+        index = CatalogIndex(projects)
+        grouped = index.units.group_by_project(index.units.match([3], max_price_cr=2.0))
+        for pos, p in enumerate(projects):
+            expected = [u for u in parse_configuration_units(p.get('configuration') or '')
+                        if u[0] == 3 and u[3] <= 2.0]
+            self.assertEqual(len(grouped.get(pos, [])), len(expected), p['name'])
+
+
+if __name__ == '__main__':
+    unittest.main()
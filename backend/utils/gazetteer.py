@@ -0,0 +1,351 @@
+"""
+Gazetteer - Multi-pattern matcher for locations, zones and project names.
+
+All known place names (coordinate table, locality -> zone map, zone names,
+common spellings) are compiled into one Aho-Corasick automaton, so a query
+is tagged in a single left-to-right pass instead of each module running its
+own `any(kw in text ...)` loop over a private keyword list. Matches only
+count at word boundaries ("hsr" does not match inside "thsr").
+
+Catalog snapshots extend the location gazetteer with project names (see
+CatalogIndex.gazetteer).
+"""
+
+import logging
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from utils.geolocation_utils import BANGALORE_COORDINATES
+
+logger = logging.getLogger(__name__)
+
+# Span kinds
+LOCALITY = "locality"
+ZONE = "zone"
+DIRECTION = "direction"
+CITY = "city"
+PROJECT = "project"
+
+LOCATION_KINDS = (LOCALITY, ZONE)
+
+# Locality -> Zone mapping (used for automatic zone inference)
+LOCALITY_ZONES: Dict[str, str] = {
+    # ========== EAST BANGALORE ==========
+    'whitefield': 'East Bangalore',
+    'budigere': 'East Bangalore',
+    'budigere cross': 'East Bangalore',
+    'varthur': 'East Bangalore',
+    'gunjur': 'East Bangalore',
+    'sarjapur': 'East Bangalore',
+    'sarjapur road': 'East Bangalore',
+    'panathur': 'East Bangalore',
+    'panathur road': 'East Bangalore',
+    'kadugodi': 'East Bangalore',
+    'marathahalli': 'East Bangalore',
+    'bellandur': 'East Bangalore',
+    'brookefield': 'East Bangalore',
+    'kundanhalli': 'East Bangalore',
+    'mahadevpura': 'East Bangalore',
+    'kr puram': 'East Bangalore',
+    'krishnarajapuram': 'East Bangalore',
+    'harlur': 'East Bangalore',
+    'harlur road': 'East Bangalore',
+    'kodathi': 'East Bangalore',
+    'carmelaram': 'East Bangalore',
+    'dommasandra': 'East Bangalore',
+    'old madras road': 'East Bangalore',
+    'hoodi': 'East Bangalore',
+    'itpl': 'East Bangalore',
+    
+    # ========== NORTH BANGALORE ==========
+    'thanisandra': 'North Bangalore',
+    'jakkur': 'North Bangalore',
+    'baglur': 'North Bangalore',
+    'bagalur': 'North Bangalore',
+    'yelahanka': 'North Bangalore',
+    'devanahalli': 'North Bangalore',
+    'devanhalli': 'North Bangalore',  # Common misspelling
+    'airport': 'North Bangalore',
+    'kempegowda international airport': 'North Bangalore',
+    'kia': 'North Bangalore',
+    'bial': 'North Bangalore',
+    'hebbal': 'North Bangalore',
+    'hennur': 'North Bangalore',
+    'hennur road': 'North Bangalore',
+    'kothanur': 'North Bangalore',
+    'sahakara nagar': 'North Bangalore',
+    'nagawara': 'North Bangalore',
+    'kasturi nagar': 'North Bangalore',
+    'rachenahalli': 'North Bangalore',
+    'kogilu': 'North Bangalore',
+    
+    # ========== SOUTH BANGALORE ==========
+    'koramangala': 'South Bangalore',
+    'hsr layout': 'South Bangalore',
+    'hsr': 'South Bangalore',
+    'btm layout': 'South Bangalore',
+    'btm': 'South Bangalore',
+    'jp nagar': 'South Bangalore',
+    'jayanagar': 'South Bangalore',
+    'bannerghatta': 'South Bangalore',
+    'bannerghatta road': 'South Bangalore',
+    'electronic city': 'South Bangalore',
+    'e-city': 'South Bangalore',
+    'ecity': 'South Bangalore',
+    'bommanahalli': 'South Bangalore',
+    'begur': 'South Bangalore',
+    'begur road': 'South Bangalore',
+    'kanakapura': 'South Bangalore',
+    'kanakapura road': 'South Bangalore',
+    'basavanagudi': 'South Bangalore',
+    'bilekahalli': 'South Bangalore',
+    'arekere': 'South Bangalore',
+    'hebbegodi': 'South Bangalore',
+    'chandapura': 'South Bangalore',
+    'hosur road': 'South Bangalore',
+    'kudlu gate': 'South Bangalore',
+    'hulimavu': 'South Bangalore',
+    
+    # ========== WEST BANGALORE ==========
+    'rajajinagar': 'West Bangalore',
+    'yeshwanthpur': 'West Bangalore',
+    'malleshwaram': 'West Bangalore',
+    'vijayanagar': 'West Bangalore',
+    'nagarbhavi': 'West Bangalore',
+    'magadi': 'West Bangalore',
+    'magadi road': 'West Bangalore',
+    'tumkur road': 'West Bangalore',
+    'peenya': 'West Bangalore',
+    'jalahalli': 'West Bangalore',
+    'dasarahalli': 'West Bangalore',
+    'bangalore university': 'West Bangalore',
+    'kengeri': 'West Bangalore',
+    'mysore road': 'West Bangalore',
+    'rajarajeshwari nagar': 'West Bangalore',
+    'rr nagar': 'West Bangalore',
+    
+    # ========== CENTRAL BANGALORE ==========
+    'indiranagar': 'Central Bangalore',
+    'mg road': 'Central Bangalore',
+    'brigade road': 'Central Bangalore',
+    'ulsoor': 'Central Bangalore',
+    'richmond road': 'Central Bangalore',
+    'lavelle road': 'Central Bangalore',
+    'vasanth nagar': 'Central Bangalore',
+    'shivajinagar': 'Central Bangalore',
+    'cubbon park': 'Central Bangalore',
+    'richmond town': 'Central Bangalore',
+}
+
+# Explicit zone mentions
+ZONE_ALIASES: Dict[str, str] = {
+    'north bangalore': 'North Bangalore',
+    'north bmr': 'North Bangalore',
+    'south bangalore': 'South Bangalore',
+    'east bangalore': 'East Bangalore',
+    'west bangalore': 'West Bangalore',
+    'central bangalore': 'Central Bangalore',
+    'north bengaluru': 'North Bangalore',
+    'south bengaluru': 'South Bangalore',
+    'east bengaluru': 'East Bangalore',
+    'west bengaluru': 'West Bangalore',
+    'central bengaluru': 'Central Bangalore',
+}
+
+# Standalone direction words (less reliable than explicit zones)
+DIRECTION_ZONES: Dict[str, str] = {
+    'north': 'North Bangalore',
+    'south': 'South Bangalore',
+    'east': 'East Bangalore',
+    'west': 'West Bangalore',
+    'central': 'Central Bangalore',
+}
+
+# Alternate spellings -> canonical locality
+LOCALITY_ALIASES: Dict[str, str] = {
+    'sarjapura': 'sarjapur',
+    'devanahali': 'devanahalli',
+    'yeshwantpur': 'yeshwanthpur',
+    'kanakpura road': 'kanakapura road',
+    'orr': 'outer ring road',
+    'outer ring road': 'outer ring road',
+    'sahakar nagar': 'sahakara nagar',
+}
+
+CITY_ALIASES: Dict[str, str] = {
+    'bangalore': 'Bangalore',
+    'bengaluru': 'Bangalore',
+    'blr': 'Bangalore',
+}
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class Span(NamedTuple):
+    start: int
+    end: int    # Exclusive
+    text: str   # Matched surface text (lowercased)
+    kind: str   # LOCALITY | ZONE | DIRECTION | CITY | PROJECT
+    value: str  # Canonical value (locality key, zone name, city or project name)
+
+
+def _normalize(pattern: str) -> str:
+    return _WHITESPACE_RE.sub(" ", pattern.lower().strip())
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum()
+
+
+class Gazetteer:
+    """Aho-Corasick automaton over (pattern, kind, value) entries."""
+
+    def __init__(self, entries: Iterable[Tuple[str, str, str]] = ()):
+        self._entries: Dict[str, List[Tuple[str, str]]] = {}
+        self._compiled = False
+        for pattern, kind, value in entries:
+            self.add(pattern, kind, value)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, pattern: str, kind: str, value: str) -> None:
+        pattern = _normalize(pattern or "")
+        if not pattern:
+            return
+        payloads = self._entries.setdefault(pattern, [])
+        if (kind, value) not in payloads:
+            payloads.append((kind, value))
+            self._compiled = False
+
+    def entries(self) -> List[Tuple[str, str, str]]:
+        return [(pattern, kind, value)
+                for pattern, payloads in self._entries.items()
+                for kind, value in payloads]
+
+    def extended(self, entries: Iterable[Tuple[str, str, str]]) -> "Gazetteer":
+        """A new gazetteer with this one's entries plus `entries`."""
+        return Gazetteer(list(self.entries()) + list(entries))
+
+    # ------------------------------------------------------------------
+    # Automaton
+    # ------------------------------------------------------------------
+
+    def _compile(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[str]] = [[]]
+        for pattern in self._entries:
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(pattern)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fallback = goto[f].get(ch, 0)
+                fail[nxt] = fallback if fallback != nxt else 0
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+
+        self._goto, self._fail, self._outputs = goto, fail, outputs
+        self._compiled = True
+
+    # ------------------------------------------------------------------
+    # Tagging
+    # ------------------------------------------------------------------
+
+    def tag(self, text: str, kinds: Optional[Sequence[str]] = None) -> List[Span]:
+        """
+        Every word-bounded match in `text`, ordered by start then longest first.
+        Overlapping matches are all returned ("sarjapur road" and "sarjapur").
+        """
+        if not text:
+            return []
+        if not self._compiled:
+            self._compile()
+
+        text = text.lower()
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        spans: List[Span] = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern in outputs[state]:
+                start = i - len(pattern) + 1
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if i + 1 < len(text) and _is_word_char(text[i + 1]):
+                    continue
+                for kind, value in self._entries[pattern]:
+                    if kinds is None or kind in kinds:
+                        spans.append(Span(start, i + 1, pattern, kind, value))
+
+        spans.sort(key=lambda s: (s.start, s.start - s.end))
+        return spans
+
+    def longest(self, text: str, kinds: Optional[Sequence[str]] = None) -> List[Span]:
+        """Non-overlapping leftmost-longest matches ("sarjapur road", not also "sarjapur")."""
+        selected: List[Span] = []
+        end = -1
+        for span in self.tag(text, kinds):
+            if span.start >= end:
+                selected.append(span)
+                end = span.end
+        return selected
+
+    def best(self, text: str, kinds: Optional[Sequence[str]] = None) -> Optional[Span]:
+        """The longest match (leftmost on ties) -- the most specific mention."""
+        spans = self.tag(text, kinds)
+        return max(spans, key=lambda s: (s.end - s.start, -s.start)) if spans else None
+
+
+def _location_entries() -> List[Tuple[str, str, str]]:
+    entries: List[Tuple[str, str, str]] = []
+    for locality in LOCALITY_ZONES:
+        entries.append((locality, LOCALITY, locality))
+    for alias, locality in LOCALITY_ALIASES.items():
+        entries.append((alias, LOCALITY, locality))
+    for alias, zone in ZONE_ALIASES.items():
+        entries.append((alias, ZONE, zone))
+    for direction, zone in DIRECTION_ZONES.items():
+        entries.append((direction, DIRECTION, zone))
+    for alias, city in CITY_ALIASES.items():
+        entries.append((alias, CITY, city))
+    for place in BANGALORE_COORDINATES:
+        if place in ZONE_ALIASES:
+            entries.append((place, ZONE, ZONE_ALIASES[place]))
+        elif place not in CITY_ALIASES:
+            entries.append((place, LOCALITY, place))
+    return entries
+
+
+@lru_cache(maxsize=1)
+def location_gazetteer() -> Gazetteer:
+    """Process-wide gazetteer of localities, zones, directions and city names."""
+    gazetteer = Gazetteer(_location_entries())
+    gazetteer._compile()
+    logger.info(f"Location gazetteer compiled: {len(gazetteer)} patterns")
+    return gazetteer
+
+
+def catalog_gazetteer(project_names: Iterable[Optional[str]]) -> Gazetteer:
+    """Location gazetteer extended with the catalog's project names."""
+    return location_gazetteer().extended(
+        (name, PROJECT, name) for name in project_names if name
+    )
@@ -1,6 +1,10 @@
 import math
 from typing import Dict, Tuple, Optional
 
+import numpy as np
+
+EARTH_RADIUS_KM = 6371
+
 # Representative coordinates for Bangalore micro-locations
 BANGALORE_COORDINATES: Dict[str, Tuple[float, float]] = {
     "whitefield": (12.9698, 77.7500),
@@ -60,6 +64,17 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     r = 6371 # Radius of earth in kilometers. Use 3956 for miles
     return c * r
 
+def haversine_km(lat1: float, lon1: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Vectorized Haversine distance (km) from one point to arrays of points
+    (decimal degrees). NaN coordinates yield NaN distances.
+    """
+    lat1, lon1 = math.radians(lat1), math.radians(lon1)
+    lats = np.radians(lats)
+    lons = np.radians(lons)
+    a = np.sin((lats - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lats) * np.sin((lons - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
 def get_coordinates(location_name: str) -> Optional[Tuple[float, float]]:
     """
     Returns (lat, lon) for a given location name.
@@ -71,9 +86,19 @@ def get_coordinates(location_name: str) -> Optional[Tuple[float, float]]:
     if location_name in BANGALORE_COORDINATES:
         return BANGALORE_COORDINATES[location_name]
     
-    # Keyword containing match
+    # Most specific known place mentioned in the name (single gazetteer pass):
+    # localities before zones before the bare city name, longest first
+    from utils.gazetteer import location_gazetteer, LOCALITY, ZONE, CITY
+    rank = {LOCALITY: 0, ZONE: 1, CITY: 2}
+    spans = location_gazetteer().tag(location_name, tuple(rank))
+    for span in sorted(spans, key=lambda s: (rank[s.kind], s.start - s.end, s.start)):
+        coords = BANGALORE_COORDINATES.get(span.value.lower())
+        if coords:
+            return coords
+    
+    # Partial names ("budigere" -> "budigere cross")
     for key, coords in BANGALORE_COORDINATES.items():
-        if key in location_name or location_name in key:
+        if location_name and location_name in key:
             return coords
             
     return None